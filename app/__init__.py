@@ -9,7 +9,6 @@ import cloudinary
 import os
 from dotenv import load_dotenv
 import pytz
-import time
 
 # Khởi tạo extensions
 db = SQLAlchemy()
@@ -23,79 +22,7 @@ VN_TZ = pytz.timezone('Asia/Ho_Chi_Minh')
 
 
 # ===== CACHE MANAGER (GLOBAL) =====
-class CacheManager:
-    """Quản lý cache với TTL động từ settings"""
-
-    def __init__(self):
-        self._cache = {}
-        self._timestamps = {}
-        self._stats = {'hits': 0, 'misses': 0, 'clears': 0}
-
-    def get_ttl(self):
-        """Lấy TTL từ settings"""
-        from app.models.settings import get_setting
-        try:
-            return max(int(get_setting('cache_time', '300')), 0)
-        except:
-            return 300
-
-    def get(self, key):
-        """Lấy cache với TTL check"""
-        if key not in self._cache:
-            self._stats['misses'] += 1
-            return None
-
-        ttl = self.get_ttl()
-        if ttl > 0:
-            age = time.time() - self._timestamps.get(key, 0)
-            if age > ttl:
-                self.delete(key)
-                self._stats['misses'] += 1
-                return None
-
-        self._stats['hits'] += 1
-        return self._cache[key]
-
-    def set(self, key, value):
-        self._cache[key] = value
-        self._timestamps[key] = time.time()
-
-    def delete(self, key):
-        self._cache.pop(key, None)
-        self._timestamps.pop(key, None)
-
-    def clear(self, pattern=None):
-        """Clear cache theo pattern hoặc tất cả"""
-        if pattern:
-            keys = [k for k in list(self._cache.keys()) if pattern in k]
-            for k in keys:
-                self.delete(k)
-        else:
-            self._cache.clear()
-            self._timestamps.clear()
-        self._stats['clears'] += 1
-
-    def get_stats(self):
-        """Thống kê cache"""
-        total = self._stats['hits'] + self._stats['misses']
-        hit_rate = (self._stats['hits'] / total * 100) if total > 0 else 0
-        return {
-            'hits': self._stats['hits'],
-            'misses': self._stats['misses'],
-            'hit_rate': f"{hit_rate:.1f}%",
-            'clears': self._stats['clears'],
-            'cached_keys': len(self._cache),
-            'ttl_seconds': self.get_ttl(),
-            'keys': list(self._cache.keys())
-        }
-
-    def is_cached(self, key):
-        """Check xem key có đang cached không"""
-        return self.get(key) is not None
-
-
-# Global cache instance
-cache_manager = CacheManager()
+from app.cache import CacheManager, cache_manager
 
 
 def create_app(config_class=Config):
@@ -116,15 +43,21 @@ def create_app(config_class=Config):
     # Upload Security
     app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024
 
-    # Static files caching
-    app.config['SEND_FILE_MAX_AGE_DEFAULT'] = 0
-
     # ==================== INIT EXTENSIONS ====================
     db.init_app(app)
     migrate.init_app(app, db)
     login_manager.init_app(app)
     compress.init_app(app)
     csrf.init_app(app)
+    cache_manager.init_app(app)
+
+    # ETag/Last-Modified + cache static (đăng ký sau compress để chạy trước Flask-Compress)
+    from app.http_cache import init_http_cache
+    init_http_cache(app)
+
+    # Asset đã fingerprint + nén sẵn (app/static/dist, xem asset_pipeline.py)
+    from app.assets import init_assets
+    init_assets(app)
 
     # ==================== CLOUDINARY ====================
     cloudinary.config(
@@ -148,10 +81,25 @@ def create_app(config_class=Config):
     app.register_blueprint(admin_bp, url_prefix='/admin')
     app.register_blueprint(chatbot_bp)
 
+    # ==================== SEARCH INDEX ====================
+    from app.search_index import init_search_index
+    init_search_index(app)
+
+    # ==================== FACET INDEX ====================
+    from app.facets import init_facet_index
+    init_facet_index(app)
+
+    # ==================== RELATED INDEX ====================
+    from app.related import init_related_index
+    init_related_index(app)
+
+    # ==================== VIEW COUNTER ====================
+    from app.view_counter import init_view_counter
+    init_view_counter(app)
+
     # ==================== GROQ INIT ====================
-    with app.app_context():
-        from app.chatbot.routes import init_groq
-        init_groq()
+    from app.chatbot.routes import init_chatbot
+    init_chatbot(app)
 
     config_class.init_app(app)
 
@@ -160,15 +108,12 @@ def create_app(config_class=Config):
     def inject_globals():
         """Inject globals với cache thông minh"""
         from app.models.settings import get_setting
-        from app.models.product import Category
+        from app.models.product import get_cached_categories
         from app.models.features import get_feature_context
         from app.models.wizard import get_default_wizard  # ⭐ THÊM IMPORT WIZARD
         from datetime import datetime
 
-        cached_categories = cache_manager.get('categories_active')
-        if cached_categories is None:
-            cached_categories = Category.query.filter_by(is_active=True).all()
-            cache_manager.set('categories_active', cached_categories)
+        cached_categories = get_cached_categories()
 
         feature_context = get_feature_context()
 
@@ -208,7 +153,7 @@ def create_app(config_class=Config):
                 page = 'all'
 
             # Lấy popup active
-            g.popup = Popup.get_active_popup(page)
+            g.popup = Popup.get_cached_active_popup(page)
 
     # ==================== JINJA2 FILTERS ====================
     @app.template_filter('format_price')
@@ -5,6 +5,8 @@
 from flask import render_template, request, flash, redirect, url_for
 from app import db, cache_manager
 from app.models.product import Product, get_cached_products
+from app.models.records import snapshot_products
+from sqlalchemy.orm import joinedload
 from app.forms.product import ProductForm
 from app.decorators import permission_required
 from app.admin import admin_bp
@@ -30,7 +32,11 @@ def products():
     products_list = cache_manager.get(cache_key)
 
     if products_list is None:
-        products_list = Product.query.order_by(Product.created_at.desc()).all()
+        products_list = snapshot_products(
+            Product.query.options(joinedload(Product.category))
+            .order_by(Product.created_at.desc()).all(),
+            with_media=False
+        )
         cache_manager.set(cache_key, products_list)
 
     per_page = 20
@@ -260,10 +260,12 @@ def clear_cache():
 @admin_bp.route('/settings/cache/stats', methods=['GET'])
 @permission_required('manage_settings')
 def cache_stats_api():
-    """API endpoint để lấy cache stats"""
+    """API endpoint để lấy cache stats (kèm thống kê flush lượt xem)"""
+    from app.view_counter import view_counter
     return jsonify({
         'success': True,
-        'stats': cache_manager.get_stats()
+        'stats': cache_manager.get_stats(),
+        'view_counter': view_counter.get_stats()
     })
 
 
@@ -0,0 +1,151 @@
+"""
+Phục vụ asset đã build (app/static/dist) - xem asset_pipeline.py
+
+- Manifest (dist/manifest.json) đọc 1 lần lúc khởi động; DEBUG thì đọc lại khi file đổi
+- Template: {{ asset_url('main.css') }} -> /assets/main.<hash>.css
+  Chưa có manifest (chưa chạy build) thì fallback về css/main.min.css qua url_for('static')
+- /assets/<file> gửi sẵn bản .br/.gz theo Accept-Encoding (không nén lại mỗi request),
+  Cache-Control 1 năm + immutable vì tên file đã chứa hash nội dung
+- Trang public: {{ page_css_url() }} = CSS chỉ gồm module trang đó dùng,
+  {{ critical_css() }} = CSS above-the-fold để inline vào <head> (build_css.py tạo sẵn)
+"""
+import json
+import mimetypes
+import os
+
+from flask import current_app, g, request, send_file, url_for, abort, before_render_template
+from markupsafe import Markup
+from werkzeug.security import safe_join
+
+DIST_FOLDER = 'dist'
+MANIFEST_NAME = 'manifest.json'
+ASSET_MAX_AGE = 31536000  # 1 năm
+
+# Thứ tự ưu tiên: brotli nhỏ hơn gzip ~15-20%
+PRECOMPRESSED = (('br', '.br'), ('gzip', '.gz'))
+
+# Tên logic -> file build cũ (khi chưa có manifest)
+ASSET_FALLBACKS = {
+    'main.css': 'css/main.min.css',
+    'main.js': 'js/main.min.js',
+}
+
+
+def _dist_dir(app):
+    return os.path.join(app.static_folder, DIST_FOLDER)
+
+
+def load_manifest(app):
+    """Đọc manifest vào app.extensions['asset_manifest']"""
+    path = os.path.join(_dist_dir(app), MANIFEST_NAME)
+    try:
+        mtime = os.path.getmtime(path)
+        with open(path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        mtime, manifest = None, {}
+
+    app.extensions['asset_manifest'] = (mtime, manifest)
+    return manifest
+
+
+def get_manifest():
+    app = current_app._get_current_object()
+    mtime, manifest = app.extensions.get('asset_manifest', (None, None))
+    if manifest is None:
+        return load_manifest(app)
+
+    if app.debug:
+        try:
+            current_mtime = os.path.getmtime(os.path.join(_dist_dir(app), MANIFEST_NAME))
+        except OSError:
+            current_mtime = None
+        if current_mtime != mtime:
+            return load_manifest(app)
+    return manifest
+
+
+def asset_url(name):
+    """URL của asset đã fingerprint, vd asset_url('main.css')"""
+    filename = get_manifest().get(name)
+    if filename:
+        return url_for('assets', filename=filename)
+    return url_for('static', filename=ASSET_FALLBACKS.get(name, name))
+
+
+# ==================== CSS THEO TỪNG TRANG ====================
+def _remember_page_template(sender, template, context, **extra):
+    """Template render đầu tiên của request = template của trang (include không phát signal)"""
+    if 'page_template' not in g:
+        g.page_template = template.name
+
+
+def _page_name():
+    """'public/san_pham/products.html' -> 'san_pham/products', template ngoài public -> None"""
+    name = g.get('page_template') or ''
+    if not name.startswith('public/') or not name.endswith('.html'):
+        return None
+    return name[len('public/'):-len('.html')]
+
+
+def page_css_url():
+    """CSS riêng của trang hiện tại, chưa build thì dùng main.css"""
+    page = _page_name()
+    if page and get_manifest().get(f'pages/{page}.css'):
+        return asset_url(f'pages/{page}.css')
+    return asset_url('main.css')
+
+
+def critical_css():
+    """Nội dung critical CSS của trang để inline, '' nếu tắt hoặc chưa build"""
+    page = _page_name()
+    if not page or not current_app.config.get('CRITICAL_CSS_ENABLED', True):
+        return ''
+
+    filename = get_manifest().get(f'critical/{page}.css')
+    if not filename:
+        return ''
+
+    contents = current_app.extensions.setdefault('critical_css', {})
+    if filename not in contents:
+        try:
+            with open(os.path.join(_dist_dir(current_app), filename), 'r', encoding='utf-8') as f:
+                contents[filename] = f.read()
+        except OSError:
+            contents[filename] = ''
+    # File do build script tạo, không chứa input người dùng; chặn '</style' cho chắc
+    return Markup(contents[filename].replace('</', '<\\/'))
+
+
+def serve_asset(filename):
+    """Gửi file trong dist/, ưu tiên bản nén sẵn mà client chấp nhận"""
+    path = safe_join(_dist_dir(current_app), filename)
+    if path is None or filename == MANIFEST_NAME or not os.path.isfile(path):
+        abort(404)
+
+    if filename.endswith('.map'):
+        mimetype = 'application/json'
+    else:
+        mimetype = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+    encoding = None
+    for name, suffix in PRECOMPRESSED:
+        if request.accept_encodings[name] and os.path.isfile(path + suffix):
+            path, encoding = path + suffix, name
+            break
+
+    response = send_file(path, mimetype=mimetype, conditional=True, max_age=ASSET_MAX_AGE)
+    if encoding:
+        response.headers['Content-Encoding'] = encoding
+    response.vary.add('Accept-Encoding')
+    response.cache_control.public = True
+    response.cache_control.immutable = True
+    return response
+
+
+def init_assets(app):
+    load_manifest(app)
+    app.add_url_rule('/assets/<path:filename>', 'assets', serve_asset)
+    app.jinja_env.globals['asset_url'] = asset_url
+    app.jinja_env.globals['page_css_url'] = page_css_url
+    app.jinja_env.globals['critical_css'] = critical_css
+    before_render_template.connect(_remember_page_template, app)
@@ -0,0 +1,619 @@
+"""
+Cache Manager - cache cho toàn app với backend có thể thay thế
+
+- Thread-safe (gunicorn gthread chạy nhiều thread / worker)
+- TTL mặc định lấy từ setting 'cache_time' (cache lại, chỉ đọc lại khi setting thay đổi)
+- TTL riêng cho từng key qua cache_manager.set(key, value, ttl=...)
+
+Backend (config CACHE_BACKEND):
+- 'memory' (mặc định): dict trong RAM của worker, LRU theo số key và dung lượng ước tính
+- 'sqlite': file SQLite dùng chung giữa các worker trên cùng máy (CACHE_SQLITE_PATH)
+- 'redis': server nói giao thức Redis (RESP) qua CACHE_REDIS_URL, dùng chung nhiều máy
+
+Với backend dùng chung, clear()/delete() ở 1 worker có hiệu lực ngay cho mọi worker.
+Các cache nội bộ từng worker (vd: settings) dùng bump_version()/get_version()
+để biết khi nào cần load lại.
+"""
+import os
+import pickle
+import socket
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from urllib.parse import urlparse, unquote
+
+DEFAULT_TTL = 300
+DEFAULT_MAX_ENTRIES = 500
+DEFAULT_MAX_BYTES = 32 * 1024 * 1024
+
+
+def estimate_size(value, _depth=0, _seen=None):
+    """
+    Ước tính dung lượng (bytes) của 1 giá trị cache
+
+    Chỉ duyệt tối đa vài tầng (list/dict/object) để không tốn CPU,
+    kết quả là xấp xỉ - đủ để giới hạn bộ nhớ, không cần chính xác.
+    """
+    if _seen is None:
+        _seen = set()
+    if id(value) in _seen:
+        return 0
+    _seen.add(id(value))
+
+    size = sys.getsizeof(value, 64)
+    if _depth >= 3 or isinstance(value, (str, bytes, int, float, bool)) or value is None:
+        return size
+
+    if isinstance(value, dict):
+        for k, v in value.items():
+            size += estimate_size(k, _depth + 1, _seen) + estimate_size(v, _depth + 1, _seen)
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        for item in value:
+            size += estimate_size(item, _depth + 1, _seen)
+    else:
+        attrs = getattr(value, '__dict__', None)
+        if attrs:
+            for k, v in attrs.items():
+                if not k.startswith('_sa_'):
+                    size += estimate_size(v, _depth + 1, _seen)
+        for slot in getattr(type(value), '__slots__', ()):
+            size += estimate_size(getattr(value, slot, None), _depth + 1, _seen)
+    return size
+
+
+# ==================== BACKENDS ====================
+class CacheBackend:
+    """
+    Interface cho backend lưu cache
+
+    Mỗi entry là tuple (value, timestamp, ttl). CacheManager lo TTL + thống kê,
+    backend chỉ lo lưu trữ, giới hạn dung lượng và đồng bộ giữa các worker.
+    """
+    name = 'base'
+    shared = False  # True = dùng chung giữa các worker/process
+
+    def configure(self, max_entries, max_bytes):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+
+    def get(self, key):
+        raise NotImplementedError
+
+    def set(self, key, value, timestamp, ttl):
+        raise NotImplementedError
+
+    def delete(self, key):
+        raise NotImplementedError
+
+    def clear(self, pattern=None):
+        raise NotImplementedError
+
+    def keys(self):
+        raise NotImplementedError
+
+    def incr_version(self, name):
+        raise NotImplementedError
+
+    def get_version(self, name):
+        raise NotImplementedError
+
+    def stats(self):
+        """Thống kê riêng của backend: approx_bytes, evictions"""
+        return {'approx_bytes': 0, 'evictions': 0}
+
+
+class MemoryBackend(CacheBackend):
+    """Dict trong RAM (mỗi worker 1 bản), LRU theo số key và dung lượng ước tính"""
+    name = 'memory'
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES, max_bytes=DEFAULT_MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        # key -> (value, timestamp, ttl, size)
+        self._cache = OrderedDict()
+        self._versions = {}
+        self._bytes = 0
+        self._evictions = 0
+        self._lock = threading.RLock()
+
+    def configure(self, max_entries, max_bytes):
+        with self._lock:
+            super().configure(max_entries, max_bytes)
+            self._evict()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is None:
+                return None
+            self._cache.move_to_end(key)
+            return entry[:3]
+
+    def set(self, key, value, timestamp, ttl):
+        size = estimate_size(value)
+        with self._lock:
+            self._remove(key)
+            if self.max_bytes and size > self.max_bytes:
+                # Giá trị quá lớn - không cache để tránh đẩy hết key khác ra
+                self._evictions += 1
+                return
+            self._cache[key] = (value, timestamp, ttl, size)
+            self._bytes += size
+            self._evict()
+
+    def delete(self, key):
+        with self._lock:
+            self._remove(key)
+
+    def clear(self, pattern=None):
+        with self._lock:
+            if pattern:
+                for k in [k for k in self._cache if pattern in k]:
+                    self._remove(k)
+            else:
+                self._cache.clear()
+                self._bytes = 0
+
+    def keys(self):
+        with self._lock:
+            return list(self._cache.keys())
+
+    def incr_version(self, name):
+        with self._lock:
+            self._versions[name] = self._versions.get(name, 0) + 1
+            return self._versions[name]
+
+    def get_version(self, name):
+        return self._versions.get(name, 0)
+
+    def stats(self):
+        return {'approx_bytes': self._bytes, 'evictions': self._evictions}
+
+    def _remove(self, key):
+        entry = self._cache.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry[3]
+
+    def _evict(self):
+        """Xóa key ít dùng nhất (LRU) cho tới khi nằm trong giới hạn"""
+        while self._cache and (
+                (self.max_entries and len(self._cache) > self.max_entries) or
+                (self.max_bytes and self._bytes > self.max_bytes)):
+            _, entry = self._cache.popitem(last=False)
+            self._bytes -= entry[3]
+            self._evictions += 1
+
+
+class SQLiteBackend(CacheBackend):
+    """
+    Cache dùng chung giữa các worker trên cùng máy qua 1 file SQLite (WAL)
+
+    Giá trị được pickle. LRU xấp xỉ: cột accessed chỉ cập nhật khi cũ hơn vài giây
+    để tránh ghi file ở mỗi lần đọc.
+    """
+    name = 'sqlite'
+    shared = True
+    ACCESS_UPDATE_INTERVAL = 5
+
+    def __init__(self, path, max_entries=DEFAULT_MAX_ENTRIES, max_bytes=DEFAULT_MAX_BYTES):
+        self.path = path
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._local = threading.local()
+        self._evictions = 0
+        self._connect()
+
+    def _connect(self):
+        """1 connection / thread, tạo lại sau khi fork (gunicorn preload_app)"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None and self._local.pid == os.getpid():
+            return conn
+
+        conn = sqlite3.connect(self.path, timeout=5, isolation_level=None, check_same_thread=False)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        conn.execute('CREATE TABLE IF NOT EXISTS cache ('
+                     'key TEXT PRIMARY KEY, value BLOB NOT NULL, created REAL NOT NULL, '
+                     'ttl REAL, size INTEGER NOT NULL, accessed REAL NOT NULL)')
+        conn.execute('CREATE INDEX IF NOT EXISTS ix_cache_accessed ON cache (accessed)')
+        conn.execute('CREATE TABLE IF NOT EXISTS cache_versions ('
+                     'name TEXT PRIMARY KEY, version INTEGER NOT NULL)')
+        self._local.conn = conn
+        self._local.pid = os.getpid()
+        return conn
+
+    def get(self, key):
+        conn = self._connect()
+        row = conn.execute('SELECT value, created, ttl, accessed FROM cache WHERE key = ?', (key,)).fetchone()
+        if row is None:
+            return None
+
+        now = time.time()
+        if now - row[3] > self.ACCESS_UPDATE_INTERVAL:
+            conn.execute('UPDATE cache SET accessed = ? WHERE key = ?', (now, key))
+        return pickle.loads(row[0]), row[1], row[2]
+
+    def set(self, key, value, timestamp, ttl):
+        data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        if self.max_bytes and len(data) > self.max_bytes:
+            self._evictions += 1
+            return
+
+        conn = self._connect()
+        conn.execute('INSERT OR REPLACE INTO cache (key, value, created, ttl, size, accessed) '
+                     'VALUES (?, ?, ?, ?, ?, ?)', (key, data, timestamp, ttl, len(data), timestamp))
+        self._evict(conn)
+
+    def delete(self, key):
+        self._connect().execute('DELETE FROM cache WHERE key = ?', (key,))
+
+    def clear(self, pattern=None):
+        conn = self._connect()
+        if pattern:
+            conn.execute('DELETE FROM cache WHERE instr(key, ?) > 0', (pattern,))
+        else:
+            conn.execute('DELETE FROM cache')
+
+    def keys(self):
+        return [row[0] for row in self._connect().execute('SELECT key FROM cache ORDER BY accessed')]
+
+    def incr_version(self, name):
+        conn = self._connect()
+        conn.execute('INSERT INTO cache_versions (name, version) VALUES (?, 1) '
+                     'ON CONFLICT(name) DO UPDATE SET version = version + 1', (name,))
+        return self.get_version(name)
+
+    def get_version(self, name):
+        row = self._connect().execute('SELECT version FROM cache_versions WHERE name = ?', (name,)).fetchone()
+        return row[0] if row else 0
+
+    def stats(self):
+        count, total = self._connect().execute('SELECT COUNT(*), COALESCE(SUM(size), 0) FROM cache').fetchone()
+        return {'approx_bytes': total, 'evictions': self._evictions}
+
+    def _evict(self, conn):
+        count, total = conn.execute('SELECT COUNT(*), COALESCE(SUM(size), 0) FROM cache').fetchone()
+        while count and ((self.max_entries and count > self.max_entries) or
+                         (self.max_bytes and total > self.max_bytes)):
+            row = conn.execute('SELECT key, size FROM cache ORDER BY accessed LIMIT 1').fetchone()
+            if row is None:
+                break
+            conn.execute('DELETE FROM cache WHERE key = ?', (row[0],))
+            count -= 1
+            total -= row[1]
+            self._evictions += 1
+
+
+class RedisError(Exception):
+    pass
+
+
+class RedisBackend(CacheBackend):
+    """
+    Cache dùng chung qua server nói giao thức Redis (RESP2)
+
+    Client tối giản (GET/SET/DEL/SCAN/INCR) nên không cần thêm thư viện;
+    chạy được với Redis, Valkey, KeyDB hoặc 1 server giả lập RESP khi test.
+    Giới hạn bộ nhớ để cho server lo (maxmemory + allkeys-lru).
+    """
+    name = 'redis'
+    shared = True
+    RETRY_AFTER = 5  # giây chờ trước khi thử kết nối lại khi server không phản hồi
+
+    def __init__(self, url, prefix='bricon:', socket_timeout=1.0):
+        parsed = urlparse(url)
+        self.host = parsed.hostname or 'localhost'
+        self.port = parsed.port or 6379
+        self.password = unquote(parsed.password) if parsed.password else None
+        self.db = int(parsed.path.lstrip('/') or 0)
+        self.prefix = prefix
+        self.socket_timeout = socket_timeout
+        self._local = threading.local()
+        self._down_until = 0
+
+    # ----- RESP protocol -----
+    def _connect(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None and self._local.pid == os.getpid():
+            return conn
+
+        # Server đang lỗi: fail nhanh thay vì chờ timeout ở mỗi request
+        if time.monotonic() < self._down_until:
+            raise ConnectionError('Redis unavailable')
+        try:
+            sock = socket.create_connection((self.host, self.port), timeout=self.socket_timeout)
+        except OSError:
+            self._down_until = time.monotonic() + self.RETRY_AFTER
+            raise
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        conn = (sock, sock.makefile('rb'))
+        # Chỉ giữ connection khi AUTH/SELECT thành công (không dùng lại socket chưa xác thực)
+        try:
+            if self.password:
+                self._execute(conn, ('AUTH', self.password))
+            if self.db:
+                self._execute(conn, ('SELECT', self.db))
+        except Exception:
+            self._close(conn)
+            raise
+        self._local.conn = conn
+        self._local.pid = os.getpid()
+        return conn
+
+    @staticmethod
+    def _close(conn):
+        try:
+            conn[1].close()
+            conn[0].close()
+        except OSError:
+            pass
+
+    def _disconnect(self):
+        conn = getattr(self._local, 'conn', None)
+        self._local.conn = None
+        if conn is not None:
+            self._close(conn)
+
+    def _execute(self, conn, args):
+        sock, reader = conn
+        parts = [b'*%d\r\n' % len(args)]
+        for arg in args:
+            if not isinstance(arg, bytes):
+                arg = str(arg).encode('utf-8')
+            parts.append(b'$%d\r\n%s\r\n' % (len(arg), arg))
+        sock.sendall(b''.join(parts))
+        return self._read_reply(reader)
+
+    def _command(self, *args):
+        conn = self._connect()
+        try:
+            return self._execute(conn, args)
+        except (OSError, ValueError):
+            # Connection hỏng: bỏ để lần sau kết nối lại
+            self._disconnect()
+            raise
+
+    def _read_reply(self, reader):
+        line = reader.readline()
+        if not line:
+            raise ConnectionError('Redis connection closed')
+        kind, payload = line[:1], line[1:-2]
+        if kind == b'+':
+            return payload.decode('utf-8')
+        if kind == b'-':
+            raise RedisError(payload.decode('utf-8'))
+        if kind == b':':
+            return int(payload)
+        if kind == b'$':
+            length = int(payload)
+            if length == -1:
+                return None
+            data = reader.read(length + 2)
+            return data[:-2]
+        if kind == b'*':
+            length = int(payload)
+            if length == -1:
+                return None
+            return [self._read_reply(reader) for _ in range(length)]
+        raise RedisError(f'Unknown reply: {line!r}')
+
+    # ----- Backend API -----
+    def _key(self, key):
+        return f'{self.prefix}c:{key}'
+
+    def _scan(self, match):
+        cursor = b'0'
+        while True:
+            cursor, keys = self._command('SCAN', cursor, 'MATCH', match, 'COUNT', 500)
+            yield from keys
+            if cursor in (b'0', 0, '0'):
+                break
+
+    @staticmethod
+    def _escape_glob(text):
+        for ch in '\\*?[]':
+            text = text.replace(ch, '\\' + ch)
+        return text
+
+    def get(self, key):
+        data = self._command('GET', self._key(key))
+        if data is None:
+            return None
+        return pickle.loads(data)
+
+    def set(self, key, value, timestamp, ttl):
+        data = pickle.dumps((value, timestamp, ttl), protocol=pickle.HIGHEST_PROTOCOL)
+        # CacheManager luôn truyền TTL đã chốt; chỉ ttl=0 (không hết hạn) mới ghi không PX
+        if ttl:
+            self._command('SET', self._key(key), data, 'PX', int(ttl * 1000))
+        else:
+            self._command('SET', self._key(key), data)
+
+    def delete(self, key):
+        self._command('DEL', self._key(key))
+
+    def clear(self, pattern=None):
+        match = f'{self.prefix}c:*'
+        if pattern:
+            match = f'{self.prefix}c:*{self._escape_glob(pattern)}*'
+        keys = list(self._scan(match))
+        for i in range(0, len(keys), 500):
+            self._command('DEL', *keys[i:i + 500])
+
+    def keys(self):
+        offset = len(self._key(''))
+        return [k.decode('utf-8')[offset:] for k in self._scan(f'{self.prefix}c:*')]
+
+    def incr_version(self, name):
+        return self._command('INCR', f'{self.prefix}v:{name}')
+
+    def get_version(self, name):
+        value = self._command('GET', f'{self.prefix}v:{name}')
+        return int(value) if value is not None else 0
+
+
+def create_backend(config):
+    """Tạo backend theo config CACHE_BACKEND"""
+    backend = (config.get('CACHE_BACKEND') or 'memory').lower()
+    max_entries = int(config.get('CACHE_MAX_ENTRIES', DEFAULT_MAX_ENTRIES))
+    max_bytes = int(config.get('CACHE_MAX_BYTES', DEFAULT_MAX_BYTES))
+
+    if backend == 'sqlite':
+        path = config.get('CACHE_SQLITE_PATH') or os.path.join(tempfile.gettempdir(), 'bricon_cache.sqlite3')
+        return SQLiteBackend(path, max_entries, max_bytes)
+    if backend == 'redis':
+        return RedisBackend(config.get('CACHE_REDIS_URL') or 'redis://localhost:6379/0',
+                            prefix=config.get('CACHE_KEY_PREFIX', 'bricon:'))
+    return MemoryBackend(max_entries, max_bytes)
+
+
+# ==================== CACHE MANAGER ====================
+class CacheManager:
+    """Quản lý cache với TTL động từ settings, lưu trữ qua backend"""
+
+    def __init__(self, backend=None):
+        self.backend = backend or MemoryBackend()
+        self._ttl = None
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0, 'clears': 0, 'expirations': 0, 'errors': 0}
+        self._logger = None
+
+    def init_app(self, app):
+        """Chọn backend + giới hạn cache từ config"""
+        self._logger = app.logger
+        backend = (app.config.get('CACHE_BACKEND') or 'memory').lower()
+        if backend == self.backend.name == 'memory':
+            self.backend.configure(int(app.config.get('CACHE_MAX_ENTRIES', self.backend.max_entries)),
+                                   int(app.config.get('CACHE_MAX_BYTES', self.backend.max_bytes)))
+            return
+
+        try:
+            self.backend = create_backend(app.config)
+        except Exception as e:
+            app.logger.error(f"❌ Cache backend '{backend}' unavailable, fallback to memory: {e}")
+            self.backend = create_backend({**app.config, 'CACHE_BACKEND': 'memory'})
+
+    @property
+    def is_shared(self):
+        return self.backend.shared
+
+    def _count(self, stat):
+        with self._lock:
+            self._stats[stat] += 1
+
+    def _backend_call(self, method, *args, default=None):
+        """Gọi backend, lỗi backend (vd: Redis mất kết nối) coi như cache miss"""
+        try:
+            return getattr(self.backend, method)(*args)
+        except Exception as e:
+            self._count('errors')
+            if self._logger:
+                self._logger.error(f"❌ Cache backend {method} error: {e}")
+            return default
+
+    # ==================== TTL ====================
+    def get_ttl(self):
+        """Lấy TTL mặc định (cache lại, chỉ đọc settings khi chưa có)"""
+        ttl = self._ttl
+        if ttl is not None:
+            return ttl
+
+        from app.models.settings import get_setting
+        try:
+            ttl = max(int(get_setting('cache_time', str(DEFAULT_TTL))), 0)
+        except Exception:
+            # Chưa có app context / DB chưa sẵn sàng: dùng mặc định, không cache lại
+            return DEFAULT_TTL
+        self._ttl = ttl
+        return ttl
+
+    def reset_ttl(self):
+        """Gọi khi settings thay đổi để đọc lại cache_time ở lần get kế tiếp"""
+        self._ttl = None
+
+    # ==================== GET / SET ====================
+    def get(self, key):
+        """Lấy cache với TTL check"""
+        entry = self._backend_call('get', key)
+        if entry is None:
+            self._count('misses')
+            return None
+
+        value, timestamp, ttl = entry
+        if ttl is None:
+            ttl = self.get_ttl()
+        if ttl > 0 and time.time() - timestamp > ttl:
+            self._backend_call('delete', key)
+            self._count('expirations')
+            self._count('misses')
+            return None
+
+        self._count('hits')
+        return value
+
+    def set(self, key, value, ttl=None):
+        """
+        Lưu cache
+
+        Args:
+            ttl: TTL riêng cho key này (giây), None = dùng cache_time, 0 = không hết hạn
+        """
+        if ttl is None:
+            # Chốt TTL lúc ghi: backend tự xóa key hết hạn (Redis không có giới hạn số key);
+            # đổi cache_time thì admin xóa toàn bộ cache
+            ttl = self.get_ttl()
+        self._backend_call('set', key, value, time.time(), ttl)
+
+    def delete(self, key):
+        self._backend_call('delete', key)
+
+    def clear(self, pattern=None):
+        """Clear cache theo pattern hoặc tất cả"""
+        self._backend_call('clear', pattern)
+        self._count('clears')
+
+    # ==================== VERSION (ĐỒNG BỘ GIỮA WORKERS) ====================
+    def bump_version(self, name):
+        """Tăng version của 1 namespace - các worker khác thấy và tự load lại"""
+        return self._backend_call('incr_version', name)
+
+    def get_version(self, name):
+        return self._backend_call('get_version', name, default=0)
+
+    # ==================== STATS ====================
+    def get_stats(self):
+        """Thống kê cache (hits/misses tính riêng cho worker hiện tại)"""
+        ttl = self.get_ttl()
+        keys = self._backend_call('keys', default=[])
+        backend_stats = self._backend_call('stats', default={}) or {}
+        with self._lock:
+            stats = dict(self._stats)
+        total = stats['hits'] + stats['misses']
+        hit_rate = (stats['hits'] / total * 100) if total > 0 else 0
+        return {
+            'backend': self.backend.name,
+            'hits': stats['hits'],
+            'misses': stats['misses'],
+            'hit_rate': f"{hit_rate:.1f}%",
+            'clears': stats['clears'],
+            'evictions': backend_stats.get('evictions', 0),
+            'expirations': stats['expirations'],
+            'errors': stats['errors'],
+            'cached_keys': len(keys),
+            'max_entries': getattr(self.backend, 'max_entries', 0),
+            'approx_bytes': backend_stats.get('approx_bytes', 0),
+            'max_bytes': getattr(self.backend, 'max_bytes', 0),
+            'ttl_seconds': ttl,
+            'keys': keys
+        }
+
+    def is_cached(self, key):
+        """Check xem key có đang cached không"""
+        return self.get(key) is not None
+
+
+# Global cache instance
+cache_manager = CacheManager()
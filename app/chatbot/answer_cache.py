@@ -0,0 +1,187 @@
+"""
+Cache câu trả lời theo câu hỏi gần giống nhau (giá, hotline, đổi trả, nên dùng keo nào...)
+
+- Chuẩn hóa câu hỏi: bỏ dấu (tokenize của app/search_index.py) + bỏ từ đệm/xưng hô
+  ('cho em hỏi', 'ạ', 'vậy'...) -> term = từ + cặp từ liền nhau
+- Tìm câu hỏi đã lưu có cosine TF-IDF >= CHATBOT_ANSWER_CACHE_THRESHOLD -> trả câu trả lời cũ,
+  không gọi Groq
+- Chỉ dùng/lưu khi chưa có lịch sử hội thoại (câu trả lời không phụ thuộc ngữ cảnh)
+- Giới hạn CHATBOT_ANSWER_CACHE_SIZE câu (LRU), hết hạn sau CHATBOT_ANSWER_CACHE_TTL giây,
+  xóa hết khi company_info.json đổi
+- Mỗi worker 1 bản trong RAM; thống kê (hit rate, token tiết kiệm, độ trễ) ở /chatbot/status
+"""
+import math
+import threading
+import time
+from collections import OrderedDict
+
+from app.search_index import tokenize
+from .prompts import estimate_tokens
+
+DEFAULT_THRESHOLD = 0.85
+DEFAULT_SIZE = 500
+DEFAULT_TTL = 6 * 3600
+
+# Từ đệm, xưng hô, từ hỏi (đã bỏ dấu) - không làm đổi nghĩa câu hỏi
+# (tránh từ trùng với thuật ngữ sau khi bỏ dấu: đá, dày, bền, cam...)
+STOPWORDS = frozenset('''
+a ad admin ah alo anh ban bricon cho chi chu co cua dang duoc em gi gium giup hay hoi la
+minh nao nay nhe nhi oi shop thi the toi va vay voi vui long xin chao
+'''.split())
+
+
+def normalize_terms(question):
+    words = [word for word in tokenize(question) if word not in STOPWORDS]
+    return words + [f'{a} {b}' for a, b in zip(words, words[1:])]
+
+
+def _key(terms):
+    """Câu hỏi trùng hẳn sau chuẩn hóa ('Hotline?' / 'cho em xin hotline ạ') -> cùng key"""
+    return '|'.join(sorted(terms))
+
+
+class CachedAnswer:
+    __slots__ = ('key', 'question', 'terms', 'answer', 'mode', 'saved_tokens', 'created_at', 'hits')
+
+    def __init__(self, key, question, terms, answer, mode, saved_tokens):
+        self.key = key
+        self.question = question
+        self.terms = terms              # {term: tf}
+        self.answer = answer
+        self.mode = mode
+        self.saved_tokens = saved_tokens
+        self.created_at = time.time()
+        self.hits = 0
+
+
+class AnswerCache:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()   # key (term đã chuẩn hóa) -> CachedAnswer
+        self._df = {}                   # term -> số câu hỏi đã lưu chứa term
+        self._source = None             # mtime company_info lúc lưu
+        self.enabled = True
+        self.threshold = DEFAULT_THRESHOLD
+        self.max_entries = DEFAULT_SIZE
+        self.ttl = DEFAULT_TTL
+        self._stats = {'lookups': 0, 'hits': 0, 'stores': 0, 'evictions': 0, 'saved_tokens': 0,
+                       'total_hit_ms': 0.0, 'misses_timed': 0, 'total_miss_ms': 0.0}
+
+    def init_app(self, app):
+        self.enabled = app.config.get('CHATBOT_ANSWER_CACHE_ENABLED', True)
+        self.threshold = float(app.config.get('CHATBOT_ANSWER_CACHE_THRESHOLD', DEFAULT_THRESHOLD))
+        self.max_entries = int(app.config.get('CHATBOT_ANSWER_CACHE_SIZE', DEFAULT_SIZE))
+        self.ttl = int(app.config.get('CHATBOT_ANSWER_CACHE_TTL', DEFAULT_TTL))
+
+    # ---------- vector ----------
+    def _weights(self, terms):
+        total = len(self._entries) + 1
+        vector = {term: (1 + math.log(tf)) * (math.log((1 + total) / (1 + self._df.get(term, 0))) + 1)
+                  for term, tf in terms.items()}
+        norm = math.sqrt(sum(w * w for w in vector.values()))
+        return {term: w / norm for term, w in vector.items()} if norm else {}
+
+    @staticmethod
+    def _counts(question):
+        counts = {}
+        for term in normalize_terms(question):
+            counts[term] = counts.get(term, 0) + 1
+        return counts
+
+    def _remove(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for term in entry.terms:
+            left = self._df.get(term, 0) - 1
+            if left > 0:
+                self._df[term] = left
+            else:
+                self._df.pop(term, None)
+
+    def _check_source(self, source):
+        if source != self._source:
+            self._entries.clear()
+            self._df.clear()
+            self._source = source
+
+    # ---------- API ----------
+    def lookup(self, question, source=None):
+        """CachedAnswer gần nhất (cosine >= threshold) hoặc None"""
+        if not self.enabled:
+            return None
+        started = time.perf_counter()
+        terms = self._counts(question)
+        with self._lock:
+            self._check_source(source)
+            self._stats['lookups'] += 1
+            if not terms:
+                return None
+
+            best, best_score = self._entries.get(_key(terms)), 1.0
+            if best is None:
+                query = self._weights(terms)
+                best_score = 0.0
+                for entry in self._entries.values():
+                    vector = self._weights(entry.terms)
+                    score = sum(weight * vector.get(term, 0.0) for term, weight in query.items())
+                    if score > best_score:
+                        best, best_score = entry, score
+
+            if best is None or best_score < self.threshold:
+                return None
+            if time.time() - best.created_at > self.ttl:
+                self._remove(best.key)
+                return None
+
+            self._entries.move_to_end(best.key)
+            best.hits += 1
+            self._stats['hits'] += 1
+            self._stats['saved_tokens'] += best.saved_tokens
+            self._stats['total_hit_ms'] += (time.perf_counter() - started) * 1000
+            return best
+
+    def store(self, question, answer, mode, prompt_tokens, source=None):
+        if not self.enabled:
+            return
+        terms = self._counts(question)
+        if not terms:
+            return
+        key = _key(terms)
+        entry = CachedAnswer(key, question, terms, answer, mode, prompt_tokens + estimate_tokens(answer))
+        with self._lock:
+            self._check_source(source)
+            self._remove(key)
+            self._entries[key] = entry
+            for term in terms:
+                self._df[term] = self._df.get(term, 0) + 1
+            self._stats['stores'] += 1
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+                self._stats['evictions'] += 1
+
+    def record_miss(self, elapsed_ms):
+        """Thời gian trả lời khi phải gọi Groq (để so với khi lấy từ cache)"""
+        with self._lock:
+            self._stats['misses_timed'] += 1
+            self._stats['total_miss_ms'] += elapsed_ms
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._df.clear()
+
+    def get_stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            stats['entries'] = len(self._entries)
+        hits, lookups, misses = stats['hits'], stats['lookups'], stats.pop('misses_timed')
+        stats['hit_rate'] = round(hits / lookups, 3) if lookups else 0.0
+        stats['avg_hit_ms'] = round(stats.pop('total_hit_ms') / hits, 3) if hits else 0.0
+        stats['avg_miss_ms'] = round(stats.pop('total_miss_ms') / misses, 1) if misses else 0.0
+        stats['enabled'] = self.enabled
+        stats['threshold'] = self.threshold
+        return stats
+
+
+answer_cache = AnswerCache()
@@ -0,0 +1,307 @@
+"""
+Client Groq dùng chung cho /chatbot/send và /chatbot/stream
+
+- 1 httpx.Client / worker: giữ kết nối keep-alive tới API Groq (không bắt tay TLS mỗi câu hỏi),
+  tạo lại sau khi gunicorn fork (preload_app)
+- Deadline mỗi lượt gọi GROQ_TIMEOUT giây (tính cả các lần thử lại)
+- Thử lại khi 429/5xx/lỗi kết nối: backoff lũy thừa + jitter, tôn trọng Retry-After
+- Circuit breaker: GROQ_BREAKER_THRESHOLD lỗi liên tiếp -> mở GROQ_BREAKER_COOLDOWN giây,
+  trong lúc mở báo lỗi ngay (không chờ timeout); hết cooldown cho 1 request thử
+- Giới hạn GROQ_MAX_CONCURRENCY lượt gọi cùng lúc (stream giữ slot tới khi đóng) để chatbot
+  không chiếm hết thread gunicorn; hết slot sau GROQ_QUEUE_TIMEOUT giây -> báo bận
+
+Usage:
+    from .client import groq_gateway, GroqUnavailable
+    completion = groq_gateway.complete(messages=..., model=...)
+    stream = groq_gateway.stream(messages=..., model=...)   # for chunk in stream ... stream.close()
+"""
+import os
+import random
+import threading
+import time
+
+import httpx
+from groq import Groq, APIConnectionError, APIStatusError
+
+DEFAULT_TIMEOUT = 30
+DEFAULT_CONNECT_TIMEOUT = 5
+DEFAULT_MAX_RETRIES = 2
+DEFAULT_RETRY_BACKOFF = 0.5
+DEFAULT_MAX_CONCURRENCY = 2
+DEFAULT_QUEUE_TIMEOUT = 2
+DEFAULT_BREAKER_THRESHOLD = 5
+DEFAULT_BREAKER_COOLDOWN = 30
+DEFAULT_KEEPALIVE = 60
+
+
+class GroqUnavailable(Exception):
+    """
+    Không gọi được Groq, reason:
+    - 'not_configured': thiếu GROQ_API_KEY
+    - 'circuit_open': Groq đang lỗi liên tục, tạm ngừng gọi
+    - 'busy': hết slot gọi đồng thời
+    - 'upstream': đã thử lại nhưng vẫn lỗi (429/5xx/timeout)
+    """
+
+    def __init__(self, reason, message=''):
+        super().__init__(message or reason)
+        self.reason = reason
+
+
+def _is_retryable(error):
+    if isinstance(error, APIConnectionError):     # gồm cả APITimeoutError
+        return True
+    if isinstance(error, APIStatusError):
+        return error.status_code == 429 or error.status_code >= 500
+    return False
+
+
+def _retry_after(error):
+    """Giây chờ theo header Retry-After (nếu có)"""
+    response = getattr(error, 'response', None)
+    try:
+        return float(response.headers.get('retry-after')) if response is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+class CircuitBreaker:
+    def __init__(self, threshold=DEFAULT_BREAKER_THRESHOLD, cooldown=DEFAULT_BREAKER_COOLDOWN):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at = None
+        self._trial = False          # đang có 1 request thử (half-open)
+        self.opened = 0
+
+    @property
+    def state(self):
+        if self._opened_at is None:
+            return 'closed'
+        return 'half_open' if time.monotonic() - self._opened_at >= self.cooldown else 'open'
+
+    def allow(self):
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if time.monotonic() - self._opened_at < self.cooldown or self._trial:
+                return False
+            self._trial = True
+            return True
+
+    def success(self):
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial = False
+
+    def failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._trial or self._failures >= self.threshold:
+                if self._opened_at is None or self._trial:
+                    self.opened += 1
+                self._opened_at = time.monotonic()
+                self._trial = False
+
+    def release(self):
+        """Request thử kết thúc không rõ kết quả (lỗi 4xx, khách ngắt stream)"""
+        with self._lock:
+            self._trial = False
+
+    def stats(self):
+        with self._lock:
+            return {'state': self.state, 'consecutive_failures': self._failures, 'opened': self.opened}
+
+
+class GatewayStream:
+    """Bọc Stream của Groq: giữ slot + ghi kết quả vào breaker khi đọc hết/đóng"""
+
+    def __init__(self, gateway, stream):
+        self._gateway = gateway
+        self._stream = stream
+        self._done = False
+
+    def __iter__(self):
+        try:
+            for chunk in self._stream:
+                yield chunk
+        except Exception as error:
+            self._finish(error)
+            raise
+        self._finish(None)
+
+    def _finish(self, error):
+        if self._done:
+            return
+        self._done = True
+        self._gateway._settle(error)
+        self._gateway._slots.release()
+
+    def close(self):
+        try:
+            self._stream.close()
+        finally:
+            if not self._done:
+                # Đóng giữa chừng (khách ngắt kết nối): không tính là lỗi của Groq
+                self._done = True
+                self._gateway.breaker.release()
+                self._gateway._slots.release()
+
+
+class GroqGateway:
+    def __init__(self):
+        self._client = None
+        self._pid = None
+        self._client_lock = threading.Lock()
+        self._api_key = None
+        self.timeout = DEFAULT_TIMEOUT
+        self.connect_timeout = DEFAULT_CONNECT_TIMEOUT
+        self.max_retries = DEFAULT_MAX_RETRIES
+        self.retry_backoff = DEFAULT_RETRY_BACKOFF
+        self.queue_timeout = DEFAULT_QUEUE_TIMEOUT
+        self.max_concurrency = DEFAULT_MAX_CONCURRENCY
+        self.keepalive = DEFAULT_KEEPALIVE
+        self.breaker = CircuitBreaker()
+        self._slots = threading.BoundedSemaphore(self.max_concurrency)
+        self._stats_lock = threading.Lock()
+        self._stats = {'calls': 0, 'succeeded': 0, 'failed': 0, 'retries': 0,
+                       'rejected_open': 0, 'rejected_busy': 0, 'total_ms': 0.0}
+
+    def init_app(self, app):
+        self._api_key = app.config.get('GROQ_API_KEY')
+        self.timeout = float(app.config.get('GROQ_TIMEOUT', DEFAULT_TIMEOUT))
+        self.connect_timeout = float(app.config.get('GROQ_CONNECT_TIMEOUT', DEFAULT_CONNECT_TIMEOUT))
+        self.max_retries = int(app.config.get('GROQ_MAX_RETRIES', DEFAULT_MAX_RETRIES))
+        self.retry_backoff = float(app.config.get('GROQ_RETRY_BACKOFF', DEFAULT_RETRY_BACKOFF))
+        self.queue_timeout = float(app.config.get('GROQ_QUEUE_TIMEOUT', DEFAULT_QUEUE_TIMEOUT))
+        self.max_concurrency = max(1, int(app.config.get('GROQ_MAX_CONCURRENCY', DEFAULT_MAX_CONCURRENCY)))
+        self.keepalive = float(app.config.get('GROQ_KEEPALIVE', DEFAULT_KEEPALIVE))
+        self.breaker = CircuitBreaker(int(app.config.get('GROQ_BREAKER_THRESHOLD', DEFAULT_BREAKER_THRESHOLD)),
+                                      float(app.config.get('GROQ_BREAKER_COOLDOWN', DEFAULT_BREAKER_COOLDOWN)))
+        self._slots = threading.BoundedSemaphore(self.max_concurrency)
+        self._client = None
+        if not self._api_key:
+            app.logger.warning("⚠️ GROQ_API_KEY not found in config")
+        else:
+            app.logger.info(f"✅ Groq client ready (concurrency={self.max_concurrency}, timeout={self.timeout}s)")
+
+    @property
+    def configured(self):
+        return bool(self._api_key)
+
+    def _get_client(self):
+        """Groq client của process hiện tại (tạo lại sau fork: không dùng chung socket với master)"""
+        if self._client is not None and self._pid == os.getpid():
+            return self._client
+        with self._client_lock:
+            if self._client is None or self._pid != os.getpid():
+                http_client = httpx.Client(
+                    timeout=httpx.Timeout(self.timeout, connect=self.connect_timeout),
+                    limits=httpx.Limits(max_connections=self.max_concurrency,
+                                        max_keepalive_connections=self.max_concurrency,
+                                        keepalive_expiry=self.keepalive),
+                )
+                # Tự thử lại ở _call (có jitter + deadline chung), tắt retry của SDK
+                self._client = Groq(api_key=self._api_key, http_client=http_client, max_retries=0)
+                self._pid = os.getpid()
+        return self._client
+
+    def _record(self, **counters):
+        with self._stats_lock:
+            for key, value in counters.items():
+                self._stats[key] += value
+
+    def _settle(self, error):
+        """Ghi kết quả 1 lượt gọi vào breaker"""
+        if error is None:
+            self.breaker.success()
+        elif _is_retryable(error):
+            self.breaker.failure()
+        else:
+            self.breaker.release()
+
+    def _call(self, kwargs):
+        """Gọi create() với deadline chung + thử lại; giả định đã giữ slot"""
+        client = self._get_client()
+        deadline = time.monotonic() + self.timeout
+        attempt = 0
+        while True:
+            remaining = max(deadline - time.monotonic(), 0.1)
+            try:
+                return client.chat.completions.create(
+                    timeout=httpx.Timeout(remaining, connect=min(self.connect_timeout, remaining)), **kwargs)
+            except Exception as error:
+                if not _is_retryable(error) or attempt >= self.max_retries:
+                    raise
+                # Full jitter: tránh mọi worker thử lại cùng lúc sau khi Groq hồi phục
+                delay = random.uniform(0, self.retry_backoff * (2 ** attempt))
+                delay = max(delay, _retry_after(error) or 0)
+                if time.monotonic() + delay >= deadline:
+                    raise
+                attempt += 1
+                self._record(retries=1)
+                time.sleep(delay)
+
+    def _acquire(self):
+        if not self.configured:
+            raise GroqUnavailable('not_configured')
+        if not self.breaker.allow():
+            self._record(rejected_open=1)
+            raise GroqUnavailable('circuit_open')
+        if not self._slots.acquire(timeout=self.queue_timeout):
+            self.breaker.release()
+            self._record(rejected_busy=1)
+            raise GroqUnavailable('busy')
+        self._record(calls=1)
+
+    def complete(self, **kwargs):
+        """chat.completions.create(stream=False) qua pool + retry + breaker"""
+        self._acquire()
+        started = time.perf_counter()
+        try:
+            completion = self._call(dict(kwargs, stream=False))
+        except Exception as error:
+            self._settle(error)
+            self._record(failed=1)
+            if _is_retryable(error):
+                raise GroqUnavailable('upstream', str(error)) from error
+            raise
+        finally:
+            self._slots.release()
+        self._settle(None)
+        self._record(succeeded=1, total_ms=(time.perf_counter() - started) * 1000)
+        return completion
+
+    def stream(self, **kwargs):
+        """
+        Mở stream (thử lại nếu chưa nhận được response); slot được giữ tới khi
+        stream đọc hết hoặc close()
+        """
+        self._acquire()
+        started = time.perf_counter()
+        try:
+            stream = self._call(dict(kwargs, stream=True))
+        except Exception as error:
+            self._settle(error)
+            self._slots.release()
+            self._record(failed=1)
+            if _is_retryable(error):
+                raise GroqUnavailable('upstream', str(error)) from error
+            raise
+        self._record(succeeded=1, total_ms=(time.perf_counter() - started) * 1000)
+        return GatewayStream(self, stream)
+
+    def get_stats(self):
+        with self._stats_lock:
+            stats = dict(self._stats)
+        succeeded = stats['succeeded']
+        stats['avg_response_ms'] = round(stats.pop('total_ms') / succeeded, 1) if succeeded else 0.0
+        stats['configured'] = self.configured
+        stats['max_concurrency'] = self.max_concurrency
+        stats['breaker'] = self.breaker.stats()
+        return stats
+
+
+groq_gateway = GroqGateway()
@@ -0,0 +1,176 @@
+"""
+Dựng system prompt cho chatbot từ company_info.json
+
+- create_full_prompt: toàn bộ thông tin (chế độ 'full')
+- estimate_tokens: ước lượng kích thước prompt
+- Các section/đoạn (passage) dùng chung với chế độ 'retrieval' (app/chatbot/retrieval.py):
+  phần đầu (liên hệ) + nguyên tắc trả lời luôn có, phần kiến thức chỉ lấy đoạn liên quan
+"""
+
+RULE = '━' * 40
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Ước lượng số token (không có tokenizer của model): ~4 byte UTF-8 / token,
+    đủ để theo dõi kích thước prompt / chi phí
+    """
+    return (len(text.encode('utf-8')) + 3) // 4 if text else 0
+
+
+def contact_fields(company_info: dict) -> dict:
+    """Thông tin cơ bản + liên hệ (có giá trị mặc định)"""
+    contact = company_info.get('contact', {}) or {}
+    phone = contact.get('phone', '0901.180.094')
+    return {
+        'company_name': company_info.get('company_name', 'CÔNG TY TNHH BRICON VIỆT NAM'),
+        'slogan': company_info.get('slogan', 'Kết dính bền lâu – Xây dựng niềm tin'),
+        'phone': phone,
+        'hotline': contact.get('hotline', '0901180094'),
+        'email': contact.get('email', 'info@bricon.vn'),
+        'zalo': contact.get('zalo', phone),
+        'address': contact.get('address', '171 Đường An Phú Đông 03, P. An Phú Đông, Q.12, TP.HCM'),
+        'website': contact.get('website', 'https://www.bricon.vn'),
+        'working_hours': contact.get('working_hours', '8:00 - 17:30 (Thứ 2 - Thứ 7)'),
+    }
+
+
+def format_header(fields: dict) -> str:
+    return (f"BẠN LÀ TRỢ LÝ ẢO BRICON - CHUYÊN GIA VẬT LIỆU XÂY DỰNG\n\n"
+            f"🏢 {fields['company_name']} | 💡 {fields['slogan']}\n"
+            f"📞 {fields['hotline']} | 💬 Zalo: {fields['zalo']} | 📧 {fields['email']} | 🌐 {fields['website']}\n"
+            f"📍 {fields['address']} | ⏰ {fields['working_hours']}")
+
+
+def format_block(title: str, body: str) -> str:
+    return f"{RULE}\n{title}\n{RULE}\n{body}"
+
+
+def format_rules(fields: dict) -> str:
+    hotline, zalo = fields['hotline'], fields['zalo']
+    return f"""1. Trả lời CHÍNH XÁC dựa trên thông tin đã cung cấp ở trên
+2. Trích dẫn cụ thể từ phần sản phẩm/FAQ khi được hỏi về thông số kỹ thuật
+3. KHÔNG đưa giá cụ thể → hướng dẫn liên hệ {hotline} hoặc Zalo {zalo}
+4. Thân thiện, chuyên nghiệp, ngắn gọn (2-5 câu)
+5. Nếu không chắc chắn → nói thẳng và cho thông tin liên hệ
+6. Ưu tiên câu trả lời ngắn gọn, tránh dài dòng trừ khi khách yêu cầu chi tiết
+7. Luôn trả lời bằng tiếng Việt có dấu
+8. Khi khách hỏi về sản phẩm → giới thiệu sản phẩm phù hợp nhất từ danh mục"""
+
+
+# ==================== TỪNG LOẠI THÔNG TIN ====================
+def format_product(p: dict) -> str:
+    info = [f"━━━ {p.get('name', 'N/A')} ━━━"]
+    if p.get('category'):
+        info.append(f"• Loại: {p['category']}")
+    if p.get('brand'):
+        info.append(f"• Thương hiệu: {p['brand']}")
+    if p.get('description'):
+        info.append(f"• Mô tả: {p['description']}")
+
+    # Composition
+    if p.get('composition'):
+        info.append("• Thành phần:")
+        for comp in p['composition']:
+            info.append(f"  - {comp}")
+
+    # Application
+    if p.get('application'):
+        info.append("• Ứng dụng:")
+        for app in p['application']:
+            info.append(f"  - {app}")
+
+    # Technical specs (FULL - không cắt)
+    if p.get('technical_specs'):
+        info.append("• Thông số kỹ thuật:")
+        for k, v in p['technical_specs'].items():
+            info.append(f"  - {k}: {v}")
+
+    if p.get('packaging'):
+        info.append(f"• Đóng gói: {p['packaging']}")
+    if p.get('colors'):
+        info.append(f"• Màu sắc: {', '.join(p['colors'])}")
+    if p.get('expiry'):
+        info.append(f"• Hạn sử dụng: {p['expiry']}")
+    if p.get('standards'):
+        info.append(f"• Tiêu chuẩn: {p['standards']}")
+
+    return "\n".join(info)
+
+
+def format_faq(question: str, answer: str) -> str:
+    return f"❓ {question}\n💡 {answer}\n"
+
+
+def format_branches(branches) -> str:
+    return "\n".join([
+        f"• {b.get('name', 'N/A')}: {b.get('address', 'N/A')}"
+        for b in branches or []
+    ]) or "—"
+
+
+def format_return_policy(rp: dict) -> str:
+    return_summary = rp.get('policy_summary', 'Công ty có chính sách đổi trả linh hoạt')
+    conditions = rp.get('conditions', {}) or {}
+    conditions_parts = []
+    for key, value in conditions.items():
+        if isinstance(value, list):
+            items = "\n".join([f"  • {item}" for item in value])
+            conditions_parts.append(f"\n{key}:\n{items}")
+        else:
+            conditions_parts.append(f"\n{key}: {value}")
+    conditions_text = "".join(conditions_parts)
+
+    notes = rp.get('note', []) or []
+    notes_text = "\n".join([f"⚠️ {n}" for n in notes]) if notes else ""
+    return f"📌 {return_summary}\n✅ Điều kiện:{conditions_text}\n{notes_text}"
+
+
+# ==================== SECTION ====================
+def knowledge_sections(company_info: dict):
+    """
+    Các section kiến thức theo thứ tự trong prompt full
+
+    Returns: [(key, title, [passage, ...], separator)] - section lớn (sản phẩm, FAQ)
+    được tách thành nhiều đoạn để retrieval chọn riêng từng đoạn
+    """
+    products = company_info.get('products', []) or []
+    strengths = company_info.get('strengths', []) or []
+    process = company_info.get('process', []) or []
+    projects = company_info.get('projects', []) or []
+    faq = company_info.get('faq', []) or []
+    contact = company_info.get('contact', {}) or {}
+
+    return [
+        ('intro', '📖 GIỚI THIỆU CÔNG TY', [company_info.get('company_intro', '')], ''),
+        ('branches', '🏪 HỆ THỐNG CHI NHÁNH', [format_branches(contact.get('branches', []))], ''),
+        ('products', '📦 DANH MỤC SẢN PHẨM CHI TIẾT (TOÀN BỘ)',
+         [format_product(p) for p in products] or ["—"], "\n\n"),
+        ('strengths', '⭐ ƯU ĐIỂM NỔI BẬT',
+         ["\n".join([f"✓ {s}" for s in strengths]) or "—"], ''),
+        ('return_policy', '🔄 CHÍNH SÁCH ĐỔI TRẢ',
+         [format_return_policy(company_info.get('return_policy', {}) or {})], ''),
+        ('process', '📋 QUY TRÌNH ĐẶT HÀNG',
+         ["\n".join([f"{i + 1}. {s}" for i, s in enumerate(process)]) or "—"], ''),
+        ('projects', '🏗️ DỰ ÁN TIÊU BIỂU', ["\n".join([f"• {proj}" for proj in projects]) or "—"], ''),
+        ('faq', '❓ CÂU HỎI THƯỜNG GẶP',
+         [format_faq(q.get('question', ''), q.get('answer', '')) for q in faq] or ["—"], "\n"),
+    ]
+
+
+def assemble_prompt(fields: dict, blocks) -> str:
+    """Header + các block (tiêu đề, nội dung) + nguyên tắc trả lời"""
+    parts = [format_block(title, body) for title, body in blocks]
+    parts.append(format_block('🎯 NGUYÊN TẮC TRẢ LỜI', format_rules(fields)))
+    return format_header(fields) + "\n\n" + "\n\n".join(parts) + "\n"
+
+
+# ==================== FULL PROMPT ====================
+def create_full_prompt(company_info: dict) -> str:
+    """
+    Tạo prompt FULL với toàn bộ thông tin từ JSON
+    Không cắt giảm, không summarize
+    """
+    blocks = [(title, separator.join(passages))
+              for _, title, passages, separator in knowledge_sections(company_info)]
+    return assemble_prompt(contact_fields(company_info), blocks)
@@ -0,0 +1,222 @@
+"""
+Chế độ prompt 'retrieval': chỉ gửi các đoạn kiến thức liên quan tới câu hỏi
+
+- company_info.json được tách thành đoạn (passage): mỗi sản phẩm, mỗi FAQ, mỗi section nhỏ
+  (giới thiệu, chi nhánh, ưu điểm, đổi trả, quy trình, dự án) - app/chatbot/prompts.py
+- Tùy chọn thêm sản phẩm/FAQ đang bật trong DB (CHATBOT_RETRIEVAL_INCLUDE_DB)
+- Index BM25 trong RAM: term = từ đã bỏ dấu + cặp từ liền nhau (tokenize của app/search_index.py)
+- Prompt = header liên hệ + danh sách tên sản phẩm + top-K đoạn (giữ thứ tự section như prompt full)
+  + nguyên tắc trả lời, dừng thêm đoạn khi vượt CHATBOT_PROMPT_TOKEN_BUDGET
+- Index build lại khi company_info.json đổi (mtime) hoặc sau CHATBOT_RETRIEVAL_REFRESH giây nếu có dữ liệu DB
+"""
+import math
+import threading
+import time
+
+from app.search_index import tokenize, strip_html
+from .prompts import (contact_fields, knowledge_sections, assemble_prompt, format_block, format_product,
+                      format_faq, estimate_tokens)
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+DEFAULT_TOP_K = 6
+DEFAULT_TOKEN_BUDGET = 2500
+DEFAULT_REFRESH = 300
+
+
+def _terms(text):
+    words = tokenize(text)
+    return words + [f'{a} {b}' for a, b in zip(words, words[1:])]
+
+
+class Passage:
+    __slots__ = ('section', 'text', 'tokens')
+
+    def __init__(self, section, text, tokens):
+        self.section = section
+        self.text = text
+        self.tokens = tokens
+
+
+class KnowledgeIndex:
+    """BM25 trên các đoạn kiến thức (immutable sau khi build)"""
+
+    def __init__(self, passages, sections, fields, catalog, key):
+        self.passages = passages
+        self.sections = sections          # [(key, title, separator)] theo thứ tự prompt full
+        self.fields = fields
+        self.catalog = catalog
+        self.key = key
+        self.built_at = time.time()
+
+        # Token của khung section (tiêu đề + đường kẻ), tính khi section đầu tiên được chọn
+        titles = {key: title for key, title, _ in sections}
+        self._overhead = {key: estimate_tokens(format_block(title, '')) for key, title in titles.items()}
+
+        self._postings = {}               # term -> [(số thứ tự đoạn, tf)]
+        self._lengths = []
+        for i, passage in enumerate(passages):
+            # Tiêu đề section cũng là nội dung tìm kiếm ('chính sách đổi trả' -> đoạn đổi trả)
+            counts = {}
+            for term in _terms(f"{titles.get(passage.section, '')} {passage.text}"):
+                counts[term] = counts.get(term, 0) + 1
+            self._lengths.append(sum(counts.values()))
+            for term, tf in counts.items():
+                self._postings.setdefault(term, []).append((i, tf))
+        self._avg_length = (sum(self._lengths) / len(self._lengths)) if self._lengths else 0.0
+
+        # Phần luôn có trong prompt retrieval
+        self.base_prompt = assemble_prompt(fields, self._pinned_blocks())
+        self.base_tokens = estimate_tokens(self.base_prompt)
+
+    def _pinned_blocks(self):
+        if not self.catalog:
+            return []
+        return [('📦 DANH SÁCH SẢN PHẨM', "\n".join(f"• {name}" for name in self.catalog))]
+
+    def search(self, query, limit):
+        """[(điểm, số thứ tự đoạn)] giảm dần"""
+        total = len(self.passages)
+        scores = {}
+        for term in set(_terms(query)):
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1 + (total - len(postings) + 0.5) / (len(postings) + 0.5))
+            for i, tf in postings:
+                norm = 1 - BM25_B + BM25_B * self._lengths[i] / (self._avg_length or 1)
+                scores[i] = scores.get(i, 0.0) + idf * tf * (BM25_K1 + 1) / (tf + BM25_K1 * norm)
+        ranked = sorted(((score, i) for i, score in scores.items()), reverse=True)
+        return ranked[:limit]
+
+    def build_prompt(self, query, top_k, token_budget):
+        """Returns: (prompt, số token ước lượng, số đoạn đã dùng)"""
+        budget = token_budget - self.base_tokens
+        chosen = set()
+        sections = set()
+        for _, i in self.search(query, top_k):
+            passage = self.passages[i]
+            cost = passage.tokens + (0 if passage.section in sections else self._overhead[passage.section])
+            if cost > budget:
+                continue
+            chosen.add(i)
+            sections.add(passage.section)
+            budget -= cost
+
+        if not chosen:
+            return self.base_prompt, self.base_tokens, 0
+
+        by_section = {}
+        for i in sorted(chosen):
+            by_section.setdefault(self.passages[i].section, []).append(self.passages[i].text)
+        blocks = self._pinned_blocks()
+        blocks += [(title, separator.join(by_section[key]))
+                   for key, title, separator in self.sections if key in by_section]
+        prompt = assemble_prompt(self.fields, blocks)
+        return prompt, estimate_tokens(prompt), len(chosen)
+
+    def stats(self):
+        return {
+            'passages': len(self.passages),
+            'terms': len(self._postings),
+            'base_tokens': self.base_tokens,
+            'built_at': self.built_at,
+        }
+
+
+# ==================== NGUỒN ĐOẠN KIẾN THỨC ====================
+def _db_passages():
+    """Sản phẩm + FAQ đang bật trong DB (cần app context)"""
+    from sqlalchemy.orm import load_only
+    from app.models.product import Product
+    from app.models.content import FAQ
+
+    products = Product.query.options(load_only(Product.name, Product.description, Product.technical_info)) \
+        .filter_by(is_active=True).all()
+    faqs = FAQ.query.filter_by(is_active=True).order_by(FAQ.order).all()
+
+    passages = []
+    for p in products:
+        specs = p.technical_info if isinstance(p.technical_info, dict) else {}
+        passages.append(('products', p.name, format_product({
+            'name': p.name,
+            'description': strip_html(p.description),
+            'technical_specs': {k: v for k, v in specs.items() if v},
+        })))
+    for faq in faqs:
+        passages.append(('faq', None, format_faq(faq.question, strip_html(faq.answer))))
+    return passages
+
+
+def build_knowledge_index(company_info, include_db=False, key=None):
+    sections = knowledge_sections(company_info)
+    passages = []
+    catalog = []
+    for section_key, _, texts, _ in sections:
+        for text in texts:
+            if text and text != "—":
+                passages.append(Passage(section_key, text, estimate_tokens(text) + 1))
+    catalog.extend(p.get('name', 'N/A') for p in company_info.get('products', []) or [])
+
+    if include_db:
+        known = {name.lower() for name in catalog}
+        for section_key, name, text in _db_passages():
+            if name is not None:
+                if name.lower() in known:
+                    continue
+                known.add(name.lower())
+                catalog.append(name)
+            passages.append(Passage(section_key, text, estimate_tokens(text) + 1))
+
+    return KnowledgeIndex(passages, [(k, title, sep) for k, title, _, sep in sections],
+                          contact_fields(company_info), catalog, key)
+
+
+# ==================== CACHE + THỐNG KÊ ====================
+_index = None
+_index_lock = threading.Lock()
+_stats = {'builds': 0, 'last_build_ms': 0.0, 'queries': 0, 'total_tokens': 0,
+          'total_passages': 0, 'total_ms': 0.0}
+
+
+def get_knowledge_index(company_info, mtime, include_db=False, refresh=DEFAULT_REFRESH):
+    """Index hiện tại, build lại khi company_info.json đổi hoặc dữ liệu DB quá cũ"""
+    global _index
+    key = (mtime, include_db)
+    index = _index
+    if index is not None and index.key == key and (
+            not include_db or time.time() - index.built_at < refresh):
+        return index
+
+    with _index_lock:
+        index = _index
+        if index is not None and index.key == key and (
+                not include_db or time.time() - index.built_at < refresh):
+            return index
+        started = time.perf_counter()
+        _index = build_knowledge_index(company_info, include_db=include_db, key=key)
+        _stats['builds'] += 1
+        _stats['last_build_ms'] = round((time.perf_counter() - started) * 1000, 2)
+        return _index
+
+
+def retrieval_prompt(index, query, top_k=DEFAULT_TOP_K, token_budget=DEFAULT_TOKEN_BUDGET):
+    """Returns: (prompt, số token ước lượng)"""
+    started = time.perf_counter()
+    prompt, tokens, used = index.build_prompt(query, top_k, token_budget)
+    _stats['queries'] += 1
+    _stats['total_tokens'] += tokens
+    _stats['total_passages'] += used
+    _stats['total_ms'] += (time.perf_counter() - started) * 1000
+    return prompt, tokens
+
+
+def get_retrieval_stats():
+    stats = dict(_stats)
+    queries = stats['queries']
+    stats['avg_prompt_tokens'] = round(stats.pop('total_tokens') / queries, 1) if queries else 0.0
+    stats['avg_passages'] = round(stats.pop('total_passages') / queries, 2) if queries else 0.0
+    stats['avg_ms'] = round(stats.pop('total_ms') / queries, 3) if queries else 0.0
+    if _index is not None:
+        stats['index'] = _index.stats()
+    return stats
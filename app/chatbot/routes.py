@@ -1,36 +1,30 @@
-from flask import request, jsonify, session, current_app
+from flask import request, jsonify, session, current_app, Response
+from itsdangerous import URLSafeTimedSerializer, BadSignature
 from . import chatbot_bp
 from datetime import datetime
 import json
 import os
+import threading
+import time
+import uuid
 from app.models.features import feature_required
-from groq import Groq
+from .prompts import create_full_prompt, estimate_tokens
+from .retrieval import get_knowledge_index, retrieval_prompt, get_retrieval_stats
+from .answer_cache import answer_cache
+from .client import groq_gateway, GroqUnavailable
 
 # ==================== GLOBALS ====================
-groq_client = None
 _COMPANY_INFO_CACHE = None
 _COMPANY_INFO_MTIME = None
+# System prompt đã render từ company_info (cùng mtime với _COMPANY_INFO_CACHE)
+_SYSTEM_PROMPT_CACHE = None
+_SYSTEM_PROMPT_MTIME = None
+_SYSTEM_PROMPT_LOCK = threading.Lock()
+_PROMPT_STATS = {'builds': 0, 'hits': 0, 'last_build_ms': 0.0, 'total_build_ms': 0.0,
+                 'chars': 0, 'tokens': 0, 'built_at': None}
 _DEFAULT_MODEL_NAME = 'llama-3.3-70b-versatile'
 
 
-# ==================== INIT GROQ ====================
-def init_groq():
-    """Khởi tạo Groq API (được gọi khi app boot và khi lần đầu /send)."""
-    global groq_client
-    api_key = current_app.config.get('GROQ_API_KEY')
-    if not api_key:
-        current_app.logger.warning("⚠️ GROQ_API_KEY not found in config")
-        groq_client = None
-        return
-
-    try:
-        groq_client = Groq(api_key=api_key)
-        current_app.logger.info("✅ Groq API initialized successfully")
-    except Exception as e:
-        current_app.logger.error(f"❌ Failed to initialize Groq API: {str(e)}")
-        groq_client = None
-
-
 # ==================== COMPANY INFO (CACHE + INVALIDATION) ====================
 def load_company_info():
     """
@@ -63,172 +57,87 @@ def load_company_info():
         return _COMPANY_INFO_CACHE or {}
 
 
-# ==================== FULL PROMPT (LUÔN DÙNG) ====================
-def create_full_prompt(company_info: dict) -> str:
+# ==================== SYSTEM PROMPT (CACHE THEO MTIME) ====================
+def get_system_prompt():
     """
-    Tạo prompt FULL với toàn bộ thông tin từ JSON
-    Không cắt giảm, không summarize
+    System prompt FULL + số token ước lượng, chỉ render lại khi company_info.json đổi
+
+    Returns: (prompt, tokens)
     """
-    # Thông tin cơ bản
-    company_name = company_info.get('company_name', 'CÔNG TY TNHH BRICON VIỆT NAM')
-    slogan = company_info.get('slogan', 'Kết dính bền lâu – Xây dựng niềm tin')
-    company_intro = company_info.get('company_intro', '')
-
-    contact = company_info.get('contact', {}) or {}
-    phone = contact.get('phone', '0901.180.094')
-    hotline = contact.get('hotline', '0901180094')
-    email = contact.get('email', 'info@bricon.vn')
-    zalo = contact.get('zalo', phone)
-    address = contact.get('address', '171 Đường An Phú Đông 03, P. An Phú Đông, Q.12, TP.HCM')
-    website = contact.get('website', 'https://www.bricon.vn')
-    working_hours = contact.get('working_hours', '8:00 - 17:30 (Thứ 2 - Thứ 7)')
-
-    # Chi nhánh
-    branches = contact.get('branches', []) or []
-    branches_text = "\n".join([
-        f"• {b.get('name', 'N/A')}: {b.get('address', 'N/A')}"
-        for b in branches
-    ]) or "—"
-
-    # TOÀN BỘ SẢN PHẨM - KHÔNG CẮT GIẢM
-    products = company_info.get('products', []) or []
-    products_list = []
-    for p in products:
-        info = []
-        info.append(f"━━━ {p.get('name', 'N/A')} ━━━")
-        if p.get('category'):
-            info.append(f"• Loại: {p['category']}")
-        if p.get('brand'):
-            info.append(f"• Thương hiệu: {p['brand']}")
-        if p.get('description'):
-            info.append(f"• Mô tả: {p['description']}")
-
-        # Composition
-        if p.get('composition'):
-            info.append("• Thành phần:")
-            for comp in p['composition']:
-                info.append(f"  - {comp}")
-
-        # Application
-        if p.get('application'):
-            info.append("• Ứng dụng:")
-            for app in p['application']:
-                info.append(f"  - {app}")
-
-        # Technical specs (FULL - không cắt)
-        if p.get('technical_specs'):
-            info.append("• Thông số kỹ thuật:")
-            for k, v in p['technical_specs'].items():
-                info.append(f"  - {k}: {v}")
-
-        if p.get('packaging'):
-            info.append(f"• Đóng gói: {p['packaging']}")
-        if p.get('colors'):
-            info.append(f"• Màu sắc: {', '.join(p['colors'])}")
-        if p.get('expiry'):
-            info.append(f"• Hạn sử dụng: {p['expiry']}")
-        if p.get('standards'):
-            info.append(f"• Tiêu chuẩn: {p['standards']}")
-
-        products_list.append("\n".join(info))
-
-    products_text = "\n\n".join(products_list) or "—"
-
-    # Ưu điểm
-    strengths = company_info.get('strengths', []) or []
-    strengths_text = "\n".join([f"✓ {s}" for s in strengths]) or "—"
-
-    # Chính sách đổi trả
-    rp = company_info.get('return_policy', {}) or {}
-    return_summary = rp.get('policy_summary', 'Công ty có chính sách đổi trả linh hoạt')
-    conditions = rp.get('conditions', {}) or {}
-    conditions_parts = []
-    for key, value in conditions.items():
-        if isinstance(value, list):
-            items = "\n".join([f"  • {item}" for item in value])
-            conditions_parts.append(f"\n{key}:\n{items}")
-        else:
-            conditions_parts.append(f"\n{key}: {value}")
-    conditions_text = "".join(conditions_parts)
-
-    notes = rp.get('note', []) or []
-    notes_text = "\n".join([f"⚠️ {n}" for n in notes]) if notes else ""
-
-    # Quy trình đặt hàng
-    process = company_info.get('process', []) or []
-    process_text = "\n".join([f"{i + 1}. {s}" for i, s in enumerate(process)]) or "—"
-
-    # Dự án (TOÀN BỘ - không giới hạn 15)
-    projects = company_info.get('projects', []) or []
-    projects_text = "\n".join([f"• {proj}" for proj in projects]) or "—"
-
-    # FAQ (TOÀN BỘ - không cắt)
-    faq = company_info.get('faq', []) or []
-    faq_text = "\n".join([
-        f"❓ {q.get('question', '')}\n💡 {q.get('answer', '')}\n"
-        for q in faq
-    ]) or "—"
-
-    return f"""BẠN LÀ TRỢ LÝ ẢO BRICON - CHUYÊN GIA VẬT LIỆU XÂY DỰNG
-
-🏢 {company_name} | 💡 {slogan}
-📞 {hotline} | 💬 Zalo: {zalo} | 📧 {email} | 🌐 {website}
-📍 {address} | ⏰ {working_hours}
-
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-📖 GIỚI THIỆU CÔNG TY
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-{company_intro}
-
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-🏪 HỆ THỐNG CHI NHÁNH
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-{branches_text}
-
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-📦 DANH MỤC SẢN PHẨM CHI TIẾT (TOÀN BỘ)
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-{products_text}
-
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-⭐ ƯU ĐIỂM NỔI BẬT
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-{strengths_text}
-
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-🔄 CHÍNH SÁCH ĐỔI TRẢ
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-📌 {return_summary}
-✅ Điều kiện:{conditions_text}
-{notes_text}
-
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-📋 QUY TRÌNH ĐẶT HÀNG
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-{process_text}
-
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-🏗️ DỰ ÁN TIÊU BIỂU
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-{projects_text}
-
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-❓ CÂU HỎI THƯỜNG GẶP
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-{faq_text}
-
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-🎯 NGUYÊN TẮC TRẢ LỜI
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-1. Trả lời CHÍNH XÁC dựa trên thông tin đã cung cấp ở trên
-2. Trích dẫn cụ thể từ phần sản phẩm/FAQ khi được hỏi về thông số kỹ thuật
-3. KHÔNG đưa giá cụ thể → hướng dẫn liên hệ {hotline} hoặc Zalo {zalo}
-4. Thân thiện, chuyên nghiệp, ngắn gọn (2-5 câu)
-5. Nếu không chắc chắn → nói thẳng và cho thông tin liên hệ
-6. Ưu tiên câu trả lời ngắn gọn, tránh dài dòng trừ khi khách yêu cầu chi tiết
-7. Luôn trả lời bằng tiếng Việt có dấu
-8. Khi khách hỏi về sản phẩm → giới thiệu sản phẩm phù hợp nhất từ danh mục
-"""
+    global _SYSTEM_PROMPT_CACHE, _SYSTEM_PROMPT_MTIME
+    company_info = load_company_info()
+    mtime = _COMPANY_INFO_MTIME
+
+    cached = _SYSTEM_PROMPT_CACHE
+    if cached is not None and _SYSTEM_PROMPT_MTIME == mtime:
+        _PROMPT_STATS['hits'] += 1
+        return cached
+
+    with _SYSTEM_PROMPT_LOCK:
+        if _SYSTEM_PROMPT_CACHE is not None and _SYSTEM_PROMPT_MTIME == mtime:
+            _PROMPT_STATS['hits'] += 1
+            return _SYSTEM_PROMPT_CACHE
+
+        started = time.perf_counter()
+        prompt = create_full_prompt(company_info)
+        tokens = estimate_tokens(prompt)
+        elapsed = (time.perf_counter() - started) * 1000
+
+        _SYSTEM_PROMPT_CACHE = (prompt, tokens)
+        _SYSTEM_PROMPT_MTIME = mtime
+        _PROMPT_STATS['builds'] += 1
+        _PROMPT_STATS['last_build_ms'] = round(elapsed, 2)
+        _PROMPT_STATS['total_build_ms'] += elapsed
+        _PROMPT_STATS['chars'] = len(prompt)
+        _PROMPT_STATS['tokens'] = tokens
+        _PROMPT_STATS['built_at'] = datetime.now().isoformat()
+        current_app.logger.info(f"✅ Built chatbot system prompt ({len(prompt)} chars, ~{tokens} tokens, {elapsed:.1f}ms)")
+        return _SYSTEM_PROMPT_CACHE
+
+
+def get_prompt_stats():
+    stats = dict(_PROMPT_STATS)
+    builds = stats['builds']
+    stats['avg_build_ms'] = round(stats.pop('total_build_ms') / builds, 2) if builds else 0.0
+    return stats
+
+
+# ==================== CHẾ ĐỘ PROMPT ====================
+def get_prompt_mode():
+    """'full' (toàn bộ company_info) | 'retrieval' (chỉ đoạn liên quan - app/chatbot/retrieval.py)"""
+    mode = (current_app.config.get('CHATBOT_PROMPT_MODE') or 'full').lower()
+    return mode if mode in ('full', 'retrieval') else 'full'
+
+
+def get_retrieval_index():
+    company_info = load_company_info()
+    return get_knowledge_index(
+        company_info, _COMPANY_INFO_MTIME,
+        include_db=current_app.config.get('CHATBOT_RETRIEVAL_INCLUDE_DB', False),
+        refresh=int(current_app.config.get('CHATBOT_RETRIEVAL_REFRESH', 300))
+    )
+
+
+def get_prompt_for(query: str):
+    """
+    System prompt cho 1 câu hỏi theo CHATBOT_PROMPT_MODE
+
+    Returns: (prompt, tokens, mode)
+    """
+    mode = get_prompt_mode()
+    if mode == 'retrieval':
+        try:
+            prompt, tokens = retrieval_prompt(
+                get_retrieval_index(), query,
+                top_k=int(current_app.config.get('CHATBOT_RETRIEVAL_TOP_K', 6)),
+                token_budget=int(current_app.config.get('CHATBOT_PROMPT_TOKEN_BUDGET', 2500))
+            )
+            return prompt, tokens, mode
+        except Exception as e:
+            # Retrieval lỗi thì vẫn trả lời được bằng prompt full
+            current_app.logger.error(f"❌ Chatbot retrieval error: {str(e)}")
+    prompt, tokens = get_system_prompt()
+    return prompt, tokens, 'full'
 
 
 # ==================== PROMPT BUILDER ====================
@@ -257,118 +166,322 @@ def build_messages(system_prompt: str, history_context: str, user_message: str)
     return messages
 
 
-# ==================== ROUTES ====================
-@chatbot_bp.route('/send', methods=['POST'])
-@feature_required('chatbot')
-def send_message():
-    """
-    Xử lý tin nhắn với Groq - LUÔN DÙNG FULL MODE
+# ==================== CHAT (DÙNG CHUNG /send VÀ /stream) ====================
+EMPTY_REPLY = (
+    "😔 Dạ xin lỗi, em chưa có đủ thông tin để trả lời.\n"
+    "Anh/chị vui lòng liên hệ: 📞 0901180094 hoặc Zalo 0901.180.094 để được hỗ trợ nhanh ạ."
+)
+OVERLOADED_REPLY = '⚠️ Hệ thống đang quá tải, anh/chị vui lòng thử lại sau vài giây hoặc gọi 📞 0901180094.'
+UNAVAILABLE_REPLY = '😔 Chatbot tạm thời không khả dụng.\nLiên hệ: 📞 0901180094'
+ERROR_REPLY = '😔 Đã có lỗi xảy ra. Vui lòng liên hệ BRICON: 📞 0901180094 | Zalo 0901.180.094 | Email info@bricon.vn'
+
+
+def _prepare_chat():
     """
-    global groq_client
+    Validate + rate limit + dựng messages cho Groq
 
+    Returns: (response lỗi, None) hoặc (None, ctx)
+    """
     # Bật/tắt chatbot
     if not current_app.config.get('CHATBOT_ENABLED', True):
-        return jsonify({'response': '⚠️ Chatbot đang bảo trì. Vui lòng liên hệ: 📞 0901 180 094'}), 503
+        return (jsonify({'response': '⚠️ Chatbot đang bảo trì. Vui lòng liên hệ: 📞 0901 180 094'}), 503), None
 
-    # Init client nếu chưa có
-    if groq_client is None:
-        init_groq()
-    if groq_client is None:
-        return jsonify({'response': '😔 Chatbot tạm thời không khả dụng.\nLiên hệ: 📞 0901180094'}), 500
+    if not groq_gateway.configured:
+        return (jsonify({'response': UNAVAILABLE_REPLY}), 500), None
 
-    try:
-        data = request.json or {}
-        user_message = (data.get('message') or '').strip()
-
-        # Validate
-        if not user_message:
-            return jsonify({'error': 'Tin nhắn không được để trống'}), 400
-        if len(user_message) > 500:
-            return jsonify({'error': 'Tin nhắn quá dài (tối đa 500 ký tự)'}), 400
-
-        # Rate limit theo session
-        if 'chatbot_request_count' not in session:
-            session['chatbot_request_count'] = 0
-            session['chatbot_request_start_time'] = datetime.now().timestamp()
-
-        now_ts = datetime.now().timestamp()
-        request_limit = int(current_app.config.get('CHATBOT_REQUEST_LIMIT', 15))
-        window = int(current_app.config.get('CHATBOT_REQUEST_WINDOW', 3600))  # 1h
-
-        # Reset window
-        if now_ts - session['chatbot_request_start_time'] > window:
-            session['chatbot_request_count'] = 0
-            session['chatbot_request_start_time'] = now_ts
-
-        if session['chatbot_request_count'] >= request_limit:
-            return jsonify({
-                'response': (
-                    f'⏰ Anh/chị đã dùng hết {request_limit} lượt chat/giờ.\n'
-                    f'Vui lòng thử lại sau hoặc liên hệ 📞 0901.180.094 | Zalo {current_app.config.get("HOTLINE_ZALO", "0901.180.094")}'
-                )
-            })
-
-        session['chatbot_request_count'] += 1
-
-        # Lịch sử hội thoại (tăng lên 10 turns để nhớ lâu hơn)
-        history_turns = int(current_app.config.get('CHATBOT_HISTORY_TURNS', 10))
-        if 'chatbot_history' not in session:
-            session['chatbot_history'] = []
-        history_context = "\n".join([
-            f"{'Khách' if msg['role'] == 'user' else 'Bot'}: {msg['content']}"
-            for msg in session['chatbot_history'][-history_turns:]
-        ])
-
-        # Tạo FULL PROMPT (luôn luôn)
-        company_info = load_company_info()
-        system_prompt = create_full_prompt(company_info)
-        messages = build_messages(system_prompt, history_context, user_message)
-
-        # Gọi Groq API
-        try:
-            chat_completion = groq_client.chat.completions.create(
-                messages=messages,
-                model=current_app.config.get('GROQ_MODEL', _DEFAULT_MODEL_NAME),
-                temperature=0.4,  # Giảm xuống 0.4 để ổn định hơn
-                max_tokens=1000,  # Tăng lên 1000 vì full mode
-                top_p=0.9,
-                stream=False
+    data = request.json or {}
+    user_message = (data.get('message') or '').strip()
+
+    # Validate
+    if not user_message:
+        return (jsonify({'error': 'Tin nhắn không được để trống'}), 400), None
+    if len(user_message) > 500:
+        return (jsonify({'error': 'Tin nhắn quá dài (tối đa 500 ký tự)'}), 400), None
+
+    # Rate limit theo session
+    if 'chatbot_request_count' not in session:
+        session['chatbot_request_count'] = 0
+        session['chatbot_request_start_time'] = datetime.now().timestamp()
+
+    now_ts = datetime.now().timestamp()
+    request_limit = int(current_app.config.get('CHATBOT_REQUEST_LIMIT', 15))
+    window = int(current_app.config.get('CHATBOT_REQUEST_WINDOW', 3600))  # 1h
+
+    # Reset window
+    if now_ts - session['chatbot_request_start_time'] > window:
+        session['chatbot_request_count'] = 0
+        session['chatbot_request_start_time'] = now_ts
+
+    if session['chatbot_request_count'] >= request_limit:
+        return jsonify({
+            'response': (
+                f'⏰ Anh/chị đã dùng hết {request_limit} lượt chat/giờ.\n'
+                f'Vui lòng thử lại sau hoặc liên hệ 📞 0901.180.094 | Zalo {current_app.config.get("HOTLINE_ZALO", "0901.180.094")}'
             )
+        }), None
+
+    session['chatbot_request_count'] += 1
+
+    # Lịch sử hội thoại (tăng lên 10 turns để nhớ lâu hơn)
+    history_turns = int(current_app.config.get('CHATBOT_HISTORY_TURNS', 10))
+    if 'chatbot_history' not in session:
+        session['chatbot_history'] = []
+    history_context = "\n".join([
+        f"{'Khách' if msg['role'] == 'user' else 'Bot'}: {msg['content']}"
+        for msg in session['chatbot_history'][-history_turns:]
+    ])
+
+    ctx = {
+        'user_message': user_message,
+        'remaining': request_limit - session['chatbot_request_count'],
+        # Câu hỏi đầu tiên (chưa có ngữ cảnh) mới dùng/lưu cache câu trả lời
+        'cacheable': not session['chatbot_history'],
+        'cached': None,
+    }
+    if ctx['cacheable']:
+        ctx['cached'] = answer_cache.lookup(user_message, source=_COMPANY_INFO_MTIME)
+        if ctx['cached'] is not None:
+            ctx['mode'] = 'cache'
+            return None, ctx
+
+    # System prompt: full (render sẵn) hoặc chỉ các đoạn liên quan tới câu hỏi
+    # (kèm câu hỏi trước của khách để hiểu câu hỏi nối tiếp: "loại đó đóng gói thế nào?")
+    previous_questions = [msg['content'] for msg in session['chatbot_history'] if msg['role'] == 'user']
+    query = ' '.join(previous_questions[-1:] + [user_message])
+    system_prompt, prompt_tokens, prompt_mode = get_prompt_for(query)
+
+    ctx['messages'] = build_messages(system_prompt, history_context, user_message)
+    ctx['mode'] = prompt_mode
+    ctx['prompt_tokens'] = prompt_tokens
+    return None, ctx
+
+
+def _remember_answer(ctx, bot_reply, elapsed_ms):
+    """Sau khi Groq trả lời: ghi thời gian + lưu cache nếu là câu hỏi không có ngữ cảnh"""
+    answer_cache.record_miss(elapsed_ms)
+    if ctx['cacheable'] and bot_reply != EMPTY_REPLY:
+        answer_cache.store(ctx['user_message'], bot_reply, ctx['mode'], ctx['prompt_tokens'],
+                           source=_COMPANY_INFO_MTIME)
+
+
+def _completion_kwargs(messages, stream):
+    return dict(
+        messages=messages,
+        model=current_app.config.get('GROQ_MODEL', _DEFAULT_MODEL_NAME),
+        temperature=0.4,  # Giảm xuống 0.4 để ổn định hơn
+        max_tokens=1000,  # Tăng lên 1000 vì full mode
+        top_p=0.9,
+        stream=stream
+    )
+
+
+def _unavailable_reply(error):
+    """Câu trả lời soạn sẵn khi không gọi được Groq (breaker mở / hết slot / lỗi sau khi thử lại)"""
+    return OVERLOADED_REPLY if error.reason == 'busy' else UNAVAILABLE_REPLY
+
+
+def _save_turn(user_message, bot_reply):
+    """Lưu lịch sử (tăng lên 30 message)"""
+    history = session.get('chatbot_history', [])
+    history.append({'role': 'user', 'content': user_message})
+    history.append({'role': 'assistant', 'content': bot_reply})
+    session['chatbot_history'] = history[-30:]
+    session.modified = True
 
-            bot_reply = chat_completion.choices[0].message.content.strip()
 
-            if not bot_reply:
-                bot_reply = (
-                    "😔 Dạ xin lỗi, em chưa có đủ thông tin để trả lời.\n"
-                    "Anh/chị vui lòng liên hệ: 📞 0901180094 hoặc Zalo 0901.180.094 để được hỗ trợ nhanh ạ."
-                )
+# ==================== ROUTES ====================
+@chatbot_bp.route('/send', methods=['POST'])
+@feature_required('chatbot')
+def send_message():
+    """
+    Xử lý tin nhắn với Groq (prompt full hoặc retrieval theo CHATBOT_PROMPT_MODE)
+    """
+    try:
+        error, ctx = _prepare_chat()
+        if error is not None:
+            return error
 
-        except Exception as api_error:
-            current_app.logger.error(f"❌ Groq API error: {str(api_error)}")
-            return jsonify({
-                'response': '⚠️ Hệ thống đang quá tải, anh/chị vui lòng thử lại sau vài giây hoặc gọi 📞 0901180094.'
-            }), 500
-
-        # Lưu lịch sử (tăng lên 30 message)
-        session['chatbot_history'].append({'role': 'user', 'content': user_message})
-        session['chatbot_history'].append({'role': 'assistant', 'content': bot_reply})
-        session['chatbot_history'] = session['chatbot_history'][-30:]
-        session.modified = True
+        if ctx['cached'] is not None:
+            bot_reply = ctx['cached'].answer
+        else:
+            # Gọi Groq API
+            started = time.perf_counter()
+            try:
+                chat_completion = groq_gateway.complete(**_completion_kwargs(ctx['messages'], False))
+                bot_reply = chat_completion.choices[0].message.content.strip() or EMPTY_REPLY
 
-        remaining = request_limit - session['chatbot_request_count']
+            except GroqUnavailable as unavailable:
+                current_app.logger.warning(f"⚠️ Groq unavailable ({unavailable.reason}): {str(unavailable)}")
+                return jsonify({'response': _unavailable_reply(unavailable)}), 503
+            except Exception as api_error:
+                current_app.logger.error(f"❌ Groq API error: {str(api_error)}")
+                return jsonify({'response': OVERLOADED_REPLY}), 500
+
+            _remember_answer(ctx, bot_reply, (time.perf_counter() - started) * 1000)
+
+        _save_turn(ctx['user_message'], bot_reply)
 
         return jsonify({
             'response': bot_reply,
-            'mode': 'full',  # Luôn là full
-            'remaining_requests': remaining,
+            'mode': ctx['mode'],
+            'cached': ctx['cached'] is not None,
+            'remaining_requests': ctx['remaining'],
             'timestamp': datetime.now().isoformat()
         })
 
     except Exception as e:
         current_app.logger.error(f"❌ Chatbot error: {str(e)}", exc_info=True)
-        return jsonify({
-            'response': '😔 Đã có lỗi xảy ra. Vui lòng liên hệ BRICON: 📞 0901180094 | Zalo 0901.180.094 | Email info@bricon.vn'
-        }), 500
+        return jsonify({'response': ERROR_REPLY}), 500
+
+
+# ==================== STREAMING (SSE) ====================
+# Cookie session được ghi vào header trước khi body stream bắt đầu, nên lượt chat
+# (câu hỏi + câu trả lời) được trả về ở event 'done' dưới dạng token đã ký;
+# trình duyệt gửi lại token đó lên /chatbot/history để lưu vào session.
+_TURN_TOKEN_SALT = 'chatbot-turn'
+# Số nonce đã lưu gần nhất giữ trong session để chặn gửi lại token cũ (A, B, A...)
+_SEEN_TURNS_LIMIT = 20
+_STREAM_STATS = {'started': 0, 'completed': 0, 'cancelled': 0, 'errors': 0,
+                 'total_first_token_ms': 0.0, 'total_stream_ms': 0.0}
+_STREAM_STATS_LOCK = threading.Lock()
+
+
+def _sse(event, data):
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+def _turn_serializer():
+    return URLSafeTimedSerializer(current_app.secret_key, salt=_TURN_TOKEN_SALT)
+
+
+def _record_stream(**counters):
+    with _STREAM_STATS_LOCK:
+        for key, value in counters.items():
+            _STREAM_STATS[key] += value
+
+
+def get_stream_stats():
+    with _STREAM_STATS_LOCK:
+        stats = dict(_STREAM_STATS)
+    completed = stats['completed']
+    stats['avg_first_token_ms'] = round(stats.pop('total_first_token_ms') / completed, 1) if completed else 0.0
+    stats['avg_stream_ms'] = round(stats.pop('total_stream_ms') / completed, 1) if completed else 0.0
+    return stats
+
+
+def _stream_done(bot_reply, user_message, meta, serializer):
+    return _sse('done', {
+        'response': bot_reply,
+        'history_token': serializer.dumps({'u': user_message, 'a': bot_reply, 'n': uuid.uuid4().hex}),
+        **meta
+    })
+
+
+def _stream_cached(bot_reply, user_message, meta, serializer):
+    """Câu trả lời có sẵn trong cache: 1 event 'token' + 'done'"""
+    yield _sse('token', {'text': bot_reply})
+    yield _stream_done(bot_reply, user_message, meta, serializer)
+
+
+def _stream_reply(stream, started, user_message, meta, logger, serializer, on_complete=None):
+    """
+    Generator SSE: 'token' (từng đoạn text) -> 'done' (câu trả lời đầy đủ + token lịch sử)
+    hoặc 'error'. Client ngắt kết nối -> server gọi close() (GeneratorExit) -> đóng stream Groq.
+    stream: đã mở bằng groq_gateway.stream() lúc perf_counter() = started
+    on_complete(câu trả lời, ms): gọi khi stream xong
+    """
+    first_token_ms = None
+    parts = []
+    try:
+        for chunk in stream:
+            delta = chunk.choices[0].delta.content if chunk.choices else None
+            if not delta:
+                continue
+            if first_token_ms is None:
+                first_token_ms = (time.perf_counter() - started) * 1000
+            parts.append(delta)
+            yield _sse('token', {'text': delta})
+    except GeneratorExit:
+        # Khách đóng widget/tải lại trang giữa chừng
+        _record_stream(cancelled=1)
+        raise
+    except Exception as api_error:
+        logger.error(f"❌ Groq stream error: {str(api_error)}")
+        _record_stream(errors=1)
+        yield _sse('error', {'response': OVERLOADED_REPLY})
+        return
+    finally:
+        # Đóng kết nối tới Groq (hủy phần đang sinh nếu chưa xong) + trả slot cho gateway
+        stream.close()
+
+    bot_reply = ''.join(parts).strip() or EMPTY_REPLY
+    elapsed = (time.perf_counter() - started) * 1000
+    _record_stream(completed=1, total_first_token_ms=first_token_ms or elapsed, total_stream_ms=elapsed)
+    if on_complete is not None:
+        on_complete(bot_reply, elapsed)
+    yield _stream_done(bot_reply, user_message, meta, serializer)
+
+
+@chatbot_bp.route('/stream', methods=['POST'])
+@feature_required('chatbot')
+def stream_message():
+    """
+    Như /send nhưng trả text/event-stream: câu trả lời hiện dần theo từng token của Groq
+    (lỗi validate/rate limit vẫn trả JSON như /send)
+    """
+    try:
+        error, ctx = _prepare_chat()
+        if error is not None:
+            return error
+    except Exception as e:
+        current_app.logger.error(f"❌ Chatbot error: {str(e)}", exc_info=True)
+        return jsonify({'response': ERROR_REPLY}), 500
+
+    meta = {'mode': ctx['mode'], 'cached': ctx['cached'] is not None, 'remaining_requests': ctx['remaining'],
+            'timestamp': datetime.now().isoformat()}
+    if ctx['cached'] is not None:
+        generator = _stream_cached(ctx['cached'].answer, ctx['user_message'], meta, _turn_serializer())
+    else:
+        # Mở stream trước khi trả header: breaker mở / hết slot / Groq lỗi -> JSON như /send
+        started = time.perf_counter()
+        _record_stream(started=1)
+        try:
+            stream = groq_gateway.stream(**_completion_kwargs(ctx['messages'], True))
+        except GroqUnavailable as unavailable:
+            current_app.logger.warning(f"⚠️ Groq unavailable ({unavailable.reason}): {str(unavailable)}")
+            _record_stream(errors=1)
+            return jsonify({'response': _unavailable_reply(unavailable)}), 503
+        except Exception as api_error:
+            current_app.logger.error(f"❌ Groq stream error: {str(api_error)}")
+            _record_stream(errors=1)
+            return jsonify({'response': OVERLOADED_REPLY}), 500
+        generator = _stream_reply(stream, started, ctx['user_message'], meta, current_app.logger,
+                                  _turn_serializer(),
+                                  on_complete=lambda reply, elapsed: _remember_answer(ctx, reply, elapsed))
+    response = Response(generator, mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'  # nginx/proxy không gom buffer
+    return response
+
+
+@chatbot_bp.route('/history', methods=['POST'])
+@feature_required('chatbot')
+def save_streamed_turn():
+    """Lưu lượt chat đã stream xong (token từ event 'done' của /chatbot/stream)"""
+    token = (request.json or {}).get('token', '')
+    max_age = int(current_app.config.get('CHATBOT_HISTORY_TOKEN_MAX_AGE', 600))
+    try:
+        turn = _turn_serializer().loads(token, max_age=max_age)
+    except BadSignature:
+        return jsonify({'status': 'error', 'message': 'Token không hợp lệ'}), 400
+
+    # Mỗi token chỉ lưu 1 lần: nhớ _SEEN_TURNS_LIMIT nonce gần nhất (đủ cho số token còn hạn
+    # CHATBOT_HISTORY_TOKEN_MAX_AGE với rate limit mặc định)
+    seen = session.get('chatbot_seen_turns', [])
+    if turn['n'] not in seen:
+        session['chatbot_seen_turns'] = (seen + [turn['n']])[-_SEEN_TURNS_LIMIT:]
+        _save_turn(turn['u'], turn['a'])
+    return jsonify({'status': 'success', 'history_length': len(session.get('chatbot_history', []))})
 
 
 @chatbot_bp.route('/reset', methods=['POST'])
@@ -377,6 +490,7 @@ def reset_chat():
     """Xoá lịch sử + đếm lượt"""
     try:
         session.pop('chatbot_history', None)
+        # Giữ chatbot_seen_turns: token cũ gửi lại sau khi reset vẫn bị bỏ qua
         session.pop('chatbot_request_count', None)
         session.pop('chatbot_request_start_time', None)
         session.modified = True
@@ -393,17 +507,21 @@ def reset_chat():
 def chatbot_status():
     """Kiểm tra trạng thái chatbot"""
     try:
-        global groq_client
         limit = int(current_app.config.get('CHATBOT_REQUEST_LIMIT', 15))
         used = int(session.get('chatbot_request_count', 0))
         return jsonify({
             'enabled': current_app.config.get('CHATBOT_ENABLED', True),
-            'model_initialized': groq_client is not None,
+            'model_initialized': groq_gateway.configured,
             'model': current_app.config.get('GROQ_MODEL', _DEFAULT_MODEL_NAME),
-            'mode': 'full',  # Luôn là full
+            'mode': get_prompt_mode(),
             'request_limit': limit,
             'remaining_requests': max(0, limit - used),
             'history_length': len(session.get('chatbot_history', [])),
+            'prompt': get_prompt_stats(),
+            'retrieval': get_retrieval_stats(),
+            'stream': get_stream_stats(),
+            'answer_cache': answer_cache.get_stats(),
+            'groq': groq_gateway.get_stats(),
             'timestamp': datetime.now().isoformat()
         })
     except Exception as e:
@@ -414,11 +532,14 @@ def chatbot_status():
 # ==================== APP HOOK ====================
 def init_chatbot(app):
     """Gọi ở __init__.py khi khởi động app"""
+    answer_cache.init_app(app)
+    groq_gateway.init_app(app)
     with app.app_context():
-        init_groq()
-        # Preload company info để cache sẵn
+        # Preload company info + render sẵn system prompt / index retrieval
         try:
-            load_company_info()
-            current_app.logger.info("🤖 BRICON Chatbot initialized with Groq (FULL MODE ONLY)")
+            get_system_prompt()
+            if get_prompt_mode() == 'retrieval':
+                get_retrieval_index()
+            current_app.logger.info(f"🤖 BRICON Chatbot initialized with Groq ({get_prompt_mode().upper()} MODE)")
         except Exception:
             pass
\ No newline at end of file
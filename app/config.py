@@ -54,12 +54,37 @@ class Config:
     CHATBOT_ENABLED = True
     CHATBOT_REQUEST_LIMIT = int(os.environ.get('CHATBOT_REQUEST_LIMIT', 15))
     CHATBOT_REQUEST_WINDOW = int(os.environ.get('CHATBOT_REQUEST_WINDOW', 3600))
+    # Deadline mỗi lượt gọi Groq (tính cả các lần thử lại 429/5xx) - app/chatbot/client.py
     GROQ_TIMEOUT = int(os.environ.get('GROQ_TIMEOUT', 30))
+    GROQ_CONNECT_TIMEOUT = float(os.environ.get('GROQ_CONNECT_TIMEOUT', 5))
+    GROQ_MAX_RETRIES = int(os.environ.get('GROQ_MAX_RETRIES', 2))
+    GROQ_RETRY_BACKOFF = float(os.environ.get('GROQ_RETRY_BACKOFF', 0.5))
+    # Số lượt gọi Groq cùng lúc / worker (< GTHREADS để còn thread phục vụ trang thường)
+    GROQ_MAX_CONCURRENCY = int(os.environ.get('GROQ_MAX_CONCURRENCY', 2))
+    GROQ_QUEUE_TIMEOUT = float(os.environ.get('GROQ_QUEUE_TIMEOUT', 2))
+    # Circuit breaker: số lỗi liên tiếp để ngừng gọi Groq + thời gian ngừng (giây)
+    GROQ_BREAKER_THRESHOLD = int(os.environ.get('GROQ_BREAKER_THRESHOLD', 5))
+    GROQ_BREAKER_COOLDOWN = int(os.environ.get('GROQ_BREAKER_COOLDOWN', 30))
+    GROQ_KEEPALIVE = int(os.environ.get('GROQ_KEEPALIVE', 60))
 
     CHATBOT_HISTORY_TURNS = int(os.environ.get('CHATBOT_HISTORY_TURNS', 5))
     CHATBOT_PROMPT_MODE_DEFAULT = os.environ.get('CHATBOT_PROMPT_MODE_DEFAULT', 'lite')
     CHATBOT_TEMPERATURE = float(os.environ.get('CHATBOT_TEMPERATURE', 0.6))
     CHATBOT_MAX_OUTPUT_TOKENS = int(os.environ.get('CHATBOT_MAX_OUTPUT_TOKENS', 800))
+    # full: gửi toàn bộ company_info.json | retrieval: chỉ top-K đoạn liên quan (app/chatbot/retrieval.py)
+    CHATBOT_PROMPT_MODE = os.environ.get('CHATBOT_PROMPT_MODE', 'full').lower()
+    CHATBOT_RETRIEVAL_TOP_K = int(os.environ.get('CHATBOT_RETRIEVAL_TOP_K', 6))
+    CHATBOT_PROMPT_TOKEN_BUDGET = int(os.environ.get('CHATBOT_PROMPT_TOKEN_BUDGET', 2500))
+    # Thêm sản phẩm/FAQ đang bật trong DB vào index (làm mới mỗi CHATBOT_RETRIEVAL_REFRESH giây)
+    CHATBOT_RETRIEVAL_INCLUDE_DB = os.environ.get('CHATBOT_RETRIEVAL_INCLUDE_DB', 'false').lower() == 'true'
+    CHATBOT_RETRIEVAL_REFRESH = int(os.environ.get('CHATBOT_RETRIEVAL_REFRESH', 300))
+    # Cache câu trả lời cho câu hỏi gần giống nhau (cosine TF-IDF >= ngưỡng, chỉ khi chưa có lịch sử chat)
+    CHATBOT_ANSWER_CACHE_ENABLED = os.environ.get('CHATBOT_ANSWER_CACHE_ENABLED', 'true').lower() == 'true'
+    CHATBOT_ANSWER_CACHE_THRESHOLD = float(os.environ.get('CHATBOT_ANSWER_CACHE_THRESHOLD', 0.85))
+    CHATBOT_ANSWER_CACHE_SIZE = int(os.environ.get('CHATBOT_ANSWER_CACHE_SIZE', 500))
+    CHATBOT_ANSWER_CACHE_TTL = int(os.environ.get('CHATBOT_ANSWER_CACHE_TTL', 6 * 3600))
+    # /chatbot/stream: thời hạn token lưu lượt chat (gửi lại lên /chatbot/history khi stream xong)
+    CHATBOT_HISTORY_TOKEN_MAX_AGE = int(os.environ.get('CHATBOT_HISTORY_TOKEN_MAX_AGE', 600))
     HOTLINE_ZALO = os.environ.get('HOTLINE_ZALO', '0901.180.094')
 
     # ===== SCHEDULER (AUTO PUBLISH) =====
@@ -77,6 +102,49 @@ class Config:
     # ===== CACHING =====
     CACHE_TYPE = 'simple'
     CACHE_DEFAULT_TIMEOUT = 300
+    CACHE_MAX_ENTRIES = int(os.environ.get('CACHE_MAX_ENTRIES', 500))
+    CACHE_MAX_BYTES = int(os.environ.get('CACHE_MAX_BYTES', 32 * 1024 * 1024))  # ~32MB / worker
+    # memory (mỗi worker 1 bản) | sqlite (dùng chung trên 1 máy) | redis (dùng chung nhiều máy)
+    CACHE_BACKEND = os.environ.get('CACHE_BACKEND', 'memory')
+    CACHE_SQLITE_PATH = os.environ.get('CACHE_SQLITE_PATH')  # mặc định: <tmp>/bricon_cache.sqlite3
+    CACHE_REDIS_URL = os.environ.get('CACHE_REDIS_URL') or os.environ.get('REDIS_URL')
+    CACHE_KEY_PREFIX = os.environ.get('CACHE_KEY_PREFIX', 'bricon:')
+
+    # ===== PAGE CACHE (trang public, khách chưa đăng nhập) =====
+    PAGE_CACHE_ENABLED = os.environ.get('PAGE_CACHE_ENABLED', 'true').lower() == 'true'
+    PAGE_CACHE_TTL = int(os.environ.get('PAGE_CACHE_TTL', 600))
+
+    # ===== HTTP CACHE (STATIC FILES) =====
+    # File static qua url_for() có ?v=<hash> được cache 1 năm (immutable),
+    # giá trị này chỉ áp dụng cho URL static không có fingerprint
+    SEND_FILE_MAX_AGE_DEFAULT = int(os.environ.get('STATIC_MAX_AGE', 3600))
+    # Inline critical CSS vào <head>, CSS của trang tải không chặn render (cần chạy build_css.py)
+    CRITICAL_CSS_ENABLED = os.environ.get('CRITICAL_CSS_ENABLED', 'true').lower() == 'true'
+
+    # ===== SEARCH =====
+    # memory: search index trong RAM (app/search_index.py)
+    # postgres: full-text search của PostgreSQL cho sản phẩm/bài viết (app/fulltext.py,
+    #           cần migration a7c3e91d5b20); DB không phải PostgreSQL thì dùng lại
+    #           đường cũ: ILIKE cho /san-pham?search=, /tin-tuc?search=, index RAM cho /tim-kiem
+    SEARCH_BACKEND = os.environ.get('SEARCH_BACKEND', 'memory').lower()
+    # /api/search-suggestions: cache response theo prefix đã chuẩn hóa (LRU trong RAM mỗi worker)
+    # + Cache-Control để trình duyệt/CDN dùng lại trong SEARCH_SUGGESTION_MAX_AGE giây
+    SEARCH_SUGGESTION_CACHE_SIZE = int(os.environ.get('SEARCH_SUGGESTION_CACHE_SIZE', 512))
+    SEARCH_SUGGESTION_CACHE_TTL = int(os.environ.get('SEARCH_SUGGESTION_CACHE_TTL', 60))
+    SEARCH_SUGGESTION_MAX_AGE = int(os.environ.get('SEARCH_SUGGESTION_MAX_AGE', 60))
+
+    # ===== PRODUCT LISTING =====
+    # offset: phân trang theo số trang (mặc định)
+    # keyset: chỉ có "Xem thêm" theo cursor (?after=), không OFFSET/COUNT - hợp với catalog lớn
+    PRODUCT_PAGINATION = os.environ.get('PRODUCT_PAGINATION', 'offset').lower()
+    # Key trong technical_info dùng làm bộ lọc (facet), phân cách bằng dấu phẩy (app/facets.py)
+    PRODUCT_FACETS = [key.strip() for key in
+                      os.environ.get('PRODUCT_FACETS', 'Ứng dụng,Màu sắc,Thành phần').split(',') if key.strip()]
+
+    # ===== VIEW COUNTER =====
+    # Lượt xem được cộng dồn trong RAM, ghi xuống DB theo lô mỗi N giây (0 = ghi ngay)
+    VIEW_COUNTER_FLUSH_INTERVAL = float(os.environ.get('VIEW_COUNTER_FLUSH_INTERVAL', 5))
+    VIEW_COUNTER_MAX_PENDING = int(os.environ.get('VIEW_COUNTER_MAX_PENDING', 5000))
 
     # ===== SECURITY / RATE LIMIT =====
     RATELIMIT_ENABLED = True
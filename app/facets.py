@@ -0,0 +1,393 @@
+"""
+Lọc sản phẩm theo thuộc tính kỹ thuật (facet) cho /san-pham, kèm số lượng mỗi giá trị
+
+- Facet = 1 key trong Product.technical_info (config PRODUCT_FACETS, vd 'Ứng dụng', 'Màu sắc');
+  giá trị dạng list hoặc chuỗi 'Dán gạch | Dán đá' (xem admin/utils/technical_parser.py)
+  được tách thành từng giá trị
+- Index trong RAM dạng bitmap: mỗi sản phẩm (is_active) giữ 1 slot (bit), mỗi giá trị facet
+  và mỗi danh mục là 1 số nguyên Python dùng làm bitset. Click facet = AND/OR các bitmap,
+  đếm = int.bit_count(), không quét JSON của từng dòng
+- Khoảng giá: (giá, slot) sort sẵn + bitmap mỗi dải PRICE_BAND_SIZE sản phẩm liền nhau theo giá
+  -> bisect 2 đầu, OR các dải nằm trọn trong khoảng; scope tính 1 lần/request
+- Cùng facet chọn nhiều giá trị = OR, khác facet = AND. Số lượng của facet X tính trên
+  kết quả của các facet còn lại (chọn thêm giá trị trong X không làm các giá trị khác về 0)
+- Query string: ?f-ung-dung=dan-gach&f-mau-sac=xam (slugify key/giá trị)
+- Cập nhật từng sản phẩm qua event listener (áp dụng sau commit), backend cache dùng chung
+  thì đồng bộ giữa các worker bằng version 'facet_index' (app/live_index.py)
+
+Usage:
+    from app.facets import get_facet_index
+    index = get_facet_index()
+    selection = index.parse_selection(request.args)
+    scope = index.scope(category_id, min_price, max_price)
+    ids = index.matching_ids(selection, scope)
+    facets = index.counts(selection, scope)
+"""
+import math
+import threading
+import time
+from bisect import bisect_left, bisect_right
+
+from flask import current_app
+
+from app.live_index import register_index
+from app.search_index import fold_text
+from app.utils import slugify
+
+FACET_VERSION_NAME = 'facet_index'
+PARAM_PREFIX = 'f-'
+DEFAULT_FACETS = ('Ứng dụng', 'Màu sắc', 'Thành phần')
+
+# Số giá trị hiển thị tối đa mỗi facet (giá trị đang chọn luôn hiển thị)
+MAX_VALUES_PER_FACET = 20
+# Số sản phẩm (theo thứ tự giá) mỗi dải giá có bitmap sẵn
+PRICE_BAND_SIZE = 64
+
+
+def split_values(value):
+    """['Xám', 'Trắng'] hoặc 'Dán gạch | Dán đá' -> list giá trị đã strip"""
+    if value is None:
+        return []
+    items = value if isinstance(value, (list, tuple)) else str(value).split('|')
+    return [str(item).strip() for item in items if str(item).strip()]
+
+
+def iter_bits(mask):
+    """Vị trí các bit 1 của bitmap (từ thấp đến cao)"""
+    bits = bin(mask)[:1:-1]
+    position = bits.find('1')
+    while position != -1:
+        yield position
+        position = bits.find('1', position + 1)
+
+
+class Facet:
+    __slots__ = ('key', 'slug', 'labels', 'bitmaps')
+
+    def __init__(self, key):
+        self.key = key
+        self.slug = slugify(key)
+        self.labels = {}    # slug giá trị -> nhãn hiển thị (bản gặp đầu tiên)
+        self.bitmaps = {}   # slug giá trị -> bitmap sản phẩm
+
+    @property
+    def param(self):
+        return PARAM_PREFIX + self.slug
+
+
+class FacetScope:
+    __slots__ = ('generation', 'mask', 'category_id', 'min_price', 'max_price')
+
+    def __init__(self, generation, mask, category_id, min_price, max_price):
+        self.generation = generation
+        self.mask = mask
+        self.category_id = category_id
+        self.min_price = min_price
+        self.max_price = max_price
+
+
+# ==================== INDEX ====================
+class FacetIndex:
+    """Bitmap index theo facet + danh mục, thread-safe"""
+
+    def __init__(self, keys=()):
+        self._lock = threading.RLock()
+        self._facets = {}      # slug facet -> Facet (giữ thứ tự của config)
+        self._lookup = {}      # key technical_info đã bỏ dấu -> slug facet
+        self._slots = {}       # product_id -> slot
+        self._ids = []         # slot -> product_id (None = slot trống)
+        self._free = []        # slot trống để dùng lại
+        self._entries = {}     # product_id -> (category_id, price, ((slug facet, slug giá trị), ...))
+        self._categories = {}  # category_id -> bitmap
+        self._prices = []      # (giá, slot) của sản phẩm có giá, sort khi build dải giá
+        self._price_bands = None  # bitmap mỗi PRICE_BAND_SIZE phần tử liên tiếp của _prices (None = cần build lại)
+        self._all = 0
+        self.ready = False
+        self.version = 0
+        self.generation = 0
+        self.built_at = None
+        self.build_seconds = 0.0
+        self._set_keys(keys)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _set_keys(self, keys):
+        self._facets = {}
+        self._lookup = {}
+        for key in keys:
+            facet = Facet(key)
+            if facet.slug and facet.slug not in self._facets:
+                self._facets[facet.slug] = facet
+                self._lookup[fold_text(key).strip()] = facet.slug
+
+    # ---------- build / cập nhật ----------
+    def build(self, products, keys, version=0):
+        """Build lại từ đầu rồi mới thay thế index cũ (request đang đọc không bị ảnh hưởng)"""
+        started = time.perf_counter()
+        fresh = FacetIndex(keys)
+        for product in products:
+            fresh._add(product.id, product.category_id, product.price, product.technical_info)
+
+        with self._lock:
+            self._facets = fresh._facets
+            self._lookup = fresh._lookup
+            self._slots = fresh._slots
+            self._ids = fresh._ids
+            self._free = fresh._free
+            self._entries = fresh._entries
+            self._categories = fresh._categories
+            self._prices = fresh._prices
+            self._price_bands = None
+            self._all = fresh._all
+            self.version = version
+            self.generation += 1
+            self.ready = True
+            self.built_at = time.time()
+            self.build_seconds = time.perf_counter() - started
+
+    def add(self, product_id, category_id, price, technical_info):
+        with self._lock:
+            self._remove(product_id)
+            self._add(product_id, category_id, price, technical_info)
+            self.generation += 1
+
+    def remove(self, product_id):
+        with self._lock:
+            self._remove(product_id)
+            self.generation += 1
+
+    def _pairs(self, technical_info):
+        pairs = []
+        if not isinstance(technical_info, dict):
+            return pairs
+        for key, value in technical_info.items():
+            facet_slug = self._lookup.get(fold_text(str(key)).strip())
+            if facet_slug is None:
+                continue
+            facet = self._facets[facet_slug]
+            for label in split_values(value):
+                value_slug = slugify(label)
+                if value_slug:
+                    facet.labels.setdefault(value_slug, label)
+                    pairs.append((facet_slug, value_slug))
+        return tuple(dict.fromkeys(pairs))
+
+    def _add(self, product_id, category_id, price, technical_info):
+        if self._free:
+            slot = self._free.pop()
+            self._ids[slot] = product_id
+        else:
+            slot = len(self._ids)
+            self._ids.append(product_id)
+        bit = 1 << slot
+
+        pairs = self._pairs(technical_info)
+        self._slots[product_id] = slot
+        self._entries[product_id] = (category_id, price, pairs)
+        self._all |= bit
+        self._categories[category_id] = self._categories.get(category_id, 0) | bit
+        if price is not None:
+            self._prices.append((price, slot))
+            self._price_bands = None
+        for facet_slug, value_slug in pairs:
+            bitmaps = self._facets[facet_slug].bitmaps
+            bitmaps[value_slug] = bitmaps.get(value_slug, 0) | bit
+
+    def _remove(self, product_id):
+        slot = self._slots.pop(product_id, None)
+        if slot is None:
+            return
+        category_id, price, pairs = self._entries.pop(product_id)
+        clear = ~(1 << slot)
+        if price is not None:
+            self._prices.remove((price, slot))
+            self._price_bands = None
+
+        self._all &= clear
+        self._categories[category_id] &= clear
+        if not self._categories[category_id]:
+            del self._categories[category_id]
+        for facet_slug, value_slug in pairs:
+            facet = self._facets[facet_slug]
+            facet.bitmaps[value_slug] &= clear
+            if not facet.bitmaps[value_slug]:
+                del facet.bitmaps[value_slug]
+                facet.labels.pop(value_slug, None)
+
+        self._ids[slot] = None
+        self._free.append(slot)
+
+    # ---------- truy vấn ----------
+    def parse_selection(self, args):
+        """request.args -> {slug facet: frozenset(slug giá trị)}, bỏ facet/giá trị không tồn tại"""
+        selection = {}
+        with self._lock:
+            for facet_slug, facet in self._facets.items():
+                values = frozenset(value for value in args.getlist(facet.param) if value in facet.bitmaps)
+                if values:
+                    selection[facet_slug] = values
+        return selection
+
+    def selection_params(self, selection):
+        """{slug facet: values} -> query string {'f-ung-dung': [...]} (dùng cho url_for)"""
+        return {PARAM_PREFIX + facet_slug: sorted(values) for facet_slug, values in selection.items()}
+
+    def _price_index(self):
+        """(giá, slot) đã sort + bitmap từng dải; build lại 1 lần sau mỗi thay đổi"""
+        if self._price_bands is None:
+            self._prices.sort()
+            bands = []
+            for start in range(0, len(self._prices), PRICE_BAND_SIZE):
+                band = 0
+                for _, slot in self._prices[start:start + PRICE_BAND_SIZE]:
+                    band |= 1 << slot
+                bands.append(band)
+            self._price_bands = bands
+        return self._prices, self._price_bands
+
+    def _price_mask(self, min_price, max_price):
+        """
+        Bitmap sản phẩm có giá trong [min_price, max_price]: bisect trên danh sách theo giá,
+        OR bitmap các dải nằm trọn trong khoảng, chỉ 2 dải ở biên set từng bit
+        """
+        prices, bands = self._price_index()
+        lo = 0 if min_price is None else bisect_left(prices, (min_price, -1))
+        hi = len(prices) if max_price is None else bisect_right(prices, (max_price, math.inf))
+        if lo >= hi:
+            return 0
+
+        first_band, last_band = lo // PRICE_BAND_SIZE, hi // PRICE_BAND_SIZE
+        mask = 0
+        if first_band == last_band:
+            edges = prices[lo:hi]
+        else:
+            edges = prices[lo:(first_band + 1) * PRICE_BAND_SIZE] + prices[last_band * PRICE_BAND_SIZE:hi]
+            for band in bands[first_band + 1:last_band]:
+                mask |= band
+        for _, slot in edges:
+            mask |= 1 << slot
+        return mask
+
+    def scope(self, category_id=None, min_price=None, max_price=None):
+        """
+        Phạm vi lọc (danh mục + khoảng giá, giá NULL bị loại như WHERE trong SQL),
+        tính 1 lần mỗi request rồi truyền cho matching_ids() và counts()
+        """
+        with self._lock:
+            mask = self._categories.get(category_id, 0) if category_id else self._all
+            if mask and (min_price is not None or max_price is not None):
+                mask &= self._price_mask(min_price, max_price)
+            return FacetScope(self.generation, mask, category_id, min_price, max_price)
+
+    def _scope_mask(self, scope):
+        """Bitmap của scope (tính lại nếu index đã đổi sau khi tạo scope: slot có thể đã dùng lại)"""
+        if scope is None:
+            return self._all
+        if scope.generation != self.generation:
+            scope = self.scope(scope.category_id, scope.min_price, scope.max_price)
+        return scope.mask
+
+    def _selection_mask(self, mask, selection, exclude=None):
+        for facet_slug, values in selection.items():
+            if facet_slug == exclude:
+                continue
+            bitmaps = self._facets[facet_slug].bitmaps
+            union = 0
+            for value_slug in values:
+                union |= bitmaps.get(value_slug, 0)
+            mask &= union
+            if not mask:
+                break
+        return mask
+
+    def matching_ids(self, selection, scope=None):
+        """Id sản phẩm trong scope khớp mọi facet đang chọn (thứ tự slot, không phải thứ tự hiển thị)"""
+        with self._lock:
+            mask = self._selection_mask(self._scope_mask(scope), selection)
+            return [self._ids[slot] for slot in iter_bits(mask)]
+
+    def counts(self, selection, scope=None):
+        """
+        Facet kèm số lượng để render bộ lọc:
+        [{'slug', 'key', 'param', 'values': [{'slug', 'label', 'count', 'selected'}]}]
+        """
+        result = []
+        with self._lock:
+            scope_mask = self._scope_mask(scope)
+            for facet_slug, facet in self._facets.items():
+                selected = selection.get(facet_slug, frozenset())
+                base = self._selection_mask(scope_mask, selection, exclude=facet_slug)
+                values = []
+                for value_slug, bitmap in facet.bitmaps.items():
+                    count = (bitmap & base).bit_count()
+                    if count or value_slug in selected:
+                        values.append({'slug': value_slug, 'label': facet.labels[value_slug],
+                                       'count': count, 'selected': value_slug in selected})
+                if not values:
+                    continue
+                values.sort(key=lambda item: (not item['selected'], -item['count'], item['label']))
+                result.append({'slug': facet_slug, 'key': facet.key, 'param': facet.param,
+                               'values': values[:max(MAX_VALUES_PER_FACET, len(selected))]})
+        return result
+
+    def stats(self):
+        with self._lock:
+            return {
+                'ready': self.ready,
+                'products': len(self._entries),
+                'facets': {facet.key: len(facet.bitmaps) for facet in self._facets.values()},
+                'version': self.version,
+                'generation': self.generation,
+                'build_ms': round(self.build_seconds * 1000, 2),
+            }
+
+
+facet_index = FacetIndex()
+
+
+def facet_keys():
+    return current_app.config.get('PRODUCT_FACETS') or DEFAULT_FACETS
+
+
+def load_products():
+    """Sản phẩm đang hiển thị (chỉ load các cột cần index)"""
+    from sqlalchemy.orm import load_only
+    from app.models.product import Product
+    return Product.query.options(load_only(Product.id, Product.category_id, Product.price,
+                                           Product.technical_info, Product.is_active)) \
+        .filter_by(is_active=True).all()
+
+
+def _build(version):
+    facet_index.build(load_products(), facet_keys(), version=version)
+
+
+live_facet_index = register_index(FACET_VERSION_NAME, facet_index, build=_build,
+                                  add=lambda product_id, entry: facet_index.add(product_id, *entry))
+
+
+def rebuild_facet_index():
+    """Build lại toàn bộ index từ DB (cần app context)"""
+    return live_facet_index.rebuild()
+
+
+def get_facet_index():
+    """Index đã sẵn sàng (build ở lần gọi đầu tiên)"""
+    return live_facet_index.get()
+
+
+# ==================== CẬP NHẬT THEO MODEL ====================
+def schedule_facet_update(target):
+    """Gọi trong event listener after_insert/after_update/after_delete của Product"""
+    if target.id is None:
+        return
+    entry = None
+    if target.is_active:
+        technical_info = dict(target.technical_info) if target.technical_info else None
+        entry = (target.category_id, target.price, technical_info)
+    live_facet_index.schedule(target, target.id, entry)
+
+
+def init_facet_index(app):
+    live_facet_index.init_app(app)
@@ -0,0 +1,134 @@
+"""
+Full-text search trên PostgreSQL: tsvector + GIN, unaccent, pg_trgm
+
+- Bật bằng SEARCH_BACKEND=postgres, cần migration a7c3e91d5b20 (cột search_vector,
+  index GIN, text search config vn_unaccent, hàm f_unaccent)
+- products.search_vector = tên (A) + mô tả (C); blogs.search_vector = tiêu đề (A) + tóm tắt (B)
+  + nội dung (D). Cột GENERATED nên PostgreSQL tự cập nhật, app không cần ghi
+- Query: mọi từ đều phải khớp, từ cuối match theo prefix ('gach op:*'), xếp hạng ts_rank_cd;
+  tên/tiêu đề gần giống (pg_trgm, gõ sai chính tả) cũng được tính là khớp
+- Snippet: ts_headline trên text gốc (giữ dấu), chỉ chạy cho các dòng đang hiển thị
+- DB không phải PostgreSQL (SQLite khi dev) hoặc chưa chạy migration -> is_enabled() = False,
+  route dùng lại đường cũ (ILIKE / search index trong RAM)
+
+Usage:
+    if fulltext.is_enabled():
+        query = fulltext.apply_search(Product.query, Product, keyword)
+        snippets = fulltext.snippets(Product, [p.id for p in products], keyword)
+"""
+from flask import current_app
+from markupsafe import Markup, escape
+from sqlalchemy import func, literal_column, or_, inspect as sa_inspect
+
+from app import db
+from app.search_index import tokenize
+
+TS_CONFIG = 'vn_unaccent'
+
+# Cột tìm kiếm theo model (cột search_vector không khai báo trong model vì SQLite không có tsvector)
+SEARCH_COLUMNS = {
+    'products': {'title': 'name', 'snippet': 'description'},
+    'blogs': {'title': 'title', 'snippet': 'excerpt'},
+}
+
+# Điểm pg_trgm similarity() cộng thêm vào ts_rank_cd (toán tử % dùng ngưỡng mặc định 0.3)
+TRIGRAM_WEIGHT = 0.5
+
+# Dùng ký tự điều khiển làm marker để escape HTML trước rồi mới chèn <mark>
+_MARK_START = '\x02'
+_MARK_STOP = '\x03'
+HEADLINE_OPTIONS = (f'StartSel={_MARK_START}, StopSel={_MARK_STOP}, '
+                    'MaxWords=30, MinWords=12, ShortWord=2, MaxFragments=2, FragmentDelimiter=" ... "')
+
+
+def is_enabled():
+    """SEARCH_BACKEND=postgres, DB là PostgreSQL và đã có cột search_vector"""
+    if (current_app.config.get('SEARCH_BACKEND') or 'memory').lower() != 'postgres':
+        return False
+
+    available = current_app.extensions.get('fulltext_available')
+    if available is None:
+        available = db.engine.dialect.name == 'postgresql' and _has_search_columns()
+        current_app.extensions['fulltext_available'] = available
+        if not available:
+            current_app.logger.warning('SEARCH_BACKEND=postgres nhưng DB chưa hỗ trợ '
+                                       '(không phải PostgreSQL hoặc chưa migrate), dùng ILIKE')
+    return available
+
+
+def _has_search_columns():
+    try:
+        inspector = sa_inspect(db.engine)
+        return all(any(column['name'] == 'search_vector' for column in inspector.get_columns(table))
+                   for table in SEARCH_COLUMNS)
+    except Exception:
+        return False
+
+
+# ==================== QUERY ====================
+def build_tsquery(keyword, prefix=True):
+    """'Gạch ốp' -> to_tsquery('vn_unaccent', 'gach & op:*'), None nếu không có từ nào"""
+    tokens = list(dict.fromkeys(tokenize(keyword)))
+    if not tokens:
+        return None
+    if prefix:
+        tokens[-1] += ':*'
+    # tokenize() chỉ trả về [a-z0-9]+ nên không cần escape cú pháp tsquery
+    return func.to_tsquery(TS_CONFIG, ' & '.join(tokens))
+
+
+def search_vector(model):
+    return literal_column(f'{model.__tablename__}.search_vector')
+
+
+def folded(expression):
+    """f_unaccent(lower(x)) - cùng biểu thức với index trigram trong migration"""
+    return func.f_unaccent(func.lower(expression))
+
+
+def apply_search(query, model, keyword, prefix=True, order=True):
+    """
+    Lọc query theo keyword, sắp theo độ liên quan (ts_rank_cd + độ giống của tên)
+
+    order=False: chỉ lọc, giữ thứ tự sắp xếp của caller
+    """
+    tsquery = build_tsquery(keyword, prefix)
+    if tsquery is None:
+        return query.filter(db.false())
+
+    vector = search_vector(model)
+    title = folded(getattr(model, SEARCH_COLUMNS[model.__tablename__]['title']))
+    needle = folded(keyword)
+
+    query = query.filter(or_(vector.op('@@')(tsquery), title.op('%')(needle)))
+    if order:
+        score = func.ts_rank_cd(vector, tsquery) + func.similarity(title, needle) * TRIGRAM_WEIGHT
+        query = query.order_by(score.desc(), model.id.desc())
+    return query
+
+
+def search(model, keyword, limit, prefix=True, options=()):
+    """Top `limit` object khớp keyword (is_active)"""
+    query = model.query.options(*options).filter(model.is_active == True)
+    return apply_search(query, model, keyword, prefix).limit(limit).all()
+
+
+# ==================== SNIPPET ====================
+def _to_markup(headline):
+    text = str(escape(headline))
+    return Markup(text.replace(_MARK_START, '<mark>').replace(_MARK_STOP, '</mark>'))
+
+
+def snippets(model, ids, keyword):
+    """{id: Markup} đoạn trích có <mark> quanh từ khớp, chỉ query cho `ids` đang hiển thị"""
+    tsquery = build_tsquery(keyword)
+    if not ids or tsquery is None:
+        return {}
+
+    column = getattr(model, SEARCH_COLUMNS[model.__tablename__]['snippet'])
+    # Bỏ thẻ HTML trước khi cắt đoạn
+    plain = func.regexp_replace(func.coalesce(column, ''), '<[^>]+>', ' ', 'g')
+    rows = db.session.query(model.id, func.ts_headline(TS_CONFIG, plain, tsquery, HEADLINE_OPTIONS)) \
+        .filter(model.id.in_(ids)).all()
+    return {row_id: _to_markup(headline) for row_id, headline in rows
+            if headline and _MARK_START in headline}
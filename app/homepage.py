@@ -0,0 +1,104 @@
+"""
+Dữ liệu trang chủ: gom mọi section vào 1 entry cache
+
+- Chỉ load section của feature đang bật (banners, products, blogs, projects)
+- Mỗi section 1 query với load_only (chỉ cột template dùng), sản phẩm joinedload danh mục
+- SEO ảnh (Media Library) của banner/sản phẩm/bài viết/dự án: 1 query chung cho mọi ảnh
+- Kết quả là các record (app/models/records.py), template không query thêm
+- Key = 'home_sections:' + bitmask các feature đang bật; event listener của
+  Banner/Product/Category/Blog/Project gọi invalidate_homepage_cache()
+
+Usage:
+    from app.homepage import get_homepage_data
+    return render_template('public/index.html', **get_homepage_data())
+"""
+from sqlalchemy.orm import joinedload, load_only
+
+# Không chứa 'page:' (tiền tố page cache) hay tên feature: clear() so khớp theo chuỗi con
+HOMEPAGE_CACHE_PREFIX = 'home_sections:'
+SECTION_FEATURES = ('banners', 'products', 'blogs', 'projects')
+FEATURED_PRODUCTS_LIMIT = 6
+FEATURED_BLOGS_LIMIT = 3
+FEATURED_PROJECTS_LIMIT = 6
+
+
+def _load_sections(features):
+    """Query các section (chưa resolve SEO ảnh)"""
+    from app.models.product import Product, Category
+    from app.models.media import Banner, Project
+    from app.models.content import Blog
+
+    sections = {'banners': [], 'featured_products': [], 'categories': [],
+                'featured_blogs': [], 'featured_projects': []}
+
+    if 'banners' in features:
+        sections['banners'] = Banner.query.options(load_only(
+            Banner.id, Banner.title, Banner.subtitle, Banner.image, Banner.image_mobile,
+            Banner.link, Banner.button_text, Banner.order
+        )).filter_by(is_active=True).order_by(Banner.order).all()
+
+    if 'products' in features:
+        sections['featured_products'] = Product.query.options(joinedload(Product.category)) \
+            .filter_by(is_featured=True, is_active=True).limit(FEATURED_PRODUCTS_LIMIT).all()
+        sections['categories'] = Category.query.filter_by(is_active=True).order_by(Category.name).all()
+
+    if 'blogs' in features:
+        sections['featured_blogs'] = Blog.query.options(load_only(
+            Blog.id, Blog.title, Blog.slug, Blog.excerpt, Blog.content, Blog.image, Blog.views,
+            Blog.image_alt_text, Blog.image_title, Blog.image_caption,
+            Blog.created_at, Blog.updated_at
+        )).filter_by(is_featured=True, is_active=True) \
+            .order_by(Blog.created_at.desc()).limit(FEATURED_BLOGS_LIMIT).all()
+
+    if 'projects' in features:
+        sections['featured_projects'] = Project.query.options(load_only(
+            Project.id, Project.title, Project.slug, Project.client, Project.location, Project.year,
+            Project.description, Project.image, Project.project_type, Project.area,
+            Project.is_featured, Project.created_at
+        )).filter_by(is_featured=True, is_active=True) \
+            .order_by(Project.created_at.desc()).limit(FEATURED_PROJECTS_LIMIT).all()
+
+    return sections
+
+
+def build_homepage_data(features):
+    """Query + snapshot toàn bộ trang chủ (cần app context)"""
+    from app.models.helpers import get_media_map_by_image_urls
+    from app.models.records import (snapshot_banners, snapshot_products, snapshot_categories,
+                                    snapshot_blogs, snapshot_projects)
+
+    sections = _load_sections(features)
+    media_map = get_media_map_by_image_urls(
+        [b.image for b in sections['banners']]
+        + [b.image_mobile for b in sections['banners']]
+        + [p.image for p in sections['featured_products']]
+        + [b.image for b in sections['featured_blogs']]
+        + [p.image for p in sections['featured_projects']]
+    )
+    return {
+        'banners': snapshot_banners(sections['banners'], media_map),
+        'featured_products': snapshot_products(sections['featured_products'], media_map=media_map),
+        'categories': snapshot_categories(sections['categories']),
+        'featured_blogs': snapshot_blogs(sections['featured_blogs'], media_map),
+        'featured_projects': snapshot_projects(sections['featured_projects'], media_map),
+    }
+
+
+def get_homepage_data():
+    """View-model trang chủ từ cache_manager (build lại khi bị invalidate)"""
+    from app import cache_manager
+    from app.models.features import get_enabled_features
+
+    features = get_enabled_features()
+    mask = sum(1 << i for i, feature in enumerate(SECTION_FEATURES) if feature in features)
+    cache_key = f'{HOMEPAGE_CACHE_PREFIX}{mask}'
+    data = cache_manager.get(cache_key)
+    if data is None:
+        data = build_homepage_data(features)
+        cache_manager.set(cache_key, data)
+    return data
+
+
+def invalidate_homepage_cache():
+    from app import cache_manager
+    cache_manager.clear(HOMEPAGE_CACHE_PREFIX)
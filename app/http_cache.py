@@ -0,0 +1,154 @@
+"""
+HTTP caching: ETag / Last-Modified, conditional GET (304) và cache static files
+
+- Response HTML/JSON (GET, 200, ngoài /admin) được gắn strong ETag = sha1(body)
+  và Cache-Control: no-cache (trình duyệt luôn hỏi lại, nhận 304 nếu không đổi)
+- View gọi mark_last_modified(product, ...) để gửi Last-Modified = max(updated_at)
+- url_for('static', ...) tự thêm ?v=<hash nội dung>; file static có ?v= được cache
+  1 năm (immutable), còn lại theo SEND_FILE_MAX_AGE_DEFAULT
+- 304 được trả trước khi Flask-Compress chạy nên không tốn CPU nén lại HTML
+"""
+import hashlib
+import os
+from datetime import datetime, timezone
+
+from flask import g, request, current_app
+
+ETAG_MIMETYPES = {'text/html', 'application/json', 'application/xml', 'text/xml', 'text/plain'}
+COMPRESSION_SUFFIXES = ('gzip', 'br', 'deflate', 'zstd')
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+
+_static_hashes = {}
+
+
+def compute_etag(data):
+    return hashlib.sha1(data).hexdigest()
+
+
+# ==================== LAST-MODIFIED ====================
+def _as_utc(dt):
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.astimezone(timezone.utc).replace(microsecond=0)
+
+
+def mark_last_modified(*items):
+    """
+    Ghi nhận thời điểm sửa đổi của dữ liệu render trong request hiện tại
+
+    items: datetime, object có updated_at (fallback created_at), hoặc list các loại trên
+    """
+    latest = g.get('last_modified')
+    for item in items:
+        if item is None:
+            continue
+        if isinstance(item, (list, tuple)):
+            values = item
+        elif hasattr(item, 'items') and not isinstance(item, dict):
+            values = item.items  # Pagination
+        else:
+            values = [item]
+
+        for value in values:
+            if not isinstance(value, datetime):
+                value = getattr(value, 'updated_at', None) or getattr(value, 'created_at', None)
+            if value is None:
+                continue
+            value = _as_utc(value)
+            if latest is None or value > latest:
+                latest = value
+    g.last_modified = latest
+    return latest
+
+
+# ==================== CONDITIONAL GET ====================
+def _etag_matches(etag):
+    """So khớp If-None-Match, chấp nhận cả ETag có hậu tố nén (Flask-Compress: "abc:gzip")"""
+    if_none_match = request.if_none_match
+    if if_none_match.star_tag:
+        return True
+    base = etag.rsplit(':', 1)[0] if etag.rsplit(':', 1)[-1] in COMPRESSION_SUFFIXES else etag
+    candidates = [base] + [f'{base}:{suffix}' for suffix in COMPRESSION_SUFFIXES]
+    return any(if_none_match.contains_weak(candidate) for candidate in candidates)
+
+
+def _not_modified(response):
+    etag, _ = response.get_etag()
+    if request.if_none_match:
+        # Có If-None-Match thì bỏ qua If-Modified-Since (RFC 9110)
+        return bool(etag) and _etag_matches(etag)
+    if request.if_modified_since and response.last_modified:
+        return response.last_modified <= request.if_modified_since
+    return False
+
+
+def _to_not_modified(response):
+    response.status_code = 304
+    response.set_data(b'')
+    for header in ('Content-Encoding', 'Content-Length', 'Content-Type'):
+        response.headers.pop(header, None)
+    return response
+
+
+def apply_validators(response):
+    """Gắn ETag/Last-Modified và trả 304 nếu client đã có bản mới nhất"""
+    if request.method not in ('GET', 'HEAD') or response.status_code != 200:
+        return response
+
+    if request.endpoint == 'static':
+        if 'v' in request.args:
+            response.headers['Cache-Control'] = IMMUTABLE_CACHE_CONTROL
+        return response
+
+    if (request.path.startswith('/admin') or response.is_streamed or response.direct_passthrough
+            or response.mimetype not in ETAG_MIMETYPES):
+        return response
+
+    last_modified = g.get('last_modified')
+    if last_modified is not None and response.last_modified is None:
+        response.last_modified = last_modified
+
+    if not response.get_etag()[0]:
+        response.set_etag(compute_etag(response.get_data()))
+    if 'Cache-Control' not in response.headers:
+        response.headers['Cache-Control'] = 'no-cache'
+
+    if _not_modified(response):
+        return _to_not_modified(response)
+    return response
+
+
+# ==================== STATIC FINGERPRINT ====================
+def static_file_hash(filename):
+    """Hash nội dung file static (cache theo mtime)"""
+    path = os.path.join(current_app.static_folder, filename)
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        return None
+
+    cached = _static_hashes.get(filename)
+    if cached and cached[0] == mtime:
+        return cached[1]
+
+    with open(path, 'rb') as f:
+        digest = hashlib.md5(f.read()).hexdigest()[:10]
+    _static_hashes[filename] = (mtime, digest)
+    return digest
+
+
+def _static_url_defaults(endpoint, values):
+    if endpoint == 'static' and 'filename' in values and 'v' not in values:
+        digest = static_file_hash(values['filename'])
+        if digest:
+            values['v'] = digest
+
+
+def init_http_cache(app):
+    """
+    Đăng ký after_request + url_defaults
+
+    Gọi SAU compress.init_app() để after_request này chạy trước Flask-Compress.
+    """
+    app.url_defaults(_static_url_defaults)
+    app.after_request(apply_validators)
@@ -0,0 +1,130 @@
+"""
+Khung dùng chung cho các index trong RAM được cập nhật theo model
+(app/search_index.py, app/facets.py, app/related.py)
+
+- Build lần đầu khi cần (hoặc lúc khởi động), có lock để chỉ 1 thread build
+- Thay đổi của model gom vào session.info lúc flush, chỉ áp dụng sau commit
+  (rollback thì bỏ); 1 cặp listener after_commit/after_rollback cho mọi index
+- Cache backend dùng chung (sqlite/redis): mỗi index có 1 version trong cache_manager,
+  worker áp dụng thay đổi thì tăng version, worker khác thấy lệch thì build lại
+  (kiểm tra tối đa 1 lần/VERSION_CHECK_INTERVAL giây)
+
+Usage:
+    live = register_index('facet_index', facet_index, build=lambda version: ...,
+                          add=lambda product_id, entry: facet_index.add(product_id, *entry))
+    index = live.get()                     # trong request
+    live.schedule(target, key, payload)    # trong event listener (payload None = xóa)
+"""
+import threading
+import time
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+VERSION_CHECK_INTERVAL = 1.0
+PENDING_KEY = 'live_index_pending'
+
+
+class LiveIndex:
+    """
+    index: object có .ready, .version, .remove(key)
+    build(version): build lại index từ DB (cần app context)
+    add(key, payload): áp dụng 1 thay đổi đã commit
+    tables: bảng phải có trong DB để build lúc khởi động
+    """
+
+    def __init__(self, name, index, build, add, tables=('products',)):
+        self.name = name
+        self.index = index
+        self._build = build
+        self._add = add
+        self.tables = tables
+        self._build_lock = threading.Lock()
+        self._version_checked_at = 0.0
+
+    def rebuild(self):
+        from app import cache_manager
+        version = cache_manager.get_version(self.name) if cache_manager.is_shared else 0
+        self._build(version)
+        return self.index
+
+    def _sync_shared_version(self):
+        from app import cache_manager
+        if not cache_manager.is_shared:
+            return
+
+        now = time.monotonic()
+        if now - self._version_checked_at < VERSION_CHECK_INTERVAL:
+            return
+        self._version_checked_at = now
+
+        if cache_manager.get_version(self.name) != self.index.version:
+            self.index.ready = False
+
+    def get(self):
+        """Index đã sẵn sàng (build ở lần gọi đầu tiên hoặc khi worker khác đã đổi)"""
+        self._sync_shared_version()
+        if not self.index.ready:
+            with self._build_lock:
+                if not self.index.ready:
+                    self.rebuild()
+        return self.index
+
+    def schedule(self, target, key, payload):
+        """Gọi lúc flush (attribute còn nguyên); payload None = xóa khỏi index"""
+        session = inspect(target).session
+        if session is None:
+            return
+        pending = session.info.setdefault(PENDING_KEY, {})
+        pending.setdefault(self.name, {})[key] = (target, payload)
+
+    def apply(self, changes):
+        if not changes or not self.index.ready:
+            return
+
+        from app import cache_manager
+        for key, (target, payload) in changes.items():
+            if payload is None or inspect(target).was_deleted:
+                self.index.remove(key)
+            else:
+                self._add(key, payload)
+
+        if cache_manager.is_shared:
+            # Worker này đã cập nhật tại chỗ, chỉ các worker khác cần build lại
+            self.index.version = cache_manager.bump_version(self.name)
+
+    def init_app(self, app):
+        """Build sẵn lúc khởi động (bỏ qua nếu DB chưa có bảng, vd lúc chạy migration)"""
+        from app import db
+        with app.app_context():
+            try:
+                engine_inspector = inspect(db.engine)
+                if all(engine_inspector.has_table(table) for table in self.tables):
+                    self.rebuild()
+            except Exception as e:
+                app.logger.warning(f'{self.name}: chưa build được lúc khởi động ({e})')
+            finally:
+                db.session.remove()
+
+
+_registry = {}
+
+
+def register_index(name, index, build, add, tables=('products',)):
+    live = LiveIndex(name, index, build, add, tables)
+    _registry[name] = live
+    return live
+
+
+@event.listens_for(Session, 'after_commit')
+def _apply_pending_updates(session):
+    pending = session.info.pop(PENDING_KEY, None)
+    if not pending:
+        return
+    for name, changes in pending.items():
+        _registry[name].apply(changes)
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_pending_updates(session):
+    session.info.pop(PENDING_KEY, None)
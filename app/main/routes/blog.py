@@ -1,15 +1,22 @@
 from flask import render_template, request, redirect, url_for
 from app.main import main_bp
-from app import db
 from app.models.content import Blog, FAQ
 from app.models.settings import get_setting
 from sqlalchemy import or_
 from sqlalchemy.orm import joinedload, load_only
 from app.models.features import feature_required
+from app.view_counter import record_view
+from app.page_cache import cache_page
+from app.http_cache import mark_last_modified
+from app import fulltext
+from app.related import get_related_index
+
+RELATED_BLOGS_LIMIT = 2
 
 
 @main_bp.route('/tin-tuc')
 @feature_required('blogs')
+@cache_page('blogs')
 def blog():
     """Trang danh sách blog"""
     page = request.args.get('page', 1, type=int)
@@ -28,16 +35,21 @@ def blog():
              )
 
     # Search
-    if search:
-        query = query.filter(
-            or_(
-                Blog.title.ilike(f'%{search}%'),
-                Blog.excerpt.ilike(f'%{search}%')
+    use_fulltext = bool(search) and fulltext.is_enabled()
+    if use_fulltext:
+        # Sắp theo độ liên quan
+        query = fulltext.apply_search(query, Blog, search)
+    else:
+        if search:
+            query = query.filter(
+                or_(
+                    Blog.title.ilike(f'%{search}%'),
+                    Blog.excerpt.ilike(f'%{search}%')
+                )
             )
-        )
 
-    # Sắp xếp mới nhất
-    query = query.order_by(Blog.created_at.desc())
+        # Sắp xếp mới nhất
+        query = query.order_by(Blog.created_at.desc())
 
     # Phân trang
     per_page = 9
@@ -57,8 +69,12 @@ def blog():
                       .order_by(Blog.created_at.desc())
                       ).limit(5).all()
 
+    blog_snippets = fulltext.snippets(Blog, [b.id for b in blogs], search) if use_fulltext else {}
+
+    mark_last_modified(blogs)
     return render_template('public/tin_tuc/blogs.html',
                            blogs=blogs,
+                           blog_snippets=blog_snippets,
                            pagination=pagination,
                            featured_blogs=featured_blogs,
                            current_search=search)
@@ -73,16 +89,26 @@ def blog_detail(slug):
             .filter_by(slug=slug, is_active=True)
             ).first_or_404()
 
-    # Tăng lượt xem
-    blog.views += 1
-    db.session.commit()
-
-    # Bài viết liên quan (cùng category hoặc mới nhất)
-    related_blogs = (Blog.query
-                     .options(load_only(Blog.slug, Blog.title, Blog.created_at, Blog.image))
-                     .filter(Blog.id != blog.id, Blog.is_active == True)
-                     .order_by(Blog.created_at.desc())
-                     ).limit(2).all()
+    # Tăng lượt xem (gom lại, ghi xuống DB theo lô - app/view_counter.py)
+    record_view(blog)
+
+    # Bài viết liên quan theo độ tương đồng nội dung (app/related.py), thiếu thì lấy bài mới nhất
+    related_ids = get_related_index('blog').related(blog.id, limit=RELATED_BLOGS_LIMIT)
+    related_blogs = []
+    if related_ids:
+        found = {b.id: b for b in (Blog.query
+                                   .options(load_only(Blog.id, Blog.slug, Blog.title, Blog.created_at, Blog.image))
+                                   .filter(Blog.id.in_(related_ids), Blog.is_active == True)
+                                   ).all()}
+        related_blogs = [found[blog_id] for blog_id in related_ids if blog_id in found]
+
+    if len(related_blogs) < RELATED_BLOGS_LIMIT:
+        related_blogs += (Blog.query
+                          .options(load_only(Blog.slug, Blog.title, Blog.created_at, Blog.image))
+                          .filter(Blog.id.notin_([blog.id] + [b.id for b in related_blogs]),
+                                  Blog.is_active == True)
+                          .order_by(Blog.created_at.desc())
+                          ).limit(RELATED_BLOGS_LIMIT - len(related_blogs)).all()
 
     # ===== THÊM PHẦN NÀY: Tin tức nổi bật cho sidebar =====
     featured_blogs = (Blog.query
@@ -106,6 +132,7 @@ def blog_detail(slug):
         featured_blogs.extend(additional_blogs)
     # =========================================================
 
+    mark_last_modified(blog)
     return render_template('public/tin_tuc/blog_detail.html',
                            blog=blog,
                            related_blogs=related_blogs,
@@ -114,6 +141,7 @@ def blog_detail(slug):
 
 @main_bp.route('/cau-hoi-thuong-gap')
 @feature_required('blogs')
+@cache_page('faqs')
 def faq():
     """Trang câu hỏi thường gặp"""
     faqs = FAQ.query.filter_by(is_active=True).order_by(FAQ.order).all()
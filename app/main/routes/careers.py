@@ -3,6 +3,7 @@ from app.main import main_bp
 from app import db
 from app.models.job import Job
 from app.models.features import feature_required
+from app.view_counter import record_view
 
 @main_bp.route('/tuyen-dung')
 @feature_required('careers')
@@ -36,9 +37,8 @@ def job_detail(slug):
     """Trang chi tiết tuyển dụng"""
     job = Job.query.filter_by(slug=slug, is_active=True).first_or_404()
 
-    # Tăng lượt xem
-    job.view_count += 1
-    db.session.commit()
+    # Tăng lượt xem (gom lại, ghi xuống DB theo lô - app/view_counter.py)
+    record_view(job)
 
     # Các vị trí khác
     other_jobs = Job.query.filter(
@@ -1,552 +1,169 @@
-from flask import render_template, request, redirect, url_for, send_from_directory, current_app, abort, jsonify
+from flask import render_template, request, redirect, url_for, send_from_directory, current_app, abort
 from app.main import main_bp
 from app.models.product import Product
 from app.models.content import Blog
-from sqlalchemy import or_
+from app.search_index import get_search_index, tokenize
+from app.static_pages import match_static_pages, get_static_page_matcher
+from app.cache import MemoryBackend
+from app import db, fulltext
+from sqlalchemy import select, literal, null, union_all
+from sqlalchemy.orm import joinedload
+import json
 import os
+import time
+
+# Số kết quả tối đa theo loại ('page' = trang tĩnh, match riêng bằng app/static_pages.py)
+SEARCH_PAGE_LIMITS = {'page': 10, 'product': 10, 'blog': 5, 'project': 5, 'faq': 5}
+SUGGESTION_LIMITS = {'page': 3, 'product': 5, 'blog': 3, 'project': 2, 'faq': 2}
+SUGGESTION_ORDER = ('page', 'product', 'blog', 'project', 'faq')
+# Các loại lấy từ PostgreSQL full-text khi SEARCH_BACKEND=postgres
+FULLTEXT_TYPES = ('product', 'blog')
+EMPTY_SUGGESTIONS = '{"suggestions":[]}'
+SUGGESTION_CACHE_MAX_BYTES = 4 * 1024 * 1024
+
+
+def _index_limits(limits, use_fulltext):
+    """Giới hạn cho search index trong RAM (bỏ trang tĩnh và các loại lấy từ full-text)"""
+    excluded = ('page',) + (FULLTEXT_TYPES if use_fulltext else ())
+    return {doc_type: count for doc_type, count in limits.items() if doc_type not in excluded}
 
 
 @main_bp.route('/tim-kiem')
 def search():
-    """Trang tìm kiếm tổng hợp"""
-    keyword = request.args.get('q', '')
+    """Trang tìm kiếm tổng hợp (search index trong RAM + PostgreSQL full-text nếu bật)"""
+    keyword = request.args.get('q', '').strip()
 
     if not keyword:
         return redirect(url_for('main.index'))
 
-    # Mapping trang tĩnh với từ khóa
-    static_pages_map = {
-        'điều khoản': {
-            'title': 'Điều khoản dịch vụ',
-            'url': 'main.policy',
-            'params': {'policy_slug': 'dieu-khoan-dich-vu'},
-            'icon': 'bi-file-earmark-text',
-            'description': 'Các quy định và điều khoản khi sử dụng dịch vụ'
-        },
-        'dịch vụ': {
-            'title': 'Điều khoản dịch vụ',
-            'url': 'main.policy',
-            'params': {'policy_slug': 'dieu-khoan-dich-vu'},
-            'icon': 'bi-file-earmark-text',
-            'description': 'Các quy định và điều khoản khi sử dụng dịch vụ'
-        },
-        'chính sách': {
-            'title': 'Chính sách',
-            'url': 'main.policy',
-            'params': {},
-            'icon': 'bi-shield-check',
-            'description': 'Các chính sách vận chuyển, đổi trả, bảo hành và bảo mật'
-        },
-        'vận chuyển': {
-            'title': 'Chính sách vận chuyển',
-            'url': 'main.policy',
-            'params': {'policy_slug': 'van-chuyen'},
-            'icon': 'bi-truck',
-            'description': 'Thông tin về vận chuyển và giao hàng'
-        },
-        'giao hàng': {
-            'title': 'Chính sách vận chuyển',
-            'url': 'main.policy',
-            'params': {'policy_slug': 'van-chuyen'},
-            'icon': 'bi-truck',
-            'description': 'Thông tin về vận chuyển và giao hàng'
-        },
-        'đổi trả': {
-            'title': 'Chính sách đổi trả',
-            'url': 'main.policy',
-            'params': {'policy_slug': 'doi-tra'},
-            'icon': 'bi-arrow-repeat',
-            'description': 'Quy định về đổi trả sản phẩm'
-        },
-        'hoàn trả': {
-            'title': 'Chính sách đổi trả',
-            'url': 'main.policy',
-            'params': {'policy_slug': 'doi-tra'},
-            'icon': 'bi-arrow-repeat',
-            'description': 'Quy định về đổi trả sản phẩm'
-        },
-        'bảo hành': {
-            'title': 'Chính sách bảo hành',
-            'url': 'main.policy',
-            'params': {'policy_slug': 'bao-hanh'},
-            'icon': 'bi-shield-check',
-            'description': 'Thông tin về bảo hành sản phẩm'
-        },
-        'bảo mật': {
-            'title': 'Chính sách bảo mật',
-            'url': 'main.policy',
-            'params': {'policy_slug': 'bao-mat'},
-            'icon': 'bi-lock',
-            'description': 'Cam kết bảo mật thông tin khách hàng'
-        },
-        'quyền riêng tư': {
-            'title': 'Chính sách bảo mật',
-            'url': 'main.policy',
-            'params': {'policy_slug': 'bao-mat'},
-            'icon': 'bi-lock',
-            'description': 'Cam kết bảo mật thông tin khách hàng'
-        },
-        'giới thiệu': {
-            'title': 'Giới thiệu về chúng tôi',
-            'url': 'main.about',
-            'params': {},
-            'icon': 'bi-info-circle',
-            'description': 'Thông tin về công ty và đội ngũ'
-        },
-        'về chúng tôi': {
-            'title': 'Giới thiệu về chúng tôi',
-            'url': 'main.about',
-            'params': {},
-            'icon': 'bi-info-circle',
-            'description': 'Thông tin về công ty và đội ngũ'
-        },
-        'công ty': {
-            'title': 'Giới thiệu về chúng tôi',
-            'url': 'main.about',
-            'params': {},
-            'icon': 'bi-info-circle',
-            'description': 'Thông tin về công ty và đội ngũ'
-        },
-        'liên hệ': {
-            'title': 'Liên hệ',
-            'url': 'main.contact',
-            'params': {},
-            'icon': 'bi-envelope',
-            'description': 'Thông tin liên hệ và gửi tin nhắn'
-        },
-        'hỏi đáp': {
-            'title': 'Câu hỏi thường gặp',
-            'url': 'main.faq',
-            'params': {},
-            'icon': 'bi-question-circle',
-            'description': 'Các câu hỏi thường gặp và giải đáp'
-        },
-        'faq': {
-            'title': 'Câu hỏi thường gặp',
-            'url': 'main.faq',
-            'params': {},
-            'icon': 'bi-question-circle',
-            'description': 'Các câu hỏi thường gặp và giải đáp'
-        },
-        'câu hỏi': {
-            'title': 'Câu hỏi thường gặp',
-            'url': 'main.faq',
-            'params': {},
-            'icon': 'bi-question-circle',
-            'description': 'Các câu hỏi thường gặp và giải đáp'
-        },
-        'màu sắc': {
-            'title': 'Bảng màu sản phẩm',
-            'url': 'main.color_chart',
-            'params': {},
-            'icon': 'bi-palette',
-            'description': 'Bảng màu và mẫu sản phẩm'
-        },
-        'bảng màu': {
-            'title': 'Bảng màu sản phẩm',
-            'url': 'main.color_chart',
-            'params': {},
-            'icon': 'bi-palette',
-            'description': 'Bảng màu và mẫu sản phẩm'
-        },
-        'hướng dẫn': {
-            'title': 'Hướng dẫn thi công',
-            'url': 'main.installation_guide',
-            'params': {},
-            'icon': 'bi-tools',
-            'description': 'Hướng dẫn thi công và lắp đặt'
-        },
-        'thi công': {
-            'title': 'Hướng dẫn thi công',
-            'url': 'main.installation_guide',
-            'params': {},
-            'icon': 'bi-tools',
-            'description': 'Hướng dẫn thi công và lắp đặt'
-        },
-        'lắp đặt': {
-            'title': 'Hướng dẫn thi công',
-            'url': 'main.installation_guide',
-            'params': {},
-            'icon': 'bi-tools',
-            'description': 'Hướng dẫn thi công và lắp đặt'
-        },
-    }
-
-    # Tìm trang tĩnh phù hợp với fuzzy matching (tránh trùng lặp)
-    matched_pages = {}
-    keyword_lower = keyword.lower()
-    keyword_words = keyword_lower.split()
-
-    for key, page_info in static_pages_map.items():
-        # Match nếu:
-        # 1. Từ khóa chứa trong key (exact)
-        # 2. HOẶC bất kỳ từ nào trong keyword match với key
-        # 3. HOẶC key chứa trong từ khóa
-        match = False
-
-        if key in keyword_lower:
-            match = True
-        else:
-            # Kiểm tra từng từ trong keyword
-            for word in keyword_words:
-                if word in key or key in word:
-                    match = True
-                    break
-
-        if match:
-            # Dùng URL làm key để tránh trùng lặp
-            page_key = page_info['url'] + str(page_info.get('params', {}))
-            if page_key not in matched_pages:
-                matched_pages[page_key] = page_info
-
-    # Chuyển về list
-    static_pages = list(matched_pages.values())
-
-    # Tìm sản phẩm
-    products = Product.query.filter(
-        Product.name.ilike(f'%{keyword}%'),
-        Product.is_active == True
-    ).limit(10).all()
-
-    # Tìm blog
-    blogs = Blog.query.filter(
-        or_(
-            Blog.title.ilike(f'%{keyword}%'),
-            Blog.excerpt.ilike(f'%{keyword}%')
-        ),
-        Blog.is_active == True
-    ).limit(5).all()
+    keyword = keyword[:100]
+    use_fulltext = fulltext.is_enabled()
+
+    grouped = {doc_type: [] for doc_type in SEARCH_PAGE_LIMITS}
+    for doc in get_search_index().search(keyword, limits=_index_limits(SEARCH_PAGE_LIMITS, use_fulltext)):
+        grouped[doc.type].append(doc)
+    grouped['page'] = match_static_pages(keyword)[:SEARCH_PAGE_LIMITS['page']]
+
+    product_snippets, blog_snippets = {}, {}
+    if use_fulltext:
+        products = fulltext.search(Product, keyword, SEARCH_PAGE_LIMITS['product'],
+                                   options=(joinedload(Product.category),))
+        blogs = fulltext.search(Blog, keyword, SEARCH_PAGE_LIMITS['blog'])
+        product_snippets = fulltext.snippets(Product, [p.id for p in products], keyword)
+        blog_snippets = fulltext.snippets(Blog, [b.id for b in blogs], keyword)
+    else:
+        # Sản phẩm/bài viết render bằng card component nên cần ORM object (1 query mỗi loại)
+        products = _load_in_order(Product, grouped['product'], joinedload(Product.category))
+        blogs = _load_in_order(Blog, grouped['blog'])
 
     return render_template('public/search.html',
                            keyword=keyword,
                            products=products,
                            blogs=blogs,
-                           static_pages=static_pages)
+                           product_snippets=product_snippets,
+                           blog_snippets=blog_snippets,
+                           projects=grouped['project'],
+                           faqs=grouped['faq'],
+                           static_pages=grouped['page'])
+
+
+def _load_in_order(model, docs, *options):
+    """Load các object theo id của kết quả tìm kiếm, giữ nguyên thứ tự xếp hạng"""
+    if not docs:
+        return []
+    ids = [doc.id for doc in docs]
+    objects = {obj.id: obj for obj in model.query.options(*options).filter(
+        model.id.in_(ids), model.is_active == True).all()}
+    return [objects[obj_id] for obj_id in ids if obj_id in objects]
 
 
 @main_bp.route('/api/search-suggestions')
 def search_suggestions():
-    """API endpoint trả về gợi ý tìm kiếm cho autocomplete"""
+    """
+    API endpoint trả về gợi ý tìm kiếm cho autocomplete
+
+    Index trong RAM (không query DB) hoặc 1 query UNION ALL khi bật PostgreSQL full-text.
+    Response được cache theo prefix đã chuẩn hóa ('Gạch  Ốp' = 'gach op'), key gồm generation
+    của index/trang tĩnh nên sửa sản phẩm, bài viết... là có kết quả mới ngay.
+    """
     keyword = request.args.get('q', '').strip()
 
-    # Validate input
-    if not keyword or len(keyword) < 2:
-        return jsonify({'suggestions': []})
-
-    # Giới hạn keyword length để tránh abuse
-    if len(keyword) > 100:
-        return jsonify({'suggestions': []})
-
-    # Mapping trang tĩnh (giống như ở trên)
-    static_pages_map = {
-        'điều khoản': {
-            'title': 'Điều khoản dịch vụ',
-            'url': '/chinh-sach/dieu-khoan-dich-vu',
-            'icon': 'bi-file-earmark-text',
-            'type': 'page'
-        },
-        'dịch vụ': {
-            'title': 'Điều khoản dịch vụ',
-            'url': '/chinh-sach/dieu-khoan-dich-vu',
-            'icon': 'bi-file-earmark-text',
-            'type': 'page'
-        },
-        'chính sách': {
-            'title': 'Chính sách',
-            'url': '/chinh-sach',
-            'icon': 'bi-shield-check',
-            'type': 'page'
-        },
-        'policy': {
-            'title': 'Chính sách',
-            'url': '/chinh-sach',
-            'icon': 'bi-shield-check',
-            'type': 'page'
-        },
-        'vận chuyển': {
-            'title': 'Chính sách vận chuyển',
-            'url': '/chinh-sach/van-chuyen',
-            'icon': 'bi-truck',
-            'type': 'page'
-        },
-        'ship': {
-            'title': 'Chính sách vận chuyển',
-            'url': '/chinh-sach/van-chuyen',
-            'icon': 'bi-truck',
-            'type': 'page'
-        },
-        'giao hàng': {
-            'title': 'Chính sách vận chuyển',
-            'url': '/chinh-sach/van-chuyen',
-            'icon': 'bi-truck',
-            'type': 'page'
-        },
-        'đổi trả': {
-            'title': 'Chính sách đổi trả',
-            'url': '/chinh-sach/doi-tra',
-            'icon': 'bi-arrow-repeat',
-            'type': 'page'
-        },
-        'đổi': {
-            'title': 'Chính sách đổi trả',
-            'url': '/chinh-sach/doi-tra',
-            'icon': 'bi-arrow-repeat',
-            'type': 'page'
-        },
-        'trả': {
-            'title': 'Chính sách đổi trả',
-            'url': '/chinh-sach/doi-tra',
-            'icon': 'bi-arrow-repeat',
-            'type': 'page'
-        },
-        'hoàn trả': {
-            'title': 'Chính sách đổi trả',
-            'url': '/chinh-sach/doi-tra',
-            'icon': 'bi-arrow-repeat',
-            'type': 'page'
-        },
-        'bảo hành': {
-            'title': 'Chính sách bảo hành',
-            'url': '/chinh-sach/bao-hanh',
-            'icon': 'bi-shield-check',
-            'type': 'page'
-        },
-        'bảo': {
-            'title': 'Chính sách bảo hành',
-            'url': '/chinh-sach/bao-hanh',
-            'icon': 'bi-shield-check',
-            'type': 'page'
-        },
-        'hành': {
-            'title': 'Chính sách bảo hành',
-            'url': '/chinh-sach/bao-hanh',
-            'icon': 'bi-shield-check',
-            'type': 'page'
-        },
-        'bảo mật': {
-            'title': 'Chính sách bảo mật',
-            'url': '/chinh-sach/bao-mat',
-            'icon': 'bi-lock',
-            'type': 'page'
-        },
-        'mật': {
-            'title': 'Chính sách bảo mật',
-            'url': '/chinh-sach/bao-mat',
-            'icon': 'bi-lock',
-            'type': 'page'
-        },
-        'quyền riêng tư': {
-            'title': 'Chính sách bảo mật',
-            'url': '/chinh-sach/bao-mat',
-            'icon': 'bi-lock',
-            'type': 'page'
-        },
-        'privacy': {
-            'title': 'Chính sách bảo mật',
-            'url': '/chinh-sach/bao-mat',
-            'icon': 'bi-lock',
-            'type': 'page'
-        },
-        'giới thiệu': {
-            'title': 'Giới thiệu',
-            'url': '/gioi-thieu',
-            'icon': 'bi-info-circle',
-            'type': 'page'
-        },
-        'về chúng tôi': {
-            'title': 'Giới thiệu',
-            'url': '/gioi-thieu',
-            'icon': 'bi-info-circle',
-            'type': 'page'
-        },
-        'about': {
-            'title': 'Giới thiệu',
-            'url': '/gioi-thieu',
-            'icon': 'bi-info-circle',
-            'type': 'page'
-        },
-        'công ty': {
-            'title': 'Giới thiệu',
-            'url': '/gioi-thieu',
-            'icon': 'bi-info-circle',
-            'type': 'page'
-        },
-        'liên hệ': {
-            'title': 'Liên hệ',
-            'url': '/lien-he',
-            'icon': 'bi-envelope',
-            'type': 'page'
-        },
-        'contact': {
-            'title': 'Liên hệ',
-            'url': '/lien-he',
-            'icon': 'bi-envelope',
-            'type': 'page'
-        },
-        'hỏi đáp': {
-            'title': 'Câu hỏi thường gặp',
-            'url': '/hoi-dap',
-            'icon': 'bi-question-circle',
-            'type': 'page'
-        },
-        'faq': {
-            'title': 'Câu hỏi thường gặp',
-            'url': '/hoi-dap',
-            'icon': 'bi-question-circle',
-            'type': 'page'
-        },
-        'hỏi': {
-            'title': 'Câu hỏi thường gặp',
-            'url': '/hoi-dap',
-            'icon': 'bi-question-circle',
-            'type': 'page'
-        },
-        'câu hỏi': {
-            'title': 'Câu hỏi thường gặp',
-            'url': '/hoi-dap',
-            'icon': 'bi-question-circle',
-            'type': 'page'
-        },
-        'màu sắc': {
-            'title': 'Bảng màu',
-            'url': '/bang-mau',
-            'icon': 'bi-palette',
-            'type': 'page'
-        },
-        'màu': {
-            'title': 'Bảng màu',
-            'url': '/bang-mau',
-            'icon': 'bi-palette',
-            'type': 'page'
-        },
-        'bảng màu': {
-            'title': 'Bảng màu',
-            'url': '/bang-mau',
-            'icon': 'bi-palette',
-            'type': 'page'
-        },
-        'bảng': {
-            'title': 'Bảng màu',
-            'url': '/bang-mau',
-            'icon': 'bi-palette',
-            'type': 'page'
-        },
-        'color': {
-            'title': 'Bảng màu',
-            'url': '/bang-mau',
-            'icon': 'bi-palette',
-            'type': 'page'
-        },
-        'hướng dẫn': {
-            'title': 'Hướng dẫn thi công',
-            'url': '/huong-dan-thi-cong',
-            'icon': 'bi-tools',
-            'type': 'page'
-        },
-        'hướng': {
-            'title': 'Hướng dẫn thi công',
-            'url': '/huong-dan-thi-cong',
-            'icon': 'bi-tools',
-            'type': 'page'
-        },
-        'dẫn': {
-            'title': 'Hướng dẫn thi công',
-            'url': '/huong-dan-thi-cong',
-            'icon': 'bi-tools',
-            'type': 'page'
-        },
-        'thi công': {
-            'title': 'Hướng dẫn thi công',
-            'url': '/huong-dan-thi-cong',
-            'icon': 'bi-tools',
-            'type': 'page'
-        },
-        'lắp đặt': {
-            'title': 'Hướng dẫn thi công',
-            'url': '/huong-dan-thi-cong',
-            'icon': 'bi-tools',
-            'type': 'page'
-        },
-        'guide': {
-            'title': 'Hướng dẫn thi công',
-            'url': '/huong-dan-thi-cong',
-            'icon': 'bi-tools',
-            'type': 'page'
-        },
-    }
+    # Validate input (giới hạn keyword length để tránh abuse)
+    if len(keyword) < 2 or len(keyword) > 100:
+        return _suggestion_response(EMPTY_SUGGESTIONS)
+
+    normalized = ' '.join(tokenize(keyword))
+    if not normalized:
+        return _suggestion_response(EMPTY_SUGGESTIONS)
+
+    use_fulltext = fulltext.is_enabled()
+    index = get_search_index()
+    matcher = get_static_page_matcher()
+    cache = _get_suggestion_cache()
+    key = f'{normalized}|{index.generation}|{matcher.generation}|{int(use_fulltext)}'
+
+    cached = cache.get(key)
+    if cached is not None and time.time() - cached[1] < cached[2]:
+        return _suggestion_response(cached[0])
+
+    pages = matcher.match(normalized)[:SUGGESTION_LIMITS['page']]
+    hits = index.search(normalized, limits=_index_limits(SUGGESTION_LIMITS, use_fulltext))
+    suggestions = [doc.to_suggestion() for doc in pages + hits]
+    if use_fulltext:
+        suggestions += _fulltext_suggestions(normalized)
+
+    # Giữ thứ tự nhóm như cũ: trang tĩnh, sản phẩm, bài viết, dự án, FAQ
+    suggestions.sort(key=lambda item: SUGGESTION_ORDER.index(item['type']))
+
+    # Giới hạn 10 kết quả, cache sẵn body JSON
+    body = json.dumps({'suggestions': suggestions[:10]}, ensure_ascii=False, separators=(',', ':'))
+    cache.set(key, body, time.time(), current_app.config.get('SEARCH_SUGGESTION_CACHE_TTL', 60))
+    return _suggestion_response(body)
+
+
+def _get_suggestion_cache():
+    """LRU riêng cho gợi ý tìm kiếm (không dùng cache_manager: key ngắn hạn, nhiều, mỗi worker 1 bản)"""
+    cache = current_app.extensions.get('suggestion_cache')
+    if cache is None:
+        cache = MemoryBackend(max_entries=current_app.config.get('SEARCH_SUGGESTION_CACHE_SIZE', 512),
+                              max_bytes=SUGGESTION_CACHE_MAX_BYTES)
+        current_app.extensions['suggestion_cache'] = cache
+    return cache
+
+
+def _suggestion_response(body):
+    response = current_app.response_class(body, mimetype='application/json')
+    # Gợi ý giống nhau với mọi người dùng -> trình duyệt và CDN được cache
+    max_age = current_app.config.get('SEARCH_SUGGESTION_MAX_AGE', 60)
+    response.cache_control.public = True
+    response.cache_control.max_age = max_age
+    response.cache_control.stale_while_revalidate = max_age
+    return response
+
+
+def _fulltext_suggestions(keyword):
+    """
+    Gợi ý sản phẩm/bài viết từ PostgreSQL full-text: 1 query UNION ALL, mỗi nhánh tự
+    xếp hạng + LIMIT riêng và chỉ SELECT các cột cần hiển thị (không tạo ORM object)
+    """
+    branches = []
+    for model, doc_type, title, image in ((Product, 'product', Product.name, Product.image),
+                                          (Blog, 'blog', Blog.title, null())):
+        branch = select(literal(doc_type).label('type'), title.label('title'),
+                        model.slug.label('slug'), image.label('image')) \
+            .where(model.is_active == True)
+        branch = fulltext.apply_search(branch, model, keyword).limit(SUGGESTION_LIMITS[doc_type])
+        branches.append(branch)
 
     suggestions = []
-    keyword_lower = keyword.lower()
-
-    # Tìm trang tĩnh với fuzzy matching (tránh duplicate)
-    matched_pages = {}
-
-    # Tách keyword thành các từ riêng lẻ để tìm kiếm thông minh hơn
-    keyword_words = keyword_lower.split()
-
-    for key, page_info in static_pages_map.items():
-        # Match nếu:
-        # 1. Từ khóa chứa trong key (exact)
-        # 2. HOẶC bất kỳ từ nào trong keyword match với key
-        # 3. HOẶC key chứa trong từ khóa
-        match = False
-
-        if key in keyword_lower:
-            match = True
+    for row in db.session.execute(union_all(*branches)):
+        if row.type == 'product':
+            suggestions.append({'title': row.title, 'url': f'/san-pham/{row.slug}',
+                                'icon': 'bi-box-seam', 'type': 'product', 'image': row.image})
         else:
-            # Kiểm tra từng từ trong keyword
-            for word in keyword_words:
-                if word in key or key in word:
-                    match = True
-                    break
-
-        if match:
-            page_key = page_info['url']
-            if page_key not in matched_pages:
-                matched_pages[page_key] = page_info
-
-    suggestions.extend(list(matched_pages.values()))
-
-    # Tìm sản phẩm (top 5)
-    try:
-        products = Product.query.filter(
-            Product.name.ilike(f'%{keyword}%'),
-            Product.is_active == True
-        ).limit(5).all()
-
-        for product in products:
-            suggestions.append({
-                'title': product.name,
-                'url': f'/san-pham/{product.slug}',
-                'icon': 'bi-box-seam',
-                'type': 'product',
-                'image': product.image if hasattr(product, 'image') else None
-            })
-    except Exception as e:
-        current_app.logger.error(f"Error fetching products: {e}")
-
-    # Tìm blog (top 3)
-    try:
-        blogs = Blog.query.filter(
-            or_(
-                Blog.title.ilike(f'%{keyword}%'),
-                Blog.excerpt.ilike(f'%{keyword}%')
-            ),
-            Blog.is_active == True
-        ).limit(3).all()
-
-        for blog in blogs:
-            suggestions.append({
-                'title': blog.title,
-                'url': f'/tin-tuc/{blog.slug}',
-                'icon': 'bi-journal-text',
-                'type': 'blog'
-            })
-    except Exception as e:
-        current_app.logger.error(f"Error fetching blogs: {e}")
-
-    # Giới hạn 10 kết quả
-    return jsonify({'suggestions': suggestions[:10]})
+            suggestions.append({'title': row.title, 'url': f'/tin-tuc/{row.slug}',
+                                'icon': 'bi-journal-text', 'type': 'blog'})
+    return suggestions
 
 
 # Route cũ redirect sang mới
@@ -1,16 +1,217 @@
-from flask import render_template, request, redirect, url_for, flash
+from flask import render_template, request, redirect, url_for, flash, current_app
 from app.main import main_bp
 from app import db, cache_manager
-from app.models.product import Product, Category, get_cached_products
+from app.models.product import Product, Category
+from app.models.records import snapshot_products
 from app.models.settings import get_setting
+from sqlalchemy import func, tuple_
 from sqlalchemy.orm import joinedload
 from jinja2 import Template
 from datetime import datetime, timedelta
 from app.models.features import feature_required
+from app.view_counter import record_view
+from app.page_cache import cache_page
+from app.http_cache import mark_last_modified
+from app import fulltext
+from app.facets import get_facet_index
+from app.related import get_related_index
+
+PRODUCTS_PER_PAGE = 6
+RELATED_PRODUCTS_LIMIT = 4
+
+# sort -> (cột, giảm dần?). Luôn kèm id làm tie-breaker để thứ tự ổn định giữa các trang
+PRODUCT_SORTS = {
+    'latest': (Product.created_at, True),
+    'price_asc': (Product.price, False),
+    'price_desc': (Product.price, True),
+    'popular': (Product.views, True),
+}
+
+# Giá trị thay cho NULL khi sắp xếp/so sánh keyset (cột nullable: views, price...):
+# NULL không so sánh được trong (cột, id) < (...) và không encode được vào cursor
+SORT_NULL_VALUES = {
+    'latest': datetime(1970, 1, 1),
+    'price_asc': 0,
+    'price_desc': 0,
+    'popular': 0,
+}
+
+# Chuyển giá trị trong cursor keyset về kiểu của cột
+CURSOR_PARSERS = {
+    'latest': datetime.fromisoformat,
+    'price_asc': float,
+    'price_desc': float,
+    'popular': int,
+}
+
+
+class SimplePagination:
+    """Pagination theo trang (OFFSET), cùng interface với Flask-SQLAlchemy Pagination"""
+
+    def __init__(self, items, page, per_page, total):
+        self.items = items
+        self.page = page
+        self.per_page = per_page
+        self.total = total
+        self.pages = (total + per_page - 1) // per_page
+
+    @property
+    def has_prev(self):
+        return self.page > 1
+
+    @property
+    def has_next(self):
+        return self.page < self.pages
+
+    @property
+    def prev_num(self):
+        return self.page - 1 if self.has_prev else None
+
+    @property
+    def next_num(self):
+        return self.page + 1 if self.has_next else None
+
+    def iter_pages(self, left_edge=2, left_current=2, right_current=3, right_edge=2):
+        """Generate page numbers for pagination"""
+        last = 0
+        for num in range(1, self.pages + 1):
+            if (num <= left_edge or
+                (self.page - left_current <= num <= self.page + right_current) or
+                num > self.pages - right_edge):
+                if last + 1 != num:
+                    yield None
+                yield num
+                last = num
+
+
+class KeysetPagination:
+    """
+    Pagination keyset: chỉ có "trang sau" (next_cursor), không đếm tổng
+
+    pages = 0 để components/pagination.html không render số trang
+    """
+
+    def __init__(self, items, per_page, next_cursor):
+        self.items = items
+        self.per_page = per_page
+        self.next_cursor = next_cursor
+        self.page = 1
+        self.pages = 0
+        self.has_next = next_cursor is not None
+
+
+def _filtered_query(category_id, min_price, max_price, product_ids=None):
+    """product_ids: id khớp facet đang chọn (None = không lọc facet)"""
+    query = Product.query.options(joinedload(Product.category)).filter(Product.is_active == True)
+    if product_ids is not None:
+        query = query.filter(Product.id.in_(product_ids)) if product_ids else query.filter(db.false())
+    if category_id:
+        query = query.filter(Product.category_id == category_id)
+    if min_price is not None:
+        query = query.filter(Product.price >= min_price)
+    if max_price is not None:
+        query = query.filter(Product.price <= max_price)
+    return query
+
+
+def _sort_column(sort):
+    """(biểu thức sắp xếp, giảm dần?) - coalesce NULL về SORT_NULL_VALUES"""
+    column, descending = PRODUCT_SORTS[sort]
+    return func.coalesce(column, SORT_NULL_VALUES[sort]), descending
+
+
+def _encode_cursor(product, sort):
+    value = getattr(product, PRODUCT_SORTS[sort][0].key)
+    if value is None:
+        value = SORT_NULL_VALUES[sort]
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    return f'{value}_{product.id}'
+
+
+def _decode_cursor(cursor, sort):
+    """'<giá trị cột sort>_<id>' -> (value, id), cursor hỏng -> None (về trang đầu)"""
+    try:
+        value, product_id = cursor.rsplit('_', 1)
+        return CURSOR_PARSERS[sort](value), int(product_id)
+    except (AttributeError, ValueError):
+        return None
+
+
+def _order(query, sort):
+    column, descending = _sort_column(sort)
+    if descending:
+        return query.order_by(column.desc(), Product.id.desc())
+    return query.order_by(column.asc(), Product.id.asc())
+
+
+def _paginate(query, sort, page, after=None, keyset=False):
+    """
+    sort=None: giữ thứ tự sẵn có của query (độ liên quan full-text), luôn phân trang OFFSET
+
+    Keyset: WHERE (cột, id) < (giá trị, id) của sản phẩm cuối trang trước, đi thẳng theo
+    index thay vì bỏ qua OFFSET dòng. Giá trị NULL (views, price...) được xếp như
+    SORT_NULL_VALUES ở cả 2 chế độ nên cursor luôn encode/decode được.
+    """
+    per_page = PRODUCTS_PER_PAGE
+    if sort is None or not keyset:
+        page = max(page, 1)
+        if sort is not None:
+            query = _order(query, sort)
+        total = query.order_by(None).count()
+        items = query.offset((page - 1) * per_page).limit(per_page).all() if total else []
+        return SimplePagination(snapshot_products(items), page, per_page, total)
+
+    column, descending = _sort_column(sort)
+    position = _decode_cursor(after, sort) if after else None
+    if position is not None:
+        row = tuple_(column, Product.id)
+        query = query.filter(row < position if descending else row > position)
+
+    items = _order(query, sort).limit(per_page + 1).all()
+    next_cursor = _encode_cursor(items[per_page - 1], sort) if len(items) > per_page else None
+    return KeysetPagination(snapshot_products(items[:per_page]), per_page, next_cursor)
+
+
+def _facet_url(link_args, facet_params, param, value):
+    """URL danh sách sản phẩm sau khi bật/tắt 1 giá trị facet (về trang 1)"""
+    params = {name: list(values) for name, values in facet_params.items()}
+    values = params.setdefault(param, [])
+    if value in values:
+        values.remove(value)
+    else:
+        values.append(value)
+    return url_for('main.products', **link_args, **{name: sorted(v) for name, v in params.items() if v})
+
+
+def _cached_product_page(category_id, sort, min_price, max_price, page, after, keyset,
+                         selection=None, product_ids=None):
+    """
+    1 trang sản phẩm (ProductRecord), cache theo (danh mục, sort, khoảng giá, facet, trang)
+
+    Sản phẩm đổi thì models.product.invalidate_product_cache xóa products_page:<danh mục>:
+    và products_page:all:, danh mục khác giữ nguyên.
+    """
+    price_band = '-'.join('' if price is None else f'{price:g}' for price in (min_price, max_price))
+    if keyset:
+        position = f'after:{after}' if after and _decode_cursor(after, sort) else 'after:'
+    else:
+        position = f'page:{page}'
+    facet_part = ';'.join(f'{facet}={",".join(sorted(values))}' for facet, values in sorted((selection or {}).items()))
+    cache_key = f'products_page:{category_id or "all"}:{sort}:{price_band}:{facet_part}:{position}'
+
+    pagination = cache_manager.get(cache_key)
+    if pagination is None:
+        query = _filtered_query(category_id, min_price, max_price, product_ids)
+        pagination = _paginate(query, sort, page, after, keyset)
+        cache_manager.set(cache_key, pagination)
+    return pagination
+
 
 @main_bp.route('/san-pham')
 @main_bp.route('/loai-san-pham/<category_slug>')
 @feature_required('products')
+@cache_page('products')
 def products(category_slug=None):
     """Trang danh sách sản phẩm với cache thông minh"""
     page = request.args.get('page', 1, type=int)
@@ -34,11 +235,10 @@ def products(category_slug=None):
             flash('Danh mục không tồn tại.', 'warning')
             return redirect(url_for('main.products'))
 
-    # ========== LẤY PRODUCTS TỪ CACHE ==========
+    # ========== XÁC ĐỊNH CATEGORY ==========
     current_category = None
     category_id = None
 
-    # Xác định category nếu có
     if category_slug:
         current_category = Category.query.filter_by(
             slug=category_slug,
@@ -46,99 +246,98 @@ def products(category_slug=None):
         ).first_or_404()
         category_id = current_category.id
 
+    if sort not in PRODUCT_SORTS:
+        sort = 'latest'
+
+    # ========== LỌC + SẮP XẾP + PHÂN TRANG TRONG SQL ==========
+    # ?after=<cursor> hoặc PRODUCT_PAGINATION=keyset: phân trang keyset (không OFFSET/COUNT)
+    after = request.args.get('after')
+    keyset = after is not None or current_app.config.get('PRODUCT_PAGINATION') == 'keyset'
+    use_fulltext = bool(search) and fulltext.is_enabled()
+
+    # ========== FACET (technical_info) ==========
+    # Lọc facet bằng bitmap trong RAM -> danh sách id, giá/sort/phân trang vẫn làm trong SQL
+    facet_index = get_facet_index()
+    selection = facet_index.parse_selection(request.args)
+    facet_scope = facet_index.scope(category_id, min_price, max_price)
+    product_ids = facet_index.matching_ids(selection, facet_scope) if selection else None
+
     if search:
-        query = Product.query.options(joinedload(Product.category)).filter_by(is_active=True)
-        if category_id:
-            query = query.filter_by(category_id=category_id)
-        query = query.filter(Product.name.ilike(f'%{search}%'))
-        products_list = query.all()
+        # Kết quả tìm kiếm không cache (page cache đã cache theo query string)
+        # Full-text: giữ thứ tự theo độ liên quan, chỉ sắp lại khi người dùng chọn sort
+        by_relevance = use_fulltext and 'sort' not in request.args
+        query = _filtered_query(category_id, min_price, max_price, product_ids)
+        if use_fulltext:
+            query = fulltext.apply_search(query, Product, search, order=by_relevance)
+        else:
+            query = query.filter(Product.name.ilike(f'%{search}%'))
+        pagination = _paginate(query, None if by_relevance else sort, page, after, keyset)
     else:
-        products_list = get_cached_products(category_id=category_id, featured_only=False)
-
-    # ========== LỌC THEO GIÁ ==========
-    if min_price is not None or max_price is not None:
-        filtered_products = []
-        for p in products_list:
-            if p.price is None:
-                continue
-            if min_price is not None and p.price < min_price:
-                continue
-            if max_price is not None and p.price > max_price:
-                continue
-            filtered_products.append(p)
-        products_list = filtered_products
-
-    # ========== SẮP XẾP (TRONG MEMORY) ==========
-    if sort == 'latest':
-        products_list = sorted(products_list, key=lambda p: p.created_at, reverse=True)
-    elif sort == 'price_asc':
-        products_list = sorted(products_list, key=lambda p: p.price or 0)
-    elif sort == 'price_desc':
-        products_list = sorted(products_list, key=lambda p: p.price or 0, reverse=True)
-    elif sort == 'popular':
-        products_list = sorted(products_list, key=lambda p: p.views, reverse=True)
-
-    # ========== PHÂN TRANG THỦ CÔNG ==========
-    per_page = 6
-    total = len(products_list)
-    total_pages = (total + per_page - 1) // per_page  # Làm tròn lên
-
-    # Slice products cho trang hiện tại
-    start = (page - 1) * per_page
-    end = start + per_page
-    products = products_list[start:end]
-
-    # Tạo pagination object giả (để template không bị lỗi)
-    class SimplePagination:
-        def __init__(self, items, page, per_page, total):
-            self.items = items
-            self.page = page
-            self.per_page = per_page
-            self.total = total
-            self.pages = (total + per_page - 1) // per_page
-
-        @property
-        def has_prev(self):
-            return self.page > 1
-
-        @property
-        def has_next(self):
-            return self.page < self.pages
-
-        @property
-        def prev_num(self):
-            return self.page - 1 if self.has_prev else None
-
-        @property
-        def next_num(self):
-            return self.page + 1 if self.has_next else None
-
-        def iter_pages(self, left_edge=2, left_current=2, right_current=3, right_edge=2):
-            """Generate page numbers for pagination"""
-            last = 0
-            for num in range(1, self.pages + 1):
-                if (num <= left_edge or
-                    (self.page - left_current <= num <= self.page + right_current) or
-                    num > self.pages - right_edge):
-                    if last + 1 != num:
-                        yield None
-                    yield num
-                    last = num
-
-    pagination = SimplePagination(products, page, per_page, total)
+        pagination = _cached_product_page(category_id, sort, min_price, max_price, page, after, keyset,
+                                          selection, product_ids)
+
+    products = pagination.items
 
     # ✅ LẤY CATEGORIES TỪ CACHE (đã có sẵn trong context_processor)
     categories = Category.query.filter_by(is_active=True).all()
 
+    product_snippets = fulltext.snippets(Product, [p.id for p in products], search) if use_fulltext else {}
+
+    # Số lượng theo facet (chưa tính từ khóa tìm kiếm) + link bật/tắt từng giá trị
+    facet_params = facet_index.selection_params(selection)
+    link_args = {'category_slug': category_slug, 'search': search or None,
+                 'sort': sort if sort != 'latest' else None,
+                 'min_price': min_price, 'max_price': max_price}
+    facets = facet_index.counts(selection, facet_scope)
+    for facet in facets:
+        for value in facet['values']:
+            value['url'] = _facet_url(link_args, facet_params, facet['param'], value['slug'])
+
+    mark_last_modified(products)
     return render_template('public/san_pham/products.html',
                            products=products,
+                           product_snippets=product_snippets,
                            categories=categories,
                            pagination=pagination,
                            current_category=current_category,
                            current_search=search,
                            current_sort=sort,
                            min_price=min_price,
-                           max_price=max_price)
+                           max_price=max_price,
+                           facets=facets,
+                           facet_params=facet_params)
+
+
+def _related_products(product):
+    """
+    Sản phẩm liên quan theo độ tương đồng nội dung (app/related.py),
+    thiếu thì bổ sung sản phẩm cùng danh mục
+
+    Chỉ cache phần lấy từ bảng tương đồng (id liên quan, records): bảng đổi thì id khác -> query lại.
+    Sản phẩm bổ sung luôn query mới (không có trong referrers nên không được invalidate theo index).
+    """
+    related_ids = tuple(get_related_index('product').related(product.id, limit=RELATED_PRODUCTS_LIMIT))
+    cache_key = f'related_products_{product.id}'
+    cached = cache_manager.get(cache_key)
+    if cached is not None and cached[0] == related_ids:
+        related_products = cached[1]
+    else:
+        products = []
+        if related_ids:
+            found = {p.id: p for p in Product.query.options(joinedload(Product.category))
+                     .filter(Product.id.in_(related_ids), Product.is_active == True).all()}
+            products = [found[product_id] for product_id in related_ids if product_id in found]
+        related_products = snapshot_products(products)
+        cache_manager.set(cache_key, (related_ids, related_products))
+
+    if len(related_products) < RELATED_PRODUCTS_LIMIT:
+        fillers = Product.query.options(joinedload(Product.category)).filter(
+            Product.category_id == product.category_id,
+            Product.id.notin_([product.id] + [p.id for p in related_products]),
+            Product.is_active == True
+        ).limit(RELATED_PRODUCTS_LIMIT - len(related_products)).all()
+        related_products = list(related_products) + snapshot_products(fillers)
+    return related_products
 
 
 @main_bp.route('/san-pham/<slug>')
@@ -151,24 +350,10 @@ def product_detail(slug):
     product = Product.query.options(joinedload(Product.category)) \
         .filter_by(slug=slug, is_active=True).first_or_404()
 
-    # Tăng lượt xem
-    product.views += 1
-    db.session.commit()
-
-    # ✅ LẤY RELATED PRODUCTS TỪ CACHE
-    cache_key = f'related_products_{product.category_id}_{product.id}'
-    related_products = cache_manager.get(cache_key)
-
-    if related_products is None:
-        related_products = Product.query.options(joinedload(Product.category)) \
-            .filter(
-                Product.category_id == product.category_id,
-                Product.id != product.id,
-                Product.is_active == True
-            ).limit(4).all()
-        cache_manager.set(cache_key, related_products)
-    else:
-        pass
+    # Tăng lượt xem (gom lại, ghi xuống DB theo lô - app/view_counter.py)
+    record_view(product)
+
+    related_products = _related_products(product)
 
     # ========== RENDER META DESCRIPTION ĐỘNG ==========
     rendered_meta_description = None
@@ -191,6 +376,7 @@ def product_detail(slug):
     else:
         rendered_meta_description = f"Mua {product.name} chất lượng cao từ {get_setting('website_name')} với giá tốt nhất."
 
+    mark_last_modified(product)
     return render_template('public/san_pham/product_detail.html',
                            product=product,
                            related_products=related_products,
@@ -1,10 +1,11 @@
 from flask import render_template, request, redirect, url_for
 from app.main import main_bp
-from app import db
 from app.models.media import Project
 from app.project_config import PROJECT_TYPES
 from sqlalchemy.orm import load_only
 from app.models.features import feature_required
+from app.view_counter import record_view
+from app.http_cache import mark_last_modified
 
 @main_bp.route('/du-an')
 @feature_required('projects')
@@ -18,7 +19,7 @@ def projects():
         load_only(
             Project.id, Project.slug, Project.title, Project.image,
             Project.description, Project.location, Project.year,
-            Project.project_type, Project.is_featured
+            Project.project_type, Project.is_featured, Project.updated_at
         )
     )
              .filter_by(is_active=True)
@@ -36,6 +37,7 @@ def projects():
                          .filter_by(is_featured=True, is_active=True)
                          ).limit(6).all()
 
+    mark_last_modified(projects)
     return render_template('public/du_an/projects.html',
                            projects=projects,
                            featured_projects=featured_projects,
@@ -49,9 +51,8 @@ def project_detail(slug):
     """Trang chi tiết dự án"""
     project = Project.query.filter_by(slug=slug, is_active=True).first_or_404()
 
-    # Tăng lượt xem
-    project.view_count += 1
-    db.session.commit()
+    # Tăng lượt xem (gom lại, ghi xuống DB theo lô - app/view_counter.py)
+    record_view(project)
 
     # Dự án liên quan
     related = (Project.query
@@ -63,6 +64,7 @@ def project_detail(slug):
     )
     ).limit(2).all()
 
+    mark_last_modified(project)
     return render_template('public/du_an/project_detail.html',
                            project=project,
                            related=related)
\ No newline at end of file
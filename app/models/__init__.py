@@ -9,7 +9,7 @@ from app.models.media import Banner, Media, Project
 from app.models.job import Job
 from app.models.quiz import Quiz, Question, Answer, QuizAttempt, UserAnswer
 from app.models.contact import Contact
-from app.models.settings import Settings, get_setting, set_setting
+from app.models.settings import Settings, get_setting, set_setting, get_all_settings, clear_settings_cache
 from app.models.distributor import Distributor
 from app.models.popup import Popup
 from app.models.wizard import (
@@ -50,7 +50,7 @@ __all__ = [
     # Contact
     'Contact',
     # Settings
-    'Settings', 'get_setting', 'set_setting',
+    'Settings', 'get_setting', 'set_setting', 'get_all_settings', 'clear_settings_cache',
     # Distributor
     'Distributor',
     # Popup
@@ -1,5 +1,6 @@
 from app import db
 from datetime import datetime
+from sqlalchemy import event
 
 
 # ==================== BLOG MODEL ====================
@@ -131,7 +132,12 @@ class Blog(db.Model):
             return None
 
         from app.models.helpers import get_media_by_image_url
-        media = get_media_by_image_url(self.image)
+        return self.build_media_seo_info(get_media_by_image_url(self.image))
+
+    def build_media_seo_info(self, media):
+        """Tạo dict SEO ảnh từ Media record (đã query sẵn) hoặc fallback legacy fields"""
+        if not self.image:
+            return None
 
         if media:
             return {
@@ -161,4 +167,31 @@ class FAQ(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
     def __repr__(self):
-        return f'<FAQ {self.question[:50]}>'
\ No newline at end of file
+        return f'<FAQ {self.question[:50]}>'
+
+
+# ==================== AUTO CLEAR CACHE EVENTS ====================
+
+@event.listens_for(Blog, 'after_insert')
+@event.listens_for(Blog, 'after_update')
+@event.listens_for(Blog, 'after_delete')
+def clear_blog_cache(mapper, connection, target):
+    from app.page_cache import invalidate_page_cache, has_content_changes
+    from app.search_index import schedule_index_update
+    from app.related import schedule_related_update
+    from app.homepage import invalidate_homepage_cache
+    if has_content_changes(target):
+        invalidate_page_cache('blogs')
+        invalidate_homepage_cache()
+        schedule_index_update(target)
+        schedule_related_update(target)
+
+
+@event.listens_for(FAQ, 'after_insert')
+@event.listens_for(FAQ, 'after_update')
+@event.listens_for(FAQ, 'after_delete')
+def clear_faq_cache(mapper, connection, target):
+    from app.page_cache import invalidate_page_cache
+    from app.search_index import schedule_index_update
+    invalidate_page_cache('faqs')
+    schedule_index_update(target)
@@ -1,6 +1,7 @@
 """
 Helper functions cho models
 """
+from sqlalchemy import or_
 from app.models.media import Media
 
 
@@ -19,7 +20,7 @@ def get_media_by_image_url(image_url):
         return None
 
     # Case 1: URL Cloudinary đầy đủ - tìm theo filepath
-    if image_url.startswith('http://') or image_url.startswith('https://'):
+    if _is_remote_url(image_url):
         return Media.query.filter_by(filepath=image_url).first()
 
     # Case 2: Local path - tìm theo filename
@@ -33,6 +34,15 @@ def get_media_by_image_url(image_url):
         return media
 
     # Case 3: Nếu không tìm thấy, thử chuẩn hóa path và tìm lại
+    return Media.query.filter_by(filepath=_normalize_local_path(image_url)).first()
+
+
+def _is_remote_url(image_url):
+    return image_url.startswith('http://') or image_url.startswith('https://')
+
+
+def _normalize_local_path(image_url):
+    """uploads/products/a.jpg -> /static/uploads/products/a.jpg"""
     normalized_path = image_url
     if not normalized_path.startswith('/'):
         normalized_path = '/' + normalized_path
@@ -41,5 +51,46 @@ def get_media_by_image_url(image_url):
             normalized_path = '/static' + normalized_path
         else:
             normalized_path = '/static/' + normalized_path.lstrip('/')
+    return normalized_path
+
+
+def get_media_map_by_image_urls(image_urls):
+    """
+    Bản bulk của get_media_by_image_url - 1 query cho cả list ảnh
+
+    Cùng thứ tự ưu tiên: URL đầy đủ theo filepath, local theo filename rồi filepath chuẩn hóa.
 
-    return Media.query.filter_by(filepath=normalized_path).first()
\ No newline at end of file
+    Returns: dict {image_url: Media} (chỉ chứa các URL tìm thấy)
+    """
+    urls = {url for url in image_urls if url}
+    if not urls:
+        return {}
+
+    filepaths = set()
+    filenames = set()
+    for url in urls:
+        if _is_remote_url(url):
+            filepaths.add(url)
+        else:
+            filenames.add(url.split('/')[-1])
+            filepaths.add(_normalize_local_path(url))
+
+    candidates = Media.query.filter(
+        or_(Media.filepath.in_(filepaths), Media.filename.in_(filenames))
+    ).order_by(Media.id).all()
+
+    by_filepath = {}
+    by_filename = {}
+    for media in candidates:
+        by_filepath.setdefault(media.filepath, media)
+        by_filename.setdefault(media.filename, media)
+
+    result = {}
+    for url in urls:
+        if _is_remote_url(url):
+            media = by_filepath.get(url)
+        else:
+            media = by_filename.get(url.split('/')[-1]) or by_filepath.get(_normalize_local_path(url))
+        if media:
+            result[url] = media
+    return result
\ No newline at end of file
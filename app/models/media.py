@@ -1,5 +1,6 @@
 from app import db
 from datetime import datetime
+from sqlalchemy import event
 
 
 # ==================== BANNER MODEL ====================
@@ -27,19 +28,7 @@ class Banner(db.Model):
             return None
 
         from app.models.helpers import get_media_by_image_url
-        media = get_media_by_image_url(self.image)
-
-        if media:
-            return {
-                'alt_text': media.alt_text or self.title,
-                'title': media.title or self.title,
-                'caption': media.caption or self.subtitle
-            }
-        return {
-            'alt_text': self.title,
-            'title': self.title,
-            'caption': self.subtitle
-        }
+        return self.build_media_seo_info(get_media_by_image_url(self.image))
 
     def get_mobile_media_seo_info(self):
         """Lấy thông tin SEO cho ảnh Mobile"""
@@ -48,15 +37,37 @@ class Banner(db.Model):
 
         from app.models.helpers import get_media_by_image_url
         media = get_media_by_image_url(self.image_mobile)
+        if media:
+            return self.build_mobile_media_seo_info(media, None)
+        return self.get_media_seo_info()
+
+    def build_media_seo_info(self, media):
+        """Tạo dict SEO ảnh desktop từ Media record (đã query sẵn) hoặc fallback title/subtitle"""
+        if not self.image:
+            return None
 
         if media:
             return {
-                'alt_text': media.alt_text or f"{self.title} - Mobile",
+                'alt_text': media.alt_text or self.title,
                 'title': media.title or self.title,
                 'caption': media.caption or self.subtitle
             }
+        return {
+            'alt_text': self.title,
+            'title': self.title,
+            'caption': self.subtitle
+        }
 
-        return self.get_media_seo_info()
+    def build_mobile_media_seo_info(self, mobile_media, media):
+        """SEO ảnh mobile từ Media record của ảnh mobile, không có thì dùng của ảnh desktop"""
+        if not self.image_mobile or not mobile_media:
+            return self.build_media_seo_info(media)
+
+        return {
+            'alt_text': mobile_media.alt_text or f"{self.title} - Mobile",
+            'title': mobile_media.title or self.title,
+            'caption': mobile_media.caption or self.subtitle
+        }
 
 
 # ==================== MEDIA MODEL ====================
@@ -153,7 +164,12 @@ class Project(db.Model):
             return None
 
         from app.models.helpers import get_media_by_image_url
-        media = get_media_by_image_url(self.image)
+        return self.build_media_seo_info(get_media_by_image_url(self.image))
+
+    def build_media_seo_info(self, media):
+        """Tạo dict SEO ảnh từ Media record (đã query sẵn) hoặc fallback thông tin Project"""
+        if not self.image:
+            return None
 
         if media:
             return {
@@ -167,4 +183,44 @@ class Project(db.Model):
             'alt_text': f"Dự án {self.title}" + (f" - {self.location}" if self.location else ""),
             'title': f"{self.title} ({self.year})" if self.year else self.title,
             'caption': self.description or f"Dự án {self.project_type} tại {self.location}"
-        }
\ No newline at end of file
+        }
+
+
+# ==================== AUTO CLEAR CACHE EVENTS ====================
+
+@event.listens_for(Banner, 'after_insert')
+@event.listens_for(Banner, 'after_update')
+@event.listens_for(Banner, 'after_delete')
+def clear_banner_cache(mapper, connection, target):
+    from app.page_cache import invalidate_page_cache
+    from app.homepage import invalidate_homepage_cache
+    invalidate_page_cache('banners')
+    invalidate_homepage_cache()
+
+
+@event.listens_for(Media, 'after_insert')
+@event.listens_for(Media, 'after_update')
+@event.listens_for(Media, 'after_delete')
+def clear_media_cache(mapper, connection, target):
+    from app import cache_manager
+    from app.page_cache import invalidate_page_cache
+    from app.homepage import invalidate_homepage_cache
+    # Trang chủ + ProductRecord đã cache kèm SEO ảnh (alt/title/caption) từ Media Library:
+    # products_all/_featured/_cat_*, products_page:*, related_products_*, admin_products_all
+    invalidate_homepage_cache()
+    cache_manager.clear('products')
+    # Ảnh có thể nằm trên bất kỳ trang nào đã cache
+    invalidate_page_cache()
+
+
+@event.listens_for(Project, 'after_insert')
+@event.listens_for(Project, 'after_update')
+@event.listens_for(Project, 'after_delete')
+def clear_project_cache(mapper, connection, target):
+    from app.page_cache import invalidate_page_cache, has_content_changes
+    from app.search_index import schedule_index_update
+    from app.homepage import invalidate_homepage_cache
+    if has_content_changes(target):
+        invalidate_page_cache('projects')
+        invalidate_homepage_cache()
+        schedule_index_update(target)
@@ -3,6 +3,7 @@ Model Popup/Banner khuyến mãi
 """
 from app import db
 from datetime import datetime
+from sqlalchemy import event
 
 
 class Popup(db.Model):
@@ -96,4 +97,43 @@ class Popup(db.Model):
                 db.or_(Popup.end_date == None, Popup.end_date >= now)
             ).order_by(Popup.created_at.desc()).first()
 
-        return popup
\ No newline at end of file
+        return popup
+
+    @staticmethod
+    def get_cached_active_popup(page='all'):
+        """
+        Bản cache của get_active_popup (chạy ở before_request của mọi trang public)
+
+        Cache list PopupRecord đang bật + chưa hết hạn, chọn theo trang/thời gian trong RAM.
+        """
+        from app import cache_manager
+        from app.models.records import PopupRecord
+        popups = cache_manager.get(ACTIVE_POPUPS_CACHE_KEY)
+        now = datetime.utcnow()
+        if popups is None:
+            popups = [PopupRecord.from_model(p) for p in Popup.query.filter(
+                Popup.is_active == True,
+                db.or_(Popup.end_date == None, Popup.end_date >= now)
+            ).order_by(Popup.created_at.desc()).all()]
+            cache_manager.set(ACTIVE_POPUPS_CACHE_KEY, popups)
+
+        live = [p for p in popups if p.is_live(now)]
+        return (next((p for p in live if p.display_pages == page), None)
+                or next((p for p in live if p.display_pages == 'all'), None))
+
+
+ACTIVE_POPUPS_CACHE_KEY = 'popups_active'
+
+
+# ==================== AUTO CLEAR CACHE EVENTS ====================
+
+@event.listens_for(Popup, 'after_insert')
+@event.listens_for(Popup, 'after_update')
+@event.listens_for(Popup, 'after_delete')
+def clear_popup_cache(mapper, connection, target):
+    """Popup có thể hiển thị ở mọi trang - bỏ qua khi chỉ tăng view/click"""
+    from app.page_cache import invalidate_page_cache, has_content_changes
+    from app import cache_manager
+    if has_content_changes(target):
+        cache_manager.delete(ACTIVE_POPUPS_CACHE_KEY)
+        invalidate_page_cache()
@@ -2,7 +2,7 @@
 
 from app import db
 from datetime import datetime
-from sqlalchemy import event
+from sqlalchemy import event, inspect
 
 
 # ==================== CATEGORY MODEL ====================
@@ -28,6 +28,12 @@ class Category(db.Model):
 class Product(db.Model):
     """Model sản phẩm - JSON động"""
     __tablename__ = 'products'
+    # Index cho trang /san-pham: lọc theo danh mục + mới nhất, sắp theo giá, phổ biến
+    __table_args__ = (
+        db.Index('ix_products_active_category_created', 'is_active', 'category_id', 'created_at'),
+        db.Index('ix_products_price', 'price'),
+        db.Index('ix_products_views', 'views'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(200), nullable=False)
@@ -37,10 +43,11 @@ class Product(db.Model):
     old_price = db.Column(db.Float)
     image = db.Column(db.String(255))
     images = db.Column(db.Text)
-    is_featured = db.Column(db.Boolean, default=False)
+    # active_history: listener cần giá trị cũ để xóa đúng cache (invalidate_product_cache)
+    is_featured = db.column_property(db.Column(db.Boolean, default=False), active_history=True)
     is_active = db.Column(db.Boolean, default=True)
     views = db.Column(db.Integer, default=0)
-    category_id = db.Column(db.Integer, db.ForeignKey('categories.id'))
+    category_id = db.column_property(db.Column(db.Integer, db.ForeignKey('categories.id')), active_history=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
@@ -71,7 +78,12 @@ class Product(db.Model):
             return None
 
         from app.models.helpers import get_media_by_image_url
-        media = get_media_by_image_url(self.image)
+        return self.build_media_seo_info(get_media_by_image_url(self.image))
+
+    def build_media_seo_info(self, media):
+        """Tạo dict SEO ảnh từ Media record (đã query sẵn) hoặc fallback field legacy"""
+        if not self.image:
+            return None
 
         if media:
             return {
@@ -104,35 +116,94 @@ class Product(db.Model):
 @event.listens_for(Category, 'after_delete')
 def clear_category_cache(mapper, connection, target):
     from app import cache_manager
+    from app.page_cache import invalidate_page_cache
+    from app.homepage import invalidate_homepage_cache
     cache_manager.clear('categories')
     cache_manager.clear('products')
+    invalidate_homepage_cache()
+    # Danh mục hiển thị ở menu/footer của mọi trang
+    invalidate_page_cache()
 
 
 @event.listens_for(Product, 'after_insert')
 @event.listens_for(Product, 'after_update')
 @event.listens_for(Product, 'after_delete')
 def clear_product_cache(mapper, connection, target):
+    from app.page_cache import invalidate_page_cache, has_content_changes
+    from app.search_index import schedule_index_update
+    from app.facets import schedule_facet_update
+    from app.related import schedule_related_update
+    # Chỉ đổi bộ đếm (views...) thì không xóa gì: danh sách/chi tiết vẫn đúng
+    # (sort 'popular' cập nhật theo TTL của cache)
+    if not has_content_changes(target):
+        return
+    invalidate_product_cache(target)
+    invalidate_page_cache('products')
+    schedule_index_update(target)
+    schedule_facet_update(target)
+    schedule_related_update(target)
+
+
+def _history_values(target, column):
+    """Giá trị hiện tại + giá trị cũ (nếu vừa đổi) của 1 cột"""
+    history = inspect(target).attrs[column].history
+    return {getattr(target, column), *(history.deleted or ())}
+
+
+def invalidate_product_cache(target):
+    """
+    Xóa đúng các key cache bị ảnh hưởng bởi 1 sản phẩm thay vì clear('products')
+
+    - products_all, danh sách theo danh mục hiện tại + danh mục cũ (nếu vừa chuyển danh mục)
+    - products_featured + dữ liệu trang chủ nếu sản phẩm đang/vừa là nổi bật
+    - Trang danh sách đã cache (products_page:<danh mục>:..., products_page:all:...)
+    - Sản phẩm liên quan: của chính nó + của các sản phẩm đang hiển thị nó (related_products_<id>)
+    - Danh sách trong admin
+    """
     from app import cache_manager
-    cache_manager.clear('products')
+    from app.homepage import invalidate_homepage_cache
+    category_ids = {category_id for category_id in _history_values(target, 'category_id') if category_id}
+
+    cache_manager.delete('products_all')
+    cache_manager.delete('admin_products_all')
+    if any(_history_values(target, 'is_featured')):
+        cache_manager.delete('products_featured')
+        invalidate_homepage_cache()
+
+    cache_manager.clear('products_page:all:')
+    for category_id in category_ids:
+        cache_manager.delete(f'products_cat_{category_id}')
+        cache_manager.clear(f'products_page:{category_id}:')
+
+    from app.related import related_indexes
+    index = related_indexes['product']
+    if index.ready:
+        for product_id in [target.id, *index.referrers(target.id)]:
+            cache_manager.delete(f'related_products_{product_id}')
+    else:
+        cache_manager.clear('related_products_')
 
 
 # ==================== HELPER FUNCTIONS ====================
 
 def get_cached_categories():
-    """Lấy categories từ cache hoặc DB"""
+    """Lấy categories từ cache hoặc DB (cache CategoryRecord, không cache ORM object)"""
     from app import cache_manager
+    from app.models.records import snapshot_categories
     cached = cache_manager.get('categories_active')
     if cached is not None:
         return cached
 
-    categories = Category.query.filter_by(is_active=True).all()
+    categories = snapshot_categories(Category.query.filter_by(is_active=True).all())
     cache_manager.set('categories_active', categories)
     return categories
 
 
 def get_cached_products(category_id=None, featured_only=False):
-    """Lấy products từ cache hoặc DB"""
+    """Lấy products từ cache hoặc DB (cache ProductRecord, không cache ORM object)"""
     from app import cache_manager
+    from app.models.records import snapshot_products
+    from sqlalchemy.orm import joinedload
 
     if featured_only:
         cache_key = 'products_featured'
@@ -145,12 +216,12 @@ def get_cached_products(category_id=None, featured_only=False):
     if cached is not None:
         return cached
 
-    query = Product.query.filter_by(is_active=True)
+    query = Product.query.options(joinedload(Product.category)).filter_by(is_active=True)
     if featured_only:
         query = query.filter_by(is_featured=True)
     if category_id:
         query = query.filter_by(category_id=category_id)
 
-    products = query.all()
+    products = snapshot_products(query.all())
     cache_manager.set(cache_key, products)
-    return products
\ No newline at end of file
+    return products
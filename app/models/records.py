@@ -0,0 +1,237 @@
+"""
+Snapshot (record) nhẹ của các model để lưu vào cache_manager
+
+ORM instance lưu trong cache sẽ bị detached sau db.session.remove() ở teardown,
+truy cập lazy attribute (product.category, wizard.steps) sẽ lỗi DetachedInstanceError
+hoặc query lại DB. Các record ở đây:
+- Chỉ chứa dữ liệu thuần (đã load sẵn quan hệ cần dùng)
+- Immutable, dùng __slots__ nên nhẹ hơn nhiều so với ORM object
+- Giữ nguyên tên thuộc tính/method mà templates đang dùng
+"""
+import json
+
+
+class FrozenRecord:
+    """Base class cho record read-only"""
+    __slots__ = ()
+
+    def __init__(self, **fields):
+        for name in self.__slots__:
+            object.__setattr__(self, name, fields.get(name))
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f'{type(self).__name__} là read-only')
+
+    def __delattr__(self, name):
+        raise AttributeError(f'{type(self).__name__} là read-only')
+
+    # Hỗ trợ pickle (cache backend dùng chung giữa các worker)
+    def __getstate__(self):
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def __setstate__(self, state):
+        for name, value in zip(self.__slots__, state):
+            object.__setattr__(self, name, value)
+
+    def __repr__(self):
+        return f'<{type(self).__name__} {getattr(self, "id", "")}>'
+
+    @classmethod
+    def from_model(cls, obj, **extra):
+        """Copy các cột cùng tên từ ORM instance, `extra` ghi đè/bổ sung"""
+        fields = {name: getattr(obj, name, None) for name in cls.__slots__ if name not in extra}
+        fields.update(extra)
+        return cls(**fields)
+
+
+# ==================== PRODUCT / CATEGORY ====================
+class CategoryRecord(FrozenRecord):
+    __slots__ = ('id', 'name', 'slug', 'description', 'image', 'is_active', 'created_at')
+
+
+class ProductRecord(FrozenRecord):
+    __slots__ = (
+        'id', 'name', 'slug', 'description', 'price', 'old_price', 'image', 'images',
+        'is_featured', 'is_active', 'views', 'category_id', 'created_at', 'updated_at',
+        'image_alt_text', 'image_title', 'image_caption', 'technical_info',
+        'category', 'media_seo'
+    )
+
+    def get_media_seo_info(self):
+        """Thông tin SEO ảnh (đã resolve sẵn lúc tạo snapshot)"""
+        return self.media_seo
+
+    def get_images_list(self):
+        """Lấy danh sách ảnh từ JSON"""
+        if not self.images:
+            return []
+        try:
+            return json.loads(self.images)
+        except (TypeError, ValueError):
+            return []
+
+
+def snapshot_category(category):
+    return CategoryRecord.from_model(category) if category is not None else None
+
+
+def snapshot_categories(categories):
+    return [snapshot_category(c) for c in categories]
+
+
+def snapshot_products(products, with_media=True, media_map=None):
+    """
+    Chuyển list Product -> list ProductRecord
+
+    Nên query products với joinedload(Product.category) để tránh N+1.
+    with_media=True: resolve SEO ảnh từ Media Library bằng 1 query cho cả list
+    (hoặc dùng media_map {url: Media} đã query sẵn).
+    """
+    if media_map is None:
+        media_map = {}
+        if with_media:
+            from app.models.helpers import get_media_map_by_image_urls
+            media_map = get_media_map_by_image_urls(p.image for p in products)
+
+    category_records = {}
+    records = []
+    for p in products:
+        category = p.category
+        if category is not None and category.id not in category_records:
+            category_records[category.id] = snapshot_category(category)
+
+        records.append(ProductRecord.from_model(
+            p,
+            technical_info=dict(p.technical_info) if p.technical_info else p.technical_info,
+            category=category_records.get(category.id) if category is not None else None,
+            media_seo=p.build_media_seo_info(media_map.get(p.image)) if with_media else None
+        ))
+    return records
+
+
+# ==================== TRANG CHỦ: BANNER / BLOG / PROJECT ====================
+class BannerRecord(FrozenRecord):
+    __slots__ = ('id', 'title', 'subtitle', 'image', 'image_mobile', 'link', 'button_text',
+                 'order', 'media_seo', 'mobile_media_seo')
+
+    def get_media_seo_info(self):
+        return self.media_seo
+
+    def get_mobile_media_seo_info(self):
+        return self.mobile_media_seo
+
+
+class BlogRecord(FrozenRecord):
+    """
+    Blog cho card (components/card_blog.html)
+
+    content chỉ giữ đoạn đầu đã bỏ HTML (card dùng khi bài không có excerpt).
+    """
+    __slots__ = ('id', 'title', 'slug', 'excerpt', 'content', 'image', 'views',
+                 'created_at', 'updated_at', 'media_seo')
+
+    def get_media_seo_info(self):
+        return self.media_seo
+
+
+class ProjectRecord(FrozenRecord):
+    __slots__ = ('id', 'title', 'slug', 'client', 'location', 'year', 'description', 'image',
+                 'project_type', 'area', 'is_featured', 'created_at', 'media_seo')
+
+    def get_media_seo_info(self):
+        return self.media_seo
+
+
+# Đủ cho đoạn trích 120 ký tự của card blog
+BLOG_CARD_CONTENT_LENGTH = 300
+
+
+def _media_map(*image_lists):
+    from app.models.helpers import get_media_map_by_image_urls
+    return get_media_map_by_image_urls(url for images in image_lists for url in images)
+
+
+def snapshot_banners(banners, media_map=None):
+    """media_map: {url: Media} đã query sẵn (None = tự query 1 lần cho cả list)"""
+    if media_map is None:
+        media_map = _media_map([b.image for b in banners], [b.image_mobile for b in banners])
+    return [BannerRecord.from_model(
+        b,
+        media_seo=b.build_media_seo_info(media_map.get(b.image)),
+        mobile_media_seo=b.build_mobile_media_seo_info(media_map.get(b.image_mobile), media_map.get(b.image))
+    ) for b in banners]
+
+
+def snapshot_blogs(blogs, media_map=None):
+    from app.search_index import strip_html
+    if media_map is None:
+        media_map = _media_map([b.image for b in blogs])
+    return [BlogRecord.from_model(
+        b,
+        content=None if b.excerpt else strip_html(b.content)[:BLOG_CARD_CONTENT_LENGTH],
+        media_seo=b.build_media_seo_info(media_map.get(b.image))
+    ) for b in blogs]
+
+
+def snapshot_projects(projects, media_map=None):
+    if media_map is None:
+        media_map = _media_map([p.image for p in projects])
+    return [ProjectRecord.from_model(p, media_seo=p.build_media_seo_info(media_map.get(p.image)))
+            for p in projects]
+
+
+# ==================== POPUP ====================
+class PopupRecord(FrozenRecord):
+    __slots__ = ('id', 'image', 'link', 'display_pages', 'frequency', 'delay_seconds',
+                 'start_date', 'end_date', 'created_at', 'updated_at')
+
+    def is_live(self, now):
+        return ((self.start_date is None or self.start_date <= now)
+                and (self.end_date is None or self.end_date >= now))
+
+
+# ==================== WIZARD ====================
+class WizardOptionRecord(FrozenRecord):
+    __slots__ = ('id', 'step_id', 'option_text', 'description', 'icon_class', 'emoji', 'tags', 'order')
+
+
+class WizardStepRecord(FrozenRecord):
+    __slots__ = ('id', 'wizard_id', 'step_number', 'question_text', 'description',
+                 'step_type', 'is_required', 'options')
+
+    @property
+    def total_options(self):
+        return len(self.options)
+
+
+class WizardRecord(FrozenRecord):
+    __slots__ = ('id', 'name', 'slug', 'description', 'icon', 'is_active', 'is_default',
+                 'created_at', 'updated_at', 'steps')
+
+    @property
+    def total_steps(self):
+        return len(self.steps or ())
+
+
+def snapshot_wizard(wizard, steps=None, options=None):
+    """
+    Chuyển Wizard -> WizardRecord
+
+    steps/options: list WizardStep/WizardOption đã query sẵn (None = chỉ snapshot wizard)
+    """
+    if wizard is None:
+        return None
+
+    options_by_step = {}
+    for option in options or []:
+        options_by_step.setdefault(option.step_id, []).append(
+            WizardOptionRecord.from_model(option, tags=list(option.tags) if option.tags else option.tags)
+        )
+
+    step_records = None
+    if steps is not None:
+        step_records = tuple(
+            WizardStepRecord.from_model(step, options=tuple(options_by_step.get(step.id, ())))
+            for step in steps
+        )
+    return WizardRecord.from_model(wizard, steps=step_records)
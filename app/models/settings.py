@@ -1,5 +1,8 @@
 from app import db
 from datetime import datetime
+from sqlalchemy import event
+import threading
+import time
 
 
 # ==================== SETTINGS MODEL ====================
@@ -18,11 +21,101 @@ class Settings(db.Model):
         return f'<Settings {self.key}: {self.value}>'
 
 
+# ==================== SETTINGS CACHE (IN-PROCESS) ====================
+# Toàn bộ bảng settings được load 1 lần (1 query) vào dict trong RAM.
+# get_setting() đọc từ dict này, set_setting() và các event bên dưới sẽ xóa cache
+# để lần gọi kế tiếp load lại.
+# Khi cache_manager dùng backend chung (sqlite/redis), version 'settings' được tăng
+# mỗi lần xóa để các worker khác cũng load lại (kiểm tra tối đa 1 lần/giây).
+SETTINGS_VERSION_CHECK_INTERVAL = 1.0
+
+_settings_cache = None
+_settings_generation = 0
+_settings_version = 0
+_settings_checked_at = 0.0
+_settings_lock = threading.Lock()
+
+
+def _sync_shared_version():
+    """Worker khác đã thay đổi settings (backend dùng chung) thì bỏ cache local"""
+    global _settings_checked_at
+    from app import cache_manager
+    if not cache_manager.is_shared:
+        return
+
+    now = time.monotonic()
+    if now - _settings_checked_at < SETTINGS_VERSION_CHECK_INTERVAL:
+        return
+    _settings_checked_at = now
+
+    if cache_manager.get_version('settings') != _settings_version:
+        _reset_local_settings_cache()
+
+
+def _load_settings_cache():
+    """Load toàn bộ settings bằng 1 query (chỉ lấy key, value)"""
+    global _settings_cache, _settings_version
+    from app import cache_manager
+
+    _sync_shared_version()
+    cache = _settings_cache
+    if cache is not None:
+        return cache
+
+    with _settings_lock:
+        if _settings_cache is not None:
+            return _settings_cache
+        generation = _settings_generation
+
+    version = cache_manager.get_version('settings') if cache_manager.is_shared else 0
+    rows = db.session.query(Settings.key, Settings.value).all()
+    cache = {key: value for key, value in rows}
+
+    with _settings_lock:
+        # Nếu trong lúc query có invalidate thì không ghi đè bằng dữ liệu cũ
+        if generation == _settings_generation:
+            _settings_cache = cache
+            _settings_version = version
+    return cache
+
+
+def _reset_local_settings_cache():
+    global _settings_cache, _settings_generation
+    with _settings_lock:
+        _settings_cache = None
+        _settings_generation += 1
+
+    # cache_time có thể đã thay đổi
+    from app import cache_manager
+    cache_manager.reset_ttl()
+
+
+def clear_settings_cache():
+    """Xóa cache settings (mọi worker), lần gọi get_setting() kế tiếp sẽ load lại từ DB"""
+    from app import cache_manager
+    from app.page_cache import invalidate_page_cache
+    _reset_local_settings_cache()
+    cache_manager.bump_version('settings')
+    # Settings (tên web, logo, hotline, feature flags...) dùng ở mọi trang
+    invalidate_page_cache()
+
+
+def get_all_settings():
+    """Lấy toàn bộ settings dạng dict {key: value} (từ cache)"""
+    return dict(_load_settings_cache())
+
+
+@event.listens_for(Settings, 'after_insert')
+@event.listens_for(Settings, 'after_update')
+@event.listens_for(Settings, 'after_delete')
+def invalidate_settings_cache(mapper, connection, target):
+    clear_settings_cache()
+
+
 # ==================== HELPER FUNCTIONS ====================
 def get_setting(key, default=None):
-    """Lấy giá trị setting từ DB"""
-    setting = Settings.query.filter_by(key=key).first()
-    return setting.value if setting else default
+    """Lấy giá trị setting (từ cache trong RAM, load cả bảng ở lần đầu)"""
+    return _load_settings_cache().get(key, default)
 
 
 def set_setting(key, value, group='general', description=''):
@@ -55,4 +148,7 @@ def set_setting(key, value, group='general', description=''):
 
     # BƯỚC 4: COMMIT
     db.session.commit()
+
+    # BƯỚC 5: XÓA CACHE (sau commit để không load lại dữ liệu chưa commit)
+    clear_settings_cache()
     return setting
\ No newline at end of file
@@ -127,7 +127,9 @@ class WizardResult(db.Model):
 @event.listens_for(Wizard, 'after_delete')
 def clear_wizard_cache(mapper, connection, target):
     from app import cache_manager
+    from app.page_cache import invalidate_page_cache
     cache_manager.clear('wizards')
+    invalidate_page_cache('wizards')
 
 
 @event.listens_for(WizardStep, 'after_insert')
@@ -155,11 +157,12 @@ def clear_wizard_option_cache(mapper, connection, target):
 def get_active_wizards():
     """Lấy tất cả wizards đang active"""
     from app import cache_manager
+    from app.models.records import snapshot_wizard
     cached = cache_manager.get('wizards_active')
     if cached is not None:
         return cached
 
-    wizards = Wizard.query.filter_by(is_active=True).all()
+    wizards = [snapshot_wizard(w) for w in Wizard.query.filter_by(is_active=True).all()]
     cache_manager.set('wizards_active', wizards)
     return wizards
 
@@ -167,18 +170,20 @@ def get_active_wizards():
 def get_default_wizard():
     """Lấy wizard mặc định"""
     from app import cache_manager
+    from app.models.records import snapshot_wizard
     cached = cache_manager.get('wizard_default')
     if cached is not None:
         return cached
 
-    wizard = Wizard.query.filter_by(is_active=True, is_default=True).first()
+    wizard = snapshot_wizard(Wizard.query.filter_by(is_active=True, is_default=True).first())
     cache_manager.set('wizard_default', wizard)
     return wizard
 
 
 def get_wizard_with_steps(wizard_id):
-    """Lấy wizard kèm theo tất cả steps và options"""
+    """Lấy wizard kèm theo tất cả steps và options (3 query, cache WizardRecord)"""
     from app import cache_manager
+    from app.models.records import snapshot_wizard
     cache_key = f'wizard_full_{wizard_id}'
     cached = cache_manager.get(cache_key)
     if cached is not None:
@@ -186,9 +191,12 @@ def get_wizard_with_steps(wizard_id):
 
     wizard = Wizard.query.get(wizard_id)
     if wizard:
-        # Force load relationships
-        _ = wizard.steps.all()
-        for step in wizard.steps:
-            _ = step.options.all()
+        steps = WizardStep.query.filter_by(wizard_id=wizard.id) \
+            .order_by(WizardStep.step_number).all()
+        options = []
+        if steps:
+            options = WizardOption.query.filter(WizardOption.step_id.in_([s.id for s in steps])) \
+                .order_by(WizardOption.order).all()
+        wizard = snapshot_wizard(wizard, steps, options)
         cache_manager.set(cache_key, wizard)
-    return wizard
\ No newline at end of file
+    return wizard
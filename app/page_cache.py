@@ -0,0 +1,155 @@
+"""
+Full-page cache cho các trang public (khách chưa đăng nhập)
+
+- Bật/tắt bằng config PAGE_CACHE_ENABLED, TTL bằng PAGE_CACHE_TTL
+- Route nào muốn cache thì gắn @cache_page('tag1', 'tag2', ...)
+- Key = path + query string + feature flags đang bật + popup đang hiển thị (g.popup)
+- Lưu sẵn body gốc + bản gzip, client nhận gzip thì trả luôn, không nén lại mỗi request
+- Lưu kèm ETag/Last-Modified để app.http_cache trả 304 cho conditional GET
+- Invalidation theo tag: các event listener của model gọi invalidate_page_cache('products', ...)
+  Không truyền tag = xóa toàn bộ page cache (settings, categories, popup... dùng ở mọi trang)
+
+Usage:
+    @main_bp.route('/san-pham')
+    @feature_required('products')
+    @cache_page('products')
+    def products():
+        ...
+"""
+import gzip
+import hashlib
+from functools import wraps
+from urllib.parse import urlencode
+
+from flask import current_app, g, request, session, make_response
+from flask_login import current_user
+from sqlalchemy import inspect
+
+from app.http_cache import compute_etag
+
+PAGE_CACHE_PREFIX = 'page:'
+
+# Các cột chỉ là bộ đếm - thay đổi không làm nội dung trang khác đi
+COUNTER_COLUMNS = ('views', 'view_count', 'click_count', 'updated_at')
+
+
+def make_page_cache_key(tags=()):
+    """page:#tag1#tag2#:/path:<hash(query + features + popup)>"""
+    from app.models.features import get_enabled_features
+
+    popup = getattr(g, 'popup', None)
+    variant = '|'.join([
+        urlencode(sorted(request.args.items(multi=True))),
+        ','.join(get_enabled_features()),
+        f"{popup.id}@{popup.updated_at}" if popup is not None else '-'
+    ])
+    digest = hashlib.sha1(variant.encode('utf-8')).hexdigest()[:16]
+    tag_part = '#' + '#'.join(tags) + '#' if tags else '#'
+    return f'{PAGE_CACHE_PREFIX}{tag_part}:{request.path}:{digest}'
+
+
+def _is_cacheable_request():
+    if not current_app.config.get('PAGE_CACHE_ENABLED', True):
+        return False
+    if request.method not in ('GET', 'HEAD'):
+        return False
+    # Trang có flash message hoặc admin đang đăng nhập thì render riêng
+    if '_flashes' in session or current_user.is_authenticated:
+        return False
+    return True
+
+
+def _is_cacheable_response(response):
+    return (response.status_code == 200
+            and not response.is_streamed
+            and response.mimetype == 'text/html'
+            and 'Set-Cookie' not in response.headers
+            and 'Content-Encoding' not in response.headers
+            and not session.modified)
+
+
+def _response_from_entry(entry):
+    """Tạo response từ entry cache, chọn bản gzip nếu client hỗ trợ"""
+    accepts_gzip = 'gzip' in request.headers.get('Accept-Encoding', '').lower()
+    etag = entry.get('etag') or compute_etag(entry['body'])
+    if accepts_gzip and entry['gzip'] is not None:
+        response = make_response(entry['gzip'], entry['status'])
+        response.headers['Content-Encoding'] = 'gzip'
+        response.set_etag(f'{etag}:gzip')
+    else:
+        response = make_response(entry['body'], entry['status'])
+        response.set_etag(etag)
+    response.content_type = entry['content_type']
+    response.last_modified = entry.get('last_modified')
+    response.vary.add('Accept-Encoding')
+    response.headers['X-Page-Cache'] = 'HIT'
+    return response
+
+
+def cache_page(*tags, ttl=None):
+    """
+    Decorator cache toàn bộ response HTML của route
+
+    Args:
+        *tags: tag để invalidate (vd: 'products', 'blogs')
+        ttl: TTL riêng (giây), None = PAGE_CACHE_TTL
+    """
+
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            if not _is_cacheable_request():
+                return f(*args, **kwargs)
+
+            from app import cache_manager
+            key = make_page_cache_key(tags)
+            entry = cache_manager.get(key)
+            if entry is not None:
+                return _response_from_entry(entry)
+
+            response = make_response(f(*args, **kwargs))
+            if _is_cacheable_response(response):
+                body = response.get_data()
+                etag = compute_etag(body)
+                response.set_etag(etag)
+                last_modified = g.get('last_modified')
+                if last_modified is not None:
+                    response.last_modified = last_modified
+                min_size = current_app.config.get('COMPRESS_MIN_SIZE', 500)
+                level = current_app.config.get('COMPRESS_LEVEL', 6)
+                cache_manager.set(key, {
+                    'status': response.status_code,
+                    'content_type': response.content_type,
+                    'body': body,
+                    'gzip': gzip.compress(body, compresslevel=level) if len(body) >= min_size else None,
+                    'etag': etag,
+                    'last_modified': last_modified
+                }, ttl=ttl if ttl is not None else current_app.config.get('PAGE_CACHE_TTL'))
+                response.headers['X-Page-Cache'] = 'MISS'
+            return response
+
+        return decorated_function
+
+    return decorator
+
+
+def invalidate_page_cache(*tags):
+    """Xóa page cache theo tag, không truyền tag = xóa toàn bộ"""
+    from app import cache_manager
+    if not tags:
+        cache_manager.clear(PAGE_CACHE_PREFIX)
+        return
+    for tag in tags:
+        cache_manager.clear(f'#{tag}#')
+
+
+def has_content_changes(target, ignored=COUNTER_COLUMNS):
+    """
+    Dùng trong event listener: False nếu lần update chỉ đổi các cột bộ đếm (views...)
+
+    Insert/delete không có history nên luôn trả về True.
+    """
+    changed = [attr.key for attr in inspect(target).attrs if attr.history.has_changes()]
+    if not changed:
+        return True
+    return any(key not in ignored for key in changed)
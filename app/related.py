@@ -0,0 +1,366 @@
+"""
+Sản phẩm / bài viết liên quan bằng độ tương đồng TF-IDF (cosine, NumPy)
+
+- Mỗi sản phẩm: tên (x3) + thông số kỹ thuật (x2) + mô tả + token danh mục;
+  mỗi bài viết: tiêu đề (x3) + tóm tắt, meta keywords (x2) + nội dung
+- Term = từ đã bỏ dấu + cặp từ liền nhau ('gach op', 'op lat'), trọng số tf * idf,
+  băm (crc32) vào RELATED_DIMENSIONS chiều -> mỗi doc là 1 dòng float32 đã chuẩn hóa L2
+  trong 1 ma trận dày (1000 doc ~ 4MB), cosine = tích vô hướng
+- Bảng kết quả tính sẵn: neighbors (N x K, int32, số dòng; -1 = trống) + scores (float32)
+- Build toàn bộ theo khối (M[khối] @ M.T + argpartition). Sản phẩm đổi: tính lại vector của nó,
+  1 phép nhân ma trận-vector cho ra độ tương đồng với mọi doc, cập nhật dòng của nó và chèn/loại
+  nó khỏi dòng của doc khác; dòng nào mất 1 neighbor thì tính lại riêng dòng đó
+- IDF giữ theo lần build gần nhất (đủ chính xác cho cập nhật lẻ), nhiều thay đổi thì build lại
+- Cập nhật qua event listener (áp dụng sau commit), backend cache dùng chung thì đồng bộ
+  giữa các worker bằng version 'related_<loại>' (app/live_index.py)
+
+Usage:
+    from app.related import get_related_index
+    ids = get_related_index('product').related(product.id, limit=4)
+"""
+import math
+import threading
+import time
+import zlib
+
+import numpy as np
+
+from app.live_index import register_index
+from app.search_index import tokenize, strip_html
+
+VERSION_PREFIX = 'related_'
+
+RELATED_DIMENSIONS = 1024
+TOP_K = 8
+# Độ tương đồng tối thiểu để coi là liên quan
+MIN_SCORE = 0.05
+BLOCK_SIZE = 256
+# Số thay đổi lẻ (tính theo tỉ lệ số doc) trước khi build lại để cập nhật IDF
+REBUILD_RATIO = 0.2
+
+TITLE_WEIGHT = 3
+KEYWORD_WEIGHT = 2
+BODY_WEIGHT = 1
+
+
+# ==================== VECTOR ====================
+def _terms(text):
+    words = tokenize(text)
+    return words + [f'{a} {b}' for a, b in zip(words, words[1:])]
+
+
+def _bucket(term):
+    """Chỉ số chiều + dấu của term (crc32 ổn định giữa các process, khác hash())"""
+    code = zlib.crc32(term.encode('utf-8'))
+    return code % RELATED_DIMENSIONS, 1.0 if code & 0x80000000 else -1.0
+
+
+def term_frequencies(fields):
+    """[(text, trọng số)] -> {term: tf có trọng số}"""
+    counts = {}
+    for text, weight in fields:
+        for term in _terms(text or ''):
+            counts[term] = counts.get(term, 0) + weight
+    return counts
+
+
+def technical_text(technical_info):
+    if not isinstance(technical_info, dict):
+        return ''
+    parts = []
+    for value in technical_info.values():
+        parts.extend(value if isinstance(value, (list, tuple)) else [value])
+    return ' '.join(str(part) for part in parts)
+
+
+def product_fields(product):
+    return [(product.name, TITLE_WEIGHT),
+            (technical_text(product.technical_info), KEYWORD_WEIGHT),
+            (strip_html(product.description), BODY_WEIGHT),
+            (f'danhmuc{product.category_id}' if product.category_id else '', KEYWORD_WEIGHT)]
+
+
+def blog_fields(blog):
+    return [(blog.title, TITLE_WEIGHT),
+            (strip_html(blog.excerpt), KEYWORD_WEIGHT),
+            (blog.meta_keywords, KEYWORD_WEIGHT),
+            (strip_html(blog.content), BODY_WEIGHT)]
+
+
+# ==================== INDEX ====================
+class RelatedIndex:
+    """Ma trận TF-IDF + bảng top-K tính sẵn cho 1 loại doc, thread-safe"""
+
+    def __init__(self, name):
+        self.name = name
+        self._lock = threading.RLock()
+        self._rows = {}                  # id -> số dòng
+        self._ids = np.zeros(0, dtype=np.int64)
+        self._active = np.zeros(0, dtype=bool)
+        self._matrix = np.zeros((0, RELATED_DIMENSIONS), dtype=np.float32)
+        self._neighbors = np.zeros((0, TOP_K), dtype=np.int32)
+        self._scores = np.zeros((0, TOP_K), dtype=np.float32)
+        self._size = 0                   # số dòng đang dùng (mảng có thể dư chỗ)
+        self._df = {}                    # term -> số doc chứa term (lúc build)
+        self._docs = 0
+        self._changes = 0
+        self.ready = False
+        self.version = 0
+        self.generation = 0
+        self.built_at = None
+        self.build_seconds = 0.0
+
+    def __len__(self):
+        return len(self._rows)
+
+    # ---------- vector ----------
+    def _vector(self, tf):
+        vector = np.zeros(RELATED_DIMENSIONS, dtype=np.float32)
+        total = max(self._docs, 1)
+        for term, count in tf.items():
+            idf = math.log((1 + total) / (1 + self._df.get(term, 0))) + 1
+            index, sign = _bucket(term)
+            vector[index] += sign * (1 + math.log(count)) * idf
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    # ---------- build ----------
+    def build(self, docs, version=0):
+        """docs: [(id, {term: tf})]. Build xong mới thay thế dữ liệu cũ"""
+        started = time.perf_counter()
+        df = {}
+        for _, tf in docs:
+            for term in tf:
+                df[term] = df.get(term, 0) + 1
+
+        fresh = RelatedIndex(self.name)
+        fresh._df, fresh._docs = df, len(docs)
+        size = len(docs)
+        fresh._ids = np.array([doc_id for doc_id, _ in docs], dtype=np.int64)
+        fresh._rows = {doc_id: row for row, (doc_id, _) in enumerate(docs)}
+        fresh._active = np.ones(size, dtype=bool)
+        fresh._matrix = np.zeros((size, RELATED_DIMENSIONS), dtype=np.float32)
+        for row, (_, tf) in enumerate(docs):
+            fresh._matrix[row] = fresh._vector(tf)
+        fresh._size = size
+        fresh._neighbors = np.full((size, TOP_K), -1, dtype=np.int32)
+        fresh._scores = np.zeros((size, TOP_K), dtype=np.float32)
+
+        for start in range(0, size, BLOCK_SIZE):
+            stop = min(start + BLOCK_SIZE, size)
+            similarity = fresh._matrix[start:stop] @ fresh._matrix[:size].T
+            similarity[np.arange(stop - start), np.arange(start, stop)] = -np.inf
+            for offset in range(stop - start):
+                fresh._set_row(start + offset, similarity[offset])
+
+        with self._lock:
+            for attr in ('_rows', '_ids', '_active', '_matrix', '_neighbors', '_scores',
+                         '_size', '_df', '_docs'):
+                setattr(self, attr, getattr(fresh, attr))
+            self._changes = 0
+            self.version = version
+            self.generation += 1
+            self.ready = True
+            self.built_at = time.time()
+            self.build_seconds = time.perf_counter() - started
+
+    def _set_row(self, row, similarity):
+        """Ghi top-K của 1 dòng từ vector độ tương đồng với mọi dòng (đã loại chính nó)"""
+        k = min(TOP_K, len(similarity))
+        if k == 0:
+            return
+        top = np.argpartition(-similarity, k - 1)[:k]
+        top = top[np.argsort(-similarity[top], kind='stable')]
+        keep = similarity[top] > MIN_SCORE
+        count = int(keep.sum())
+        self._neighbors[row] = -1
+        self._scores[row] = 0
+        self._neighbors[row, :count] = top[keep]
+        self._scores[row, :count] = similarity[top[keep]]
+
+    def _similarity(self, row):
+        similarity = self._matrix[:self._size] @ self._matrix[row]
+        similarity[~self._active[:self._size]] = -np.inf
+        similarity[row] = -np.inf
+        return similarity
+
+    # ---------- cập nhật ----------
+    def _grow(self):
+        capacity = max(16, len(self._ids) * 2)
+        extra = capacity - len(self._ids)
+        self._ids = np.concatenate([self._ids, np.zeros(extra, dtype=np.int64)])
+        self._active = np.concatenate([self._active, np.zeros(extra, dtype=bool)])
+        self._matrix = np.vstack([self._matrix, np.zeros((extra, RELATED_DIMENSIONS), dtype=np.float32)])
+        self._neighbors = np.vstack([self._neighbors, np.full((extra, TOP_K), -1, dtype=np.int32)])
+        self._scores = np.vstack([self._scores, np.zeros((extra, TOP_K), dtype=np.float32)])
+
+    def add(self, doc_id, tf):
+        with self._lock:
+            row = self._rows.get(doc_id)
+            if row is None:
+                if self._size == len(self._ids):
+                    self._grow()
+                row = self._size
+                self._size += 1
+                self._rows[doc_id] = row
+                self._ids[row] = doc_id
+            self._active[row] = True
+            self._matrix[row] = self._vector(tf)
+
+            similarity = self._similarity(row)
+            self._set_row(row, similarity)
+            self._propagate(row, similarity)
+            self._changed()
+
+    def remove(self, doc_id):
+        with self._lock:
+            row = self._rows.pop(doc_id, None)
+            if row is None:
+                return
+            self._active[row] = False
+            self._matrix[row] = 0
+            self._neighbors[row] = -1
+            self._scores[row] = 0
+            self._propagate(row, None)
+            self._changed()
+
+    def _propagate(self, row, similarity):
+        """Cập nhật dòng của các doc khác sau khi `row` đổi (similarity=None: row bị xóa)"""
+        size = self._size
+        neighbors = self._neighbors[:size]
+        had = (neighbors == row).any(axis=1)
+        had[row] = False
+
+        # Doc từng có `row` trong top-K mà giờ điểm thấp hơn/bị xóa: tính lại cả dòng
+        if similarity is None:
+            stale = np.flatnonzero(had)
+            candidates = np.zeros(0, dtype=np.int64)
+        else:
+            old_scores = np.where(neighbors == row, self._scores[:size], 0).max(axis=1)
+            stale = np.flatnonzero(had & (similarity < old_scores))
+            # Doc có điểm với `row` vượt điểm thấp nhất trong top-K của nó: chèn vào
+            floor = np.where(self._neighbors[:size, -1] >= 0, self._scores[:size, -1], MIN_SCORE)
+            candidates = np.flatnonzero((similarity > floor) & self._active[:size] & ~np.isin(
+                np.arange(size), stale))
+
+        for other in stale:
+            if self._active[other]:
+                self._set_row(other, self._similarity(other))
+        for other in candidates:
+            self._insert(other, row, similarity[other])
+
+    def _insert(self, row, neighbor, score):
+        neighbors = [n for n in self._neighbors[row] if n >= 0 and n != neighbor]
+        scores = {n: s for n, s in zip(self._neighbors[row], self._scores[row]) if n >= 0}
+        scores[neighbor] = score
+        ranked = sorted(neighbors + [neighbor], key=lambda n: -scores[n])[:TOP_K]
+        self._neighbors[row] = -1
+        self._scores[row] = 0
+        self._neighbors[row, :len(ranked)] = ranked
+        self._scores[row, :len(ranked)] = [scores[n] for n in ranked]
+
+    def _changed(self):
+        self.generation += 1
+        self._changes += 1
+        if self._changes > max(REBUILD_RATIO * max(self._docs, 1), 50):
+            # IDF đã lệch nhiều: lần get_related_index() kế tiếp build lại
+            self.ready = False
+
+    # ---------- truy vấn ----------
+    def related(self, doc_id, limit=4):
+        """Id các doc liên quan nhất (giảm dần theo độ tương đồng)"""
+        with self._lock:
+            row = self._rows.get(doc_id)
+            if row is None:
+                return []
+            return [int(self._ids[n]) for n in self._neighbors[row][:limit] if n >= 0]
+
+    def referrers(self, doc_id):
+        """Id các doc đang có doc_id trong danh sách liên quan"""
+        with self._lock:
+            row = self._rows.get(doc_id)
+            if row is None:
+                return []
+            rows = np.flatnonzero((self._neighbors[:self._size] == row).any(axis=1))
+            return [int(self._ids[r]) for r in rows]
+
+    def stats(self):
+        with self._lock:
+            return {
+                'ready': self.ready,
+                'documents': len(self._rows),
+                'rows': self._size,
+                'bytes': int(self._matrix.nbytes + self._neighbors.nbytes + self._scores.nbytes),
+                'version': self.version,
+                'generation': self.generation,
+                'build_ms': round(self.build_seconds * 1000, 2),
+            }
+
+
+# ==================== NGUỒN DỮ LIỆU ====================
+def _load_products():
+    from sqlalchemy.orm import load_only
+    from app.models.product import Product
+    products = Product.query.options(load_only(Product.id, Product.name, Product.description,
+                                               Product.technical_info, Product.category_id,
+                                               Product.is_active)) \
+        .filter_by(is_active=True).all()
+    return [(p.id, term_frequencies(product_fields(p))) for p in products]
+
+
+def _load_blogs():
+    from sqlalchemy.orm import load_only
+    from app.models.content import Blog
+    blogs = Blog.query.options(load_only(Blog.id, Blog.title, Blog.excerpt, Blog.meta_keywords,
+                                         Blog.content, Blog.is_active)) \
+        .filter_by(is_active=True).all()
+    return [(b.id, term_frequencies(blog_fields(b))) for b in blogs]
+
+
+# Loại -> (tên model, hàm load toàn bộ, hàm lấy field của 1 object, bảng)
+SOURCES = {
+    'product': ('Product', _load_products, product_fields, 'products'),
+    'blog': ('Blog', _load_blogs, blog_fields, 'blogs'),
+}
+MODEL_TYPES = {model: doc_type for doc_type, (model, _, _, _) in SOURCES.items()}
+
+related_indexes = {doc_type: RelatedIndex(doc_type) for doc_type in SOURCES}
+
+
+def _register(doc_type):
+    index = related_indexes[doc_type]
+    return register_index(VERSION_PREFIX + doc_type, index,
+                          build=lambda version: index.build(SOURCES[doc_type][1](), version=version),
+                          add=index.add, tables=(SOURCES[doc_type][3],))
+
+
+live_related_indexes = {doc_type: _register(doc_type) for doc_type in SOURCES}
+
+
+def rebuild_related_index(doc_type):
+    """Build lại index của 1 loại từ DB (cần app context)"""
+    return live_related_indexes[doc_type].rebuild()
+
+
+def get_related_index(doc_type):
+    """Index đã sẵn sàng (build ở lần gọi đầu tiên)"""
+    return live_related_indexes[doc_type].get()
+
+
+# ==================== CẬP NHẬT THEO MODEL ====================
+def schedule_related_update(target):
+    """
+    Gọi trong event listener after_insert/after_update/after_delete của Product/Blog
+
+    Tính term ngay lúc flush (attribute còn nguyên), áp dụng vào index sau khi commit.
+    """
+    if target.id is None:
+        return
+    doc_type = MODEL_TYPES[type(target).__name__]
+    tf = term_frequencies(SOURCES[doc_type][2](target)) if target.is_active else None
+    live_related_indexes[doc_type].schedule(target, target.id, tf)
+
+
+def init_related_index(app):
+    for live in live_related_indexes.values():
+        live.init_app(app)
@@ -0,0 +1,432 @@
+"""
+Search index trong RAM cho /tim-kiem và /api/search-suggestions
+
+- Inverted index: term -> {doc_key: tf có trọng số}, doc = sản phẩm, bài viết, dự án,
+  FAQ (is_active); trang tĩnh được match riêng bằng app/static_pages.py
+- Term đã lower + bỏ dấu bằng remove_accents (cùng bảng với slugify): 'gạch ốp' = 'gach op'
+- Từ cuối của query match theo prefix ('gach o' -> 'gach op...'), vocabulary là list
+  đã sort nên tìm prefix bằng bisect, không phụ thuộc số dòng trong bảng
+- Xếp hạng BM25, tiêu đề có trọng số cao hơn nội dung; mọi từ trong query đều phải khớp
+- Build 1 lần (lúc khởi động hoặc lần tìm kiếm đầu tiên), sau đó cập nhật từng doc
+  qua event listener của model: thay đổi gom theo session, chỉ áp dụng sau commit
+- Cache backend dùng chung (sqlite/redis): version 'search_index' tăng mỗi lần thay đổi,
+  worker khác thấy lệch version thì build lại (app/live_index.py)
+
+Usage:
+    from app.search_index import get_search_index
+    hits = get_search_index().search('gach op', limits={'product': 5, 'blog': 3})
+"""
+import math
+import re
+import threading
+import time
+import unicodedata
+from bisect import bisect_left, insort
+
+from flask import url_for
+
+from app.live_index import register_index
+from app.utils import remove_accents
+
+INDEX_VERSION_NAME = 'search_index'
+
+# BM25
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Giới hạn số term mở rộng từ 1 prefix (prefix 2 ký tự có thể khớp hàng trăm term)
+MAX_PREFIX_TERMS = 32
+# Số doc ứng viên tối đa được chấm điểm mỗi lần tìm (giữ latency không đổi khi bảng lớn)
+MAX_CANDIDATES = 200
+MIN_CANDIDATES_PER_TERM = 20
+
+# Trọng số các field khi tính tf
+TITLE_WEIGHT = 3
+KEYWORD_WEIGHT = 2
+BODY_WEIGHT = 1
+
+SNIPPET_LENGTH = 160
+
+_TOKEN_RE = re.compile(r'[a-z0-9]+')
+_TAG_RE = re.compile(r'<[^>]+>')
+_SPACE_RE = re.compile(r'\s+')
+
+# ==================== TEXT ====================
+def fold_text(text):
+    """Lower + bỏ dấu tiếng Việt: 'Gạch Ốp Lát' -> 'gach op lat'"""
+    if not text:
+        return ''
+    return remove_accents(unicodedata.normalize('NFC', str(text)).lower())
+
+
+def tokenize(text):
+    return _TOKEN_RE.findall(fold_text(text))
+
+
+def strip_html(text):
+    if not text:
+        return ''
+    return _SPACE_RE.sub(' ', _TAG_RE.sub(' ', text)).strip()
+
+
+def make_snippet(text, length=SNIPPET_LENGTH):
+    text = strip_html(text)
+    if len(text) <= length:
+        return text
+    return text[:length].rsplit(' ', 1)[0] + '...'
+
+
+# ==================== DOCUMENT ====================
+class SearchDoc:
+    """1 kết quả tìm kiếm (dữ liệu thuần, không giữ ORM object)"""
+    __slots__ = ('type', 'id', 'title', 'path', 'endpoint', 'params', 'icon', 'image',
+                 'description', 'terms', 'length')
+
+    def __init__(self, type, id, title, fields, path=None, endpoint=None, params=None,
+                 icon=None, image=None, description=''):
+        self.type = type
+        self.id = id
+        self.title = title
+        self.path = path
+        self.endpoint = endpoint
+        self.params = params or {}
+        self.icon = icon
+        self.image = image
+        self.description = description
+        # fields: [(text, weight)] -> tf có trọng số (không giữ lại text gốc)
+        self.terms = {}
+        for text, weight in fields:
+            for term in tokenize(text):
+                self.terms[term] = self.terms.get(term, 0) + weight
+        self.length = sum(self.terms.values())
+
+    @property
+    def key(self):
+        return (self.type, self.id)
+
+    @property
+    def url(self):
+        if self.endpoint:
+            return url_for(self.endpoint, **self.params)
+        return self.path
+
+    def to_suggestion(self):
+        """Định dạng item cho /api/search-suggestions"""
+        item = {'title': self.title, 'url': self.url, 'icon': self.icon, 'type': self.type}
+        if self.type == 'product':
+            item['image'] = self.image
+        return item
+
+    def __repr__(self):
+        return f'<SearchDoc {self.type}:{self.id}>'
+
+
+# Model -> loại doc
+DOCUMENT_TYPES = {'Product': 'product', 'Blog': 'blog', 'Project': 'project', 'FAQ': 'faq'}
+
+
+def document_for(obj):
+    """Tạo SearchDoc từ ORM instance, None nếu không được hiển thị (is_active=False)"""
+    from app.models.product import Product
+    from app.models.content import Blog, FAQ
+    from app.models.media import Project
+
+    if not getattr(obj, 'is_active', True) or obj.id is None:
+        return None
+
+    if isinstance(obj, Product):
+        return SearchDoc('product', obj.id, obj.name,
+                         [(obj.name, TITLE_WEIGHT), (strip_html(obj.description), BODY_WEIGHT)],
+                         path=f'/san-pham/{obj.slug}', icon='bi-box-seam', image=obj.image,
+                         description=make_snippet(obj.description))
+    if isinstance(obj, Blog):
+        return SearchDoc('blog', obj.id, obj.title,
+                         [(obj.title, TITLE_WEIGHT), (strip_html(obj.excerpt), BODY_WEIGHT)],
+                         path=f'/tin-tuc/{obj.slug}', icon='bi-journal-text', image=obj.image,
+                         description=make_snippet(obj.excerpt))
+    if isinstance(obj, Project):
+        keywords = ' '.join(filter(None, [obj.project_type, obj.location, obj.client]))
+        return SearchDoc('project', obj.id, obj.title,
+                         [(obj.title, TITLE_WEIGHT), (keywords, KEYWORD_WEIGHT),
+                          (strip_html(obj.description), BODY_WEIGHT)],
+                         path=f'/du-an/{obj.slug}', icon='bi-building', image=obj.image,
+                         description=make_snippet(obj.description))
+    if isinstance(obj, FAQ):
+        return SearchDoc('faq', obj.id, obj.question,
+                         [(obj.question, TITLE_WEIGHT), (strip_html(obj.answer), BODY_WEIGHT)],
+                         path=f'/cau-hoi-thuong-gap#faq{obj.id}', icon='bi-question-circle',
+                         description=make_snippet(obj.answer))
+    return None
+
+
+def load_documents():
+    """Toàn bộ doc từ DB (chỉ load các cột cần index)"""
+    from sqlalchemy.orm import load_only
+    from app.models.product import Product
+    from app.models.content import Blog, FAQ
+    from app.models.media import Project
+
+    queries = [
+        Product.query.options(load_only(Product.id, Product.name, Product.slug, Product.description,
+                                        Product.image, Product.is_active)),
+        Blog.query.options(load_only(Blog.id, Blog.title, Blog.slug, Blog.excerpt,
+                                     Blog.image, Blog.is_active)),
+        Project.query.options(load_only(Project.id, Project.title, Project.slug, Project.description,
+                                        Project.project_type, Project.location, Project.client,
+                                        Project.image, Project.is_active)),
+        FAQ.query.options(load_only(FAQ.id, FAQ.question, FAQ.answer, FAQ.is_active)),
+    ]
+
+    docs = []
+    for query in queries:
+        for obj in query.filter_by(is_active=True).all():
+            doc = document_for(obj)
+            if doc is not None:
+                docs.append(doc)
+    return docs
+
+
+# ==================== INDEX ====================
+class SearchIndex:
+    """Inverted index + BM25, thread-safe (mọi thao tác đều dưới 1 lock, đều < 1ms)"""
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._docs = {}       # key -> SearchDoc
+        self._postings = {}   # term -> {key: tf}
+        self._terms = []      # vocabulary đã sort (cho prefix)
+        self._ranked = {}     # term -> {type: [key]} (lazy, xem _ranked_postings)
+        self._total_length = 0
+        self.ready = False
+        self.version = 0
+        self.generation = 0   # tăng mỗi lần index đổi (key cache của kết quả tìm kiếm)
+        self.built_at = None
+        self.build_seconds = 0.0
+
+    def __len__(self):
+        return len(self._docs)
+
+    # ---------- build / cập nhật ----------
+    def build(self, docs, version=0):
+        """Build lại từ đầu rồi mới thay thế index cũ (request đang đọc không bị ảnh hưởng)"""
+        started = time.perf_counter()
+        fresh = SearchIndex()
+        for doc in docs:
+            fresh._add(doc)
+        fresh._terms.sort()
+
+        with self._lock:
+            self._docs = fresh._docs
+            self._postings = fresh._postings
+            self._terms = fresh._terms
+            self._ranked = {}
+            self._total_length = fresh._total_length
+            self.version = version
+            self.generation += 1
+            self.ready = True
+            self.built_at = time.time()
+            self.build_seconds = time.perf_counter() - started
+
+    def add(self, doc):
+        with self._lock:
+            self._remove(doc.key)
+            self._add(doc, keep_sorted=True)
+            self.generation += 1
+
+    def remove(self, key):
+        with self._lock:
+            self._remove(key)
+            self.generation += 1
+
+    def _add(self, doc, keep_sorted=False):
+        self._docs[doc.key] = doc
+        self._total_length += doc.length
+        for term, tf in doc.terms.items():
+            postings = self._postings.get(term)
+            if postings is None:
+                postings = self._postings[term] = {}
+                if keep_sorted:
+                    insort(self._terms, term)
+                else:
+                    self._terms.append(term)
+            postings[doc.key] = tf
+            self._ranked.pop(term, None)
+
+    def _remove(self, key):
+        doc = self._docs.pop(key, None)
+        if doc is None:
+            return
+        self._total_length -= doc.length
+        for term in doc.terms:
+            postings = self._postings.get(term)
+            if postings is None:
+                continue
+            postings.pop(key, None)
+            self._ranked.pop(term, None)
+            if not postings:
+                del self._postings[term]
+                position = bisect_left(self._terms, term)
+                if position < len(self._terms) and self._terms[position] == term:
+                    del self._terms[position]
+
+    # ---------- tìm kiếm ----------
+    def _expand(self, token, prefix):
+        """Các term khớp token: chính nó, hoặc mọi term bắt đầu bằng token nếu prefix"""
+        if not prefix:
+            return [token] if token in self._postings else []
+        terms = []
+        position = bisect_left(self._terms, token)
+        while position < len(self._terms) and len(terms) < MAX_PREFIX_TERMS:
+            term = self._terms[position]
+            if not term.startswith(token):
+                break
+            terms.append(term)
+            position += 1
+        return terms
+
+    def _ranked_postings(self, term):
+        """Postings của term chia theo loại doc, sắp theo tf đã chuẩn hóa độ dài (giảm dần)"""
+        ranked = self._ranked.get(term)
+        if ranked is None:
+            avg_length = self._avg_length()
+            postings = self._postings[term]
+            ranked = {}
+            for key in sorted(postings, key=lambda key: -self._tf_norm(postings[key], key, avg_length)):
+                ranked.setdefault(key[0], []).append(key)
+            self._ranked[term] = ranked
+        return ranked
+
+    def _avg_length(self):
+        return (self._total_length / len(self._docs)) if self._docs else 1
+
+    def _tf_norm(self, tf, key, avg_length):
+        length = self._docs[key].length
+        return tf * (BM25_K1 + 1) / (tf + BM25_K1 * (1 - BM25_B + BM25_B * length / avg_length))
+
+    def _idf(self, term, total_docs):
+        df = len(self._postings[term])
+        return math.log(1 + (total_docs - df + 0.5) / (df + 0.5))
+
+    def search(self, query, types=None, limits=None, limit=None, prefix=True):
+        """
+        Tìm doc khớp TẤT CẢ các từ trong query, sắp theo điểm BM25 giảm dần
+
+        types: chỉ lấy các loại này ('product', 'blog', 'project', 'faq')
+        limits: số kết quả tối đa theo từng loại, vd {'product': 5, 'blog': 3}
+        limit: tổng số kết quả tối đa
+        prefix: từ cuối của query được match theo prefix (autocomplete)
+
+        Ứng viên chỉ lấy từ top postings (theo tf) của token hiếm nhất nên thời gian
+        chạy bị chặn trên bởi MAX_CANDIDATES, không tăng theo số doc. Với term có
+        ít hơn MIN_CANDIDATES_PER_TERM doc mỗi loại, kết quả là chính xác.
+        """
+        tokens = list(dict.fromkeys(tokenize(query)))
+        if not tokens:
+            return []
+        if limits is not None:
+            types = [doc_type for doc_type in (types or limits) if limits.get(doc_type)]
+
+        with self._lock:
+            total_docs = len(self._docs)
+            if not total_docs:
+                return []
+            avg_length = self._avg_length()
+
+            expansions = []
+            for position, token in enumerate(tokens):
+                terms = self._expand(token, prefix and position == len(tokens) - 1)
+                if not terms:
+                    return []
+                # Term khớp đúng được ưu tiên hơn term chỉ khớp prefix
+                expansions.append([(term, self._idf(term, total_docs) * (1.0 if term == token else 0.8))
+                                   for term in terms])
+
+            # Token có ít doc nhất quyết định tập ứng viên
+            driver = min(expansions, key=lambda terms: sum(len(self._postings[t]) for t, _ in terms))
+            per_term = max(MIN_CANDIDATES_PER_TERM, MAX_CANDIDATES // len(driver))
+            candidates = set()
+            for term, _ in driver:
+                for doc_type, keys in self._ranked_postings(term).items():
+                    if not types or doc_type in types:
+                        candidates.update(keys[:per_term])
+
+            scores = {}
+            for key in candidates:
+                total = 0.0
+                for terms in expansions:
+                    best = 0.0
+                    for term, weight in terms:
+                        tf = self._postings[term].get(key)
+                        if tf:
+                            best = max(best, weight * self._tf_norm(tf, key, avg_length))
+                    if not best:
+                        break
+                    total += best
+                else:
+                    scores[key] = total
+
+            ranked = sorted(scores.items(), key=lambda item: (-item[1], self._docs[item[0]].title))
+            docs = self._docs
+
+        results = []
+        counts = {}
+        for key, _ in ranked:
+            doc = docs[key]
+            if limits is not None:
+                if counts.get(doc.type, 0) >= limits[doc.type]:
+                    continue
+                counts[doc.type] = counts.get(doc.type, 0) + 1
+            results.append(doc)
+            if limit and len(results) >= limit:
+                break
+        return results
+
+    def stats(self):
+        with self._lock:
+            by_type = {}
+            for doc_type, _ in self._docs:
+                by_type[doc_type] = by_type.get(doc_type, 0) + 1
+            return {
+                'ready': self.ready,
+                'documents': len(self._docs),
+                'terms': len(self._terms),
+                'by_type': by_type,
+                'version': self.version,
+                'generation': self.generation,
+                'build_ms': round(self.build_seconds * 1000, 2),
+            }
+
+
+search_index = SearchIndex()
+
+
+def _build(version):
+    search_index.build(load_documents(), version=version)
+
+
+live_search_index = register_index(INDEX_VERSION_NAME, search_index, build=_build,
+                                   add=lambda key, doc: search_index.add(doc))
+
+
+def rebuild_search_index():
+    """Build lại toàn bộ index từ DB (cần app context)"""
+    return live_search_index.rebuild()
+
+
+def get_search_index():
+    """Index đã sẵn sàng (build ở lần gọi đầu tiên)"""
+    return live_search_index.get()
+
+
+# ==================== CẬP NHẬT THEO MODEL ====================
+def schedule_index_update(target):
+    """
+    Gọi trong event listener after_insert/after_update/after_delete của model
+
+    Chụp lại doc ngay lúc flush (attribute còn nguyên), áp dụng vào index sau khi commit.
+    """
+    live_search_index.schedule(target, (DOCUMENT_TYPES[type(target).__name__], target.id), document_for(target))
+
+
+def init_search_index(app):
+    live_search_index.init_app(app)
@@ -535,31 +535,23 @@ class ChatbotWidget {
     this.showTyping();
 
     try {
-      const response = await fetch("/chatbot/send", {
+      const response = await fetch("/chatbot/stream", {
         method: "POST",
         headers: {
           "Content-Type": "application/json",
+          Accept: "text/event-stream",
         },
         body: JSON.stringify({ message: message }),
       });
 
-      const data = await response.json();
-      this.hideTyping();
-
-      if (response.ok) {
-        this.addMessage(data.response, "bot");
-
-        if (data.remaining_requests !== undefined) {
-          this.remainingRequests = data.remaining_requests;
-          this.updateRequestCount();
-        }
+      const contentType = response.headers.get("Content-Type") || "";
+      if (response.ok && response.body && contentType.includes("text/event-stream")) {
+        await this.readStream(response);
       } else {
-        this.addMessage(
-          data.error ||
-            data.response ||
-            "Xin lỗi, đã có lỗi xảy ra. Vui lòng thử lại! 😊",
-          "bot"
-        );
+        // Lỗi validate / hết lượt / bảo trì: server trả JSON như /chatbot/send
+        const data = await response.json();
+        this.hideTyping();
+        this.handleReply(response.ok, data);
       }
     } catch (error) {
       console.error("Chatbot error:", error);
@@ -575,6 +567,91 @@ class ChatbotWidget {
     }
   }
 
+  // Đọc server-sent events từ /chatbot/stream: token -> hiện dần, done -> lưu lịch sử
+  async readStream(response) {
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = "";
+    let text = "";
+    let contentDiv = null;
+
+    const render = (value) => {
+      if (!contentDiv) {
+        this.hideTyping();
+        contentDiv = this.addMessage("", "bot");
+      }
+      contentDiv.innerHTML = this.escapeHtml(value).replace(/\n/g, "<br>");
+      this.scrollToBottom();
+    };
+
+    while (true) {
+      const { value, done } = await reader.read();
+      if (done) break;
+      buffer += decoder.decode(value, { stream: true });
+
+      let boundary;
+      while ((boundary = buffer.indexOf("\n\n")) !== -1) {
+        const raw = buffer.slice(0, boundary);
+        buffer = buffer.slice(boundary + 2);
+
+        let event = "message";
+        let data = "";
+        raw.split("\n").forEach((line) => {
+          if (line.startsWith("event: ")) event = line.slice(7);
+          else if (line.startsWith("data: ")) data += line.slice(6);
+        });
+        if (!data) continue;
+        const payload = JSON.parse(data);
+
+        if (event === "token") {
+          text += payload.text;
+          render(text);
+        } else if (event === "done") {
+          render(payload.response);
+          if (payload.remaining_requests !== undefined) {
+            this.remainingRequests = payload.remaining_requests;
+            this.updateRequestCount();
+          }
+          this.saveHistory(payload.history_token);
+        } else if (event === "error") {
+          render(payload.response);
+        }
+      }
+    }
+
+    if (!contentDiv) {
+      this.hideTyping();
+      this.addMessage("Xin lỗi, đã có lỗi xảy ra. Vui lòng thử lại! 😊", "bot");
+    }
+  }
+
+  saveHistory(token) {
+    if (!token) return;
+    fetch("/chatbot/history", {
+      method: "POST",
+      headers: { "Content-Type": "application/json" },
+      body: JSON.stringify({ token: token }),
+    }).catch((error) => console.error("Chatbot history error:", error));
+  }
+
+  handleReply(ok, data) {
+    if (ok) {
+      this.addMessage(data.response, "bot");
+
+      if (data.remaining_requests !== undefined) {
+        this.remainingRequests = data.remaining_requests;
+        this.updateRequestCount();
+      }
+    } else {
+      this.addMessage(
+        data.error ||
+          data.response ||
+          "Xin lỗi, đã có lỗi xảy ra. Vui lòng thử lại! 😊",
+        "bot"
+      );
+    }
+  }
+
   addMessage(text, sender) {
     const messageDiv = document.createElement("div");
     messageDiv.className = `chatbot-message ${sender}`;
@@ -586,6 +663,7 @@ class ChatbotWidget {
     messageDiv.appendChild(contentDiv);
     this.messagesContainer.appendChild(messageDiv);
     this.scrollToBottom();
+    return contentDiv;
   }
 
   escapeHtml(text) {
@@ -2065,7 +2143,7 @@ document.addEventListener("DOMContentLoaded", function () {
         return;
       }
 
-      const grouped = { page: [], product: [], blog: [] };
+      const grouped = { page: [], product: [], blog: [], project: [], faq: [] };
       suggestions.forEach(item => {
         if (grouped[item.type]) grouped[item.type].push(item);
       });
@@ -2099,6 +2177,24 @@ document.addEventListener("DOMContentLoaded", function () {
         html += '</div>';
       }
 
+      if (grouped.project.length > 0) {
+        html += '<div class="search-autocomplete-group">';
+        html += '<div class="search-autocomplete-group-title"><i class="bi bi-building"></i> Dự án</div>';
+        grouped.project.forEach((item, index) => {
+          html += this.renderItem(item, grouped.page.length + grouped.product.length + grouped.blog.length + index);
+        });
+        html += '</div>';
+      }
+
+      if (grouped.faq.length > 0) {
+        html += '<div class="search-autocomplete-group">';
+        html += '<div class="search-autocomplete-group-title"><i class="bi bi-question-circle"></i> Hỏi đáp</div>';
+        grouped.faq.forEach((item, index) => {
+          html += this.renderItem(item, grouped.page.length + grouped.product.length + grouped.blog.length + grouped.project.length + index);
+        });
+        html += '</div>';
+      }
+
       this.resultsContainer.innerHTML = html;
       this.resultsContainer.style.display = 'block';
       this.currentFocus = -1;
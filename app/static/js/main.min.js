@@ -1 +1,176 @@
-window.addEventListener("scroll",(function(){const e=document.querySelector(".floating-buttons");e&&(e.style.display="flex")}));const observerOptions={threshold:.1,rootMargin:"0px 0px -50px 0px"},observer=new IntersectionObserver((function(e){e.forEach((e=>{e.isIntersecting&&e.target.classList.add("animate-on-scroll")}))}),observerOptions);if(document.addEventListener("DOMContentLoaded",(function(){document.querySelectorAll(".product-card, .blog-card").forEach((e=>{observer.observe(e)}))})),document.addEventListener("DOMContentLoaded",(function(){document.querySelectorAll(".alert.alert-dismissible").forEach((e=>{setTimeout((()=>{new bootstrap.Alert(e).close()}),3e3)}))})),document.addEventListener("DOMContentLoaded",(function(){document.querySelectorAll('form[action*="search"]').forEach((e=>{e.addEventListener("submit",(function(t){const n=e.querySelector('input[name="q"], input[name="search"]');n&&""===n.value.trim()&&(t.preventDefault(),alert("Vui lòng nhập từ khóa tìm kiếm"))}))}))})),"loading"in HTMLImageElement.prototype){document.querySelectorAll("img[data-src]").forEach((e=>{e.src=e.dataset.src}))}else{const e=document.createElement("script");e.src="https://cdnjs.cloudflare.com/ajax/libs/lazysizes/5.3.2/lazysizes.min.js",document.body.appendChild(e)}let resizeTimer;document.addEventListener("DOMContentLoaded",(function(){document.querySelectorAll('a[href*="#"]').forEach((e=>{e.addEventListener("click",(function(e){if(this.hasAttribute("data-bs-toggle"))return;const t=this.getAttribute("href");if("#"===t)return;const n=t.includes("#")?t.split("#")[1]:null;if(n){const t=document.getElementById(n);if(t){e.preventDefault();const n=t.offsetTop-120;window.scrollTo({top:n,behavior:"smooth"})}}}))}))})),function(){const e=document.getElementById("scrollToTop");if(!e)return;const t=e.querySelector("circle.progress"),n=t.r.baseVal.value,s=2*Math.PI*n;function i(){const n=window.pageYOffset||document.documentElement.scrollTop,i=document.documentElement.scrollHeight-document.documentElement.clientHeight,o=s-n/i*100/100*s;t.style.strokeDashoffset=o,n>300?e.classList.add("show"):e.classList.remove("show")}t.style.strokeDasharray=s,t.style.strokeDashoffset=s,e.addEventListener("click",(function(){window.scrollTo({top:0,behavior:"smooth"})}));let o=!1;window.addEventListener("scroll",(function(){o||(window.requestAnimationFrame((function(){i(),o=!1})),o=!0)})),i()}(),document.addEventListener("DOMContentLoaded",(function(){const e=document.getElementById("bannerCarousel");if(!e)return;const t=e.querySelectorAll('.banner-img[loading="lazy"]');if("IntersectionObserver"in window&&t.length>0){const e=new IntersectionObserver(((e,t)=>{e.forEach((e=>{if(e.isIntersecting){const n=e.target,s=n.closest(".carousel-item");s&&s.classList.add("loading"),n.onload=function(){n.classList.add("loaded"),s&&s.classList.remove("loading"),t.unobserve(n)},n.dataset.src?n.src=n.dataset.src:(n.classList.add("loaded"),s&&s.classList.remove("loading"))}}))}),{rootMargin:"100px"});t.forEach((t=>e.observe(t)))}else t.forEach((e=>e.classList.add("loaded")));if(e.addEventListener("slide.bs.carousel",(function(t){const n=e.querySelectorAll(".carousel-item"),s=t.to,i=n[s];if(i){const e=i.querySelector(".banner-img");e&&!e.classList.contains("loaded")&&e.classList.add("loaded")}[s-1<0?n.length-1:s-1,s+1>=n.length?0:s+1].forEach((e=>{const t=n[e];if(t){const e=t.querySelector(".banner-img");e&&!e.classList.contains("loaded")&&e.classList.add("loaded")}}))})),window.innerWidth>=768){let t=!1;e.addEventListener("mouseenter",(function(){t=!0;const n=bootstrap.Carousel.getInstance(e);n&&n.pause()})),e.addEventListener("mouseleave",(function(){if(t){t=!1;const n=bootstrap.Carousel.getInstance(e);n&&n.cycle()}}))}e.addEventListener("touchstart",(function(){const t=bootstrap.Carousel.getInstance(e);t&&t.pause()})),e.addEventListener("touchend",(function(){const t=bootstrap.Carousel.getInstance(e);t&&setTimeout((()=>t.cycle()),3e3)})),e.addEventListener("keydown",(function(t){const n=bootstrap.Carousel.getInstance(e);n&&("ArrowLeft"===t.key?(t.preventDefault(),n.prev()):"ArrowRight"===t.key&&(t.preventDefault(),n.next()))})),window.matchMedia("(prefers-reduced-motion: reduce)").matches&&(e.setAttribute("data-bs-interval","false"),e.querySelectorAll(".carousel-item").forEach((e=>{e.style.transition="none"})));e.querySelectorAll('.carousel-caption .btn[href^="#"]').forEach((e=>{e.addEventListener("click",(function(e){const t=this.getAttribute("href");if(t&&"#"!==t){const n=document.querySelector(t);n&&(e.preventDefault(),n.scrollIntoView({behavior:"smooth",block:"start"}))}}))})),setTimeout((()=>{e.querySelectorAll(".banner-img:not(.loaded)").forEach((e=>{e.classList.add("loaded");const t=e.closest(".carousel-item");t&&t.classList.remove("loading")}))}),3e3),"undefined"!=typeof gtag&&e.addEventListener("slid.bs.carousel",(function(t){const n=e.querySelector(".carousel-item.active"),s=n?.querySelector("h1, h2")?.textContent;gtag("event","banner_view",{event_category:"Banner",event_label:s||`Slide ${t.to+1}`,value:t.to+1})}));const n=e.querySelector(".banner-img");if(n){const e=n.getAttribute("src")||"";if(e.includes("cloudinary.com")||e.includes("imgix.net")){const t=document.createElement("link");t.rel="preconnect",t.href=e.includes("cloudinary")?"https://res.cloudinary.com":"https://assets.imgix.net",t.crossOrigin="anonymous",document.head.appendChild(t)}}})),window.addEventListener("resize",(function(){clearTimeout(resizeTimer),resizeTimer=setTimeout((function(){const e=document.getElementById("bannerCarousel");if(!e)return;e.querySelectorAll("picture").forEach((e=>{const t=e.querySelector("img");t&&(t.src=t.src)}))}),250)})),document.addEventListener("DOMContentLoaded",(()=>{const e=document.getElementById("page-loader");e&&setTimeout((()=>e.classList.add("hidden")),1e3)})),function(){"use strict";if(!document.querySelector("#featured-projects .project-slider"))return void console.warn("Featured Projects Swiper: Element not found");const e=new Swiper(".project-slider",{loop:!0,speed:700,slidesPerView:1,spaceBetween:0,pagination:{el:".project-pagination",clickable:!0},autoplay:{delay:4500,disableOnInteraction:!1,pauseOnMouseEnter:!0},keyboard:{enabled:!0,onlyInViewport:!0},a11y:{prevSlideMessage:"Dự án trước",nextSlideMessage:"Dự án tiếp theo",paginationBulletMessage:"Đi tới dự án {{index}}"},effect:"slide",on:{init:function(){console.log("Featured Projects Swiper: Initialized with",this.slides.length,"slides")}}});window.projectSwiper=e,console.log("Featured Projects Swiper: Ready")}();class ChatbotWidget{constructor(){this.isOpen=!1,this.isTyping=!1,this.remainingRequests=20,this.chatButton=document.getElementById("chatbotButton"),this.chatWidget=document.getElementById("chatbotWidget"),this.closeBtn=document.getElementById("chatbotCloseBtn"),this.messagesContainer=document.getElementById("chatbotMessages"),this.userInput=document.getElementById("chatbotInput"),this.sendBtn=document.getElementById("chatbotSendBtn"),this.resetBtn=document.getElementById("chatbotResetBtn"),this.requestCountEl=document.getElementById("requestCount"),this.chatButton&&this.chatWidget?this.init():console.error("Chatbot elements not found")}init(){this.chatButton.addEventListener("click",(()=>this.toggleChat())),this.closeBtn.addEventListener("click",(()=>this.toggleChat())),this.sendBtn.addEventListener("click",(()=>this.sendMessage())),this.resetBtn.addEventListener("click",(()=>this.resetChat())),this.userInput.addEventListener("keypress",(e=>{"Enter"!==e.key||e.shiftKey||(e.preventDefault(),this.sendMessage())})),console.log("Chatbot initialized successfully")}toggleChat(){this.isOpen=!this.isOpen,this.chatWidget.classList.toggle("active"),this.isOpen?(document.body.classList.add("chatbot-open"),this.scrollToBottom(),this.isMobile()&&(document.body.style.overflow="hidden",document.body.style.position="fixed",document.body.style.width="100%",document.body.style.top="0")):(document.body.classList.remove("chatbot-open"),this.isMobile()&&(document.body.style.overflow="",document.body.style.position="",document.body.style.width="",document.body.style.top=""))}isMobile(){return window.innerWidth<=768}async sendMessage(){const e=this.userInput.value.trim();if(e&&!this.isTyping)if(e.length>500)alert("Tin nhắn quá dài! Vui lòng nhập tối đa 500 ký tự.");else{this.addMessage(e,"user"),this.userInput.value="",this.setInputState(!1),this.showTyping();try{const t=await fetch("/chatbot/send",{method:"POST",headers:{"Content-Type":"application/json"},body:JSON.stringify({message:e})}),n=await t.json();this.hideTyping(),t.ok?(this.addMessage(n.response,"bot"),void 0!==n.remaining_requests&&(this.remainingRequests=n.remaining_requests,this.updateRequestCount())):this.addMessage(n.error||n.response||"Xin lỗi, đã có lỗi xảy ra. Vui lòng thử lại! 😊","bot")}catch(e){console.error("Chatbot error:",e),this.hideTyping(),this.addMessage("Xin lỗi, không thể kết nối đến server. Vui lòng kiểm tra kết nối mạng! 🔌","bot")}finally{this.setInputState(!0)}}}addMessage(e,t){const n=document.createElement("div");n.className=`chatbot-message ${t}`;const s=document.createElement("div");s.className="chatbot-message-content",s.innerHTML=this.escapeHtml(e).replace(/\n/g,"<br>"),n.appendChild(s),this.messagesContainer.appendChild(n),this.scrollToBottom()}escapeHtml(e){const t=document.createElement("div");return t.textContent=e,t.innerHTML}showTyping(){this.isTyping=!0;const e=document.createElement("div");e.className="chatbot-message bot",e.id="chatbotTypingIndicator";const t=document.createElement("div");t.className="chatbot-typing",t.innerHTML="<span></span><span></span><span></span>",e.appendChild(t),this.messagesContainer.appendChild(e),this.scrollToBottom()}hideTyping(){this.isTyping=!1;const e=document.getElementById("chatbotTypingIndicator");e&&e.remove()}setInputState(e){this.userInput.disabled=!e,this.sendBtn.disabled=!e,this.sendBtn.style.opacity=e?"1":"0.5"}scrollToBottom(){setTimeout((()=>{this.messagesContainer.scrollTop=this.messagesContainer.scrollHeight}),100)}async resetChat(){if(confirm("Bạn có chắc muốn làm mới hội thoại? Tất cả tin nhắn sẽ bị xóa."))try{if((await fetch("/chatbot/reset",{method:"POST",headers:{"Content-Type":"application/json"}})).ok){this.messagesContainer.querySelectorAll(".chatbot-message").forEach(((e,t)=>{t>0&&e.remove()})),this.remainingRequests=20,this.updateRequestCount(),this.addMessage("Đã làm mới hội thoại! Tôi có thể giúp gì cho bạn? 😊","bot")}}catch(e){console.error("Reset error:",e),alert("Không thể làm mới hội thoại. Vui lòng thử lại!")}}updateRequestCount(){this.requestCountEl&&(this.requestCountEl.textContent=`Còn ${this.remainingRequests} tin nhắn`)}}document.addEventListener("DOMContentLoaded",(()=>{document.getElementById("chatbotButton")&&new ChatbotWidget})),function(){"use strict";window.BlogCarousel=window.BlogCarousel||{};const e=window.BlogCarousel;function t(){e.createOnce()}e.state={isCreated:!1,carouselInstance:null},e.config={transitionDuration:400,snapThreshold:.3},e.createOnce=function(){if(this.state.isCreated)return void console.log("📱 Blog Carousel: Already exists, ensuring visibility");const e=document.querySelector("#featured-blogs-section");if(!e)return void console.log("📱 Blog Carousel: Section not found");const t=e.querySelector(".row.g-4");if(!t)return void console.log("📱 Blog Carousel: Grid not found");const n=t.querySelectorAll(".col-lg-4");if(0===n.length)return void console.log("📱 Blog Carousel: No blog cards found");const s=document.createElement("div");s.className="blog-carousel-wrapper";const i=document.createElement("div");i.className="blog-carousel-container";const o=document.createElement("div");o.className="blog-carousel-track",n.forEach((e=>{const t=document.createElement("div");t.className="blog-carousel-slide",t.innerHTML=e.innerHTML,o.appendChild(t)}));const a=document.createElement("button");a.className="blog-carousel-nav-btn blog-carousel-prev",a.innerHTML='<i class="bi bi-chevron-left"></i>',a.setAttribute("aria-label","Previous");const r=document.createElement("button");r.className="blog-carousel-nav-btn blog-carousel-next",r.innerHTML='<i class="bi bi-chevron-right"></i>',r.setAttribute("aria-label","Next"),i.appendChild(o),s.appendChild(i),s.appendChild(a),s.appendChild(r),t.parentNode.insertBefore(s,t),this.state.carouselInstance=this.setupCarousel(o,i,a,r),this.state.isCreated=!0,console.log(`✅ Blog Carousel: Created with ${n.length} cards (PERMANENT)`)},e.setupCarousel=function(t,n,s,i){const o=t.querySelectorAll(".blog-carousel-slide");let a,r=0,c=1,l=!1,d=0,u=0,h=0,g=0;function m(){const e=window.innerWidth;e<768?c=1:e<=991&&(c=2)}function p(){return n.offsetWidth/c}function f(n=!0){const s=p(),i=-r*s;t.style.transition=n?`transform ${e.config.transitionDuration}ms cubic-bezier(0.25, 0.46, 0.45, 0.94)`:"none",t.style.transform=`translateX(${i}px)`,u=i,h=i}function v(){const e=o.length-c;r<e?r++:r=0,f()}function b(){r>0?r--:r=o.length-c,f()}function y(e){const t=o.length-c;r=Math.max(0,Math.min(e,t)),f()}function w(e){return e.type.includes("mouse")?e.pageX:e.touches[0].clientX}function E(e){l=!0,d=w(e),g=0,t.style.cursor="grabbing",t.style.transition="none",e.type}function L(e){if(!l)return;const n=w(e);g=n-d,u=h+g,t.style.transform=`translateX(${u}px)`,Math.abs(g)>10&&e.preventDefault()}function C(){if(!l)return;l=!1,t.style.cursor="grab";const n=p(),s=g;Math.abs(s)/n>e.config.snapThreshold||Math.abs(s)>50?s<0?v():b():f()}return t.addEventListener("mousedown",E),t.addEventListener("mousemove",L),t.addEventListener("mouseup",C),t.addEventListener("mouseleave",C),t.addEventListener("touchstart",E,{passive:!0}),t.addEventListener("touchmove",L,{passive:!1}),t.addEventListener("touchend",C),t.addEventListener("click",(function(e){if(Math.abs(g)>5)return e.preventDefault(),e.stopPropagation(),!1}),!0),t.addEventListener("mousedown",(function(e){g=0})),t.addEventListener("touchstart",(function(e){g=0})),s.addEventListener("click",(function(e){e.preventDefault(),b()})),i.addEventListener("click",(function(e){e.preventDefault(),v()})),t.style.cursor="grab",t.style.userSelect="none",document.addEventListener("keydown",(function(e){n.closest(".blog-carousel-wrapper")&&("ArrowLeft"===e.key?(e.preventDefault(),b()):"ArrowRight"===e.key&&(e.preventDefault(),v()))})),window.addEventListener("resize",(()=>{clearTimeout(a),a=setTimeout((()=>{m(),y(r)}),250)})),m(),f(),{next:v,prev:b,goToSlide:y,updateItemsPerView:m,updateCarousel:f,getCurrentIndex:()=>r}},"loading"===document.readyState?document.addEventListener("DOMContentLoaded",t):t(),window.addEventListener("pageshow",(function(e){console.log("📱 pageshow:",e.persisted?"from cache":"normal load"),t()})),console.log("📦 Blog Carousel: Module loaded (Smooth drag + Infinite loop)")}(),function(){"use strict";window.BannerEffect=window.BannerEffect||{};const e=window.BannerEffect;e.config={carouselId:"bannerCarousel",animationDelay:100,animationTypes:["banner-fade-in","banner-slide-up","banner-slide-left","banner-zoom-in"],defaultAnimation:"banner-fade-in",observerThreshold:.2,enableIntersectionObserver:!0,dragThreshold:50,enableDrag:!0},e.state={carousel:null,captions:[],hasAnimated:!1,isInitialized:!1,currentAnimation:null,bsCarousel:null,isDragging:!1,startX:0,currentX:0,dragStartTime:0},e.init=function(){console.log("🎬 Banner Effect: Initializing..."),this.state.carousel=document.getElementById(this.config.carouselId),this.state.carousel?("undefined"!=typeof bootstrap&&bootstrap.Carousel&&(this.state.bsCarousel=bootstrap.Carousel.getInstance(this.state.carousel)||new bootstrap.Carousel(this.state.carousel,{ride:"carousel",interval:5e3,pause:"hover"})),this.state.captions=Array.from(this.state.carousel.querySelectorAll(".carousel-caption")),0!==this.state.captions.length?(this.setupInitialAnimation(),this.setupCarouselEvents(),this.config.enableIntersectionObserver?this.setupIntersectionObserver():this.animateCaption(this.state.captions[0]),this.config.enableDrag&&this.setupDragEvents(),this.state.isInitialized=!0,console.log("✅ Banner Effect: Initialized successfully (with drag/swipe)")):console.warn("Banner Effect: No captions found")):console.warn("Banner Effect: Carousel not found")},e.setupInitialAnimation=function(){this.state.captions.forEach(((e,t)=>{const n=e.dataset.animation||this.config.defaultAnimation;e.dataset.animationType=n,e.classList.remove(...this.config.animationTypes),e.style.opacity="0",e.style.visibility="hidden"}))},e.animateCaption=function(e){if(!e)return;const t=e.dataset.animationType||this.config.defaultAnimation;e.classList.remove(...this.config.animationTypes),setTimeout((()=>{e.style.visibility="visible",e.classList.add(t),this.state.currentAnimation=t}),this.config.animationDelay)},e.setupCarouselEvents=function(){this.state.carousel.addEventListener("slide.bs.carousel",(e=>{const t=e.to,n=this.state.captions[t];n&&(this.state.captions.forEach((e=>{e.classList.remove(...this.config.animationTypes),e.style.opacity="0",e.style.visibility="hidden"})),this.animateCaption(n))})),this.state.carousel.addEventListener("slid.bs.carousel",(e=>{console.log(`Banner slid to index: ${e.to}`)}))},e.setupIntersectionObserver=function(){if("IntersectionObserver"in window){const e={threshold:this.config.observerThreshold,rootMargin:"0px"},t=new IntersectionObserver((e=>{e.forEach((e=>{if(e.isIntersecting&&!this.state.hasAnimated){const n=this.state.carousel.querySelector(".carousel-item.active"),s=n?n.querySelector(".carousel-caption"):this.state.captions[0];s&&(this.animateCaption(s),this.state.hasAnimated=!0,t.unobserve(e.target))}}))}),e);t.observe(this.state.carousel)}else this.animateCaption(this.state.captions[0]),this.state.hasAnimated=!0},e.setupDragEvents=function(){const e=this.state.carousel;e.style.cursor="grab",e.addEventListener("mousedown",this.handleDragStart.bind(this)),e.addEventListener("mousemove",this.handleDragMove.bind(this)),e.addEventListener("mouseup",this.handleDragEnd.bind(this)),e.addEventListener("mouseleave",this.handleDragEnd.bind(this)),e.addEventListener("touchstart",this.handleDragStart.bind(this),{passive:!0}),e.addEventListener("touchmove",this.handleDragMove.bind(this),{passive:!0}),e.addEventListener("touchend",this.handleDragEnd.bind(this)),e.addEventListener("contextmenu",(e=>{this.state.isDragging&&e.preventDefault()}));e.querySelectorAll("img").forEach((e=>{e.addEventListener("dragstart",(e=>e.preventDefault()))})),console.log("👆 Banner Effect: Drag/Swipe enabled")},e.handleDragStart=function(e){e.target.closest("a, button")||(this.state.isDragging=!0,this.state.startX=this.getPositionX(e),this.state.currentX=this.state.startX,this.state.dragStartTime=Date.now(),this.state.carousel.style.cursor="grabbing",this.state.bsCarousel&&this.state.bsCarousel.pause())},e.handleDragMove=function(e){this.state.isDragging&&(this.state.currentX=this.getPositionX(e))},e.handleDragEnd=function(e){if(!this.state.isDragging)return;this.state.isDragging=!1,this.state.carousel.style.cursor="grab";const t=this.state.currentX-this.state.startX,n=Date.now()-this.state.dragStartTime,s=Math.abs(t)/n;(Math.abs(t)>this.config.dragThreshold||s>.5)&&this.state.bsCarousel&&(t>0?this.state.bsCarousel.prev():this.state.bsCarousel.next()),setTimeout((()=>{this.state.bsCarousel&&this.state.bsCarousel.cycle()}),300),this.state.startX=0,this.state.currentX=0,this.state.dragStartTime=0},e.getPositionX=function(e){return e.type.includes("mouse")?e.pageX:e.touches[0].clientX},e.setAnimationType=function(e){this.config.animationTypes.includes(e)?(this.config.defaultAnimation=e,console.log(`Banner Effect: Animation type set to ${e}`)):console.warn(`Banner Effect: Invalid animation type "${e}"`)},e.toggleDrag=function(e){this.config.enableDrag=e,e&&this.state.isInitialized&&this.setupDragEvents(),console.log("Banner Effect: Drag "+(e?"enabled":"disabled"))},e.refresh=function(){if(!this.state.isInitialized)return;console.log("🔄 Banner Effect: Refreshing..."),this.setupInitialAnimation();const e=this.state.carousel.querySelector(".carousel-item.active .carousel-caption");e&&this.animateCaption(e)},e.destroy=function(){this.state.isInitialized&&(console.log("🗑️ Banner Effect: Destroying..."),this.state.captions.forEach((e=>{e.classList.remove(...this.config.animationTypes),e.style.opacity="",e.style.visibility=""})),this.state.carousel&&(this.state.carousel.style.cursor=""),this.state={carousel:null,captions:[],hasAnimated:!1,isInitialized:!1,currentAnimation:null,bsCarousel:null,isDragging:!1,startX:0,currentX:0,dragStartTime:0})},"loading"===document.readyState?document.addEventListener("DOMContentLoaded",(()=>{e.init()})):e.init(),window.addEventListener("load",(()=>{e.state.isInitialized||e.init()})),window.addEventListener("beforeunload",(()=>{e.destroy()})),console.log("📦 Banner Effect: Module loaded (with drag/swipe support)")}(),function(){"use strict";window.Newsletter=window.Newsletter||{};const e=window.Newsletter;e.init=function(){const e=document.getElementById("newsletterForm");e&&(e.addEventListener("submit",this.handleSubmit.bind(this)),console.log("✅ Newsletter: Initialized"))},e.handleSubmit=async function(e){e.preventDefault();const t=e.target,n=t.querySelector("#newsletter-email"),s=t.querySelector("#newsletter-consent"),i=document.getElementById("newsletterMessage"),o=t.querySelector("#newsletter-submit-btn"),a=o.querySelector(".btn-text"),r=o.querySelector(".btn-icon"),c=o.querySelector(".btn-spinner");if(i.className="newsletter-message",i.textContent="",!n.value.trim())return this.showMessage(i,"Vui lòng nhập email!","error"),void n.focus();if(s.checked){o.disabled=!0,a.classList.add("d-none"),r.classList.add("d-none"),c.classList.remove("d-none");try{const e=await fetch("/newsletter/subscribe",{method:"POST",headers:{"Content-Type":"application/json","X-Requested-With":"XMLHttpRequest"},body:JSON.stringify({email:n.value.trim(),consent:s.checked})}),o=await e.json();e.ok&&o.success?(this.showMessage(i,o.message,"success"),t.reset(),"undefined"!=typeof gtag&&gtag("event","newsletter_signup",{event_category:"Newsletter",event_label:"Success"})):this.showMessage(i,o.message||"Có lỗi xảy ra!","error")}catch(e){console.error("Newsletter subscription error:",e),this.showMessage(i,"Không thể kết nối đến server. Vui lòng thử lại!","error")}finally{o.disabled=!1,a.classList.remove("d-none"),r.classList.remove("d-none"),c.classList.add("d-none")}}else this.showMessage(i,"Vui lòng đồng ý nhận email marketing!","error")},e.showMessage=function(e,t,n){e.textContent=t,e.className=`newsletter-message ${n}`,"success"===n&&setTimeout((()=>{e.style.opacity="0",setTimeout((()=>{e.className="newsletter-message",e.textContent="",e.style.opacity="1"}),300)}),5e3)},"loading"===document.readyState?document.addEventListener("DOMContentLoaded",(()=>e.init())):e.init()}(),function(){"use strict";const e={contentSelector:".blog-content-detail",tocContainerId:"blog-toc-container",inlineTocContainerId:"blog-inline-toc-content",headingSelectors:"h2, h3, h4",activeClass:"active",scrollOffset:100,observerRootMargin:"-100px 0px -66%",smoothScrollBehavior:"smooth"};function t(e){return parseInt(e.tagName.substring(1))}function n(){const n=document.getElementById(e.tocContainerId),s=document.getElementById(e.inlineTocContainerId),i=document.querySelector(e.contentSelector);if(!i)return;const o=function(n){const s=n.querySelectorAll(e.headingSelectors),i=new Set,o=[];return s.forEach(((e,n)=>{if(e.id)i.add(e.id);else{const t=e.textContent.trim().toLowerCase().normalize("NFD").replace(/[\u0300-\u036f]/g,"").replace(/đ/g,"d").replace(/[^a-z0-9\s-]/g,"").trim().replace(/\s+/g,"-").replace(/-+/g,"-").substring(0,50);e.id=function(e,t){let n=e,s=1;for(;t.has(n);)n=`${e}-${s}`,s++;return t.add(n),n}(t,i)}o.push({id:e.id,text:e.textContent.trim(),level:t(e),element:e})})),o}(i);if(0!==o.length){if(n){const t=function(t){if(0===t.length)return'<p class="text-muted small">Không có mục lục</p>';let n='<nav class="blog-toc-nav" aria-label="Mục lục bài viết"><ul class="blog-toc-list">';return t.forEach(((t,s)=>{const i=`toc-level-${t.level}`,o=0===s;n+=`\n        <li class="blog-toc-item ${i}">\n          <a href="#${t.id}"\n             class="blog-toc-link ${o?e.activeClass:""}"\n             data-target="${t.id}"\n             title="${t.text}">\n            ${t.text}\n          </a>\n        </li>\n      `})),n+="</ul></nav>",n}(o);n.innerHTML=t}if(s){const e=function(e){if(0===e.length)return"";let t='<ul class="blog-inline-toc-list">';return e.forEach((e=>{const n=`inline-toc-level-${e.level}`;t+=`\n        <li class="blog-inline-toc-item ${n}">\n          <a href="#${e.id}"\n             class="blog-inline-toc-link"\n             data-target="${e.id}"\n             title="${e.text}">\n            ${e.text}\n          </a>\n        </li>\n      `})),t+="</ul>",t}(o);s.innerHTML=e}if(n){const t=function(t){const n=document.querySelectorAll(".blog-toc-link"),s=new Map;n.forEach((e=>{const t=e.getAttribute("data-target");s.set(t,e)}));const i=new IntersectionObserver((t=>{t.forEach((t=>{const i=s.get(t.target.id);t.isIntersecting&&(n.forEach((t=>t.classList.remove(e.activeClass))),i&&(i.classList.add(e.activeClass),i.scrollIntoView({behavior:"smooth",block:"nearest"})))}))}),{rootMargin:e.observerRootMargin,threshold:[0,1]});return t.forEach((e=>{i.observe(e.element)})),i}(o);window.addEventListener("beforeunload",(()=>{t.disconnect()}))}document.addEventListener("click",(t=>{const n=t.target.closest(".blog-toc-link, .blog-inline-toc-link");if(!n)return;t.preventDefault();const s=n.getAttribute("data-target"),i=document.getElementById(s);if(i){const t=e.scrollOffset,n=i.getBoundingClientRect().top+window.pageYOffset-t;window.scrollTo({top:n,behavior:e.smoothScrollBehavior})}}))}else if(n&&(n.style.display="none"),s){const e=document.getElementById("blog-inline-toc-container");e&&(e.style.display="none")}}"loading"===document.readyState?document.addEventListener("DOMContentLoaded",n):n()}(),function(){"use strict";const e={holdTimer:null,holdDelay:200,init:function(){this.setupEventListeners()},setupEventListeners:function(){document.querySelectorAll(".nav-item.dropdown").forEach((e=>{const t=e.querySelector(".nav-link.dropdown-toggle"),n=e.querySelector(".dropdown-menu");t&&n&&(e.classList.add("hold-hien-dropdown"),t.addEventListener("mouseenter",(()=>{this.startHoldTimer(e)})),t.addEventListener("mouseleave",(()=>{this.cancelHoldTimer()})),n.addEventListener("mouseenter",(()=>{this.cancelHoldTimer()})),n.addEventListener("mouseleave",(()=>{this.hideDropdown(e)})),t.addEventListener("click",(t=>{t.preventDefault(),this.toggleDropdown(e)})))})),document.addEventListener("click",(e=>{e.target.closest(".nav-item.hold-hien-dropdown")||this.hideAllDropdowns()}))},startHoldTimer:function(e){this.cancelHoldTimer(),this.holdTimer=setTimeout((()=>{this.showDropdown(e)}),this.holdDelay)},cancelHoldTimer:function(){this.holdTimer&&(clearTimeout(this.holdTimer),this.holdTimer=null)},showDropdown:function(e){this.hideAllDropdowns(),e.classList.add("show")},hideDropdown:function(e){e.classList.remove("show")},toggleDropdown:function(e){const t=e.classList.contains("show");this.hideAllDropdowns(),t||e.classList.add("show")},hideAllDropdowns:function(){document.querySelectorAll(".nav-item.hold-hien-dropdown.show").forEach((e=>{e.classList.remove("show")}))}};"loading"===document.readyState?document.addEventListener("DOMContentLoaded",(()=>{e.init()})):e.init(),window.holdHienDropdown=e}(),document.addEventListener("DOMContentLoaded",(function(){const e=document.getElementById("productLightbox"),t=document.getElementById("lightboxImage"),n=new bootstrap.Modal(e);document.querySelectorAll(".lightbox-trigger").forEach((e=>{e.addEventListener("click",(function(e){e.preventDefault();const s=this.getAttribute("data-image"),i=this.getAttribute("data-title");t.src=s,t.alt=i,n.show()}))})),e.addEventListener("hidden.bs.modal",(function(){t.src=""}))})),function(){"use strict";class e{constructor(e,t){this.input=document.querySelector(e),this.resultsContainer=document.querySelector(t),this.debounceTimer=null,this.currentFocus=-1,this.cache=new Map,this.input&&this.resultsContainer&&this.init()}init(){this.input.addEventListener("input",(e=>this.handleInput(e))),this.input.addEventListener("keydown",(e=>this.handleKeydown(e))),this.input.addEventListener("focus",(()=>{this.input.value.trim().length>=2&&(this.resultsContainer.style.display="block")})),document.addEventListener("click",(e=>{this.input.contains(e.target)||this.resultsContainer.contains(e.target)||this.hideResults()})),this.input.closest("form")?.addEventListener("submit",(e=>{this.currentFocus>=0&&(e.preventDefault(),this.selectItem(this.currentFocus))}))}handleInput(e){const t=e.target.value.trim();clearTimeout(this.debounceTimer),t.length<2?this.hideResults():this.debounceTimer=setTimeout((()=>{this.fetchSuggestions(t)}),300)}async fetchSuggestions(e){if(this.cache.has(e))this.renderResults(this.cache.get(e));else try{this.showLoading();const t=await fetch(`/api/search-suggestions?q=${encodeURIComponent(e)}`),n=await t.json();if(this.cache.set(e,n.suggestions),this.cache.size>20){const e=this.cache.keys().next().value;this.cache.delete(e)}this.renderResults(n.suggestions)}catch(e){console.error("Search error:",e),this.hideResults()}}showLoading(){this.resultsContainer.innerHTML='\n        <div class="search-autocomplete-loading">\n          <div class="spinner-border spinner-border-sm text-warning" role="status">\n            <span class="visually-hidden">Đang tìm...</span>\n          </div>\n          <span class="ms-2">Đang tìm kiếm...</span>\n        </div>\n      ',this.resultsContainer.style.display="block"}renderResults(e){if(!e||0===e.length)return this.resultsContainer.innerHTML='\n          <div class="search-autocomplete-empty">\n            <i class="bi bi-search"></i>\n            <span>Không tìm thấy kết quả phù hợp</span>\n          </div>\n        ',void(this.resultsContainer.style.display="block");const t={page:[],product:[],blog:[]};e.forEach((e=>{t[e.type]&&t[e.type].push(e)}));let n="";t.page.length>0&&(n+='<div class="search-autocomplete-group">',n+='<div class="search-autocomplete-group-title"><i class="bi bi-file-text"></i> Trang thông tin</div>',t.page.forEach(((e,t)=>{n+=this.renderItem(e,t)})),n+="</div>"),t.product.length>0&&(n+='<div class="search-autocomplete-group">',n+='<div class="search-autocomplete-group-title"><i class="bi bi-box-seam"></i> Sản phẩm</div>',t.product.forEach(((e,s)=>{n+=this.renderItem(e,t.page.length+s)})),n+="</div>"),t.blog.length>0&&(n+='<div class="search-autocomplete-group">',n+='<div class="search-autocomplete-group-title"><i class="bi bi-journal-text"></i> Bài viết</div>',t.blog.forEach(((e,s)=>{n+=this.renderItem(e,t.page.length+t.product.length+s)})),n+="</div>"),this.resultsContainer.innerHTML=n,this.resultsContainer.style.display="block",this.currentFocus=-1}renderItem(e,t){const n=e.image?`<img src="${e.image}" alt="${e.title}" class="search-autocomplete-image">`:"";return`\n        <a href="${e.url}"\n           class="search-autocomplete-item type-${e.type}"\n           data-index="${t}">\n          ${n}\n          <span class="search-autocomplete-title">${this.highlightKeyword(e.title)}</span>\n        </a>\n      `}highlightKeyword(e){const t=this.input.value.trim();if(!t)return e;const n=new RegExp(`(${t})`,"gi");return e.replace(n,"<mark>$1</mark>")}handleKeydown(e){const t=this.resultsContainer.querySelectorAll(".search-autocomplete-item");0!==t.length&&("ArrowDown"===e.key?(e.preventDefault(),this.currentFocus++,this.currentFocus>=t.length&&(this.currentFocus=0),this.setActive(t)):"ArrowUp"===e.key?(e.preventDefault(),this.currentFocus--,this.currentFocus<0&&(this.currentFocus=t.length-1),this.setActive(t)):"Enter"===e.key?this.currentFocus>=0&&(e.preventDefault(),t[this.currentFocus].click()):"Escape"===e.key&&(this.hideResults(),this.input.blur()))}setActive(e){e.forEach(((e,t)=>{t===this.currentFocus?(e.classList.add("active"),e.scrollIntoView({block:"nearest",behavior:"smooth"})):e.classList.remove("active")}))}selectItem(e){const t=this.resultsContainer.querySelectorAll(".search-autocomplete-item");t[e]&&t[e].click()}hideResults(){this.resultsContainer.style.display="none",this.currentFocus=-1}}function t(){new e(".header-search-input","#search-autocomplete-results"),new e('#searchModal input[name="q"]',"#search-autocomplete-results-mobile"),console.log("✅ Search Autocomplete: Initialized")}"loading"===document.readyState?document.addEventListener("DOMContentLoaded",t):t()}();
\ No newline at end of file
+/*! 
+ * ============================================================================
+ * Main JavaScript Build
+ * ============================================================================
+ * Generated: 17/10/2026 23:37:44
+ * Modules: 21 files
+ * Description: Auto-generated optimized JavaScript
+ * DO NOT EDIT THIS FILE DIRECTLY - Edit individual modules instead
+ * ============================================================================
+ */
+
+"use strict";
+
+window.addEventListener("scroll",function(){const floatingButtons=document.querySelector(".floating-buttons");if(floatingButtons){floatingButtons.style.display="flex";}});
+const observerOptions={threshold:0.1,rootMargin:"0px 0px -50px 0px",};const observer=new IntersectionObserver(function(entries){entries.forEach((entry)=>{if(entry.isIntersecting){entry.target.classList.add("animate-on-scroll");}});},observerOptions);document.addEventListener("DOMContentLoaded",function(){const cards=document.querySelectorAll(".product-card, .blog-card");cards.forEach((card)=>{observer.observe(card);});});
+document.addEventListener("DOMContentLoaded",function(){const alerts=document.querySelectorAll(".alert.alert-dismissible");alerts.forEach((alert)=>{setTimeout(()=>{const bsAlert=new bootstrap.Alert(alert);bsAlert.close();},3000);});});
+document.addEventListener("DOMContentLoaded",function(){const searchForms=document.querySelectorAll('form[action*="search"]');searchForms.forEach((form)=>{form.addEventListener("submit",function(e){const input=form.querySelector('input[name="q"], input[name="search"]');if(input&&input.value.trim()===""){e.preventDefault();alert("Vui lòng nhập từ khóa tìm kiếm");}});});});
+if("loading"in HTMLImageElement.prototype){const images=document.querySelectorAll("img[data-src]");images.forEach((img)=>{img.src=img.dataset.src;});}else{const script=document.createElement("script");script.src="https://cdnjs.cloudflare.com/ajax/libs/lazysizes/5.3.2/lazysizes.min.js";document.body.appendChild(script);}
+document.addEventListener("DOMContentLoaded",function(){document.querySelectorAll('a[href*="#"]').forEach((anchor)=>{anchor.addEventListener("click",function(e){if(this.hasAttribute("data-bs-toggle")){return;}
+const href=this.getAttribute("href");if(href==="#"){return;}
+const targetId=href.includes("#")?href.split("#")[1]:null;if(targetId){const target=document.getElementById(targetId);if(target){e.preventDefault();const offsetTop=target.offsetTop-120;window.scrollTo({top:offsetTop,behavior:"smooth",});}}});});});
+(function(){const scrollToTopBtn=document.getElementById("scrollToTop");if(!scrollToTopBtn)return;const progressCircle=scrollToTopBtn.querySelector("circle.progress");const radius=progressCircle.r.baseVal.value;const circumference=2*Math.PI*radius;progressCircle.style.strokeDasharray=circumference;progressCircle.style.strokeDashoffset=circumference;function updateProgress(){const scrollTop=window.pageYOffset||document.documentElement.scrollTop;const scrollHeight=document.documentElement.scrollHeight-document.documentElement.clientHeight;const scrollPercentage=(scrollTop/scrollHeight)*100;const offset=circumference-(scrollPercentage/100)*circumference;progressCircle.style.strokeDashoffset=offset;if(scrollTop>300){scrollToTopBtn.classList.add("show");}else{scrollToTopBtn.classList.remove("show");}}
+scrollToTopBtn.addEventListener("click",function(){window.scrollTo({top:0,behavior:"smooth",});});let ticking=false;window.addEventListener("scroll",function(){if(!ticking){window.requestAnimationFrame(function(){updateProgress();ticking=false;});ticking=true;}});updateProgress();})();
+document.addEventListener("DOMContentLoaded",function(){const carousel=document.getElementById("bannerCarousel");if(!carousel)return;const lazyBannerImages=carousel.querySelectorAll('.banner-img[loading="lazy"]');if("IntersectionObserver"in window&&lazyBannerImages.length>0){const bannerObserver=new IntersectionObserver((entries,observer)=>{entries.forEach((entry)=>{if(entry.isIntersecting){const img=entry.target;const parent=img.closest(".carousel-item");if(parent)parent.classList.add("loading");img.onload=function(){img.classList.add("loaded");if(parent)parent.classList.remove("loading");observer.unobserve(img);};if(img.dataset.src){img.src=img.dataset.src;}else{img.classList.add("loaded");if(parent)parent.classList.remove("loading");}}});},{rootMargin:"100px",});lazyBannerImages.forEach((img)=>bannerObserver.observe(img));}else{lazyBannerImages.forEach((img)=>img.classList.add("loaded"));}
+carousel.addEventListener("slide.bs.carousel",function(e){const slides=carousel.querySelectorAll(".carousel-item");const nextIndex=e.to;const currentSlide=slides[nextIndex];if(currentSlide){const currentImg=currentSlide.querySelector(".banner-img");if(currentImg&&!currentImg.classList.contains("loaded")){currentImg.classList.add("loaded");}}
+const prevIndex=nextIndex-1<0?slides.length-1:nextIndex-1;const nextSlideIndex=nextIndex+1>=slides.length?0:nextIndex+1;[prevIndex,nextSlideIndex].forEach((index)=>{const slide=slides[index];if(slide){const img=slide.querySelector(".banner-img");if(img&&!img.classList.contains("loaded")){img.classList.add("loaded");}}});});if(window.innerWidth>=768){let isHovering=false;carousel.addEventListener("mouseenter",function(){isHovering=true;const bsCarousel=bootstrap.Carousel.getInstance(carousel);if(bsCarousel)bsCarousel.pause();});carousel.addEventListener("mouseleave",function(){if(isHovering){isHovering=false;const bsCarousel=bootstrap.Carousel.getInstance(carousel);if(bsCarousel)bsCarousel.cycle();}});}
+carousel.addEventListener("touchstart",function(){const bsCarousel=bootstrap.Carousel.getInstance(carousel);if(bsCarousel)bsCarousel.pause();});carousel.addEventListener("touchend",function(){const bsCarousel=bootstrap.Carousel.getInstance(carousel);if(bsCarousel){setTimeout(()=>bsCarousel.cycle(),3000);}});carousel.addEventListener("keydown",function(e){const bsCarousel=bootstrap.Carousel.getInstance(carousel);if(!bsCarousel)return;if(e.key==="ArrowLeft"){e.preventDefault();bsCarousel.prev();}else if(e.key==="ArrowRight"){e.preventDefault();bsCarousel.next();}});if(window.matchMedia("(prefers-reduced-motion: reduce)").matches){carousel.setAttribute("data-bs-interval","false");carousel.querySelectorAll(".carousel-item").forEach((item)=>{item.style.transition="none";});}
+const bannerCTAs=carousel.querySelectorAll('.carousel-caption .btn[href^="#"]');bannerCTAs.forEach((btn)=>{btn.addEventListener("click",function(e){const href=this.getAttribute("href");if(href&&href!=="#"){const target=document.querySelector(href);if(target){e.preventDefault();target.scrollIntoView({behavior:"smooth",block:"start",});}}});});setTimeout(()=>{const unloadedImages=carousel.querySelectorAll(".banner-img:not(.loaded)");unloadedImages.forEach((img)=>{img.classList.add("loaded");const parent=img.closest(".carousel-item");if(parent)parent.classList.remove("loading");});},3000);if(typeof gtag!=="undefined"){carousel.addEventListener("slid.bs.carousel",function(e){const activeSlide=carousel.querySelector(".carousel-item.active");const bannerTitle=activeSlide?.querySelector("h1, h2")?.textContent;gtag("event","banner_view",{event_category:"Banner",event_label:bannerTitle||`Slide ${e.to + 1}`,value:e.to+1,});});}
+const firstBanner=carousel.querySelector(".banner-img");if(firstBanner){const src=firstBanner.getAttribute("src")||"";if(src.includes("cloudinary.com")||src.includes("imgix.net")){const preconnect=document.createElement("link");preconnect.rel="preconnect";preconnect.href=src.includes("cloudinary")?"https://res.cloudinary.com":"https://assets.imgix.net";preconnect.crossOrigin="anonymous";document.head.appendChild(preconnect);}}});
+let resizeTimer;window.addEventListener("resize",function(){clearTimeout(resizeTimer);resizeTimer=setTimeout(function(){const carousel=document.getElementById("bannerCarousel");if(!carousel)return;const pictures=carousel.querySelectorAll("picture");pictures.forEach((picture)=>{const img=picture.querySelector("img");if(img){img.src=img.src;}});},250);});
+document.addEventListener("DOMContentLoaded",()=>{const loader=document.getElementById("page-loader");if(loader){setTimeout(()=>loader.classList.add("hidden"),1000);}});
+(function(){"use strict";const swiperElement=document.querySelector("#featured-projects .project-slider");if(!swiperElement){console.warn("Featured Projects Swiper: Element not found");return;}
+const projectSwiper=new Swiper(".project-slider",{loop:true,speed:700,slidesPerView:1,spaceBetween:0,pagination:{el:".project-pagination",clickable:true,},autoplay:{delay:4500,disableOnInteraction:false,pauseOnMouseEnter:true,},keyboard:{enabled:true,onlyInViewport:true,},a11y:{prevSlideMessage:'Dự án trước',nextSlideMessage:'Dự án tiếp theo',paginationBulletMessage:'Đi tới dự án {{index}}',},effect:'slide',on:{init:function(){console.log('Featured Projects Swiper: Initialized with',this.slides.length,'slides');},},});window.projectSwiper=projectSwiper;console.log("Featured Projects Swiper: Ready");})();
+class ChatbotWidget{constructor(){this.isOpen=false;this.isTyping=false;this.remainingRequests=20;this.chatButton=document.getElementById("chatbotButton");this.chatWidget=document.getElementById("chatbotWidget");this.closeBtn=document.getElementById("chatbotCloseBtn");this.messagesContainer=document.getElementById("chatbotMessages");this.userInput=document.getElementById("chatbotInput");this.sendBtn=document.getElementById("chatbotSendBtn");this.resetBtn=document.getElementById("chatbotResetBtn");this.requestCountEl=document.getElementById("requestCount");if(!this.chatButton||!this.chatWidget){console.error("Chatbot elements not found");return;}
+this.init();}
+init(){this.chatButton.addEventListener("click",()=>this.toggleChat());this.closeBtn.addEventListener("click",()=>this.toggleChat());this.sendBtn.addEventListener("click",()=>this.sendMessage());this.resetBtn.addEventListener("click",()=>this.resetChat());this.userInput.addEventListener("keypress",(e)=>{if(e.key==="Enter"&&!e.shiftKey){e.preventDefault();this.sendMessage();}});console.log("Chatbot initialized successfully");}
+toggleChat(){this.isOpen=!this.isOpen;this.chatWidget.classList.toggle("active");if(this.isOpen){document.body.classList.add("chatbot-open");this.scrollToBottom();if(this.isMobile()){document.body.style.overflow="hidden";document.body.style.position="fixed";document.body.style.width="100%";document.body.style.top="0";}}else{document.body.classList.remove("chatbot-open");if(this.isMobile()){document.body.style.overflow="";document.body.style.position="";document.body.style.width="";document.body.style.top="";}}}
+isMobile(){return window.innerWidth<=768;}
+async sendMessage(){const message=this.userInput.value.trim();if(!message||this.isTyping){return;}
+if(message.length>500){alert("Tin nhắn quá dài! Vui lòng nhập tối đa 500 ký tự.");return;}
+this.addMessage(message,"user");this.userInput.value="";this.setInputState(false);this.showTyping();try{const response=await fetch("/chatbot/stream",{method:"POST",headers:{"Content-Type":"application/json",Accept:"text/event-stream",},body:JSON.stringify({message:message}),});const contentType=response.headers.get("Content-Type")||"";if(response.ok&&response.body&&contentType.includes("text/event-stream")){await this.readStream(response);}else{const data=await response.json();this.hideTyping();this.handleReply(response.ok,data);}}catch(error){console.error("Chatbot error:",error);this.hideTyping();this.addMessage("Xin lỗi, không thể kết nối đến server. Vui lòng kiểm tra kết nối mạng! 🔌","bot");}finally{this.setInputState(true);}}
+async readStream(response){const reader=response.body.getReader();const decoder=new TextDecoder();let buffer="";let text="";let contentDiv=null;const render=(value)=>{if(!contentDiv){this.hideTyping();contentDiv=this.addMessage("","bot");}
+contentDiv.innerHTML=this.escapeHtml(value).replace(/\n/g,"<br>");this.scrollToBottom();};while(true){const{value,done}=await reader.read();if(done)break;buffer+=decoder.decode(value,{stream:true});let boundary;while((boundary=buffer.indexOf("\n\n"))!==-1){const raw=buffer.slice(0,boundary);buffer=buffer.slice(boundary+2);let event="message";let data="";raw.split("\n").forEach((line)=>{if(line.startsWith("event: "))event=line.slice(7);else if(line.startsWith("data: "))data+=line.slice(6);});if(!data)continue;const payload=JSON.parse(data);if(event==="token"){text+=payload.text;render(text);}else if(event==="done"){render(payload.response);if(payload.remaining_requests!==undefined){this.remainingRequests=payload.remaining_requests;this.updateRequestCount();}
+this.saveHistory(payload.history_token);}else if(event==="error"){render(payload.response);}}}
+if(!contentDiv){this.hideTyping();this.addMessage("Xin lỗi, đã có lỗi xảy ra. Vui lòng thử lại! 😊","bot");}}
+saveHistory(token){if(!token)return;fetch("/chatbot/history",{method:"POST",headers:{"Content-Type":"application/json"},body:JSON.stringify({token:token}),}).catch((error)=>console.error("Chatbot history error:",error));}
+handleReply(ok,data){if(ok){this.addMessage(data.response,"bot");if(data.remaining_requests!==undefined){this.remainingRequests=data.remaining_requests;this.updateRequestCount();}}else{this.addMessage(data.error||data.response||"Xin lỗi, đã có lỗi xảy ra. Vui lòng thử lại! 😊","bot");}}
+addMessage(text,sender){const messageDiv=document.createElement("div");messageDiv.className=`chatbot-message ${sender}`;const contentDiv=document.createElement("div");contentDiv.className="chatbot-message-content";contentDiv.innerHTML=this.escapeHtml(text).replace(/\n/g,"<br>");messageDiv.appendChild(contentDiv);this.messagesContainer.appendChild(messageDiv);this.scrollToBottom();return contentDiv;}
+escapeHtml(text){const div=document.createElement("div");div.textContent=text;return div.innerHTML;}
+showTyping(){this.isTyping=true;const typingDiv=document.createElement("div");typingDiv.className="chatbot-message bot";typingDiv.id="chatbotTypingIndicator";const typingContent=document.createElement("div");typingContent.className="chatbot-typing";typingContent.innerHTML="<span></span><span></span><span></span>";typingDiv.appendChild(typingContent);this.messagesContainer.appendChild(typingDiv);this.scrollToBottom();}
+hideTyping(){this.isTyping=false;const typingIndicator=document.getElementById("chatbotTypingIndicator");if(typingIndicator){typingIndicator.remove();}}
+setInputState(enabled){this.userInput.disabled=!enabled;this.sendBtn.disabled=!enabled;this.sendBtn.style.opacity=enabled?"1":"0.5";}
+scrollToBottom(){setTimeout(()=>{this.messagesContainer.scrollTop=this.messagesContainer.scrollHeight;},100);}
+async resetChat(){if(!confirm("Bạn có chắc muốn làm mới hội thoại? Tất cả tin nhắn sẽ bị xóa.")){return;}
+try{const response=await fetch("/chatbot/reset",{method:"POST",headers:{"Content-Type":"application/json",},});if(response.ok){const messages=this.messagesContainer.querySelectorAll(".chatbot-message");messages.forEach((msg,index)=>{if(index>0){msg.remove();}});this.remainingRequests=20;this.updateRequestCount();this.addMessage("Đã làm mới hội thoại! Tôi có thể giúp gì cho bạn? 😊","bot");}}catch(error){console.error("Reset error:",error);alert("Không thể làm mới hội thoại. Vui lòng thử lại!");}}
+updateRequestCount(){if(this.requestCountEl){this.requestCountEl.textContent=`Còn ${this.remainingRequests} tin nhắn`;}}}
+document.addEventListener("DOMContentLoaded",()=>{if(document.getElementById("chatbotButton")){new ChatbotWidget();}});
+
+(function(){"use strict";window.BlogCarousel=window.BlogCarousel||{};const BC=window.BlogCarousel;BC.state={isCreated:false,carouselInstance:null,};BC.config={transitionDuration:400,snapThreshold:0.3,};BC.createOnce=function(){if(this.state.isCreated){console.log("📱 Blog Carousel: Already exists, ensuring visibility");return;}
+const blogSection=document.querySelector("#featured-blogs-section");if(!blogSection){console.log("📱 Blog Carousel: Section not found");return;}
+const originalGrid=blogSection.querySelector(".row.g-4");if(!originalGrid){console.log("📱 Blog Carousel: Grid not found");return;}
+const blogCards=originalGrid.querySelectorAll(".col-lg-4");if(blogCards.length===0){console.log("📱 Blog Carousel: No blog cards found");return;}
+const wrapper=document.createElement("div");wrapper.className="blog-carousel-wrapper";const container=document.createElement("div");container.className="blog-carousel-container";const track=document.createElement("div");track.className="blog-carousel-track";blogCards.forEach((card)=>{const slide=document.createElement("div");slide.className="blog-carousel-slide";slide.innerHTML=card.innerHTML;track.appendChild(slide);});const prevBtn=document.createElement("button");prevBtn.className="blog-carousel-nav-btn blog-carousel-prev";prevBtn.innerHTML='<i class="bi bi-chevron-left"></i>';prevBtn.setAttribute("aria-label","Previous");const nextBtn=document.createElement("button");nextBtn.className="blog-carousel-nav-btn blog-carousel-next";nextBtn.innerHTML='<i class="bi bi-chevron-right"></i>';nextBtn.setAttribute("aria-label","Next");container.appendChild(track);wrapper.appendChild(container);wrapper.appendChild(prevBtn);wrapper.appendChild(nextBtn);originalGrid.parentNode.insertBefore(wrapper,originalGrid);this.state.carouselInstance=this.setupCarousel(track,container,prevBtn,nextBtn);this.state.isCreated=true;console.log(`✅ Blog Carousel: Created with ${blogCards.length} cards (PERMANENT)`);};BC.setupCarousel=function(track,container,prevBtn,nextBtn){const slides=track.querySelectorAll(".blog-carousel-slide");let currentIndex=0;let itemsPerView=1;let isDragging=false;let startPos=0;let currentTranslate=0;let prevTranslate=0;let dragDistance=0;function updateItemsPerView(){const width=window.innerWidth;if(width<768){itemsPerView=1;}else if(width<=991){itemsPerView=2;}}
+function getSlideWidth(){return container.offsetWidth/itemsPerView;}
+function updateCarousel(animate=true){const slideWidth=getSlideWidth();const offset=-currentIndex*slideWidth;if(animate){track.style.transition=`transform ${BC.config.transitionDuration}ms cubic-bezier(0.25, 0.46, 0.45, 0.94)`;}else{track.style.transition="none";}
+track.style.transform=`translateX(${offset}px)`;currentTranslate=offset;prevTranslate=offset;}
+function next(){const maxIndex=slides.length-itemsPerView;if(currentIndex<maxIndex){currentIndex++;}else{currentIndex=0;}
+updateCarousel();}
+function prev(){if(currentIndex>0){currentIndex--;}else{currentIndex=slides.length-itemsPerView;}
+updateCarousel();}
+function goToSlide(index){const maxIndex=slides.length-itemsPerView;currentIndex=Math.max(0,Math.min(index,maxIndex));updateCarousel();}
+function getPositionX(event){return event.type.includes("mouse")?event.pageX:event.touches[0].clientX;}
+function dragStart(event){isDragging=true;startPos=getPositionX(event);dragDistance=0;track.style.cursor="grabbing";track.style.transition="none";if(event.type==="touchstart"){}}
+function dragMove(event){if(!isDragging)return;const currentPosition=getPositionX(event);dragDistance=currentPosition-startPos;currentTranslate=prevTranslate+dragDistance;track.style.transform=`translateX(${currentTranslate}px)`;if(Math.abs(dragDistance)>10){event.preventDefault();}}
+function dragEnd(){if(!isDragging)return;isDragging=false;track.style.cursor="grab";const slideWidth=getSlideWidth();const movedBy=dragDistance;const movePercentage=Math.abs(movedBy)/slideWidth;if(movePercentage>BC.config.snapThreshold||Math.abs(movedBy)>50){if(movedBy<0){next();}else{prev();}}else{updateCarousel();}}
+track.addEventListener("mousedown",dragStart);track.addEventListener("mousemove",dragMove);track.addEventListener("mouseup",dragEnd);track.addEventListener("mouseleave",dragEnd);track.addEventListener("touchstart",dragStart,{passive:true});track.addEventListener("touchmove",dragMove,{passive:false});track.addEventListener("touchend",dragEnd);track.addEventListener("click",function(e){if(Math.abs(dragDistance)>5){e.preventDefault();e.stopPropagation();return false;}},true);track.addEventListener("mousedown",function(e){dragDistance=0;});track.addEventListener("touchstart",function(e){dragDistance=0;});prevBtn.addEventListener("click",function(e){e.preventDefault();prev();});nextBtn.addEventListener("click",function(e){e.preventDefault();next();});track.style.cursor="grab";track.style.userSelect="none";document.addEventListener("keydown",function(e){if(!container.closest(".blog-carousel-wrapper"))return;if(e.key==="ArrowLeft"){e.preventDefault();prev();}else if(e.key==="ArrowRight"){e.preventDefault();next();}});let resizeTimeout;window.addEventListener("resize",()=>{clearTimeout(resizeTimeout);resizeTimeout=setTimeout(()=>{updateItemsPerView();goToSlide(currentIndex);},250);});updateItemsPerView();updateCarousel();return{next,prev,goToSlide,updateItemsPerView,updateCarousel,getCurrentIndex:()=>currentIndex,};};function init(){BC.createOnce();}
+if(document.readyState==="loading"){document.addEventListener("DOMContentLoaded",init);}else{init();}
+window.addEventListener("pageshow",function(event){console.log("📱 pageshow:",event.persisted?"from cache":"normal load");init();});console.log("📦 Blog Carousel: Module loaded (Smooth drag + Infinite loop)");})();
+(function(){"use strict";window.BannerEffect=window.BannerEffect||{};const BannerEffect=window.BannerEffect;BannerEffect.config={carouselId:"bannerCarousel",animationDelay:100,animationTypes:["banner-fade-in","banner-slide-up","banner-slide-left","banner-zoom-in",],defaultAnimation:"banner-fade-in",observerThreshold:0.2,enableIntersectionObserver:true,dragThreshold:50,enableDrag:true,};BannerEffect.state={carousel:null,captions:[],hasAnimated:false,isInitialized:false,currentAnimation:null,bsCarousel:null,isDragging:false,startX:0,currentX:0,dragStartTime:0,};BannerEffect.init=function(){console.log("🎬 Banner Effect: Initializing...");this.state.carousel=document.getElementById(this.config.carouselId);if(!this.state.carousel){console.warn("Banner Effect: Carousel not found");return;}
+if(typeof bootstrap!=="undefined"&&bootstrap.Carousel){this.state.bsCarousel=bootstrap.Carousel.getInstance(this.state.carousel)||new bootstrap.Carousel(this.state.carousel,{ride:"carousel",interval:5000,pause:"hover",});}
+this.state.captions=Array.from(this.state.carousel.querySelectorAll(".carousel-caption"));if(this.state.captions.length===0){console.warn("Banner Effect: No captions found");return;}
+this.setupInitialAnimation();this.setupCarouselEvents();if(this.config.enableIntersectionObserver){this.setupIntersectionObserver();}else{this.animateCaption(this.state.captions[0]);}
+if(this.config.enableDrag){this.setupDragEvents();}
+this.state.isInitialized=true;console.log("✅ Banner Effect: Initialized successfully (with drag/swipe)");};BannerEffect.setupInitialAnimation=function(){this.state.captions.forEach((caption,index)=>{const animationType=caption.dataset.animation||this.config.defaultAnimation;caption.dataset.animationType=animationType;caption.classList.remove(...this.config.animationTypes);caption.style.opacity="0";caption.style.visibility="hidden";});};BannerEffect.animateCaption=function(caption){if(!caption)return;const animationType=caption.dataset.animationType||this.config.defaultAnimation;caption.classList.remove(...this.config.animationTypes);setTimeout(()=>{caption.style.visibility="visible";caption.classList.add(animationType);this.state.currentAnimation=animationType;},this.config.animationDelay);};BannerEffect.setupCarouselEvents=function(){this.state.carousel.addEventListener("slide.bs.carousel",(event)=>{const nextIndex=event.to;const nextCaption=this.state.captions[nextIndex];if(nextCaption){this.state.captions.forEach((cap)=>{cap.classList.remove(...this.config.animationTypes);cap.style.opacity="0";cap.style.visibility="hidden";});this.animateCaption(nextCaption);}});this.state.carousel.addEventListener("slid.bs.carousel",(event)=>{console.log(`Banner slid to index: ${event.to}`);});};BannerEffect.setupIntersectionObserver=function(){if("IntersectionObserver"in window){const observerOptions={threshold:this.config.observerThreshold,rootMargin:"0px",};const observer=new IntersectionObserver((entries)=>{entries.forEach((entry)=>{if(entry.isIntersecting&&!this.state.hasAnimated){const activeSlide=this.state.carousel.querySelector(".carousel-item.active");const activeCaption=activeSlide?activeSlide.querySelector(".carousel-caption"):this.state.captions[0];if(activeCaption){this.animateCaption(activeCaption);this.state.hasAnimated=true;observer.unobserve(entry.target);}}});},observerOptions);observer.observe(this.state.carousel);}else{this.animateCaption(this.state.captions[0]);this.state.hasAnimated=true;}};BannerEffect.setupDragEvents=function(){const carousel=this.state.carousel;carousel.style.cursor="grab";carousel.addEventListener("mousedown",this.handleDragStart.bind(this));carousel.addEventListener("mousemove",this.handleDragMove.bind(this));carousel.addEventListener("mouseup",this.handleDragEnd.bind(this));carousel.addEventListener("mouseleave",this.handleDragEnd.bind(this));carousel.addEventListener("touchstart",this.handleDragStart.bind(this),{passive:true,});carousel.addEventListener("touchmove",this.handleDragMove.bind(this),{passive:true,});carousel.addEventListener("touchend",this.handleDragEnd.bind(this));carousel.addEventListener("contextmenu",(e)=>{if(this.state.isDragging){e.preventDefault();}});const images=carousel.querySelectorAll("img");images.forEach((img)=>{img.addEventListener("dragstart",(e)=>e.preventDefault());});console.log("👆 Banner Effect: Drag/Swipe enabled");};BannerEffect.handleDragStart=function(e){if(e.target.closest("a, button")){return;}
+this.state.isDragging=true;this.state.startX=this.getPositionX(e);this.state.currentX=this.state.startX;this.state.dragStartTime=Date.now();this.state.carousel.style.cursor="grabbing";if(this.state.bsCarousel){this.state.bsCarousel.pause();}};BannerEffect.handleDragMove=function(e){if(!this.state.isDragging)return;this.state.currentX=this.getPositionX(e);};BannerEffect.handleDragEnd=function(e){if(!this.state.isDragging)return;this.state.isDragging=false;this.state.carousel.style.cursor="grab";const dragDistance=this.state.currentX-this.state.startX;const dragTime=Date.now()-this.state.dragStartTime;const dragVelocity=Math.abs(dragDistance)/dragTime;const shouldSlide=Math.abs(dragDistance)>this.config.dragThreshold||dragVelocity>0.5;if(shouldSlide&&this.state.bsCarousel){if(dragDistance>0){this.state.bsCarousel.prev();}else{this.state.bsCarousel.next();}}
+setTimeout(()=>{if(this.state.bsCarousel){this.state.bsCarousel.cycle();}},300);this.state.startX=0;this.state.currentX=0;this.state.dragStartTime=0;};BannerEffect.getPositionX=function(e){return e.type.includes("mouse")?e.pageX:e.touches[0].clientX;};BannerEffect.setAnimationType=function(type){if(this.config.animationTypes.includes(type)){this.config.defaultAnimation=type;console.log(`Banner Effect: Animation type set to ${type}`);}else{console.warn(`Banner Effect: Invalid animation type "${type}"`);}};BannerEffect.toggleDrag=function(enable){this.config.enableDrag=enable;if(enable&&this.state.isInitialized){this.setupDragEvents();}
+console.log(`Banner Effect: Drag ${enable ? "enabled" : "disabled"}`);};BannerEffect.refresh=function(){if(!this.state.isInitialized)return;console.log("🔄 Banner Effect: Refreshing...");this.setupInitialAnimation();const activeCaption=this.state.carousel.querySelector(".carousel-item.active .carousel-caption");if(activeCaption){this.animateCaption(activeCaption);}};BannerEffect.destroy=function(){if(!this.state.isInitialized)return;console.log("🗑️ Banner Effect: Destroying...");this.state.captions.forEach((caption)=>{caption.classList.remove(...this.config.animationTypes);caption.style.opacity="";caption.style.visibility="";});if(this.state.carousel){this.state.carousel.style.cursor="";}
+this.state={carousel:null,captions:[],hasAnimated:false,isInitialized:false,currentAnimation:null,bsCarousel:null,isDragging:false,startX:0,currentX:0,dragStartTime:0,};};if(document.readyState==="loading"){document.addEventListener("DOMContentLoaded",()=>{BannerEffect.init();});}else{BannerEffect.init();}
+window.addEventListener("load",()=>{if(!BannerEffect.state.isInitialized){BannerEffect.init();}});window.addEventListener("beforeunload",()=>{BannerEffect.destroy();});console.log("📦 Banner Effect: Module loaded (with drag/swipe support)");})();
+(function(){"use strict";window.Newsletter=window.Newsletter||{};const newsletter=window.Newsletter;newsletter.init=function(){const form=document.getElementById("newsletterForm");if(!form)return;form.addEventListener("submit",this.handleSubmit.bind(this));console.log("✅ Newsletter: Initialized");};newsletter.handleSubmit=async function(e){e.preventDefault();const form=e.target;const emailInput=form.querySelector("#newsletter-email");const consentCheckbox=form.querySelector("#newsletter-consent");const messageEl=document.getElementById("newsletterMessage");const submitBtn=form.querySelector("#newsletter-submit-btn");const btnText=submitBtn.querySelector(".btn-text");const btnIcon=submitBtn.querySelector(".btn-icon");const btnSpinner=submitBtn.querySelector(".btn-spinner");messageEl.className="newsletter-message";messageEl.textContent="";if(!emailInput.value.trim()){this.showMessage(messageEl,"Vui lòng nhập email!","error");emailInput.focus();return;}
+if(!consentCheckbox.checked){this.showMessage(messageEl,"Vui lòng đồng ý nhận email marketing!","error");return;}
+submitBtn.disabled=true;btnText.classList.add("d-none");btnIcon.classList.add("d-none");btnSpinner.classList.remove("d-none");try{const response=await fetch("/newsletter/subscribe",{method:"POST",headers:{"Content-Type":"application/json","X-Requested-With":"XMLHttpRequest",},body:JSON.stringify({email:emailInput.value.trim(),consent:consentCheckbox.checked,}),});const data=await response.json();if(response.ok&&data.success){this.showMessage(messageEl,data.message,"success");form.reset();if(typeof gtag!=="undefined"){gtag("event","newsletter_signup",{event_category:"Newsletter",event_label:"Success",});}}else{this.showMessage(messageEl,data.message||"Có lỗi xảy ra!","error");}}catch(error){console.error("Newsletter subscription error:",error);this.showMessage(messageEl,"Không thể kết nối đến server. Vui lòng thử lại!","error");}finally{submitBtn.disabled=false;btnText.classList.remove("d-none");btnIcon.classList.remove("d-none");btnSpinner.classList.add("d-none");}};newsletter.showMessage=function(element,message,type){element.textContent=message;element.className=`newsletter-message ${type}`;if(type==="success"){setTimeout(()=>{element.style.opacity="0";setTimeout(()=>{element.className="newsletter-message";element.textContent="";element.style.opacity="1";},300);},5000);}};if(document.readyState==="loading"){document.addEventListener("DOMContentLoaded",()=>newsletter.init());}else{newsletter.init();}})();
+
+
+(function(){'use strict';const CONFIG={contentSelector:'.blog-content-detail',tocContainerId:'blog-toc-container',inlineTocContainerId:'blog-inline-toc-content',headingSelectors:'h2, h3, h4',activeClass:'active',scrollOffset:100,observerRootMargin:'-100px 0px -66%',smoothScrollBehavior:'smooth'};function generateId(text){return text.toLowerCase().normalize('NFD').replace(/[\u0300-\u036f]/g,'').replace(/đ/g,'d').replace(/[^a-z0-9\s-]/g,'').trim().replace(/\s+/g,'-').replace(/-+/g,'-').substring(0,50);}
+function ensureUniqueId(baseId,existingIds){let id=baseId;let counter=1;while(existingIds.has(id)){id=`${baseId}-${counter}`;counter++;}
+existingIds.add(id);return id;}
+function getHeadingLevel(heading){return parseInt(heading.tagName.substring(1));}
+function prepareHeadings(contentElement){const headings=contentElement.querySelectorAll(CONFIG.headingSelectors);const existingIds=new Set();const tocData=[];headings.forEach((heading,index)=>{if(!heading.id){const text=heading.textContent.trim();const baseId=generateId(text);heading.id=ensureUniqueId(baseId,existingIds);}else{existingIds.add(heading.id);}
+tocData.push({id:heading.id,text:heading.textContent.trim(),level:getHeadingLevel(heading),element:heading});});return tocData;}
+function buildSidebarTocHtml(tocData){if(tocData.length===0){return'<p class="text-muted small">Không có mục lục</p>';}
+let html='<nav class="blog-toc-nav" aria-label="Mục lục bài viết"><ul class="blog-toc-list">';tocData.forEach((item,index)=>{const levelClass=`toc-level-${item.level}`;const isFirst=index===0;html+=`
+        <li class="blog-toc-item ${levelClass}">
+          <a href="#${item.id}"
+             class="blog-toc-link ${isFirst ? CONFIG.activeClass : ''}"
+             data-target="${item.id}"
+             title="${item.text}">
+            ${item.text}
+          </a>
+        </li>
+      `;});html+='</ul></nav>';return html;}
+function buildInlineTocHtml(tocData){if(tocData.length===0){return'';}
+let html='<ul class="blog-inline-toc-list">';tocData.forEach((item)=>{const levelClass=`inline-toc-level-${item.level}`;html+=`
+        <li class="blog-inline-toc-item ${levelClass}">
+          <a href="#${item.id}"
+             class="blog-inline-toc-link"
+             data-target="${item.id}"
+             title="${item.text}">
+            ${item.text}
+          </a>
+        </li>
+      `;});html+='</ul>';return html;}
+function setupScrollSpy(tocData){const tocLinks=document.querySelectorAll('.blog-toc-link');const linkMap=new Map();tocLinks.forEach(link=>{const targetId=link.getAttribute('data-target');linkMap.set(targetId,link);});const observer=new IntersectionObserver((entries)=>{entries.forEach(entry=>{const link=linkMap.get(entry.target.id);if(entry.isIntersecting){tocLinks.forEach(l=>l.classList.remove(CONFIG.activeClass));if(link){link.classList.add(CONFIG.activeClass);link.scrollIntoView({behavior:'smooth',block:'nearest'});}}});},{rootMargin:CONFIG.observerRootMargin,threshold:[0,1]});tocData.forEach(item=>{observer.observe(item.element);});return observer;}
+function setupSmoothScroll(){document.addEventListener('click',(e)=>{const link=e.target.closest('.blog-toc-link, .blog-inline-toc-link');if(!link)return;e.preventDefault();const targetId=link.getAttribute('data-target');const targetElement=document.getElementById(targetId);if(targetElement){const offset=CONFIG.scrollOffset;const elementPosition=targetElement.getBoundingClientRect().top;const offsetPosition=elementPosition+window.pageYOffset-offset;window.scrollTo({top:offsetPosition,behavior:CONFIG.smoothScrollBehavior});}});}
+function initTableOfContents(){const sidebarTocContainer=document.getElementById(CONFIG.tocContainerId);const inlineTocContainer=document.getElementById(CONFIG.inlineTocContainerId);const contentElement=document.querySelector(CONFIG.contentSelector);if(!contentElement){return;}
+const tocData=prepareHeadings(contentElement);if(tocData.length===0){if(sidebarTocContainer)sidebarTocContainer.style.display='none';if(inlineTocContainer){const inlineCard=document.getElementById('blog-inline-toc-container');if(inlineCard)inlineCard.style.display='none';}
+return;}
+if(sidebarTocContainer){const sidebarHtml=buildSidebarTocHtml(tocData);sidebarTocContainer.innerHTML=sidebarHtml;}
+if(inlineTocContainer){const inlineHtml=buildInlineTocHtml(tocData);inlineTocContainer.innerHTML=inlineHtml;}
+if(sidebarTocContainer){const observer=setupScrollSpy(tocData);window.addEventListener('beforeunload',()=>{observer.disconnect();});}
+setupSmoothScroll();}
+if(document.readyState==='loading'){document.addEventListener('DOMContentLoaded',initTableOfContents);}else{initTableOfContents();}})();
+(function(){"use strict";const holdHienDropdown={holdTimer:null,holdDelay:200,init:function(){this.setupEventListeners();},setupEventListeners:function(){const dropdownItems=document.querySelectorAll(".nav-item.dropdown");dropdownItems.forEach((item)=>{const link=item.querySelector(".nav-link.dropdown-toggle");const menu=item.querySelector(".dropdown-menu");if(!link||!menu)return;item.classList.add("hold-hien-dropdown");link.addEventListener("mouseenter",()=>{this.startHoldTimer(item);});link.addEventListener("mouseleave",()=>{this.cancelHoldTimer();});menu.addEventListener("mouseenter",()=>{this.cancelHoldTimer();});menu.addEventListener("mouseleave",()=>{this.hideDropdown(item);});link.addEventListener("click",(e)=>{e.preventDefault();this.toggleDropdown(item);});});document.addEventListener("click",(e)=>{if(!e.target.closest(".nav-item.hold-hien-dropdown")){this.hideAllDropdowns();}});},startHoldTimer:function(item){this.cancelHoldTimer();this.holdTimer=setTimeout(()=>{this.showDropdown(item);},this.holdDelay);},cancelHoldTimer:function(){if(this.holdTimer){clearTimeout(this.holdTimer);this.holdTimer=null;}},showDropdown:function(item){this.hideAllDropdowns();item.classList.add("show");},hideDropdown:function(item){item.classList.remove("show");},toggleDropdown:function(item){const isShown=item.classList.contains("show");this.hideAllDropdowns();if(!isShown){item.classList.add("show");}},hideAllDropdowns:function(){document.querySelectorAll(".nav-item.hold-hien-dropdown.show").forEach((item)=>{item.classList.remove("show");});},};if(document.readyState==="loading"){document.addEventListener("DOMContentLoaded",()=>{holdHienDropdown.init();});}else{holdHienDropdown.init();}
+window.holdHienDropdown=holdHienDropdown;})();
+document.addEventListener("DOMContentLoaded",function(){const lightbox=document.getElementById("productLightbox");const lightboxImg=document.getElementById("lightboxImage");const modal=new bootstrap.Modal(lightbox);document.querySelectorAll(".lightbox-trigger").forEach((trigger)=>{trigger.addEventListener("click",function(e){e.preventDefault();const imgSrc=this.getAttribute("data-image");const imgTitle=this.getAttribute("data-title");lightboxImg.src=imgSrc;lightboxImg.alt=imgTitle;modal.show();});});lightbox.addEventListener("hidden.bs.modal",function(){lightboxImg.src="";});});(function(){'use strict';class SearchAutocomplete{constructor(inputSelector,resultsSelector){this.input=document.querySelector(inputSelector);this.resultsContainer=document.querySelector(resultsSelector);this.debounceTimer=null;this.currentFocus=-1;this.cache=new Map();if(this.input&&this.resultsContainer){this.init();}}
+init(){this.input.addEventListener('input',(e)=>this.handleInput(e));this.input.addEventListener('keydown',(e)=>this.handleKeydown(e));this.input.addEventListener('focus',()=>{if(this.input.value.trim().length>=2){this.resultsContainer.style.display='block';}});document.addEventListener('click',(e)=>{if(!this.input.contains(e.target)&&!this.resultsContainer.contains(e.target)){this.hideResults();}});this.input.closest('form')?.addEventListener('submit',(e)=>{if(this.currentFocus>=0){e.preventDefault();this.selectItem(this.currentFocus);}});}
+handleInput(e){const keyword=e.target.value.trim();clearTimeout(this.debounceTimer);if(keyword.length<2){this.hideResults();return;}
+this.debounceTimer=setTimeout(()=>{this.fetchSuggestions(keyword);},300);}
+async fetchSuggestions(keyword){if(this.cache.has(keyword)){this.renderResults(this.cache.get(keyword));return;}
+try{this.showLoading();const response=await fetch(`/api/search-suggestions?q=${encodeURIComponent(keyword)}`);const data=await response.json();this.cache.set(keyword,data.suggestions);if(this.cache.size>20){const firstKey=this.cache.keys().next().value;this.cache.delete(firstKey);}
+this.renderResults(data.suggestions);}catch(error){console.error('Search error:',error);this.hideResults();}}
+showLoading(){this.resultsContainer.innerHTML=`
+        <div class="search-autocomplete-loading">
+          <div class="spinner-border spinner-border-sm text-warning" role="status">
+            <span class="visually-hidden">Đang tìm...</span>
+          </div>
+          <span class="ms-2">Đang tìm kiếm...</span>
+        </div>
+      `;this.resultsContainer.style.display='block';}
+renderResults(suggestions){if(!suggestions||suggestions.length===0){this.resultsContainer.innerHTML=`
+          <div class="search-autocomplete-empty">
+            <i class="bi bi-search"></i>
+            <span>Không tìm thấy kết quả phù hợp</span>
+          </div>
+        `;this.resultsContainer.style.display='block';return;}
+const grouped={page:[],product:[],blog:[],project:[],faq:[]};suggestions.forEach(item=>{if(grouped[item.type])grouped[item.type].push(item);});let html='';if(grouped.page.length>0){html+='<div class="search-autocomplete-group">';html+='<div class="search-autocomplete-group-title"><i class="bi bi-file-text"></i> Trang thông tin</div>';grouped.page.forEach((item,index)=>{html+=this.renderItem(item,index);});html+='</div>';}
+if(grouped.product.length>0){html+='<div class="search-autocomplete-group">';html+='<div class="search-autocomplete-group-title"><i class="bi bi-box-seam"></i> Sản phẩm</div>';grouped.product.forEach((item,index)=>{html+=this.renderItem(item,grouped.page.length+index);});html+='</div>';}
+if(grouped.blog.length>0){html+='<div class="search-autocomplete-group">';html+='<div class="search-autocomplete-group-title"><i class="bi bi-journal-text"></i> Bài viết</div>';grouped.blog.forEach((item,index)=>{html+=this.renderItem(item,grouped.page.length+grouped.product.length+index);});html+='</div>';}
+if(grouped.project.length>0){html+='<div class="search-autocomplete-group">';html+='<div class="search-autocomplete-group-title"><i class="bi bi-building"></i> Dự án</div>';grouped.project.forEach((item,index)=>{html+=this.renderItem(item,grouped.page.length+grouped.product.length+grouped.blog.length+index);});html+='</div>';}
+if(grouped.faq.length>0){html+='<div class="search-autocomplete-group">';html+='<div class="search-autocomplete-group-title"><i class="bi bi-question-circle"></i> Hỏi đáp</div>';grouped.faq.forEach((item,index)=>{html+=this.renderItem(item,grouped.page.length+grouped.product.length+grouped.blog.length+grouped.project.length+index);});html+='</div>';}
+this.resultsContainer.innerHTML=html;this.resultsContainer.style.display='block';this.currentFocus=-1;}
+renderItem(item,index){const imageHtml=item.image?`<img src="${item.image}" alt="${item.title}" class="search-autocomplete-image">`:'';return`
+        <a href="${item.url}"
+           class="search-autocomplete-item type-${item.type}"
+           data-index="${index}">
+          ${imageHtml}
+          <span class="search-autocomplete-title">${this.highlightKeyword(item.title)}</span>
+        </a>
+      `;}
+highlightKeyword(text){const keyword=this.input.value.trim();if(!keyword)return text;const regex=new RegExp(`(${keyword})`,'gi');return text.replace(regex,'<mark>$1</mark>');}
+handleKeydown(e){const items=this.resultsContainer.querySelectorAll('.search-autocomplete-item');if(items.length===0)return;if(e.key==='ArrowDown'){e.preventDefault();this.currentFocus++;if(this.currentFocus>=items.length)this.currentFocus=0;this.setActive(items);}else if(e.key==='ArrowUp'){e.preventDefault();this.currentFocus--;if(this.currentFocus<0)this.currentFocus=items.length-1;this.setActive(items);}else if(e.key==='Enter'){if(this.currentFocus>=0){e.preventDefault();items[this.currentFocus].click();}}else if(e.key==='Escape'){this.hideResults();this.input.blur();}}
+setActive(items){items.forEach((item,index)=>{if(index===this.currentFocus){item.classList.add('active');item.scrollIntoView({block:'nearest',behavior:'smooth'});}else{item.classList.remove('active');}});}
+selectItem(index){const items=this.resultsContainer.querySelectorAll('.search-autocomplete-item');if(items[index])items[index].click();}
+hideResults(){this.resultsContainer.style.display='none';this.currentFocus=-1;}}
+function initSearchAutocomplete(){new SearchAutocomplete('.header-search-input','#search-autocomplete-results');new SearchAutocomplete('#searchModal input[name="q"]','#search-autocomplete-results-mobile');console.log('✅ Search Autocomplete: Initialized');}
+if(document.readyState==='loading'){document.addEventListener('DOMContentLoaded',initSearchAutocomplete);}else{initSearchAutocomplete();}})();
\ No newline at end of file
@@ -0,0 +1,288 @@
+"""
+Trang tĩnh trong kết quả tìm kiếm (/tim-kiem, /api/search-suggestions)
+
+- STATIC_PAGES là định nghĩa duy nhất; setting 'search_static_pages' (JSON cùng cấu trúc)
+  nếu có và hợp lệ sẽ thay thế danh sách mặc định, không cần deploy lại
+- Từ khóa + tiêu đề được bỏ dấu (search_index.tokenize) rồi build 1 automaton Aho–Corasick,
+  build lại chỉ khi setting thay đổi. Mỗi request chỉ duyệt query 1 lần: O(độ dài query)
+- Khớp nguyên từ: 'bảo hành' khớp 'chính sách bảo hành' nhưng 'ship' không khớp 'relationship'
+- Từ cuối đang gõ dở được gợi ý theo prefix: 'bao ha' -> 'bảo hành'
+- Mỗi trang chỉ xuất hiện 1 lần, theo thứ tự vị trí khớp đầu tiên trong query
+
+Usage:
+    from app.static_pages import match_static_pages
+    pages = match_static_pages('chính sách bảo hà')
+"""
+import itertools
+import json
+import threading
+
+from flask import current_app
+
+from app.search_index import SearchDoc, tokenize
+
+SETTING_KEY = 'search_static_pages'
+
+# Prefix ngắn hơn thì không gợi ý (tránh 1 ký tự khớp mọi trang)
+MIN_PREFIX_LENGTH = 2
+
+STATIC_PAGES = (
+    {
+        'title': 'Điều khoản dịch vụ',
+        'endpoint': 'main.policy',
+        'params': {'policy_slug': 'dieu-khoan-dich-vu'},
+        'icon': 'bi-file-earmark-text',
+        'description': 'Các quy định và điều khoản khi sử dụng dịch vụ',
+        'keywords': ('điều khoản', 'dịch vụ'),
+    },
+    {
+        'title': 'Chính sách',
+        'endpoint': 'main.policy',
+        'params': {},
+        'icon': 'bi-shield-check',
+        'description': 'Các chính sách vận chuyển, đổi trả, bảo hành và bảo mật',
+        'keywords': ('chính sách', 'policy'),
+    },
+    {
+        'title': 'Chính sách vận chuyển',
+        'endpoint': 'main.policy',
+        'params': {'policy_slug': 'van-chuyen'},
+        'icon': 'bi-truck',
+        'description': 'Thông tin về vận chuyển và giao hàng',
+        'keywords': ('vận chuyển', 'giao hàng', 'ship'),
+    },
+    {
+        'title': 'Chính sách đổi trả',
+        'endpoint': 'main.policy',
+        'params': {'policy_slug': 'doi-tra'},
+        'icon': 'bi-arrow-repeat',
+        'description': 'Quy định về đổi trả sản phẩm',
+        'keywords': ('đổi trả', 'hoàn trả'),
+    },
+    {
+        'title': 'Chính sách bảo hành',
+        'endpoint': 'main.policy',
+        'params': {'policy_slug': 'bao-hanh'},
+        'icon': 'bi-shield-check',
+        'description': 'Thông tin về bảo hành sản phẩm',
+        'keywords': ('bảo hành',),
+    },
+    {
+        'title': 'Chính sách bảo mật',
+        'endpoint': 'main.policy',
+        'params': {'policy_slug': 'bao-mat'},
+        'icon': 'bi-lock',
+        'description': 'Cam kết bảo mật thông tin khách hàng',
+        'keywords': ('bảo mật', 'quyền riêng tư', 'privacy'),
+    },
+    {
+        'title': 'Giới thiệu về chúng tôi',
+        'endpoint': 'main.about',
+        'params': {},
+        'icon': 'bi-info-circle',
+        'description': 'Thông tin về công ty và đội ngũ',
+        'keywords': ('giới thiệu', 'về chúng tôi', 'công ty', 'about'),
+    },
+    {
+        'title': 'Liên hệ',
+        'endpoint': 'main.contact',
+        'params': {},
+        'icon': 'bi-envelope',
+        'description': 'Thông tin liên hệ và gửi tin nhắn',
+        'keywords': ('liên hệ', 'contact'),
+    },
+    {
+        'title': 'Câu hỏi thường gặp',
+        'endpoint': 'main.faq',
+        'params': {},
+        'icon': 'bi-question-circle',
+        'description': 'Các câu hỏi thường gặp và giải đáp',
+        'keywords': ('hỏi đáp', 'câu hỏi', 'faq'),
+    },
+    {
+        'title': 'Bảng màu sản phẩm',
+        'endpoint': 'main.color_chart',
+        'params': {},
+        'icon': 'bi-palette',
+        'description': 'Bảng màu và mẫu sản phẩm',
+        'keywords': ('màu sắc', 'bảng màu', 'color'),
+    },
+    {
+        'title': 'Hướng dẫn thi công',
+        'endpoint': 'main.installation_guide',
+        'params': {},
+        'icon': 'bi-tools',
+        'description': 'Hướng dẫn thi công và lắp đặt',
+        'keywords': ('hướng dẫn', 'thi công', 'lắp đặt', 'guide'),
+    },
+)
+
+
+# ==================== AHO–CORASICK ====================
+class AhoCorasick:
+    """
+    Automaton Aho–Corasick trên chuỗi đã bỏ dấu
+
+    Node i: _goto[i] (ký tự -> node), _fail[i], _output[i] = [(độ dài, value)] của các
+    pattern kết thúc tại i (đã gộp theo fail link), _below[i] = value của mọi pattern
+    có prefix là node i (dùng cho gợi ý từ đang gõ dở).
+    """
+
+    def __init__(self, patterns):
+        self._goto = [{}]
+        self._fail = [0]
+        self._depth = [0]
+        self._output = [[]]
+        self._below = [set()]
+
+        for pattern, value in patterns:
+            node = 0
+            self._below[0].add(value)
+            for char in pattern:
+                child = self._goto[node].get(char)
+                if child is None:
+                    child = len(self._goto)
+                    self._goto[node][char] = child
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._depth.append(self._depth[node] + 1)
+                    self._output.append([])
+                    self._below.append(set())
+                node = child
+                self._below[node].add(value)
+            self._output[node].append((len(pattern), value))
+
+        # BFS: fail link = node của suffix dài nhất cũng là prefix của 1 pattern
+        queue = list(self._goto[0].values())
+        for node in queue:
+            for char, child in self._goto[node].items():
+                fail = self._fail[node]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[child] = self._goto[fail].get(char, 0)
+                self._output[child] = self._output[child] + self._output[self._fail[child]]
+                queue.append(child)
+
+    def _step(self, node, char):
+        while node and char not in self._goto[node]:
+            node = self._fail[node]
+        return self._goto[node].get(char, 0)
+
+    def scan(self, text):
+        """
+        Duyệt text 1 lần, trả về (matches, node cuối)
+
+        matches: [(vị trí bắt đầu, vị trí kết thúc, value)]
+        """
+        matches = []
+        node = 0
+        for position, char in enumerate(text):
+            node = self._step(node, char)
+            for length, value in self._output[node]:
+                matches.append((position - length + 1, position + 1, value))
+        return matches, node
+
+    def completions(self, node, text, min_length=MIN_PREFIX_LENGTH):
+        """
+        Pattern có thể hoàn thành phần cuối của text (từ đang gõ dở): (vị trí bắt đầu, values)
+
+        node: node cuối của scan(text). Đi theo fail link tìm suffix dài nhất của text
+        bắt đầu ở đầu 1 từ và là prefix của pattern ('bao ha' thắng 'ha').
+        """
+        while node and self._depth[node] >= min_length:
+            start = len(text) - self._depth[node]
+            if start == 0 or text[start - 1] == ' ':
+                return start, self._below[node]
+            node = self._fail[node]
+        return None, ()
+
+
+# ==================== MATCHER ====================
+def _page_document(index, page):
+    return SearchDoc('page', index, page['title'], [],
+                     endpoint=page['endpoint'], params=page.get('params'),
+                     icon=page.get('icon'), description=page.get('description', ''))
+
+
+def _patterns(page):
+    """Tiêu đề + từ khóa đã bỏ dấu, kèm các đuôi theo từ ('bao hanh' -> 'hanh')"""
+    patterns = set()
+    for text in (page['title'], *page.get('keywords', ())):
+        words = tokenize(text)
+        for start in range(len(words)):
+            patterns.add(' '.join(words[start:]))
+    return patterns
+
+
+_generations = itertools.count(1)
+
+
+class StaticPageMatcher:
+    def __init__(self, pages):
+        # Matcher mới (setting đổi) = generation mới, dùng làm key cache gợi ý tìm kiếm
+        self.generation = next(_generations)
+        self.pages = [_page_document(index, page) for index, page in enumerate(pages)]
+        self._automaton = AhoCorasick(
+            (pattern, index) for index, page in enumerate(pages) for pattern in _patterns(page)
+        )
+
+    def match(self, query, complete_last_word=True):
+        """Các trang khớp query (không trùng lặp), theo thứ tự vị trí khớp trong query"""
+        text = ' '.join(tokenize(query))
+        if not text:
+            return []
+
+        matches, node = self._automaton.scan(text)
+        found = {}
+        for start, end, index in matches:
+            # Chỉ nhận khớp nguyên từ
+            if (start == 0 or text[start - 1] == ' ') and (end == len(text) or text[end] == ' '):
+                found.setdefault(index, start)
+
+        if complete_last_word:
+            start, indexes = self._automaton.completions(node, text)
+            for index in indexes:
+                found.setdefault(index, start)
+
+        return [self.pages[index] for index in sorted(found, key=lambda index: (found[index], index))]
+
+
+_matcher = None
+_matcher_source = None
+_matcher_lock = threading.Lock()
+
+
+def load_static_pages(raw):
+    """Danh sách trang từ setting (JSON), không hợp lệ thì dùng STATIC_PAGES"""
+    if not raw:
+        return STATIC_PAGES
+    try:
+        pages = json.loads(raw)
+        for page in pages:
+            if not page.get('title') or page.get('endpoint') not in current_app.view_functions:
+                raise ValueError(f"trang {page.get('title')!r} thiếu title hoặc endpoint không tồn tại")
+        return pages
+    except (ValueError, TypeError, AttributeError) as e:
+        current_app.logger.warning(f'Setting {SETTING_KEY} không hợp lệ ({e}), dùng danh sách mặc định')
+        return STATIC_PAGES
+
+
+def get_static_page_matcher():
+    """Matcher dùng chung cho mọi request, build lại khi setting thay đổi"""
+    global _matcher, _matcher_source
+    from app.models.settings import get_setting
+
+    raw = get_setting(SETTING_KEY) or None
+    matcher = _matcher
+    if matcher is not None and raw == _matcher_source:
+        return matcher
+
+    with _matcher_lock:
+        if _matcher is None or raw != _matcher_source:
+            _matcher = StaticPageMatcher(load_static_pages(raw))
+            _matcher_source = raw
+        return _matcher
+
+
+def match_static_pages(query, complete_last_word=True):
+    return get_static_page_matcher().match(query, complete_last_word)
@@ -85,6 +85,24 @@ def allowed_file(filename):
         filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
 
+# Bảng chuyển tiếng Việt có dấu -> không dấu (dùng chung cho slugify và search index)
+VIETNAMESE_ACCENTS = (
+    ('àáạảãâầấậẩẫăằắặẳẵ', 'a'),
+    ('èéẹẻẽêềếệểễ', 'e'),
+    ('ìíịỉĩ', 'i'),
+    ('òóọỏõôồốộổỗơờớợởỡ', 'o'),
+    ('ùúụủũưừứựửữ', 'u'),
+    ('ỳýỵỷỹ', 'y'),
+    ('đ', 'd'),
+)
+_ACCENT_TABLE = str.maketrans({char: base for chars, base in VIETNAMESE_ACCENTS for char in chars})
+
+
+def remove_accents(text):
+    """Bỏ dấu tiếng Việt (chỉ chữ thường): 'gạch ốp lát' -> 'gach op lat'"""
+    return text.translate(_ACCENT_TABLE)
+
+
 def slugify(text):
     """
     Chuyển text thành dạng slug-friendly
@@ -92,13 +110,7 @@ def slugify(text):
     """
     text = text.lower()
     # Chuyển tiếng Việt không dấu
-    text = re.sub(r'[àáạảãâầấậẩẫăằắặẳẵ]', 'a', text)
-    text = re.sub(r'[èéẹẻẽêềếệểễ]', 'e', text)
-    text = re.sub(r'[ìíịỉĩ]', 'i', text)
-    text = re.sub(r'[òóọỏõôồốộổỗơờớợởỡ]', 'o', text)
-    text = re.sub(r'[ùúụủũưừứựửữ]', 'u', text)
-    text = re.sub(r'[ỳýỵỷỹ]', 'y', text)
-    text = re.sub(r'[đ]', 'd', text)
+    text = remove_accents(text)
     # Xóa ký tự đặc biệt
     text = re.sub(r'[^a-z0-9\s-]', '', text)
     # Thay space bằng dash
@@ -0,0 +1,153 @@
+"""
+Bộ đếm lượt xem gom theo lô (sản phẩm, bài viết, dự án, tin tuyển dụng)
+
+- Trang chi tiết chỉ gọi record_view(obj): cộng dồn trong RAM, không mở transaction
+- Thread nền flush mỗi VIEW_COUNTER_FLUSH_INTERVAL giây: mỗi bảng 1 câu
+  UPDATE <bảng> SET views = views + :n WHERE id = :id (executemany) trong 1 transaction
+- UPDATE bằng SQLAlchemy Core nên không chạy event listener của model
+  (trước đây mỗi lượt xem xóa cache 'products' và page cache)
+- Flush thêm khi process tắt (atexit); flush lỗi thì giữ lại số đếm cho lần sau
+- VIEW_COUNTER_FLUSH_INTERVAL = 0: ghi ngay trong request (vẫn bằng UPDATE ... + 1)
+- Thống kê (số lần flush, thời gian flush) xem qua get_stats(), /admin/settings/cache/stats
+
+Usage:
+    from app.view_counter import record_view
+    record_view(product)
+"""
+import atexit
+import os
+import threading
+import time
+
+from sqlalchemy import bindparam, update
+
+# Tên model -> cột đếm lượt xem
+COUNTER_COLUMNS = {
+    'Product': 'views',
+    'Blog': 'views',
+    'Project': 'view_count',
+    'Job': 'view_count',
+}
+
+DEFAULT_FLUSH_INTERVAL = 5
+# Quá nhiều key đang chờ thì flush sớm (giới hạn RAM khi bị crawl)
+DEFAULT_MAX_PENDING = 5000
+
+
+class ViewCounter:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending = {}     # (model, id) -> số lượt xem chưa ghi
+        self._wakeup = threading.Event()
+        self._thread = None
+        self._pid = None
+        self._app = None
+        self.interval = DEFAULT_FLUSH_INTERVAL
+        self.max_pending = DEFAULT_MAX_PENDING
+        self._stats = {'recorded': 0, 'flushes': 0, 'rows': 0, 'errors': 0,
+                       'last_flush_ms': 0.0, 'max_flush_ms': 0.0, 'total_flush_ms': 0.0,
+                       'last_flush_at': None}
+
+    def init_app(self, app):
+        self._app = app
+        self.interval = max(float(app.config.get('VIEW_COUNTER_FLUSH_INTERVAL', DEFAULT_FLUSH_INTERVAL)), 0)
+        self.max_pending = int(app.config.get('VIEW_COUNTER_MAX_PENDING', DEFAULT_MAX_PENDING))
+        atexit.register(self.flush)
+
+    # ==================== GHI NHẬN ====================
+    def record(self, obj):
+        model = type(obj)
+        key = (model, obj.id)
+        with self._lock:
+            self._pending[key] = self._pending.get(key, 0) + 1
+            self._stats['recorded'] += 1
+            too_many = len(self._pending) >= self.max_pending
+
+        if not self.interval:
+            self.flush()
+            return
+        self._ensure_thread()
+        if too_many:
+            self._wakeup.set()
+
+    # ==================== FLUSH ====================
+    def flush(self):
+        """Ghi toàn bộ số đếm đang chờ, trả về số dòng đã UPDATE"""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        if not pending or self._app is None:
+            return 0
+
+        grouped = {}
+        for (model, obj_id), count in pending.items():
+            grouped.setdefault(model, []).append({'_id': obj_id, '_n': count})
+
+        from app import db
+        started = time.perf_counter()
+        try:
+            with self._app.app_context():
+                with db.engine.begin() as connection:
+                    for model, params in grouped.items():
+                        table = model.__table__
+                        column = table.c[COUNTER_COLUMNS[model.__name__]]
+                        statement = update(table) \
+                            .where(table.c.id == bindparam('_id')) \
+                            .values({column: db.func.coalesce(column, 0) + bindparam('_n')})
+                        connection.execute(statement, params)
+        except Exception as e:
+            # Trả lại số đếm để lần flush sau thử lại
+            with self._lock:
+                for key, count in pending.items():
+                    self._pending[key] = self._pending.get(key, 0) + count
+                self._stats['errors'] += 1
+            self._app.logger.error(f'❌ View counter flush error: {e}')
+            return 0
+
+        elapsed = (time.perf_counter() - started) * 1000
+        with self._lock:
+            stats = self._stats
+            stats['flushes'] += 1
+            stats['rows'] += len(pending)
+            stats['last_flush_ms'] = round(elapsed, 2)
+            stats['max_flush_ms'] = round(max(stats['max_flush_ms'], elapsed), 2)
+            stats['total_flush_ms'] += elapsed
+            stats['last_flush_at'] = time.time()
+        return len(pending)
+
+    def _ensure_thread(self):
+        # Sau fork (gunicorn preload) thread của process cha không tồn tại ở worker
+        if self._thread is not None and self._pid == os.getpid() and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is not None and self._pid == os.getpid() and self._thread.is_alive():
+                return
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._run, name='view-counter-flush', daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            self._wakeup.wait(self.interval)
+            self._wakeup.clear()
+            self.flush()
+
+    def get_stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            stats['pending_keys'] = len(self._pending)
+            stats['pending_views'] = sum(self._pending.values())
+        flushes = stats['flushes']
+        stats['avg_flush_ms'] = round(stats.pop('total_flush_ms') / flushes, 2) if flushes else 0.0
+        stats['interval'] = self.interval
+        return stats
+
+
+view_counter = ViewCounter()
+
+
+def record_view(obj):
+    view_counter.record(obj)
+
+
+def init_view_counter(app):
+    view_counter.init_app(app)
@@ -0,0 +1,394 @@
+#!/usr/bin/env python3
+"""
+Asset Pipeline - Fingerprint + nén sẵn file build cho build_css.py / build_js.py
+Author: Vũ Văn Hoàng
+
+- main.min.css -> app/static/dist/main.<hash>.css (+ .gz, .br)
+- Ghi app/static/dist/manifest.json: {"main.css": "main.<hash>.css", ...}
+- Flask đọc manifest 1 lần lúc khởi động (app/assets.py), template dùng asset_url('main.css')
+- Giữ lại KEEP_VERSIONS bản cũ để trang HTML đã cache vẫn tải được asset cũ khi deploy
+- Build incremental: cache bản minify từng module trong .build_cache/, chỉ minify lại
+  module thay đổi (song song bằng process pool), watch mode có debounce
+- Source map: mapping từng module được ghép thành main.<hash>.css.map
+
+pip install brotli   (không có thì chỉ tạo .gz)
+"""
+
+import gzip
+import hashlib
+import inspect
+import json
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from minifier import SourceMapBuilder
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# ==================== CẤU HÌNH ====================
+BASE_DIR = Path(__file__).parent.resolve()
+STATIC_DIR = BASE_DIR / 'app' / 'static'
+DIST_DIR = STATIC_DIR / 'dist'
+MANIFEST_FILE = DIST_DIR / 'manifest.json'
+
+HASH_LENGTH = 10
+KEEP_VERSIONS = 2  # Bản hiện tại + 1 bản trước
+GZIP_LEVEL = 9
+BROTLI_QUALITY = 11
+COMPRESSED_SUFFIXES = ('.gz', '.br')
+SIBLING_SUFFIXES = COMPRESSED_SUFFIXES + ('.map',)
+
+
+def content_hash(data):
+    """Hash nội dung (bytes) dùng làm fingerprint tên file"""
+    return hashlib.sha256(data).hexdigest()[:HASH_LENGTH]
+
+
+def fingerprinted_name(logical_name, digest):
+    """main.css + abc123 -> main.abc123.css"""
+    stem, ext = os.path.splitext(logical_name)
+    return f"{stem}.{digest}{ext}"
+
+
+# ==================== MANIFEST ====================
+def load_manifest():
+    if not MANIFEST_FILE.exists():
+        return {}
+    try:
+        with open(MANIFEST_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def write_manifest(manifest):
+    """Ghi manifest atomic (tmp + replace) để Flask không đọc phải file ghi dở"""
+    DIST_DIR.mkdir(parents=True, exist_ok=True)
+    tmp_path = MANIFEST_FILE.with_suffix('.json.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(dict(sorted(manifest.items())), f, indent=2)
+        f.write('\n')
+    os.replace(tmp_path, MANIFEST_FILE)
+
+
+# ==================== NÉN SẴN ====================
+def write_compressed_variants(path, data):
+    """Tạo .gz (và .br nếu có brotli) cạnh file gốc, trả về {'gz': size, 'br': size}"""
+    sizes = {}
+
+    # mtime=0 để build lại cùng nội dung cho ra file .gz giống hệt
+    gz_data = gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0)
+    Path(f"{path}.gz").write_bytes(gz_data)
+    sizes['gz'] = len(gz_data)
+
+    if brotli is not None:
+        br_data = brotli.compress(data, quality=BROTLI_QUALITY)
+        Path(f"{path}.br").write_bytes(br_data)
+        sizes['br'] = len(br_data)
+
+    return sizes
+
+
+def prune_old_versions(logical_name, current_file):
+    """Xóa các bản fingerprint cũ, chỉ giữ KEEP_VERSIONS bản mới nhất"""
+    stem, ext = os.path.splitext(logical_name)
+    versions = [p for p in DIST_DIR.glob(f"{stem}.*{ext}")
+                if p.name != current_file and len(p.name) == len(current_file)]
+    versions.sort(key=lambda p: p.stat().st_mtime, reverse=True)
+
+    removed = []
+    for old in versions[KEEP_VERSIONS - 1:]:
+        for path in [old] + [Path(f"{old}{suffix}") for suffix in SIBLING_SUFFIXES]:
+            if path.exists():
+                path.unlink()
+        removed.append(old.name)
+    return removed
+
+
+def _source_map_comment(filename):
+    map_name = f"{os.path.basename(filename)}.map"
+    if filename.endswith('.css'):
+        return f"\n/*# sourceMappingURL={map_name} */"
+    return f"\n//# sourceMappingURL={map_name}"
+
+
+def publish_asset(logical_name, content, source_map=None, compress=True):
+    """
+    Fingerprint + nén sẵn + cập nhật manifest
+
+    Args:
+        logical_name: tên dùng trong template, vd 'main.css'
+        content: nội dung đã build (str hoặc bytes)
+        source_map: SourceMapBuilder (tùy chọn) -> ghi thêm <file>.map
+        compress: False = không tạo .gz/.br (file chỉ đọc phía server, vd critical CSS)
+
+    Returns:
+        dict: file, size, gz, br (bytes), removed
+    """
+    data = content.encode('utf-8') if isinstance(content, str) else content
+    filename = fingerprinted_name(logical_name, content_hash(data))
+    path = DIST_DIR / filename
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if source_map is not None:
+        Path(f"{path}.map").write_text(source_map.to_json(path.name), encoding='utf-8')
+        data += _source_map_comment(filename).encode('utf-8')
+
+    if not path.exists() or path.read_bytes() != data:
+        path.write_bytes(data)
+    else:
+        os.utime(path)  # Đánh dấu là bản mới nhất cho prune_old_versions
+    sizes = write_compressed_variants(path, data) if compress else {}
+
+    manifest = load_manifest()
+    manifest[logical_name] = filename
+    write_manifest(manifest)
+
+    return {
+        'file': filename,
+        'size': len(data),
+        'gz': sizes.get('gz'),
+        'br': sizes.get('br'),
+        'removed': prune_old_versions(logical_name, filename),
+    }
+
+
+def source_prefix(logical_name, source_dir):
+    """
+    Đường dẫn từ file .map (URL /assets/<logical_name>) tới thư mục module (URL /static/...)
+
+    vd source_prefix('pages/san_pham/products.css', 'css/modules') -> '../../../static/css/modules/'
+    """
+    return '../' * (logical_name.count('/') + 1) + f"static/{source_dir}/"
+
+
+def format_publish_report(info):
+    """1 dòng thống kê cho output của build script"""
+    parts = [f"{info['file']}", f"{info['size'] / 1024:.1f} KB"]
+    if info.get('gz'):
+        parts.append(f"gzip {info['gz'] / 1024:.1f} KB")
+    if info.get('br'):
+        parts.append(f"brotli {info['br'] / 1024:.1f} KB")
+    return ' | '.join(parts)
+
+
+# ==================== INCREMENTAL BUILD ====================
+CACHE_DIR = BASE_DIR / '.build_cache'
+
+# Số process minify song song (0 = theo số CPU). Module nhỏ thì chạy tuần tự luôn,
+# vì khởi động process pool (~50-100ms) còn chậm hơn minify vài trăm KB bằng regex
+BUILD_WORKERS = int(os.environ.get('BUILD_WORKERS', 0))
+PARALLEL_MIN_BYTES = 256 * 1024
+
+# Gom các event file liên tiếp (editor lưu file = nhiều event) thành 1 lần build
+WATCH_DEBOUNCE_SECONDS = 0.3
+
+_minifier_fingerprints = {}
+
+
+def minifier_fingerprint(minify):
+    """
+    Hash source file chứa hàm minify - sửa minifier thì cache tự mất hiệu lực
+
+    Hỗ trợ cả functools.partial (hash thêm tham số)
+    """
+    func = getattr(minify, 'func', minify)
+    extra = repr((getattr(minify, 'args', ()), sorted(getattr(minify, 'keywords', {}).items())))
+    cache_key = (func.__module__, func.__qualname__, extra)
+    if cache_key not in _minifier_fingerprints:
+        source_file = inspect.getsourcefile(func)
+        source = Path(source_file).read_bytes() if source_file else b''
+        _minifier_fingerprints[cache_key] = hashlib.sha256(
+            source + func.__qualname__.encode() + extra.encode()
+        ).hexdigest()[:16]
+    return _minifier_fingerprints[cache_key]
+
+
+def _run_minify(minify, content):
+    """Chạy trong worker process: trả về (output, thời gian)"""
+    started = time.perf_counter()
+    output = minify(content)
+    return output, time.perf_counter() - started
+
+
+def minify_modules(modules, minify, cache_name, force=False):
+    """
+    Minify từng module, chỉ minify lại module có nội dung (hoặc minifier) thay đổi
+
+    Args:
+        modules: list (tên module, Path) theo đúng thứ tự gộp
+        minify: hàm minify(str) -> str (top-level hoặc functools.partial để pickle được)
+        cache_name: thư mục con trong .build_cache (vd 'css', 'js')
+        force: bỏ qua cache
+
+    Returns:
+        list dict theo thứ tự modules: name, key, source_size, output, cached, seconds
+    """
+    cache_dir = CACHE_DIR / cache_name
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    fingerprint = minifier_fingerprint(minify)
+
+    results = []
+    pending = []
+    for name, path in modules:
+        started = time.perf_counter()
+        content = path.read_text(encoding='utf-8')
+        key = hashlib.sha256(fingerprint.encode() + content.encode('utf-8')).hexdigest()[:16]
+        cache_file = cache_dir / f"{name}.{key}.json"
+
+        result = {'name': name, 'key': key, 'source': content,
+                  'source_size': len(content.encode('utf-8')),
+                  'output': None, 'mappings': [], 'cached': False, 'seconds': 0.0}
+        cached = None if force else _read_cache(cache_file)
+        if cached is not None:
+            result['output'], result['mappings'] = cached
+            result['cached'] = True
+            result['seconds'] = time.perf_counter() - started
+        else:
+            pending.append((result, content, cache_file))
+        results.append(result)
+
+    pending_bytes = sum(len(content) for _, content, _ in pending)
+    if len(pending) > 1 and pending_bytes >= PARALLEL_MIN_BYTES and BUILD_WORKERS != 1:
+        with ProcessPoolExecutor(max_workers=BUILD_WORKERS or None) as pool:
+            futures = [(result, cache_file, pool.submit(_run_minify, minify, content))
+                       for result, content, cache_file in pending]
+            done = [(result, cache_file, future.result()) for result, cache_file, future in futures]
+    else:
+        done = [(result, cache_file, _run_minify(minify, content))
+                for result, content, cache_file in pending]
+
+    for result, cache_file, (output, seconds) in done:
+        # Minifier trả về (code, mappings) hoặc chỉ code
+        output, mappings = output if isinstance(output, tuple) else (output, [])
+        result['output'], result['mappings'] = output, [list(m) for m in mappings]
+        result['seconds'] = seconds
+        # Xóa bản cache cũ của module này rồi ghi bản mới
+        for old in cache_dir.glob(f"{result['name']}.*.json"):
+            old.unlink()
+        with open(cache_file, 'w', encoding='utf-8') as f:
+            json.dump({'output': output, 'mappings': result['mappings']}, f, separators=(',', ':'))
+
+    return results
+
+
+def _read_cache(cache_file):
+    try:
+        with open(cache_file, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        return data['output'], data['mappings']
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def concat_modules(header, results, separator, source_prefix):
+    """
+    Ghép header + output các module, đồng thời ghép source map của từng module
+
+    source_prefix: đường dẫn (tương đối so với file .map) tới thư mục module,
+    vd '../static/css/modules/'
+
+    Returns:
+        (content, SourceMapBuilder)
+    """
+    source_map = SourceMapBuilder()
+    parts = [header]
+    line = header.count('\n')
+    col = len(header) - header.rfind('\n') - 1
+
+    for index, result in enumerate(results):
+        if index:
+            parts.append(separator)
+            line, col = _advance(line, col, separator)
+        source_index = source_map.add_source(source_prefix + result['name'], result['source'])
+        source_map.add_mappings(source_index, result['mappings'], line, col)
+        parts.append(result['output'])
+        line, col = _advance(line, col, result['output'])
+
+    return ''.join(parts), source_map
+
+
+def _advance(line, col, text):
+    newlines = text.count('\n')
+    if newlines:
+        return line + newlines, len(text) - text.rfind('\n') - 1
+    return line, col + len(text)
+
+
+def bundle_key(results):
+    """Key của cả bundle = tổ hợp key các module (đổi thứ tự/thêm/bớt module cũng đổi)"""
+    joined = '|'.join(f"{r['name']}:{r['key']}" for r in results)
+    return hashlib.sha256(joined.encode()).hexdigest()[:16]
+
+
+def load_build_state(cache_name):
+    path = CACHE_DIR / f"{cache_name}.state.json"
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_build_state(cache_name, state):
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    with open(CACHE_DIR / f"{cache_name}.state.json", 'w', encoding='utf-8') as f:
+        json.dump(state, f, indent=2)
+
+
+def format_module_timing(result):
+    """1 dòng thống kê từng module: gốc -> minify (-%) | gzip | cache hay build | thời gian"""
+    output = result['output'].encode('utf-8')
+    source_kb = result['source_size'] / 1024
+    output_kb = len(output) / 1024
+    gzip_kb = len(gzip.compress(output, mtime=0)) / 1024 if output else 0
+    saved = (1 - len(output) / result['source_size']) * 100 if result['source_size'] else 0
+    status = 'cache' if result['cached'] else 'build'
+    return (f"{result['name']:35s} | {source_kb:6.1f} -> {output_kb:6.1f} KB ({saved:4.0f}%) "
+            f"| gz {gzip_kb:5.1f} KB | {status:5s} | {result['seconds'] * 1000:6.1f} ms")
+
+
+# ==================== WATCH DEBOUNCE ====================
+class Debouncer:
+    """
+    Gom các event trong khoảng `delay` giây rồi gọi callback(paths) 1 lần
+
+    Build đang chạy mà có event mới thì build thêm 1 lần sau khi xong (không chạy chồng).
+    """
+
+    def __init__(self, callback, delay=WATCH_DEBOUNCE_SECONDS):
+        self.callback = callback
+        self.delay = delay
+        self._lock = threading.Lock()
+        self._build_lock = threading.Lock()
+        self._timer = None
+        self._paths = set()
+
+    def trigger(self, path):
+        with self._lock:
+            self._paths.add(path)
+            if self._timer is not None:
+                self._timer.cancel()
+            self._timer = threading.Timer(self.delay, self._fire)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _fire(self):
+        with self._build_lock:
+            with self._lock:
+                paths, self._paths = sorted(self._paths), set()
+                self._timer = None
+            if paths:
+                self.callback(paths)
+
+    def cancel(self):
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
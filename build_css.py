@@ -6,11 +6,20 @@ Usage: python build_css.py [command]
 pip install watchdog
 """
 
+import hashlib
 import os
 import re
+import time
 from pathlib import Path
 from datetime import datetime
 
+import minifier
+from asset_pipeline import (
+    publish_asset, format_publish_report, MANIFEST_FILE,
+    minify_modules, concat_modules, source_prefix, format_module_timing, bundle_key,
+    load_build_state, save_build_state, Debouncer, WATCH_DEBOUNCE_SECONDS
+)
+
 # ==================== CẤU HÌNH DỰ ÁN ====================
 BASE_DIR = Path(__file__).parent.resolve()
 STATIC_DIR = BASE_DIR / 'app' / 'static'
@@ -24,12 +33,14 @@ CSS_MODULES = {
     '01-variables.css': {
         'start': '/* ==================== CSS VARIABLES ==================== */',
         'end': '/* ==================== GLOBAL RESET ==================== */',
-        'description': 'CSS Variables'
+        'description': 'CSS Variables',
+        'critical': True
     },
     '02-reset.css': {
         'start': '/* ==================== GLOBAL RESET ==================== */',
         'end': '/* ==================== SCROLLBAR (Unified) ==================== */',
-        'description': 'CSS Reset & Global Styles'
+        'description': 'CSS Reset & Global Styles',
+        'critical': True
     },
     '03-scrollbar.css': {
         'start': '/* ==================== SCROLLBAR (Unified) ==================== */',
@@ -39,12 +50,14 @@ CSS_MODULES = {
     '04-skip-link.css': {
         'start': '/* ==================== SKIP LINK (Accessibility) ==================== */',
         'end': '/* ==================== UTILITY CLASSES ==================== */',
-        'description': 'Skip Link for Accessibility'
+        'description': 'Skip Link for Accessibility',
+        'critical': True
     },
     '05-utilities.css': {
         'start': '/* ==================== UTILITY CLASSES ==================== */',
         'end': '/* ==================== ANIMATIONS ==================== */',
-        'description': 'Utility Classes'
+        'description': 'Utility Classes',
+        'critical': True
     },
     '06-animations.css': {
         'start': '/* ==================== ANIMATIONS ==================== */',
@@ -59,22 +72,26 @@ CSS_MODULES = {
     '08-navbar.css': {
         'start': '/* ==================== NAVBAR ==================== */',
         'end': '/* ==================== TOP BAR ==================== */',
-        'description': 'Navigation Bar Styles'
+        'description': 'Navigation Bar Styles',
+        'critical': True
     },
     '09-topbar.css': {
         'start': '/* ==================== TOP BAR ==================== */',
         'end': '/* ==================== BANNER CAROUSEL ==================== */',
-        'description': 'Top Bar Styles'
+        'description': 'Top Bar Styles',
+        'critical': True
     },
     '10-banner.css': {
         'start': '/* ==================== BANNER CAROUSEL ==================== */',
         'end': '/* ==================== BUTTONS ==================== */',
-        'description': 'Banner Carousel Styles'
+        'description': 'Banner Carousel Styles',
+        'critical': True
     },
     '11-buttons.css': {
         'start': '/* ==================== BUTTONS ==================== */',
         'end': '/* ==================== SECTIONS ==================== */',
-        'description': 'Button Styles'
+        'description': 'Button Styles',
+        'critical': True
     },
     '12-sections.css': {
         'start': '/* ==================== SECTIONS ==================== */',
@@ -94,7 +111,8 @@ CSS_MODULES = {
     '15-page-header.css': {
         'start': '/* ==================== PAGE HEADER & BREADCRUMB ==================== */',
         'end': '/* ==================== FLOATING ACTION BUTTONS ==================== */',
-        'description': 'Page Header & Breadcrumb'
+        'description': 'Page Header & Breadcrumb',
+        'critical': True
     },
     '16-floating-buttons.css': {
         'start': '/* ==================== FLOATING ACTION BUTTONS ==================== */',
@@ -159,7 +177,8 @@ CSS_MODULES = {
     '28-page-loader.css': {
         'start': '/* ==================== PAGE LOADER ==================== */',
         'end': '/* ==================== ACCESSIBILITY ==================== */',
-        'description': 'Page Loader'
+        'description': 'Page Loader',
+        'critical': True
     },
     '29-accessibility.css': {
         'start': '/* ==================== ACCESSIBILITY ==================== */',
@@ -271,42 +290,34 @@ def print_warning(message):
     print(f"⚠️  {message}")
 
 
-def extract_css_section(content, start_marker, end_marker):
-    """Trích xuất section CSS giữa 2 marker"""
+def extract_css_section(content, start_marker, end_marker, fallback_markers=(), search_from=0):
+    """
+    Trích xuất section CSS giữa 2 marker
+
+    fallback_markers: marker bắt đầu của các module khác - end_marker không có trong
+    style.css thì dừng ở marker gần nhất phía sau (không kéo cả phần còn lại của file)
+    search_from: tìm start_marker từ vị trí này (marker lặp lại trong file, vd ACCESSIBILITY)
+    """
     if not start_marker:
         return ""
 
-    start_idx = content.find(start_marker)
+    start_idx = content.find(start_marker, search_from)
     if start_idx == -1:
         return ""
 
-    if end_marker:
-        end_idx = content.find(end_marker, start_idx)
-        if end_idx == -1:
-            return content[start_idx:]
-        return content[start_idx:end_idx]
-
-    return content[start_idx:]
+    end_idx = content.find(end_marker, start_idx) if end_marker else -1
+    if end_idx == -1:
+        following = [idx for idx in (content.find(marker, start_idx + len(start_marker))
+                                     for marker in fallback_markers) if idx != -1]
+        end_idx = min(following) if following else -1
+    if end_idx == -1:
+        return content[start_idx:]
+    return content[start_idx:end_idx]
 
 
 def minify_css(css_content):
-    """Minify CSS - loại bỏ comments và khoảng trắng thừa"""
-    # Giữ lại comment đầu tiên (header info)
-    first_comment = re.search(r'/\*.*?\*/', css_content, flags=re.DOTALL)
-    header = first_comment.group(0) if first_comment else ""
-
-    # Loại bỏ tất cả comments
-    css_content = re.sub(r'/\*.*?\*/', '', css_content, flags=re.DOTALL)
-
-    # Loại bỏ khoảng trắng thừa
-    css_content = re.sub(r'\s+', ' ', css_content)
-    css_content = re.sub(r'\s*([{}:;,>+~])\s*', r'\1', css_content)
-    css_content = re.sub(r';\s*}', '}', css_content)
-
-    # Loại bỏ dòng trống
-    css_content = re.sub(r'\n\s*\n', '\n', css_content)
-
-    return (header + "\n" + css_content.strip()) if header else css_content.strip()
+    """Minify CSS bằng tokenizer (minifier.py) - an toàn với string, url(), comment /*! */"""
+    return minifier.minify_css(css_content)[0]
 
 
 def split_css(input_file):
@@ -333,8 +344,13 @@ def split_css(input_file):
     success_count = 0
     warning_count = 0
 
+    # Module khai báo theo thứ tự trong style.css: tìm marker tiếp từ module trước
+    start_markers = [config['start'] for config in CSS_MODULES.values()]
+    cursor = 0
     for filename, config in CSS_MODULES.items():
-        section = extract_css_section(content, config['start'], config['end'])
+        section = extract_css_section(content, config['start'], config['end'], start_markers, cursor)
+        if section:
+            cursor = content.find(section, cursor)
 
         if section:
             output_path = MODULES_DIR / filename
@@ -374,8 +390,13 @@ def split_css(input_file):
     return True
 
 
-def build_css():
-    """Gộp tất cả module thành main.min.css"""
+def build_css(force=False):
+    """
+    Gộp tất cả module thành main.min.css (incremental)
+
+    Mỗi module được minify riêng và cache trong .build_cache/css, chỉ module thay đổi
+    mới minify lại. force=True: bỏ qua cache, build lại toàn bộ.
+    """
     print_header("🔨 BUILD MAIN.MIN.CSS")
 
     if not MODULES_DIR.exists():
@@ -383,29 +404,42 @@ def build_css():
         print_info("Chạy: python build_css.py split")
         return False
 
-    combined_css = []
-    total_size = 0
-    module_count = 0
+    started = time.perf_counter()
+    modules = []
     missing_files = []
 
-    print("📦 Đang gộp các module...\n")
-
     # Đọc các module theo thứ tự
     for filename in sorted(CSS_MODULES.keys()):
         file_path = MODULES_DIR / filename
-
         if file_path.exists():
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-                combined_css.append(content)
-                size = len(content) / 1024
-                total_size += size
-                module_count += 1
-            print(f"  ✓ {filename:35s} | {size:7.1f} KB")
+            modules.append((filename, file_path))
         else:
             missing_files.append(filename)
             print_warning(f"Không tìm thấy: {filename}")
 
+    print("📦 Đang minify các module...\n")
+    results = minify_modules(modules, minifier.minify_css, 'css', force=force)
+    for result in results:
+        print(f"  ✓ {format_module_timing(result)}")
+
+    module_count = len(results)
+    rebuilt = sum(1 for r in results if not r['cached'])
+    total_size = sum(r['source_size'] for r in results) / 1024
+
+    # Không module nào đổi và file build vẫn còn -> bỏ qua ghi file + publish
+    key = bundle_key(results)
+    pages_key = page_bundles_key(key)
+    state = load_build_state('css')
+    if not force and state.get('bundle') == key and OUTPUT_FILE.exists() and state.get('published'):
+        print(f"\n{'─' * 70}")
+        if state.get('pages') != pages_key:
+            # Chỉ template thay đổi -> build lại CSS từng trang
+            build_page_bundles(results)
+            save_build_state('css', dict(state, pages=pages_key))
+        else:
+            print_info(f"Không có module nào thay đổi ({time.perf_counter() - started:.2f}s) - bỏ qua")
+        return True
+
     # Tạo header cho file build
     build_header = f"""/*! 
  * ============================================================================
@@ -421,10 +455,8 @@ def build_css():
 
 """
 
-    # Gộp và minify
-    full_css = '\n\n'.join(combined_css)
-    minified_css = minify_css(full_css)
-    final_css = build_header + minified_css
+    # Gộp các module đã minify (kèm source map)
+    final_css, source_map = concat_modules(build_header, results, '', source_prefix('main.css', 'css/modules'))
 
     # Ghi file output
     with open(OUTPUT_FILE, 'w', encoding='utf-8') as f:
@@ -439,17 +471,182 @@ def build_css():
     print(f"\n{'─' * 70}")
     print(f"  📊 Thống kê Build:")
     print(f"     • Modules thành công:  {module_count}/{len(CSS_MODULES)}")
+    print(f"     • Minify lại:          {rebuilt} (cache: {module_count - rebuilt})")
     if missing_files:
         print(f"     • Modules bị thiếu:    {len(missing_files)}")
     print(f"     • Kích thước gốc:      {original_kb:8.1f} KB")
     print(f"     • Kích thước minify:   {minified_kb:8.1f} KB")
     print(f"     • Tiết kiệm:           {saved_kb:8.1f} KB ({saved_percent:.1f}%)")
+    print(f"     • Thời gian:           {time.perf_counter() - started:8.2f} s")
     print(f"{'─' * 70}")
 
     if missing_files:
         print_warning(f"Một số module bị thiếu: {', '.join(missing_files)}")
 
     print_success(f"Build thành công: {OUTPUT_FILE}")
+    published = publish_css(final_css, source_map)
+    build_page_bundles(results)
+    save_build_state('css', {'bundle': key, 'published': published, 'pages': pages_key})
+    return True
+
+
+def publish_css(content=None, source_map=None):
+    """Fingerprint + nén sẵn (.gz/.br) main.min.css vào static/dist, cập nhật manifest"""
+    if content is None:
+        if not OUTPUT_FILE.exists():
+            print_error(f"Không tìm thấy: {OUTPUT_FILE}")
+            print_info("Chạy: python build_css.py build")
+            return False
+        with open(OUTPUT_FILE, 'r', encoding='utf-8') as f:
+            content = f.read()
+
+    info = publish_asset('main.css', content, source_map)
+    print_success(f"Publish: {format_publish_report(info)}")
+    if info['removed']:
+        print_info(f"Đã xóa bản cũ: {', '.join(info['removed'])}")
+    print_info(f"Manifest: {MANIFEST_FILE}")
+    return True
+
+
+# ==================== CSS THEO TỪNG TRANG + CRITICAL CSS ====================
+TEMPLATES_DIR = BASE_DIR / 'app' / 'templates'
+PUBLIC_TEMPLATES_DIR = TEMPLATES_DIR / 'public'
+JS_SOURCE_FILE = STATIC_DIR / 'js' / 'main.js'
+
+# Critical CSS được inline vào <head> - nên nằm gọn trong ~14KB (gói TCP đầu tiên)
+CRITICAL_CSS_BUDGET = 14 * 1024
+
+_TEMPLATE_REF = re.compile(r'{%-?\s*(?:extends|include|import|from)\s+["\']([^"\']+)["\']')
+_TEMPLATE_WORD = re.compile(r'[A-Za-z_][\w-]*')
+_JINJA_CLASS_PREFIX = re.compile(r'([A-Za-z_][\w-]*-)\{\{')
+# :not(.x) và [class*="x"] không đòi hỏi phần tử phải có class đó
+_SELECTOR_OPTIONAL = re.compile(r':not\([^)]*\)|\[[^\]]*\]')
+_SELECTOR_NAME = re.compile(r'[.#]((?:\\.|[\w-])+)')
+# Trạng thái tương tác không cần cho lần render đầu tiên
+_INTERACTIVE_PSEUDO = re.compile(r':(?:hover|focus|focus-visible|focus-within|active|visited)\b')
+
+
+def collect_template_words(template_name, seen=None):
+    """
+    Tất cả từ (class, id, string...) trong template và các template nó extends/include
+
+    Returns:
+        (words, prefixes) - prefixes: class ghép từ Jinja, vd 'alert-{{ category }}' -> 'alert-'
+    """
+    seen = set() if seen is None else seen
+    words, prefixes = set(), set()
+    if template_name in seen:
+        return words, prefixes
+    seen.add(template_name)
+
+    path = TEMPLATES_DIR / template_name
+    if not path.exists():
+        return words, prefixes
+    text = path.read_text(encoding='utf-8')
+    words.update(_TEMPLATE_WORD.findall(text))
+    prefixes.update(_JINJA_CLASS_PREFIX.findall(text))
+
+    for ref in _TEMPLATE_REF.findall(text):
+        ref_words, ref_prefixes = collect_template_words(ref, seen)
+        words |= ref_words
+        prefixes |= ref_prefixes
+    return words, prefixes
+
+
+def collect_js_words():
+    """Class/id mà JS thêm vào lúc chạy (classList.add('active'...)) - coi như trang nào cũng dùng"""
+    if not JS_SOURCE_FILE.exists():
+        return set()
+    return set(_TEMPLATE_WORD.findall(JS_SOURCE_FILE.read_text(encoding='utf-8')))
+
+
+def selector_matches(selector, words, prefixes):
+    """Selector có thể khớp trang không: mọi class/id bắt buộc đều xuất hiện trong template"""
+    for name in _SELECTOR_NAME.findall(_SELECTOR_OPTIONAL.sub('', selector)):
+        name = name.replace('\\', '')
+        if name not in words and not any(name.startswith(prefix) for prefix in prefixes):
+            return False
+    return True
+
+
+def _keep_screen_at_rule(name, prelude):
+    """Critical CSS: bỏ @keyframes, @font-face, @media print"""
+    return name in ('media', 'supports', 'container', 'layer') and 'print' not in prelude
+
+
+def list_public_pages():
+    """[(page, template_name)] - page: 'index', 'san_pham/products'..."""
+    return [
+        (path.relative_to(PUBLIC_TEMPLATES_DIR).with_suffix('').as_posix(),
+         path.relative_to(TEMPLATES_DIR).as_posix())
+        for path in sorted(PUBLIC_TEMPLATES_DIR.rglob('*.html'))
+    ]
+
+
+def page_bundles_key(bundle):
+    """Key cho bước build từng trang = bundle module + nội dung toàn bộ template + main.js"""
+    digest = hashlib.sha256(bundle.encode())
+    for path in sorted(TEMPLATES_DIR.rglob('*.html')) + [JS_SOURCE_FILE]:
+        if path.exists():
+            digest.update(path.as_posix().encode())
+            digest.update(path.read_bytes())
+    return digest.hexdigest()[:16]
+
+
+def build_page_bundles(results):
+    """
+    Mỗi template trong app/templates/public:
+    - pages/<page>.css: chỉ gồm các module có selector khớp template (giữ thứ tự gốc)
+    - critical/<page>.css: rule của module 'critical' khớp template, inline vào <head>
+    """
+    print_header("📄 CSS THEO TỪNG TRANG + CRITICAL CSS")
+
+    if not PUBLIC_TEMPLATES_DIR.exists():
+        print_warning(f"Không tìm thấy: {PUBLIC_TEMPLATES_DIR}")
+        return False
+
+    js_words = collect_js_words()
+
+    # Selector của từng module (parse 1 lần)
+    module_selectors = {}
+    for result in results:
+        selectors = []
+        minifier.select_css(result['output'], lambda sel: selectors.append(sel) or True)
+        module_selectors[result['name']] = selectors
+
+    full_size = sum(len(r['output'].encode('utf-8')) for r in results)
+    for page, template_name in list_public_pages():
+        words, prefixes = collect_template_words(template_name)
+        words |= js_words
+
+        used = [
+            r for r in results
+            if r['output'] and (not module_selectors[r['name']] or any(
+                selector_matches(sel, words, prefixes) for sel in module_selectors[r['name']]
+            ))
+        ]
+        logical_name = f"pages/{page}.css"
+        content, source_map = concat_modules('', used, '', source_prefix(logical_name, 'css/modules'))
+        info = publish_asset(logical_name, content, source_map)
+
+        critical = ''.join(
+            minifier.select_css(
+                r['output'],
+                lambda sel: (selector_matches(sel, words, prefixes)
+                             and not _INTERACTIVE_PSEUDO.search(sel)),
+                _keep_screen_at_rule
+            )
+            for r in used if CSS_MODULES.get(r['name'], {}).get('critical')
+        )
+        critical_info = publish_asset(f"critical/{page}.css", critical, compress=False)
+
+        saved = (1 - info['size'] / full_size) * 100 if full_size else 0
+        print(f"  ✓ {page:32s} | {len(used):2d}/{len(results)} modules | "
+              f"{info['size'] / 1024:6.1f} KB (-{saved:4.1f}%) | critical {critical_info['size'] / 1024:5.1f} KB")
+        if critical_info['size'] > CRITICAL_CSS_BUDGET:
+            print_warning(f"Critical CSS của {page} vượt {CRITICAL_CSS_BUDGET // 1024} KB")
+
+    print_info(f"Manifest: {MANIFEST_FILE}")
     return True
 
 
@@ -463,26 +660,39 @@ def watch_and_build():
         print_info("Chạy: pip install watchdog")
         return
 
+    def rebuild(paths):
+        names = ', '.join(Path(path).name for path in paths)
+        print(f"\n🔄 Phát hiện thay đổi: {names}")
+        build_css()
+
+    debouncer = Debouncer(rebuild)
+
     class CSSChangeHandler(FileSystemEventHandler):
-        def on_modified(self, event):
-            if event.src_path.endswith('.css') and 'main.min.css' not in event.src_path:
-                print(f"\n🔄 Phát hiện thay đổi: {Path(event.src_path).name}")
-                build_css()
+        # Editor thường lưu file = ghi file tạm + rename -> bắt cả created/moved
+        def on_any_event(self, event):
+            if event.is_directory or event.event_type not in ('modified', 'created', 'moved'):
+                return
+            path = getattr(event, 'dest_path', '') or event.src_path
+            # Sửa template cũng cần build lại CSS từng trang
+            if (path.endswith('.css') and 'main.min.css' not in path) or path.endswith('.html'):
+                debouncer.trigger(path)
 
     print_header("👀 WATCH MODE - Tự động build khi có thay đổi")
-    print_info(f"Đang theo dõi: {MODULES_DIR}")
+    print_info(f"Đang theo dõi: {MODULES_DIR} (debounce {WATCH_DEBOUNCE_SECONDS * 1000:.0f}ms)")
+    print_info(f"Đang theo dõi: {TEMPLATES_DIR} (CSS từng trang)")
     print_info("Nhấn Ctrl+C để dừng...\n")
 
     event_handler = CSSChangeHandler()
     observer = Observer()
     observer.schedule(event_handler, str(MODULES_DIR), recursive=False)
+    observer.schedule(event_handler, str(TEMPLATES_DIR), recursive=True)
     observer.start()
 
     try:
-        import time
         while True:
             time.sleep(1)
     except KeyboardInterrupt:
+        debouncer.cancel()
         observer.stop()
         print("\n")
         print_info("Đã dừng watch mode")
@@ -499,7 +709,9 @@ def show_help():
     commands = [
         ("python build_css.py", "Tách + Build (mặc định)", "Lần đầu sử dụng"),
         ("python build_css.py split", "Chỉ tách file CSS", "Tách style.css thành modules"),
-        ("python build_css.py build", "Chỉ build CSS", "Gộp modules thành main.min.css"),
+        ("python build_css.py build", "Chỉ build CSS", "Gộp modules thành main.min.css + publish + CSS từng trang"),
+        ("python build_css.py build --force", "Build lại toàn bộ", "Bỏ qua cache .build_cache/css"),
+        ("python build_css.py publish", "Chỉ publish", "main.min.css -> dist/main.<hash>.css (+ .gz/.br)"),
         ("python build_css.py watch", "Watch mode", "Tự động build khi sửa file"),
         ("python build_css.py help", "Hiển thị trợ giúp", "Xem hướng dẫn này"),
     ]
@@ -512,21 +724,24 @@ def show_help():
     print("📁 Cấu trúc thư mục:\n")
     print("  app/")
     print("  └── static/")
-    print("      └── css/")
-    print("          ├── modules/              ← Các module CSS")
-    print("          │   ├── 01-variables.css")
-    print("          │   ├── 02-reset.css")
-    print("          │   └── ...")
-    print("          ├── style.css             ← File CSS gốc")
-    print("          └── main.min.css          ← File build (production)\n")
+    print("      ├── css/")
+    print("      │   ├── modules/              ← Các module CSS")
+    print("      │   │   ├── 01-variables.css")
+    print("      │   │   ├── 02-reset.css")
+    print("      │   │   └── ...")
+    print("      │   ├── style.css             ← File CSS gốc")
+    print("      │   └── main.min.css          ← File build")
+    print("      └── dist/")
+    print("          ├── main.<hash>.css(.gz/.br) ← File production (cache 1 năm)")
+    print("          └── manifest.json         ← main.css -> main.<hash>.css\n")
 
     print("⚡ Workflow khuyến nghị:\n")
     print("  1. Lần đầu:    python build_css.py")
     print("  2. Phát triển: python build_css.py watch")
-    print("  3. Production: Deploy main.min.css\n")
+    print("  3. Production: Deploy main.min.css + dist/ (commit cả manifest.json)\n")
 
     print("🔗 Update template:\n")
-    print('  <link rel="stylesheet" href="{{ url_for(\'static\', filename=\'css/main.min.css\') }}">\n')
+    print('  <link rel="stylesheet" href="{{ asset_url(\'main.css\') }}">\n')
 
 
 def main():
@@ -540,7 +755,10 @@ def main():
             split_css(INPUT_FILE)
 
         elif command == 'build':
-            build_css()
+            build_css(force='--force' in sys.argv)
+
+        elif command == 'publish':
+            publish_css()
 
         elif command == 'watch':
             watch_and_build()
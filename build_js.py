@@ -7,10 +7,17 @@ pip install watchdog
 """
 
 import os
-import re
+import time
 from pathlib import Path
 from datetime import datetime
 
+import minifier
+from asset_pipeline import (
+    publish_asset, format_publish_report, MANIFEST_FILE,
+    minify_modules, concat_modules, source_prefix, format_module_timing, bundle_key,
+    load_build_state, save_build_state, Debouncer, WATCH_DEBOUNCE_SECONDS
+)
+
 # ==================== CẤU HÌNH DỰ ÁN ====================
 BASE_DIR = Path(__file__).parent.resolve()
 STATIC_DIR = BASE_DIR / 'app' / 'static'
@@ -521,24 +528,8 @@ def extract_js_section(content, start_marker, end_marker):
 
 
 def minify_js(js_content):
-    """Minify JavaScript - loại bỏ comments và khoảng trắng thừa (cơ bản)"""
-    # Giữ lại comment đầu tiên (header info)
-    first_comment = re.search(r'/\*.*?\*/', js_content, flags=re.DOTALL)
-    header = first_comment.group(0) if first_comment else ""
-
-    # Loại bỏ single-line comments (cẩn thận với URLs)
-    js_content = re.sub(r'(?<!:)//.*?$', '', js_content, flags=re.MULTILINE)
-
-    # Loại bỏ multi-line comments
-    js_content = re.sub(r'/\*.*?\*/', '', js_content, flags=re.DOTALL)
-
-    # Loại bỏ khoảng trắng thừa (giữ nguyên strings)
-    js_content = re.sub(r'\n\s*\n', '\n', js_content)
-
-    # Loại bỏ trailing spaces
-    js_content = re.sub(r'[ \t]+$', '', js_content, flags=re.MULTILINE)
-
-    return (header + "\n" + js_content.strip()) if header else js_content.strip()
+    """Minify JavaScript bằng tokenizer (minifier.py) - an toàn với string, regex, template literal"""
+    return minifier.minify_js(js_content)[0]
 
 
 def split_js(input_file):
@@ -603,8 +594,13 @@ def split_js(input_file):
     return True
 
 
-def build_js():
-    """Gộp tất cả module thành main.min.js"""
+def build_js(force=False):
+    """
+    Gộp tất cả module thành main.min.js (incremental)
+
+    Mỗi module được minify riêng và cache trong .build_cache/js, chỉ module thay đổi
+    mới minify lại. force=True: bỏ qua cache, build lại toàn bộ.
+    """
     print_header("🔨 BUILD MAIN.MIN.JS")
 
     if not MODULES_DIR.exists():
@@ -612,27 +608,34 @@ def build_js():
         print_info("Chạy: python build_js.py split")
         return False
 
-    combined_js = []
-    total_size = 0
-    module_count = 0
-
-    print("📦 Đang gộp các module...\n")
+    started = time.perf_counter()
+    modules = []
 
     # Đọc các module theo thứ tự
     for filename in sorted(JS_MODULES.keys()):
         file_path = MODULES_DIR / filename
-
         if file_path.exists():
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-                combined_js.append(content)
-                size = len(content) / 1024
-                total_size += size
-                module_count += 1
-            print(f"  ✓ {filename:32s} | {size:7.1f} KB")
+            modules.append((filename, file_path))
         else:
             print_warning(f"Không tìm thấy: {filename}")
 
+    print("📦 Đang minify các module...\n")
+    results = minify_modules(modules, minifier.minify_js, 'js', force=force)
+    for result in results:
+        print(f"  ✓ {format_module_timing(result)}")
+
+    module_count = len(results)
+    rebuilt = sum(1 for r in results if not r['cached'])
+    total_size = sum(r['source_size'] for r in results) / 1024
+
+    # Không module nào đổi và file build vẫn còn -> bỏ qua ghi file + publish
+    key = bundle_key(results)
+    state = load_build_state('js')
+    if not force and state.get('bundle') == key and OUTPUT_FILE.exists() and state.get('published'):
+        print(f"\n{'─' * 70}")
+        print_info(f"Không có module nào thay đổi ({time.perf_counter() - started:.2f}s) - bỏ qua")
+        return True
+
     # Tạo header cho file build
     build_header = f"""/*! 
  * ============================================================================
@@ -649,10 +652,8 @@ def build_js():
 
 """
 
-    # Gộp và minify
-    full_js = '\n\n'.join(combined_js)
-    minified_js = minify_js(full_js)
-    final_js = build_header + minified_js
+    # Gộp các module đã minify (xuống dòng giữa các module để tránh lỗi ASI, kèm source map)
+    final_js, source_map = concat_modules(build_header, results, '\n', source_prefix('main.js', 'js/modules'))
 
     # Ghi file output
     with open(OUTPUT_FILE, 'w', encoding='utf-8') as f:
@@ -666,12 +667,34 @@ def build_js():
 
     print(f"\n{'─' * 70}")
     print(f"  📊 Thống kê Build:")
+    print(f"     • Minify lại:        {rebuilt} (cache: {module_count - rebuilt})")
     print(f"     • Kích thước gốc:    {original_kb:8.1f} KB")
     print(f"     • Kích thước minify: {minified_kb:8.1f} KB")
     print(f"     • Tiết kiệm:         {saved_kb:8.1f} KB ({saved_percent:.1f}%)")
+    print(f"     • Thời gian:         {time.perf_counter() - started:8.2f} s")
     print(f"{'─' * 70}")
 
     print_success(f"Build thành công: {OUTPUT_FILE}")
+    published = publish_js(final_js, source_map)
+    save_build_state('js', {'bundle': key, 'published': published})
+    return True
+
+
+def publish_js(content=None, source_map=None):
+    """Fingerprint + nén sẵn (.gz/.br) main.min.js vào static/dist, cập nhật manifest"""
+    if content is None:
+        if not OUTPUT_FILE.exists():
+            print_error(f"Không tìm thấy: {OUTPUT_FILE}")
+            print_info("Chạy: python build_js.py build")
+            return False
+        with open(OUTPUT_FILE, 'r', encoding='utf-8') as f:
+            content = f.read()
+
+    info = publish_asset('main.js', content, source_map)
+    print_success(f"Publish: {format_publish_report(info)}")
+    if info['removed']:
+        print_info(f"Đã xóa bản cũ: {', '.join(info['removed'])}")
+    print_info(f"Manifest: {MANIFEST_FILE}")
     return True
 
 
@@ -685,14 +708,24 @@ def watch_and_build():
         print_info("Chạy: pip install watchdog")
         return
 
+    def rebuild(paths):
+        names = ', '.join(Path(path).name for path in paths)
+        print(f"\n🔄 Phát hiện thay đổi: {names}")
+        build_js()
+
+    debouncer = Debouncer(rebuild)
+
     class JSChangeHandler(FileSystemEventHandler):
-        def on_modified(self, event):
-            if event.src_path.endswith('.js') and 'main.min.js' not in event.src_path:
-                print(f"\n🔄 Phát hiện thay đổi: {Path(event.src_path).name}")
-                build_js()
+        # Editor thường lưu file = ghi file tạm + rename -> bắt cả created/moved
+        def on_any_event(self, event):
+            if event.is_directory or event.event_type not in ('modified', 'created', 'moved'):
+                return
+            path = getattr(event, 'dest_path', '') or event.src_path
+            if path.endswith('.js') and 'main.min.js' not in path:
+                debouncer.trigger(path)
 
     print_header("👀 WATCH MODE - Tự động build khi có thay đổi")
-    print_info(f"Đang theo dõi: {MODULES_DIR}")
+    print_info(f"Đang theo dõi: {MODULES_DIR} (debounce {WATCH_DEBOUNCE_SECONDS * 1000:.0f}ms)")
     print_info("Nhấn Ctrl+C để dừng...\n")
 
     event_handler = JSChangeHandler()
@@ -701,10 +734,10 @@ def watch_and_build():
     observer.start()
 
     try:
-        import time
         while True:
             time.sleep(1)
     except KeyboardInterrupt:
+        debouncer.cancel()
         observer.stop()
         print("\n")
         print_info("Đã dừng watch mode")
@@ -739,7 +772,9 @@ def show_help():
     commands = [
         ("python build_js.py", "Tách + Build (mặc định)", "Lần đầu sử dụng"),
         ("python build_js.py split", "Chỉ tách file JS", "Tách main.js thành modules"),
-        ("python build_js.py build", "Chỉ build JS", "Gộp modules thành main.min.js"),
+        ("python build_js.py build", "Chỉ build JS", "Gộp modules thành main.min.js + publish"),
+        ("python build_js.py build --force", "Build lại toàn bộ", "Bỏ qua cache .build_cache/js"),
+        ("python build_js.py publish", "Chỉ publish", "main.min.js -> dist/main.<hash>.js (+ .gz/.br)"),
         ("python build_js.py watch", "Watch mode", "Tự động build khi sửa file"),
         ("python build_js.py list", "Liệt kê modules", "Xem chi tiết từng module"),
         ("python build_js.py help", "Hiển thị trợ giúp", "Xem hướng dẫn này"),
@@ -753,21 +788,24 @@ def show_help():
     print("📁 Cấu trúc thư mục:\n")
     print("  app/")
     print("  └── static/")
-    print("      └── js/")
-    print("          ├── modules/               ← Các module JavaScript")
-    print("          │   ├── 01-floating-buttons.js")
-    print("          │   ├── 02-animate-scroll.js")
-    print("          │   └── ...")
-    print("          ├── main.js                ← File JS gốc")
-    print("          └── main.min.js            ← File build (dùng trong production)\n")
+    print("      ├── js/")
+    print("      │   ├── modules/               ← Các module JavaScript")
+    print("      │   │   ├── 01-floating-buttons.js")
+    print("      │   │   ├── 02-animate-scroll.js")
+    print("      │   │   └── ...")
+    print("      │   ├── main.js                ← File JS gốc")
+    print("      │   └── main.min.js            ← File build")
+    print("      └── dist/")
+    print("          ├── main.<hash>.js(.gz/.br) ← File production (cache 1 năm)")
+    print("          └── manifest.json          ← main.js -> main.<hash>.js\n")
 
     print("⚡ Workflow khuyến nghị:\n")
     print("  1. Lần đầu: python build_js.py")
     print("  2. Phát triển: python build_js.py watch")
-    print("  3. Production: Chỉ cần deploy main.min.js\n")
+    print("  3. Production: Deploy main.min.js + dist/ (commit cả manifest.json)\n")
 
     print("🔗 Update template:\n")
-    print('  <script src="{{ url_for(\'static\', filename=\'js/main.min.js\') }}" defer></script>\n')
+    print('  <script src="{{ asset_url(\'main.js\') }}" defer></script>\n')
 
 
 def main():
@@ -781,7 +819,10 @@ def main():
             split_js(INPUT_FILE)
 
         elif command == 'build':
-            build_js()
+            build_js(force='--force' in sys.argv)
+
+        elif command == 'publish':
+            publish_js()
 
         elif command == 'watch':
             watch_and_build()
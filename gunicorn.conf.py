@@ -5,7 +5,9 @@ Gunicorn config - Render Starter (512MB RAM, 0.5 CPU)
 import os
 
 # ===== WORKERS / THREADS =====
-workers = 1
+# >1 worker: đặt CACHE_BACKEND=sqlite (hoặc redis) để các worker dùng chung cache
+# và nhận invalidation từ admin; chỉ 1 worker nên chạy scheduler (ENABLE_SCHEDULER)
+workers = int(os.environ.get("WEB_CONCURRENCY", "1"))
 threads = int(os.environ.get("GTHREADS", "3"))  # bắt đầu 3; nâng 4 nếu cần
 worker_class = "gthread"
 
@@ -23,7 +25,7 @@ bind = f"0.0.0.0:{os.environ.get('PORT', '10000')}"
 backlog = int(os.environ.get("GUNICORN_BACKLOG", "256"))
 
 # ===== PERF / PROXY COMPAT =====
-preload_app = True           # 1 worker → an toàn, warm-up nhanh
+preload_app = True           # warm-up nhanh; cache backend tự mở lại kết nối sau fork
 sendfile = False             # tránh lỗi với reverse proxy
 
 # ===== LOGGING =====
@@ -38,6 +40,8 @@ def on_starting(server):
 
 def post_fork(server, worker):
     print(f"✅ Worker {worker.pid} ready")
+    if workers > 1 and os.environ.get("CACHE_BACKEND", "memory") == "memory":
+        print("⚠️ CACHE_BACKEND=memory với nhiều worker: invalidation không đồng bộ giữa các worker")
 
 def worker_int(worker):
     print(f"⚠️ Worker {worker.pid} received SIGINT")
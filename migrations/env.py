@@ -51,6 +51,21 @@ def get_metadata():
     return target_db.metadata
 
 
+# Cột/index full-text search chỉ tạo bằng migration (không khai báo trong model,
+# xem app/fulltext.py) -> autogenerate không được đề xuất xóa chúng
+FULLTEXT_OBJECTS = {
+    'search_vector',
+    'ix_products_search_vector', 'ix_products_name_trgm',
+    'ix_blogs_search_vector', 'ix_blogs_title_trgm',
+}
+
+
+def include_object(object, name, type_, reflected, compare_to):
+    if reflected and compare_to is None and name in FULLTEXT_OBJECTS:
+        return False
+    return True
+
+
 def run_migrations_offline():
     """Run migrations in 'offline' mode.
 
@@ -65,7 +80,8 @@ def run_migrations_offline():
     """
     url = config.get_main_option("sqlalchemy.url")
     context.configure(
-        url=url, target_metadata=get_metadata(), literal_binds=True
+        url=url, target_metadata=get_metadata(), literal_binds=True,
+        include_object=include_object
     )
 
     with context.begin_transaction():
@@ -93,6 +109,7 @@ def run_migrations_online():
     conf_args = current_app.extensions['migrate'].configure_args
     if conf_args.get("process_revision_directives") is None:
         conf_args["process_revision_directives"] = process_revision_directives
+    conf_args.setdefault("include_object", include_object)
 
     connectable = get_engine()
 
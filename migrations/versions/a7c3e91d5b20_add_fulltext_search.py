@@ -0,0 +1,88 @@
+"""add fulltext search (tsvector, unaccent, pg_trgm)
+
+Revision ID: a7c3e91d5b20
+Revises: c0dfb662488d
+Create Date: 2026-10-17 10:20:41.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a7c3e91d5b20'
+down_revision = 'c0dfb662488d'
+branch_labels = None
+depends_on = None
+
+
+# Bảng -> (biểu thức tsvector, cột dùng cho index trigram)
+SEARCH_TABLES = {
+    'products': (
+        "setweight(to_tsvector('vn_unaccent', coalesce(name, '')), 'A') || "
+        "setweight(to_tsvector('vn_unaccent', coalesce(description, '')), 'C')",
+        'name',
+    ),
+    'blogs': (
+        "setweight(to_tsvector('vn_unaccent', coalesce(title, '')), 'A') || "
+        "setweight(to_tsvector('vn_unaccent', coalesce(excerpt, '')), 'B') || "
+        "setweight(to_tsvector('vn_unaccent', coalesce(content, '')), 'D')",
+        'title',
+    ),
+}
+
+
+def upgrade():
+    # Chỉ PostgreSQL (SQLite khi dev vẫn tìm kiếm bằng ILIKE / index trong RAM)
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    # ==================== BƯỚC 1: EXTENSIONS ====================
+    op.execute('CREATE EXTENSION IF NOT EXISTS unaccent')
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+
+    # ==================== BƯỚC 2: HÀM + TEXT SEARCH CONFIG ====================
+    # unaccent() là STABLE, index biểu thức cần IMMUTABLE -> bọc lại với dictionary cố định
+    op.execute("""
+        CREATE OR REPLACE FUNCTION f_unaccent(text) RETURNS text AS
+        $$ SELECT public.unaccent('public.unaccent'::regdictionary, $1) $$
+        LANGUAGE sql IMMUTABLE PARALLEL SAFE STRICT
+    """)
+
+    # Config 'simple' + unaccent: 'Gạch ốp' và 'gach op' cho cùng lexeme,
+    # ts_headline vẫn làm việc trên text gốc có dấu
+    op.execute("""
+        DO $$
+        BEGIN
+            IF NOT EXISTS (SELECT 1 FROM pg_ts_config WHERE cfgname = 'vn_unaccent') THEN
+                CREATE TEXT SEARCH CONFIGURATION vn_unaccent (COPY = simple);
+                ALTER TEXT SEARCH CONFIGURATION vn_unaccent
+                    ALTER MAPPING FOR hword, hword_part, word WITH unaccent, simple;
+            END IF;
+        END
+        $$
+    """)
+
+    # ==================== BƯỚC 3: CỘT GENERATED + INDEX ====================
+    for table, (expression, title_column) in SEARCH_TABLES.items():
+        op.execute(f"""
+            ALTER TABLE {table}
+            ADD COLUMN search_vector tsvector GENERATED ALWAYS AS ({expression}) STORED
+        """)
+        op.execute(f'CREATE INDEX ix_{table}_search_vector ON {table} USING gin (search_vector)')
+        op.execute(f'CREATE INDEX ix_{table}_{title_column}_trgm ON {table} '
+                   f'USING gin (f_unaccent(lower({title_column})) gin_trgm_ops)')
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    # ==================== ROLLBACK ====================
+    for table, (_, title_column) in SEARCH_TABLES.items():
+        op.execute(f'DROP INDEX IF EXISTS ix_{table}_{title_column}_trgm')
+        op.execute(f'DROP INDEX IF EXISTS ix_{table}_search_vector')
+        op.execute(f'ALTER TABLE {table} DROP COLUMN IF EXISTS search_vector')
+
+    op.execute('DROP TEXT SEARCH CONFIGURATION IF EXISTS vn_unaccent')
+    op.execute('DROP FUNCTION IF EXISTS f_unaccent(text)')
@@ -0,0 +1,32 @@
+"""add product listing indexes
+
+Revision ID: b4d81f0c2e67
+Revises: a7c3e91d5b20
+Create Date: 2026-10-17 14:05:12.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b4d81f0c2e67'
+down_revision = 'a7c3e91d5b20'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # /san-pham: WHERE is_active [AND category_id] ORDER BY created_at | price | views
+    with op.batch_alter_table('products', schema=None) as batch_op:
+        batch_op.create_index('ix_products_active_category_created',
+                              ['is_active', 'category_id', 'created_at'], unique=False)
+        batch_op.create_index('ix_products_price', ['price'], unique=False)
+        batch_op.create_index('ix_products_views', ['views'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('products', schema=None) as batch_op:
+        batch_op.drop_index('ix_products_views')
+        batch_op.drop_index('ix_products_price')
+        batch_op.drop_index('ix_products_active_category_created')
@@ -0,0 +1,752 @@
+#!/usr/bin/env python3
+"""
+Minifier CSS/JS dựa trên tokenizer (dùng bởi build_css.py / build_js.py)
+Author: Vũ Văn Hoàng
+
+Khác với bản regex cũ, tokenizer hiểu string, url(), comment, regex literal và
+template literal nên không bao giờ sửa nhầm bên trong chúng.
+
+CSS:
+- Bỏ comment (giữ /*! ... */), khoảng trắng thừa, dấu ; cuối block
+- Rút gọn giá trị: 0px -> 0, 0.5 -> .5, #ffffff -> #fff, margin:0 0 0 0 -> margin:0
+- Bỏ khai báo trùng lặp, rule rỗng; gộp rule liền kề cùng selector / cùng nội dung
+
+JS (bảo thủ - không đổi tên biến):
+- Bỏ comment (giữ /*! ... */) và khoảng trắng thừa
+- Chỉ giữ xuống dòng ở chỗ có thể phụ thuộc ASI (tự chèn dấu ;)
+
+Cả 2 hàm trả về (code, mappings) - mappings là list (gen_line, gen_col, src_line, src_col)
+(0-based) để build script ghép thành source map v3 cho cả bundle.
+"""
+
+import json
+import re
+
+# ==================== SOURCE MAP ====================
+_BASE64 = 'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/'
+
+
+def _vlq(value):
+    value = (-value << 1) | 1 if value < 0 else value << 1
+    encoded = ''
+    while True:
+        digit = value & 31
+        value >>= 5
+        if value:
+            digit |= 32
+        encoded += _BASE64[digit]
+        if not value:
+            return encoded
+
+
+class SourceMapBuilder:
+    """Ghép mappings của nhiều module thành 1 source map v3"""
+
+    def __init__(self):
+        self.sources = []
+        self.sources_content = []
+        self.mappings = []  # (gen_line, gen_col, source_index, src_line, src_col)
+
+    def add_source(self, name, content=None):
+        self.sources.append(name)
+        self.sources_content.append(content)
+        return len(self.sources) - 1
+
+    def add_mappings(self, source_index, mappings, line_offset=0, col_offset=0):
+        """Mappings của module được ghép bắt đầu tại (line_offset, col_offset) trong bundle"""
+        for gen_line, gen_col, src_line, src_col in mappings:
+            if gen_line == 0:
+                gen_col += col_offset
+            self.mappings.append((gen_line + line_offset, gen_col, source_index, src_line, src_col))
+
+    def to_dict(self, file):
+        lines = []
+        prev_source = prev_src_line = prev_src_col = 0
+        current_line = 0
+        segments = []
+        prev_gen_col = 0
+
+        for gen_line, gen_col, source, src_line, src_col in sorted(self.mappings):
+            while current_line < gen_line:
+                lines.append(','.join(segments))
+                segments = []
+                prev_gen_col = 0
+                current_line += 1
+            segments.append(
+                _vlq(gen_col - prev_gen_col) + _vlq(source - prev_source)
+                + _vlq(src_line - prev_src_line) + _vlq(src_col - prev_src_col)
+            )
+            prev_gen_col, prev_source, prev_src_line, prev_src_col = gen_col, source, src_line, src_col
+        lines.append(','.join(segments))
+
+        source_map = {'version': 3, 'file': file, 'sources': self.sources, 'names': [],
+                      'mappings': ';'.join(lines)}
+        if any(content is not None for content in self.sources_content):
+            source_map['sourcesContent'] = self.sources_content
+        return source_map
+
+    def to_json(self, file):
+        return json.dumps(self.to_dict(file), ensure_ascii=False, separators=(',', ':'))
+
+
+class _Writer:
+    """Ghi output + theo dõi vị trí (line, col) để tạo mapping"""
+
+    def __init__(self):
+        self.parts = []
+        self.line = 0
+        self.col = 0
+        self.mappings = []
+
+    def mark(self, src_line, src_col):
+        self.mappings.append((self.line, self.col, src_line, src_col))
+
+    def write(self, text):
+        if not text:
+            return
+        self.parts.append(text)
+        newlines = text.count('\n')
+        if newlines:
+            self.line += newlines
+            self.col = len(text) - text.rfind('\n') - 1
+        else:
+            self.col += len(text)
+
+    def getvalue(self):
+        return ''.join(self.parts)
+
+
+def _line_starts(text):
+    starts = [0]
+    for match in re.finditer('\n', text):
+        starts.append(match.end())
+    return starts
+
+
+def _position(line_starts, offset):
+    """offset -> (line, col) 0-based"""
+    lo, hi = 0, len(line_starts) - 1
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if line_starts[mid] <= offset:
+            lo = mid
+        else:
+            hi = mid - 1
+    return lo, offset - line_starts[lo]
+
+
+# ==================== CSS TOKENIZER ====================
+CSS_PUNCT = set('{}();:,!>+~')
+
+# At-rule chứa rule con (các at-rule khác như @font-face chứa khai báo)
+CSS_RULE_AT_RULES = {'media', 'supports', 'document', 'container', 'layer', 'scope',
+                     'keyframes', '-webkit-keyframes', '-moz-keyframes', '-o-keyframes'}
+
+
+def tokenize_css(css):
+    """List token (type, value, offset); type: comment, ws, string, url, punct, word"""
+    tokens = []
+    i, n = 0, len(css)
+    while i < n:
+        ch = css[i]
+        start = i
+        if ch == '/' and css.startswith('/*', i):
+            end = css.find('*/', i + 2)
+            i = n if end == -1 else end + 2
+            tokens.append(('comment', css[start:i], start))
+        elif ch.isspace():
+            while i < n and css[i].isspace():
+                i += 1
+            tokens.append(('ws', ' ', start))
+        elif ch in '"\'':
+            i += 1
+            while i < n and css[i] != ch:
+                i += 2 if css[i] == '\\' else 1
+            i += 1
+            tokens.append(('string', css[start:i], start))
+        elif ch in CSS_PUNCT:
+            i += 1
+            tokens.append(('punct', ch, start))
+        else:
+            while i < n and not css[i].isspace() and css[i] not in CSS_PUNCT \
+                    and css[i] not in '"\'' and not css.startswith('/*', i):
+                i += 2 if css[i] == '\\' else 1
+            word = css[start:i]
+            # url(...) không có quote: giữ nguyên cả cụm
+            if word.lower() == 'url' and i < n and css[i] == '(':
+                j = i + 1
+                while j < n and css[j].isspace():
+                    j += 1
+                if j < n and css[j] not in '"\'':
+                    end = css.find(')', j)
+                    i = n if end == -1 else end + 1
+                    inner = css[start + 4:i - 1].strip()
+                    tokens.append(('url', f'url({inner})', start))
+                    continue
+            tokens.append(('word', word, start))
+    return tokens
+
+
+# ==================== CSS PARSER ====================
+class _Decl:
+    __slots__ = ('prop', 'value', 'offset')
+
+    def __init__(self, prop, value, offset):
+        self.prop, self.value, self.offset = prop, value, offset
+
+
+class _Rule:
+    __slots__ = ('prelude', 'children', 'is_at', 'at_name', 'offset')
+
+    def __init__(self, prelude, children, offset, at_name=None):
+        self.prelude = prelude        # str đã compact (selector / at-rule prelude)
+        self.children = children      # list node, None = at-rule không có block (@import ...;)
+        self.offset = offset
+        self.at_name = at_name
+        self.is_at = at_name is not None
+
+
+class _Comment:
+    __slots__ = ('text', 'offset')
+
+    def __init__(self, text, offset):
+        self.text, self.offset = text, offset
+
+
+# Khoảng trắng cạnh các ký tự này có thể bỏ (theo ngữ cảnh)
+_STRIP_AFTER = {
+    'selector': {',', '>', '+', '~', '('},
+    'value': {',', '(', ':', '!'},
+    'atrule': {',', '(', ':'},
+}
+_STRIP_BEFORE = {
+    'selector': {',', '>', '+', '~', ')'},
+    'value': {',', ')', '!', ':'},
+    'atrule': {',', ')', ':'},
+}
+
+
+def _compact(tokens, context):
+    """Nối token, chỉ giữ khoảng trắng ở chỗ cần thiết"""
+    strip_after = _STRIP_AFTER[context]
+    strip_before = _STRIP_BEFORE[context]
+    out = []
+    pending_space = False
+    for kind, value, _ in tokens:
+        if kind == 'comment':
+            continue
+        if kind == 'ws':
+            pending_space = bool(out)
+            continue
+        if pending_space and out[-1] not in strip_after and value not in strip_before:
+            out.append(' ')
+        pending_space = False
+        out.append(value)
+    return ''.join(out)
+
+
+def _split_top(tokens, i, stop):
+    """Đọc token tới khi gặp 1 trong `stop` ở độ sâu ngoặc 0, trả về (tokens, index, stop_char)"""
+    depth = 0
+    collected = []
+    while i < len(tokens):
+        kind, value, _ = tokens[i]
+        if kind == 'punct':
+            if value == '(':
+                depth += 1
+            elif value == ')':
+                depth = max(depth - 1, 0)
+            elif depth == 0 and value in stop:
+                return collected, i, value
+        collected.append(tokens[i])
+        i += 1
+    return collected, i, None
+
+
+def _first_offset(tokens, default):
+    for kind, _, offset in tokens:
+        if kind not in ('ws', 'comment'):
+            return offset
+    return default
+
+
+def _parse_block(tokens, i, kind, top_level=False):
+    """Parse tới '}' (hoặc hết file). kind: 'rules' | 'decls'. Trả về (nodes, index sau '}')"""
+    nodes = []
+    while i < len(tokens):
+        tok_kind, value, offset = tokens[i]
+        if tok_kind == 'ws' or (tok_kind == 'punct' and value == ';'):
+            i += 1
+            continue
+        if tok_kind == 'comment':
+            if value.startswith('/*!') and kind == 'rules':
+                nodes.append(_Comment(value, offset))
+            i += 1
+            continue
+        if tok_kind == 'punct' and value == '}':
+            if top_level:
+                i += 1  # Dấu } thừa ở cấp ngoài cùng - bỏ qua thay vì dừng parse
+                continue
+            return nodes, i + 1
+
+        collected, i, stop = _split_top(tokens, i, ('{', ';', '}'))
+        start = _first_offset(collected, offset)
+        significant = [t for t in collected if t[0] not in ('ws', 'comment')]
+        at_name = None
+        if significant and significant[0][0] == 'word' and significant[0][1].startswith('@'):
+            at_name = significant[0][1][1:].lower()
+
+        if stop == '{':
+            if at_name is not None:
+                child_kind = 'rules' if at_name in CSS_RULE_AT_RULES else 'decls'
+                children, i = _parse_block(tokens, i + 1, child_kind)
+                nodes.append(_Rule(_compact(collected, 'atrule'), children, start, at_name))
+            else:
+                children, i = _parse_block(tokens, i + 1, 'decls')
+                nodes.append(_Rule(_compact(collected, 'selector'), children, start))
+            continue
+
+        if stop == ';':
+            i += 1
+        if not significant:
+            continue
+        if at_name is not None:
+            nodes.append(_Rule(_compact(collected, 'atrule'), None, start, at_name))
+            continue
+
+        # Khai báo: prop: value
+        colon = next((k for k, t in enumerate(collected) if t[0] == 'punct' and t[1] == ':'), None)
+        if colon is None:
+            continue
+        prop = _compact(collected[:colon], 'value')
+        value_tokens = collected[colon + 1:]
+        nodes.append(_Decl(prop, _optimize_value(prop, value_tokens), start))
+    return nodes, i
+
+
+# ==================== CSS OPTIMIZE ====================
+_ZERO_UNIT = re.compile(r'^[+-]?(?:0+(?:\.0*)?|\.0+)(?:px|em|rem|ex|ch|vw|vh|vmin|vmax|cm|mm|in|pt|pc|q)$', re.I)
+_LEADING_ZERO = re.compile(r'^([+-]?)0+\.(\d)')
+_HEX6 = re.compile(r'^#([0-9a-fA-F]{6})$')
+_TRAILING_ZERO = re.compile(r'^([+-]?\d*\.\d*?)0+([a-zA-Z%]*)$')
+
+# Thuộc tính 4 cạnh (top right bottom left) có thể rút gọn
+_BOX_SHORTHANDS = {'margin', 'padding', 'inset', 'border-width', 'border-style', 'border-color',
+                   'scroll-margin', 'scroll-padding'}
+# 0px trong flex-basis khác 0 ở một số trình duyệt cũ -> giữ nguyên
+_KEEP_ZERO_UNIT = {'flex', 'flex-basis'}
+
+
+def _trim_number(match):
+    number = match.group(1).rstrip('.')
+    return (number if number not in ('', '+', '-') else '0') + match.group(2)
+
+
+def _optimize_word(word, prop, depth):
+    hex_match = _HEX6.match(word)
+    if hex_match:
+        h = hex_match.group(1).lower()
+        if h[0] == h[1] and h[2] == h[3] and h[4] == h[5]:
+            return f'#{h[0]}{h[2]}{h[4]}'
+        return f'#{h}'
+    # Trong hàm (calc, var...) và custom property (--x, có thể dùng trong calc)
+    # 0 không đơn vị có thể không hợp lệ
+    if (depth == 0 and prop not in _KEEP_ZERO_UNIT and not prop.startswith('--')
+            and _ZERO_UNIT.match(word)):
+        return '0'
+    word = _TRAILING_ZERO.sub(_trim_number, word)
+    return _LEADING_ZERO.sub(r'\1.\2', word)
+
+
+def _optimize_value(prop, tokens):
+    prop = prop.lower()
+    optimized = []
+    depth = 0
+    for kind, value, offset in tokens:
+        if kind == 'punct':
+            if value == '(':
+                depth += 1
+            elif value == ')':
+                depth = max(depth - 1, 0)
+        elif kind == 'word':
+            # Tên hàm đứng ngay trước '(' -> giữ nguyên
+            value = _optimize_word(value, prop, depth)
+        optimized.append((kind, value, offset))
+    value = _compact(optimized, 'value')
+
+    if prop in _BOX_SHORTHANDS and '(' not in value and ',' not in value and '!' not in value:
+        parts = value.split(' ')
+        if 2 <= len(parts) <= 4:
+            if len(parts) == 4 and parts[3] == parts[1]:
+                parts.pop()
+            if len(parts) == 3 and parts[2] == parts[0]:
+                parts.pop()
+            if len(parts) == 2 and parts[1] == parts[0]:
+                parts.pop()
+            value = ' '.join(parts)
+    return value
+
+
+def _dedupe_decls(decls):
+    """Bỏ khai báo giống hệt nhau, giữ lần xuất hiện cuối (fallback khác giá trị vẫn giữ)"""
+    seen = set()
+    result = []
+    for decl in reversed(decls):
+        if not isinstance(decl, _Decl):
+            result.append(decl)
+            continue
+        key = (decl.prop, decl.value)
+        if key in seen:
+            continue
+        seen.add(key)
+        result.append(decl)
+    result.reverse()
+    return result
+
+
+def _body_key(rule):
+    return tuple((d.prop, d.value) if isinstance(d, _Decl) else id(d) for d in rule.children)
+
+
+def _mergeable_selector(selector):
+    # Selector có prefix (::-webkit-...) không hợp lệ ở trình duyệt khác sẽ làm hỏng cả rule gộp
+    return ':-' not in selector
+
+
+def _optimize_nodes(nodes):
+    """Tối ưu danh sách node cùng cấp (đệ quy vào at-rule)"""
+    result = []
+    for node in nodes:
+        if isinstance(node, _Rule) and node.children is not None:
+            node.children = _optimize_nodes(node.children)
+            if not node.is_at:
+                node.children = _dedupe_decls(node.children)
+            if not node.children and (not node.is_at or node.at_name in CSS_RULE_AT_RULES):
+                continue  # Rule rỗng
+
+            prev = result[-1] if result else None
+            if (not node.is_at and isinstance(prev, _Rule) and not prev.is_at
+                    and prev.children is not None):
+                # a{x}a{y} -> a{x;y}
+                if prev.prelude == node.prelude:
+                    prev.children = _dedupe_decls(prev.children + node.children)
+                    continue
+                # a{x}b{x} -> a,b{x}
+                if (_body_key(prev) == _body_key(node)
+                        and _mergeable_selector(prev.prelude) and _mergeable_selector(node.prelude)):
+                    prev.prelude = f'{prev.prelude},{node.prelude}'
+                    continue
+        result.append(node)
+    return result
+
+
+def _write_nodes(writer, nodes, positions):
+    for index, node in enumerate(nodes):
+        writer.mark(*_position(positions, node.offset))
+        if isinstance(node, _Comment):
+            writer.write(node.text)
+        elif isinstance(node, _Decl):
+            writer.write(f'{node.prop}:{node.value}')
+            if index < len(nodes) - 1:
+                writer.write(';')
+        elif node.children is None:
+            writer.write(f'{node.prelude};')
+        else:
+            writer.write(f'{node.prelude}{{')
+            _write_nodes(writer, node.children, positions)
+            writer.write('}')
+
+
+def split_selectors(selector):
+    """'a,b:is(c,d)' -> ['a', 'b:is(c,d)'] (chỉ tách dấu phẩy ở ngoài ngoặc)"""
+    parts, depth, start = [], 0, 0
+    for index, ch in enumerate(selector):
+        if ch in '([':
+            depth += 1
+        elif ch in ')]':
+            depth -= 1
+        elif ch == ',' and depth == 0:
+            parts.append(selector[start:index])
+            start = index + 1
+    parts.append(selector[start:])
+    return parts
+
+
+def _select_nodes(nodes, keep_selector, keep_at_rule):
+    result = []
+    for node in nodes:
+        if isinstance(node, _Comment) or isinstance(node, _Decl):
+            result.append(node)
+        elif node.is_at:
+            if not keep_at_rule(node.at_name, node.prelude):
+                continue
+            if node.children is not None and node.at_name in CSS_RULE_AT_RULES \
+                    and not node.at_name.endswith('keyframes'):
+                children = _select_nodes(node.children, keep_selector, keep_at_rule)
+                if not any(isinstance(child, _Rule) for child in children):
+                    continue
+                node = _Rule(node.prelude, children, node.offset, node.at_name)
+            result.append(node)
+        else:
+            selectors = [sel for sel in split_selectors(node.prelude) if keep_selector(sel)]
+            if selectors:
+                result.append(_Rule(','.join(selectors), node.children, node.offset))
+    return result
+
+
+def select_css(css, keep_selector, keep_at_rule=lambda name, prelude: True):
+    """
+    Minify CSS và chỉ giữ các selector mà keep_selector(selector) trả về True
+
+    Dùng cho critical CSS. At-rule chứa rule (@media...) bị bỏ nếu không còn rule nào,
+    keep_at_rule(name, prelude) quyết định giữ/bỏ at-rule (vd bỏ @keyframes, @media print).
+    """
+    nodes, _ = _parse_block(tokenize_css(css), 0, 'rules', top_level=True)
+    nodes = _select_nodes(_optimize_nodes(nodes), keep_selector, keep_at_rule)
+    writer = _Writer()
+    _write_nodes(writer, _optimize_nodes(nodes), _line_starts(css))
+    return writer.getvalue()
+
+
+def minify_css(css):
+    """Minify CSS, trả về (code, mappings)"""
+    positions = _line_starts(css)
+    nodes, _ = _parse_block(tokenize_css(css), 0, 'rules', top_level=True)
+    writer = _Writer()
+    _write_nodes(writer, _optimize_nodes(nodes), positions)
+    return writer.getvalue(), writer.mappings
+
+
+# ==================== JS TOKENIZER ====================
+JS_PUNCTUATORS = sorted([
+    '>>>=', '...', '===', '!==', '**=', '<<=', '>>=', '>>>', '&&=', '||=', '??=',
+    '=>', '==', '!=', '<=', '>=', '&&', '||', '??', '?.', '++', '--', '+=', '-=', '*=', '/=',
+    '%=', '&=', '|=', '^=', '<<', '>>', '**',
+    '{', '}', '(', ')', '[', ']', ';', ',', '<', '>', '+', '-', '*', '/', '%', '&', '|',
+    '^', '!', '~', '?', ':', '=', '.', '@', '#',
+], key=len, reverse=True)
+
+# Sau các keyword này, '/' mở đầu regex chứ không phải phép chia
+JS_REGEX_KEYWORDS = {'return', 'typeof', 'instanceof', 'in', 'of', 'new', 'delete', 'void',
+                     'throw', 'case', 'do', 'else', 'yield', 'await'}
+
+# Restricted production: xuống dòng sau các keyword này = kết thúc câu lệnh (ASI)
+JS_RESTRICTED = {'return', 'break', 'continue', 'throw', 'yield', 'async'}
+
+# Token không thể kết thúc câu lệnh -> xuống dòng phía sau luôn bỏ được
+JS_NO_ASI_AFTER = {
+    '{', '(', '[', ',', ';', ':', '?', '.', '?.', '=>', '...',
+    '=', '+=', '-=', '*=', '/=', '%=', '**=', '<<=', '>>=', '>>>=', '&=', '|=', '^=',
+    '&&=', '||=', '??=', '==', '===', '!=', '!==', '<', '>', '<=', '>=',
+    '+', '-', '*', '/', '%', '**', '<<', '>>', '>>>', '&', '|', '^', '&&', '||', '??', '!', '~',
+}
+
+# Token luôn nối tiếp biểu thức phía trước (không có ASI) -> xuống dòng phía trước bỏ được
+JS_CONTINUATION = {
+    ')', ']', '}', ',', ';', '.', '?.', '?', ':', '=>',
+    '=', '+=', '-=', '*=', '/=', '%=', '**=', '<<=', '>>=', '>>>=', '&=', '|=', '^=',
+    '&&=', '||=', '??=', '==', '===', '!=', '!==', '<', '>', '<=', '>=',
+    '*', '%', '**', '<<', '>>', '>>>', '&', '|', '^', '&&', '||', '??',
+}
+
+
+def _is_word_char(ch):
+    return ch.isalnum() or ch in '_$' or ord(ch) > 127
+
+
+def _scan_string(js, i):
+    quote = js[i]
+    i += 1
+    while i < len(js) and js[i] != quote:
+        if js[i] == '\\':
+            i += 1
+        elif js[i] == '\n':
+            break  # String lỗi - dừng để không nuốt hết file
+        i += 1
+    return i + 1
+
+
+def _scan_template(js, i):
+    """Template literal, hỗ trợ ${...} lồng nhau"""
+    i += 1
+    n = len(js)
+    while i < n:
+        ch = js[i]
+        if ch == '\\':
+            i += 2
+            continue
+        if ch == '`':
+            return i + 1
+        if ch == '$' and js.startswith('${', i):
+            i = _scan_expression(js, i + 2)
+            continue
+        i += 1
+    return n
+
+
+def _scan_expression(js, i):
+    """Bỏ qua biểu thức trong ${...} tới '}' tương ứng"""
+    depth = 0
+    n = len(js)
+    while i < n:
+        ch = js[i]
+        if ch in '"\'':
+            i = _scan_string(js, i)
+        elif ch == '`':
+            i = _scan_template(js, i)
+        elif js.startswith('//', i):
+            end = js.find('\n', i)
+            i = n if end == -1 else end
+        elif js.startswith('/*', i):
+            end = js.find('*/', i + 2)
+            i = n if end == -1 else end + 2
+        elif ch == '{':
+            depth += 1
+            i += 1
+        elif ch == '}':
+            if depth == 0:
+                return i + 1
+            depth -= 1
+            i += 1
+        else:
+            i += 1
+    return n
+
+
+def _scan_regex(js, i):
+    i += 1
+    in_class = False
+    n = len(js)
+    while i < n:
+        ch = js[i]
+        if ch == '\\':
+            i += 2
+            continue
+        if ch == '\n':
+            return i
+        if in_class:
+            if ch == ']':
+                in_class = False
+        elif ch == '[':
+            in_class = True
+        elif ch == '/':
+            i += 1
+            while i < n and _is_word_char(js[i]):
+                i += 1  # flags
+            return i
+        i += 1
+    return n
+
+
+def _regex_allowed(prev):
+    if prev is None:
+        return True
+    kind, value = prev[0], prev[1]
+    if kind == 'word':
+        return value in JS_REGEX_KEYWORDS
+    if kind == 'punct':
+        return value not in (')', ']', '}', '++', '--')
+    return False
+
+
+def tokenize_js(js):
+    """List token (type, value, offset, newline_before); type: word, string, template, regex, punct, comment"""
+    tokens = []
+    i, n = 0, len(js)
+    newline = False
+    prev = None
+    while i < n:
+        ch = js[i]
+        start = i
+        if ch.isspace():
+            if ch in '\n\r\u2028\u2029':
+                newline = True
+            i += 1
+            continue
+        if js.startswith('//', i):
+            end = js.find('\n', i)
+            i = n if end == -1 else end
+            continue
+        if js.startswith('/*', i):
+            end = js.find('*/', i + 2)
+            i = n if end == -1 else end + 2
+            text = js[start:i]
+            if '\n' in text:
+                newline = True
+            if text.startswith('/*!'):
+                tokens.append(('comment', text, start, newline))
+                newline = False
+            continue
+
+        if ch in '"\'':
+            i = _scan_string(js, i)
+            kind = 'string'
+        elif ch == '`':
+            i = _scan_template(js, i)
+            kind = 'template'
+        elif ch == '/' and _regex_allowed(prev):
+            i = _scan_regex(js, i)
+            kind = 'regex'
+        elif _is_word_char(ch) or (ch == '.' and i + 1 < n and js[i + 1].isdigit()):
+            if ch.isdigit() or ch == '.':
+                # Số: 1e-5, 0x1F, 1_000, .5
+                while i < n and (_is_word_char(js[i]) or js[i] == '.'
+                                 or (js[i] in '+-' and js[i - 1] in 'eE' and not js[start:i].lower().startswith('0x'))):
+                    i += 1
+            else:
+                while i < n and (_is_word_char(js[i]) or js[i] == '\\'):
+                    i += 2 if js[i] == '\\' else 1
+            kind = 'word'
+        else:
+            kind = 'punct'
+            for punct in JS_PUNCTUATORS:
+                if js.startswith(punct, i):
+                    i += len(punct)
+                    break
+            else:
+                i += 1
+
+        token = (kind, js[start:i], start, newline)
+        tokens.append(token)
+        prev = token
+        newline = False
+    return tokens
+
+
+def _needs_space(prev, token):
+    a, b = prev[1], token[1]
+    if _is_word_char(a[-1]) and (_is_word_char(b[0]) or b[0] == '\\'):
+        return True
+    # a + +b, a - -b, a + ++b, x / /re/
+    if a[-1] in '+-/' and b[0] == a[-1]:
+        return True
+    # 1 .toString()
+    if prev[0] == 'word' and a[0].isdigit() and b[0] == '.' and '.' not in a and 'x' not in a.lower():
+        return True
+    return False
+
+
+def minify_js(js):
+    """Minify JavaScript (không đổi tên biến), trả về (code, mappings)"""
+    positions = _line_starts(js)
+    writer = _Writer()
+    prev = None
+    for token in tokenize_js(js):
+        kind, value, offset, newline_before = token
+        if prev is not None:
+            if newline_before and not (
+                    prev[1] in JS_NO_ASI_AFTER and prev[0] == 'punct'
+                    or (token[0] == 'punct' and value in JS_CONTINUATION)
+            ) or (newline_before and prev[0] == 'word' and prev[1] in JS_RESTRICTED) \
+                    or (newline_before and value in ('++', '--')):
+                writer.write('\n')
+            elif kind == 'comment' or prev[0] == 'comment':
+                writer.write('\n')
+            elif _needs_space(prev, token):
+                writer.write(' ')
+
+        if kind != 'punct':
+            writer.mark(*_position(positions, offset))
+        writer.write(value)
+        prev = token
+    return writer.getvalue(), writer.mappings
@@ -0,0 +1,142 @@
+"""
+Micro-benchmark /api/search-suggestions khi nhiều request đồng thời
+
+Chạy: python test/bench_search_suggestions.py [số luồng] [số request mỗi luồng]
+
+- Cold: mỗi request 1 prefix khác nhau (thêm hậu tố ngẫu nhiên) -> luôn miss cache
+- Warm: lặp lại các prefix phổ biến -> hit cache LRU của server
+- In p50/p95/p99, req/s và tỉ lệ lỗi cho từng phase
+"""
+
+import sys
+import time
+import random
+import string
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.exceptions import RequestException
+
+
+class Colors:
+    GREEN = '\033[92m'
+    RED = '\033[91m'
+    YELLOW = '\033[93m'
+    BLUE = '\033[94m'
+    CYAN = '\033[96m'
+    END = '\033[0m'
+
+
+BASE_URL = "http://localhost:5000"
+ENDPOINT = "/api/search-suggestions"
+
+# Prefix người dùng hay gõ (có dấu/không dấu, gõ dở)
+PREFIXES = [
+    "ke", "keo", "keo d", "keo dán", "keo dan gach",
+    "ga", "gạch", "gach op", "gạch ốp lát",
+    "ch", "chống", "chong tham", "chống thấm",
+    "bả", "bột bả", "son", "sơn nước",
+    "bảo hà", "chính sách", "liên hệ", "hướng dẫn",
+]
+
+_local = threading.local()
+
+
+def get_session():
+    """Mỗi luồng 1 session (giữ kết nối keep-alive như trình duyệt)"""
+    session = getattr(_local, 'session', None)
+    if session is None:
+        session = _local.session = requests.Session()
+    return session
+
+
+def check_server():
+    """Kiểm tra server có chạy không"""
+    try:
+        requests.get(BASE_URL, timeout=5)
+        return True
+    except RequestException:
+        return False
+
+
+def fetch(keyword):
+    """1 request, trả về (thời gian ms, thành công)"""
+    started = time.perf_counter()
+    try:
+        response = get_session().get(BASE_URL + ENDPOINT, params={'q': keyword}, timeout=10)
+        ok = response.status_code == 200 and 'suggestions' in response.json()
+    except (RequestException, ValueError):
+        ok = False
+    return (time.perf_counter() - started) * 1000, ok
+
+
+def percentile(values, percent):
+    if not values:
+        return 0.0
+    index = min(len(values) - 1, int(round(percent / 100 * (len(values) - 1))))
+    return values[index]
+
+
+def run_phase(name, keywords, threads):
+    """Chạy danh sách keyword với `threads` luồng song song rồi in thống kê"""
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        results = list(executor.map(fetch, keywords))
+    elapsed = time.perf_counter() - started
+
+    latencies = sorted(ms for ms, ok in results if ok)
+    errors = sum(1 for _, ok in results if not ok)
+    color = Colors.GREEN if errors == 0 else Colors.RED
+
+    print(f"{Colors.BLUE}▶ {name:<8}{Colors.END} "
+          f"{len(results)} req trong {elapsed:.2f}s = {Colors.CYAN}{len(results) / elapsed:.0f} req/s{Colors.END}")
+    print(f"  p50 {percentile(latencies, 50):.1f}ms | p95 {percentile(latencies, 95):.1f}ms | "
+          f"p99 {percentile(latencies, 99):.1f}ms | {color}lỗi {errors}{Colors.END}\n")
+    return errors
+
+
+def random_suffix():
+    return ''.join(random.choices(string.ascii_lowercase, k=3))
+
+
+def main():
+    threads = int(sys.argv[1]) if len(sys.argv) > 1 else 16
+    per_thread = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    total = threads * per_thread
+
+    print("\n" + "=" * 80)
+    print(f"{Colors.BLUE}⏱️  BENCHMARK {ENDPOINT}{Colors.END}")
+    print("=" * 80 + "\n")
+    print(f"🌐 Server URL: {Colors.CYAN}{BASE_URL}{Colors.END}")
+    print(f"🧵 {threads} luồng x {per_thread} request\n")
+
+    if not check_server():
+        print(f"{Colors.RED}❌ Server không chạy tại {BASE_URL}{Colors.END}")
+        print(f"{Colors.YELLOW}💡 Vui lòng chạy: flask run hoặc python run.py{Colors.END}\n")
+        sys.exit(1)
+
+    # Cold: prefix + hậu tố ngẫu nhiên, không request nào trùng key cache
+    cold = [f"{random.choice(PREFIXES)} {random_suffix()}" for _ in range(total)]
+    # Warm: chỉ các prefix phổ biến, lượt đầu đã nạp cache
+    warm = [PREFIXES[i % len(PREFIXES)] for i in range(total)]
+
+    errors = run_phase('Cold', cold, threads)
+    errors += run_phase('Warm', warm, threads)
+
+    print("=" * 80)
+    if errors == 0:
+        print(f"{Colors.GREEN}🎉 Không có request lỗi{Colors.END}")
+    else:
+        print(f"{Colors.RED}⚠️  CÓ {errors} REQUEST LỖI - KIỂM TRA LẠI!{Colors.END}")
+    print(f"{'=' * 80}\n")
+    return 0 if errors == 0 else 1
+
+
+if __name__ == '__main__':
+    try:
+        exit_code = main()
+        sys.exit(exit_code)
+    except KeyboardInterrupt:
+        print(f"\n{Colors.YELLOW}⚠️  Benchmark bị hủy bởi user{Colors.END}\n")
+        sys.exit(1)
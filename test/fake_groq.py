@@ -0,0 +1,140 @@
+"""
+Groq giả lập cho test chatbot (không gọi API thật, không cần GROQ_API_KEY)
+
+Usage:
+    app = create_test_app()
+    fake = install_fake_client(app, GROQ_MAX_RETRIES=0)    # init lại groq_gateway + gắn client giả
+    fake.script.append(['Dạ ', 'keo ', 'BRICON'])          # lượt gọi tiếp theo: stream/trả lời này
+    fake.script.append(rate_limited(retry_after=0.2))      # ... hoặc raise lỗi này
+"""
+
+import os
+import sys
+import tempfile
+import threading
+import types
+
+import httpx
+import groq
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def create_test_app(**config):
+    """App Flask với SQLite tạm, chatbot bật, không chạy scheduler"""
+    os.environ['SCHEDULER_ENABLED'] = 'false'
+    from app import create_app, db
+    from app.config import Config
+
+    db_path = os.path.join(tempfile.mkdtemp(prefix='bricon_test_'), 'test.db')
+
+    class TestConfig(Config):
+        TESTING = True
+        SQLALCHEMY_DATABASE_URI = f'sqlite:///{db_path}'
+        SQLALCHEMY_ENGINE_OPTIONS = {}
+        SCHEDULER_ENABLED = False
+        CHATBOT_ANSWER_CACHE_ENABLED = False
+        CHATBOT_REQUEST_LIMIT = 1000
+
+    for key, value in config.items():
+        setattr(TestConfig, key, value)
+
+    app = create_app(TestConfig)
+    with app.app_context():
+        db.create_all()
+    return app
+
+
+def _chunk(text):
+    delta = types.SimpleNamespace(content=text)
+    return types.SimpleNamespace(choices=[types.SimpleNamespace(delta=delta)])
+
+
+def _completion(text):
+    message = types.SimpleNamespace(content=text)
+    return types.SimpleNamespace(choices=[types.SimpleNamespace(message=message)])
+
+
+def _response(status, headers=None):
+    return httpx.Response(status, headers=headers or {},
+                          request=httpx.Request('POST', 'https://api.groq.com/openai/v1/chat/completions'))
+
+
+def rate_limited(retry_after=None):
+    headers = {'retry-after': str(retry_after)} if retry_after is not None else {}
+    return groq.RateLimitError('rate limited', response=_response(429, headers), body=None)
+
+
+def server_error(status=503):
+    return groq.InternalServerError('upstream error', response=_response(status), body=None)
+
+
+def client_error(status=400):
+    return groq.BadRequestError('bad request', response=_response(status), body=None)
+
+
+class FakeStream:
+    """Stream token; gate (threading.Event) chặn trước mỗi token để test ngắt giữa chừng"""
+
+    def __init__(self, words, gate=None):
+        self.words = words
+        self.gate = gate
+        self.yielded = 0
+        self.closed = False
+
+    def __iter__(self):
+        for word in self.words:
+            if self.closed:
+                return
+            if self.gate is not None:
+                self.gate.wait(5)
+            self.yielded += 1
+            yield _chunk(word)
+
+    def close(self):
+        self.closed = True
+
+
+class FakeGroqClient:
+    """
+    Thay cho groq.Groq: client.chat.completions.create(**kwargs)
+    script: hàng đợi kết quả cho các lượt gọi (list từ, Exception, hoặc callable(kwargs));
+    hết script -> trả lời mặc định
+    """
+
+    DEFAULT_WORDS = ['Dạ ', 'keo ', 'BRICON ', 'ạ.']
+
+    def __init__(self):
+        self.chat = types.SimpleNamespace(completions=self)
+        self.script = []
+        self.calls = []
+        self.streams = []
+        self._lock = threading.Lock()
+
+    def create(self, **kwargs):
+        with self._lock:
+            self.calls.append(kwargs)
+            step = self.script.pop(0) if self.script else self.DEFAULT_WORDS
+        if callable(step):
+            step = step(kwargs)
+        if isinstance(step, Exception):
+            raise step
+        if isinstance(step, FakeStream):
+            self.streams.append(step)
+            return step
+        if kwargs.get('stream'):
+            stream = FakeStream(step)
+            self.streams.append(stream)
+            return stream
+        return _completion(''.join(step))
+
+
+def install_fake_client(app, **config):
+    """Init lại groq_gateway theo config app (+ override) và gắn FakeGroqClient"""
+    from app.chatbot.client import groq_gateway
+    # create_app đọc GROQ_API_KEY từ env, gán key giả ở đây
+    app.config.update({'GROQ_API_KEY': 'test-key', **config})
+    groq_gateway.init_app(app)
+    fake = FakeGroqClient()
+    groq_gateway._get_client = lambda: fake
+    return fake
@@ -0,0 +1,229 @@
+"""
+Server giả lập giao thức Redis (RESP2) trong RAM - chỉ dùng khi test RedisBackend (app/cache.py)
+
+Hỗ trợ: PING, AUTH, SELECT, GET, SET [PX ms], DEL, INCR, SCAN cursor [MATCH glob] [COUNT n]
+(glob như Redis: * ? [...] và \\ để escape)
+
+Chạy riêng: python test/resp_server.py [port] [password]
+Trong test:
+    server = RESPServer(password='secret').start()
+    backend = RedisBackend(server.url)
+    ...
+    server.stop()
+"""
+
+import re
+import socket
+import socketserver
+import sys
+import threading
+import time
+
+
+def glob_to_regex(pattern):
+    """Glob kiểu Redis -> regex (fullmatch)"""
+    out = []
+    i = 0
+    while i < len(pattern):
+        ch = pattern[i]
+        if ch == '\\' and i + 1 < len(pattern):
+            out.append(re.escape(pattern[i + 1]))
+            i += 2
+            continue
+        if ch == '*':
+            out.append('.*')
+        elif ch == '?':
+            out.append('.')
+        elif ch == '[':
+            end = pattern.find(']', i + 1)
+            if end == -1:
+                out.append(re.escape(ch))
+            else:
+                out.append('[' + pattern[i + 1:end].replace('\\', '\\\\') + ']')
+                i = end
+        else:
+            out.append(re.escape(ch))
+        i += 1
+    return re.compile(''.join(out), re.S)
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self):
+        server = self.server.owner
+        server.connections += 1
+        server._sockets.add(self.request)
+        state = {'authed': server.password is None, 'db': 0}
+        while True:
+            try:
+                args = self._read_command()
+            except (ConnectionError, ValueError):
+                return
+            if args is None:
+                return
+            try:
+                reply = server.execute(state, args)
+            except Exception as e:  # lỗi lệnh -> error reply như Redis
+                reply = RESPError(f'ERR {e}')
+            self.wfile.write(_encode(reply))
+            self.wfile.flush()
+
+    def _read_command(self):
+        line = self.rfile.readline()
+        if not line:
+            return None
+        if line[:1] != b'*':
+            raise ValueError('inline command not supported')
+        args = []
+        for _ in range(int(line[1:-2])):
+            header = self.rfile.readline()
+            length = int(header[1:-2])
+            args.append(self.rfile.read(length + 2)[:-2])
+        return args
+
+
+class RESPError(Exception):
+    pass
+
+
+class _Status(str):
+    pass
+
+
+def _encode(value):
+    if isinstance(value, RESPError):
+        return b'-' + str(value).encode('utf-8') + b'\r\n'
+    if isinstance(value, _Status):
+        return b'+' + value.encode('utf-8') + b'\r\n'
+    if value is None:
+        return b'$-1\r\n'
+    if isinstance(value, int):
+        return b':%d\r\n' % value
+    if isinstance(value, (list, tuple)):
+        return b'*%d\r\n' % len(value) + b''.join(_encode(item) for item in value)
+    if isinstance(value, str):
+        value = value.encode('utf-8')
+    return b'$%d\r\n%s\r\n' % (len(value), value)
+
+
+class _ThreadingServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class RESPServer:
+    def __init__(self, host='127.0.0.1', port=0, password=None):
+        self.password = password
+        self.data = {}          # (db, key) -> (value, hết hạn lúc (monotonic) hoặc None)
+        self.commands = []      # tên lệnh đã nhận (để test kiểm tra)
+        self.connections = 0
+        self._sockets = set()   # kết nối đang mở (stop() đóng hết như Redis restart)
+        self._lock = threading.Lock()
+        self._server = _ThreadingServer((host, port), _Handler)
+        self._server.owner = self
+        self._thread = None
+
+    @property
+    def port(self):
+        return self._server.server_address[1]
+
+    @property
+    def url(self):
+        auth = f':{self.password}@' if self.password else ''
+        return f'redis://{auth}127.0.0.1:{self.port}/0'
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+        for sock in list(self._sockets):
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+                sock.close()
+            except OSError:
+                pass
+
+    # ----- lệnh -----
+    def _live(self, db, key):
+        item = self.data.get((db, key))
+        if item is None:
+            return None
+        value, expires = item
+        if expires is not None and time.monotonic() >= expires:
+            del self.data[(db, key)]
+            return None
+        return value
+
+    def execute(self, state, args):
+        name = args[0].decode('utf-8').upper()
+        params = args[1:]
+        self.commands.append(name)
+
+        if name == 'AUTH':
+            if params[0].decode('utf-8') != self.password:
+                return RESPError('WRONGPASS invalid username-password pair')
+            state['authed'] = True
+            return _Status('OK')
+        if not state['authed']:
+            return RESPError('NOAUTH Authentication required.')
+
+        db = state['db']
+        with self._lock:
+            if name == 'PING':
+                return _Status('PONG')
+            if name == 'SELECT':
+                state['db'] = int(params[0])
+                return _Status('OK')
+            if name == 'GET':
+                return self._live(db, params[0])
+            if name == 'SET':
+                expires = None
+                if len(params) >= 4 and params[2].upper() == b'PX':
+                    expires = time.monotonic() + int(params[3]) / 1000
+                self.data[(db, params[0])] = (params[1], expires)
+                return _Status('OK')
+            if name == 'DEL':
+                removed = 0
+                for key in params:
+                    if self._live(db, key) is not None:
+                        del self.data[(db, key)]
+                        removed += 1
+                return removed
+            if name == 'INCR':
+                value = int(self._live(db, params[0]) or 0) + 1
+                self.data[(db, params[0])] = (str(value).encode('utf-8'), None)
+                return value
+            if name == 'SCAN':
+                return self._scan(db, params)
+        return RESPError(f"ERR unknown command '{name}'")
+
+    def _scan(self, db, params):
+        cursor = int(params[0])
+        match, count = None, 10
+        options = params[1:]
+        for i in range(0, len(options) - 1, 2):
+            option = options[i].upper()
+            if option == b'MATCH':
+                match = glob_to_regex(options[i + 1].decode('utf-8'))
+            elif option == b'COUNT':
+                count = int(options[i + 1])
+        keys = sorted(key for (key_db, key) in list(self.data) if key_db == db and self._live(db, key) is not None)
+        page = keys[cursor:cursor + count]
+        next_cursor = cursor + count if cursor + count < len(keys) else 0
+        if match is not None:
+            page = [key for key in page if match.fullmatch(key.decode('utf-8'))]
+        return [str(next_cursor), page]
+
+
+if __name__ == '__main__':
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else 6379
+    password = sys.argv[2] if len(sys.argv) > 2 else None
+    server = RESPServer(port=port, password=password)
+    print(f"RESP stand-in listening on {server.url}")
+    try:
+        server._server.serve_forever()
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,208 @@
+"""
+Test /chatbot/stream (SSE) với Groq giả lập (test/fake_groq.py) - không cần server/API key
+
+Chạy: python test/test_chatbot_stream.py
+"""
+
+import json
+import os
+import sys
+import threading
+import traceback
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fake_groq import create_test_app, install_fake_client, FakeStream  # noqa: E402
+from app.chatbot.client import groq_gateway  # noqa: E402
+
+
+class Colors:
+    GREEN = '\033[92m'
+    RED = '\033[91m'
+    YELLOW = '\033[93m'
+    BLUE = '\033[94m'
+    CYAN = '\033[96m'
+    END = '\033[0m'
+
+
+_APP = None
+
+
+def get_app():
+    global _APP
+    if _APP is None:
+        _APP = create_test_app()
+    return _APP
+
+
+def parse_events(body):
+    """text/event-stream -> list (event, data)"""
+    events = []
+    for block in body.strip().split('\n\n'):
+        lines = dict(line.split(': ', 1) for line in block.split('\n'))
+        events.append((lines['event'], json.loads(lines['data'])))
+    return events
+
+
+def free_slots():
+    return groq_gateway._slots._value
+
+
+# ==================== TEST CASES ====================
+def test_tokens_then_done():
+    """Stream: các event 'token' theo thứ tự rồi 'done' với câu trả lời đầy đủ"""
+    app = get_app()
+    fake = install_fake_client(app)
+    fake.script.append(['Dạ ', 'keo ', 'BRICON ', 'ạ.'])
+    client = app.test_client()
+
+    response = client.post('/chatbot/stream', json={'message': 'keo dán gạch loại nào tốt?'})
+    assert response.status_code == 200
+    assert response.mimetype == 'text/event-stream'
+    assert response.headers['Cache-Control'] == 'no-cache'
+
+    events = parse_events(response.get_data(as_text=True))
+    assert [name for name, _ in events] == ['token'] * 4 + ['done']
+    assert ''.join(data['text'] for _, data in events[:-1]) == 'Dạ keo BRICON ạ.'
+    done = events[-1][1]
+    assert done['response'] == 'Dạ keo BRICON ạ.'
+    assert done['history_token']
+    assert fake.calls[-1]['stream'] is True
+    assert fake.streams[-1].closed
+    assert free_slots() == groq_gateway.max_concurrency
+
+
+def test_history_token_saved_once():
+    """/chatbot/history: token của event 'done' lưu lượt chat đúng 1 lần, token sai -> 400"""
+    app = get_app()
+    install_fake_client(app)
+    client = app.test_client()
+
+    events = parse_events(client.post('/chatbot/stream', json={'message': 'giá keo?'}).get_data(as_text=True))
+    token = events[-1][1]['history_token']
+    # Stream không ghi được cookie session sau khi đã gửi header
+    assert client.get('/chatbot/status').json['history_length'] == 0
+
+    first = client.post('/chatbot/history', json={'token': token})
+    assert first.json == {'status': 'success', 'history_length': 2}
+    second = client.post('/chatbot/history', json={'token': token})
+    assert second.json['history_length'] == 2, 'gửi lại cùng token không được lưu lần 2'
+    assert client.get('/chatbot/status').json['history_length'] == 2
+
+    # Lượt sau có ngữ cảnh: lịch sử được gửi kèm cho Groq
+    fake = install_fake_client(app)
+    client.post('/chatbot/stream', json={'message': 'còn loại khác không?'}).get_data()
+    contents = [message['content'] for message in fake.calls[-1]['messages']]
+    assert any('giá keo?' in content for content in contents)
+
+    # A, B rồi A lần nữa: A vẫn không được lưu lại
+    events = parse_events(client.post('/chatbot/stream', json={'message': 'keo ốp lát?'}).get_data(as_text=True))
+    other = events[-1][1]['history_token']
+    assert client.post('/chatbot/history', json={'token': other}).json['history_length'] == 4
+    assert client.post('/chatbot/history', json={'token': token}).json['history_length'] == 4
+    # Reset rồi gửi lại token cũ: cũng không lưu
+    client.post('/chatbot/reset')
+    assert client.post('/chatbot/history', json={'token': token}).json['history_length'] == 0
+    client.post('/chatbot/history', json={'token': other})
+    assert client.get('/chatbot/status').json['history_length'] == 0
+
+    assert client.post('/chatbot/history', json={'token': token + 'x'}).status_code == 400
+    assert client.post('/chatbot/history', json={'token': 'abc'}).status_code == 400
+
+
+def test_disconnect_closes_upstream():
+    """Khách ngắt kết nối giữa chừng: đóng stream Groq, trả slot gateway, không tính lỗi breaker"""
+    app = get_app()
+    fake = install_fake_client(app, GROQ_MAX_CONCURRENCY=1)
+    gate = threading.Event()
+    gate.set()
+    upstream = FakeStream(['Dạ ', 'đang ', 'trả ', 'lời ', 'dài...'], gate=gate)
+    fake.script.append(upstream)
+    client = app.test_client()
+
+    response = client.post('/chatbot/stream', json={'message': 'hướng dẫn thi công'}, buffered=False)
+    assert response.status_code == 200
+    assert free_slots() == 0, 'stream đang mở phải giữ slot'
+
+    chunks = iter(response.response)
+    first = next(chunks)
+    first = first.decode('utf-8') if isinstance(first, bytes) else first
+    assert first.startswith('event: token')
+    gate.clear()
+    response.close()  # WSGI server gọi close() khi client ngắt
+
+    assert upstream.closed
+    assert upstream.yielded < len(upstream.words)
+    assert free_slots() == 1
+    assert groq_gateway.breaker.stats()['consecutive_failures'] == 0
+
+    # Slot đã trả: lượt sau vẫn gọi được
+    gate.set()
+    events = parse_events(client.post('/chatbot/stream', json={'message': 'thi công'}).get_data(as_text=True))
+    assert events[-1][0] == 'done'
+    assert client.get('/chatbot/status').json['stream']['cancelled'] >= 1
+
+
+def test_upstream_error_mid_stream():
+    """Groq lỗi giữa stream: event 'error' với câu trả lời soạn sẵn, slot được trả"""
+    app = get_app()
+    fake = install_fake_client(app)
+
+    class BrokenStream(FakeStream):
+        def __iter__(self):
+            yield from super().__iter__()
+            raise ConnectionError('connection reset')
+
+    fake.script.append(BrokenStream(['Dạ ']))
+    events = parse_events(app.test_client().post('/chatbot/stream', json={'message': 'keo'}).get_data(as_text=True))
+    assert [name for name, _ in events] == ['token', 'error']
+    assert free_slots() == groq_gateway.max_concurrency
+
+
+def test_validation_returns_json():
+    """Lỗi validate vẫn trả JSON như /send (không mở stream)"""
+    app = get_app()
+    fake = install_fake_client(app)
+    client = app.test_client()
+    response = client.post('/chatbot/stream', json={'message': ''})
+    assert response.status_code == 400
+    assert response.is_json
+    assert client.post('/chatbot/stream', json={'message': 'x' * 501}).status_code == 400
+    assert fake.calls == []
+
+
+TESTS = [
+    test_tokens_then_done,
+    test_history_token_saved_once,
+    test_disconnect_closes_upstream,
+    test_upstream_error_mid_stream,
+    test_validation_returns_json,
+]
+
+
+def main():
+    print("\n" + "=" * 80)
+    print(f"{Colors.BLUE}🧪 TEST CHATBOT STREAM (Groq giả lập){Colors.END}")
+    print("=" * 80 + "\n")
+
+    passed = 0
+    failed = 0
+    for test in TESTS:
+        try:
+            test()
+            print(f"{Colors.GREEN}✅{Colors.END} {test.__doc__.strip()}")
+            passed += 1
+        except Exception:
+            print(f"{Colors.RED}❌{Colors.END} {test.__doc__.strip()}")
+            print(f"{Colors.YELLOW}{traceback.format_exc()}{Colors.END}")
+            failed += 1
+
+    print("\n" + "=" * 80)
+    print(f"  {Colors.GREEN}✅ Passed: {passed}/{len(TESTS)}{Colors.END}")
+    print(f"  {Colors.RED}❌ Failed: {failed}/{len(TESTS)}{Colors.END}")
+    print("=" * 80 + "\n")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
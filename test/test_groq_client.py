@@ -0,0 +1,296 @@
+"""
+Test groq_gateway (app/chatbot/client.py): retry/deadline, circuit breaker, giới hạn đồng thời
+Dùng Groq giả lập (test/fake_groq.py) - không cần server/API key
+
+Chạy: python test/test_groq_client.py
+"""
+
+import os
+import sys
+import threading
+import time
+import traceback
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fake_groq import create_test_app, install_fake_client, rate_limited, server_error, client_error  # noqa: E402
+from app.chatbot.client import groq_gateway, GroqUnavailable  # noqa: E402
+from app.chatbot.routes import UNAVAILABLE_REPLY, OVERLOADED_REPLY  # noqa: E402
+
+
+class Colors:
+    GREEN = '\033[92m'
+    RED = '\033[91m'
+    YELLOW = '\033[93m'
+    BLUE = '\033[94m'
+    CYAN = '\033[96m'
+    END = '\033[0m'
+
+
+_APP = None
+
+
+def get_app():
+    global _APP
+    if _APP is None:
+        _APP = create_test_app()
+    return _APP
+
+
+def setup(**config):
+    """Gateway mới (breaker/slot/thống kê reset) + client giả"""
+    defaults = {'GROQ_TIMEOUT': 5, 'GROQ_MAX_RETRIES': 2, 'GROQ_RETRY_BACKOFF': 0.01,
+                'GROQ_MAX_CONCURRENCY': 2, 'GROQ_QUEUE_TIMEOUT': 0.05,
+                'GROQ_BREAKER_THRESHOLD': 5, 'GROQ_BREAKER_COOLDOWN': 30}
+    app = get_app()
+    fake = install_fake_client(app, **dict(defaults, **config))
+    return app, fake
+
+
+def send(app, message):
+    # Client mới mỗi lượt: không dính lịch sử/rate limit của lượt trước
+    return app.test_client().post('/chatbot/send', json={'message': message})
+
+
+def call_gateway():
+    return groq_gateway.complete(messages=[{'role': 'user', 'content': 'hi'}], model='test')
+
+
+# ==================== RETRY / DEADLINE ====================
+def test_retry_429_and_5xx_honours_retry_after():
+    """429/5xx được thử lại trong deadline, chờ đủ Retry-After"""
+    app, fake = setup(GROQ_MAX_RETRIES=3)
+    fake.script += [rate_limited(retry_after=0.3), server_error(502), ['Dạ có ạ.']]
+
+    started = time.monotonic()
+    response = send(app, 'keo chống thấm')
+    elapsed = time.monotonic() - started
+
+    assert response.status_code == 200, response.json
+    assert response.json['response'] == 'Dạ có ạ.'
+    assert len(fake.calls) == 3
+    assert elapsed >= 0.3, f'phải chờ Retry-After (chỉ chờ {elapsed:.2f}s)'
+    assert elapsed < 5
+    assert groq_gateway.get_stats()['retries'] == 2
+    # Mỗi lần thử chỉ còn phần thời gian còn lại của deadline
+    timeouts = [call['timeout'].read for call in fake.calls]
+    assert timeouts[0] <= 5 and timeouts[-1] < timeouts[0]
+    assert groq_gateway.breaker.stats()['consecutive_failures'] == 0
+
+
+def test_retry_after_beyond_deadline_fails_fast():
+    """Retry-After vượt quá deadline: không chờ, trả 503 ngay"""
+    app, fake = setup(GROQ_TIMEOUT=1, GROQ_MAX_RETRIES=3)
+    fake.script.append(rate_limited(retry_after=10))
+
+    started = time.monotonic()
+    response = send(app, 'gạch ốp tường')
+    assert response.status_code == 503
+    assert response.json['response'] == UNAVAILABLE_REPLY
+    assert time.monotonic() - started < 0.5
+    assert len(fake.calls) == 1
+
+
+def test_retries_exhausted():
+    """Hết số lần thử: 503 với câu trả lời soạn sẵn, tính 1 lỗi cho breaker"""
+    app, fake = setup(GROQ_MAX_RETRIES=2)
+    fake.script += [server_error(500), server_error(503), server_error(504), ['không tới']]
+
+    response = send(app, 'vữa tự san phẳng')
+    assert response.status_code == 503
+    assert '0901180094' in response.json['response']
+    assert len(fake.calls) == 3
+    assert groq_gateway.breaker.stats()['consecutive_failures'] == 1
+
+
+def test_client_error_not_retried():
+    """Lỗi 4xx (trừ 429) không thử lại, không tính lỗi breaker"""
+    app, fake = setup()
+    fake.script.append(client_error(400))
+
+    response = send(app, 'keo')
+    assert response.status_code == 500
+    assert len(fake.calls) == 1
+    assert groq_gateway.breaker.stats()['consecutive_failures'] == 0
+
+
+# ==================== CIRCUIT BREAKER ====================
+def test_breaker_opens_after_threshold():
+    """Sau GROQ_BREAKER_THRESHOLD lỗi: /send trả 503 + hotline, không gọi Groq"""
+    app, fake = setup(GROQ_BREAKER_THRESHOLD=3, GROQ_MAX_RETRIES=0)
+    fake.script += [server_error()] * 3
+
+    for i in range(3):
+        assert send(app, f'câu hỏi {i}').status_code == 503
+    assert groq_gateway.breaker.stats()['state'] == 'open'
+    calls = len(fake.calls)
+
+    started = time.monotonic()
+    response = send(app, 'keo dán gạch')
+    assert response.status_code == 503
+    assert response.json['response'] == UNAVAILABLE_REPLY
+    assert '0901180094' in response.json['response']
+    assert time.monotonic() - started < 0.5
+    # /stream cũng trả JSON ngay, không mở stream
+    stream = app.test_client().post('/chatbot/stream', json={'message': 'keo'})
+    assert stream.status_code == 503 and stream.is_json
+
+    assert len(fake.calls) == calls, 'breaker mở thì không được gọi Groq'
+    stats = groq_gateway.get_stats()
+    assert stats['rejected_open'] == 2
+    assert stats['breaker']['opened'] == 1
+
+
+def test_half_open_single_trial():
+    """Hết cooldown: đúng 1 request thử được gọi, các request khác bị từ chối tới khi có kết quả"""
+    app, fake = setup(GROQ_BREAKER_THRESHOLD=1, GROQ_BREAKER_COOLDOWN=0.1, GROQ_MAX_RETRIES=0)
+    fake.script.append(server_error())
+    try:
+        call_gateway()
+    except GroqUnavailable:
+        pass
+    assert groq_gateway.breaker.state == 'open'
+    time.sleep(0.15)
+    assert groq_gateway.breaker.state == 'half_open'
+
+    release = threading.Event()
+    entered = threading.Event()
+
+    def slow_trial(kwargs):
+        entered.set()
+        release.wait(5)
+        return ['Dạ ổn rồi ạ.']
+
+    fake.script.append(slow_trial)
+    results = {}
+    trial = threading.Thread(target=lambda: results.setdefault('trial', call_gateway()))
+    trial.start()
+    assert entered.wait(2)
+
+    rejected = []
+    for _ in range(5):
+        try:
+            call_gateway()
+        except GroqUnavailable as e:
+            rejected.append(e.reason)
+    assert rejected == ['circuit_open'] * 5
+    assert len(fake.calls) == 2
+
+    release.set()
+    trial.join(5)
+    assert results['trial'].choices[0].message.content == 'Dạ ổn rồi ạ.'
+    assert groq_gateway.breaker.state == 'closed'
+    call_gateway()
+    assert len(fake.calls) == 3
+
+
+def test_half_open_trial_failure_reopens():
+    """Request thử lỗi: breaker mở lại thêm 1 cooldown"""
+    app, fake = setup(GROQ_BREAKER_THRESHOLD=1, GROQ_BREAKER_COOLDOWN=0.1, GROQ_MAX_RETRIES=0)
+    fake.script += [server_error(), server_error()]
+    try:
+        call_gateway()
+    except GroqUnavailable:
+        pass
+    time.sleep(0.15)
+    try:
+        call_gateway()                      # request thử, cũng lỗi
+    except GroqUnavailable as e:
+        assert e.reason == 'upstream'
+    assert len(fake.calls) == 2
+    assert groq_gateway.breaker.state == 'open'
+    assert groq_gateway.breaker.stats()['opened'] == 2
+    try:
+        call_gateway()
+    except GroqUnavailable as e:
+        assert e.reason == 'circuit_open'
+    assert len(fake.calls) == 2
+
+
+# ==================== GIỚI HẠN ĐỒNG THỜI ====================
+def test_busy_when_slots_taken():
+    """Hết slot (stream đang mở giữ slot): chờ GROQ_QUEUE_TIMEOUT rồi báo bận, không gọi Groq"""
+    app, fake = setup(GROQ_MAX_CONCURRENCY=1, GROQ_QUEUE_TIMEOUT=0.1)
+    stream = groq_gateway.stream(messages=[{'role': 'user', 'content': 'hi'}], model='test')
+    calls = len(fake.calls)
+
+    started = time.monotonic()
+    response = send(app, 'keo dán đá')
+    elapsed = time.monotonic() - started
+    assert response.status_code == 503
+    assert response.json['response'] == OVERLOADED_REPLY
+    assert 0.1 <= elapsed < 1
+    assert len(fake.calls) == calls
+    stats = groq_gateway.get_stats()
+    assert stats['rejected_busy'] == 1
+    assert stats['breaker']['consecutive_failures'] == 0
+
+    stream.close()
+    assert send(app, 'keo dán đá').status_code == 200
+
+
+def test_concurrent_calls_limited():
+    """Nhiều request cùng lúc: tối đa GROQ_MAX_CONCURRENCY lượt gọi Groq đồng thời"""
+    app, fake = setup(GROQ_MAX_CONCURRENCY=2, GROQ_QUEUE_TIMEOUT=2)
+    lock = threading.Lock()
+    active = {'now': 0, 'max': 0}
+
+    def slow(kwargs):
+        with lock:
+            active['now'] += 1
+            active['max'] = max(active['max'], active['now'])
+        time.sleep(0.05)
+        with lock:
+            active['now'] -= 1
+        return ['ok']
+
+    fake.script += [slow] * 6
+    threads = [threading.Thread(target=call_gateway) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+    assert len(fake.calls) == 6
+    assert active['max'] == 2
+    assert groq_gateway._slots._value == 2
+
+
+TESTS = [
+    test_retry_429_and_5xx_honours_retry_after,
+    test_retry_after_beyond_deadline_fails_fast,
+    test_retries_exhausted,
+    test_client_error_not_retried,
+    test_breaker_opens_after_threshold,
+    test_half_open_single_trial,
+    test_half_open_trial_failure_reopens,
+    test_busy_when_slots_taken,
+    test_concurrent_calls_limited,
+]
+
+
+def main():
+    print("\n" + "=" * 80)
+    print(f"{Colors.BLUE}🧪 TEST GROQ GATEWAY (retry / breaker / concurrency){Colors.END}")
+    print("=" * 80 + "\n")
+
+    passed = 0
+    failed = 0
+    for test in TESTS:
+        try:
+            test()
+            print(f"{Colors.GREEN}✅{Colors.END} {test.__doc__.strip()}")
+            passed += 1
+        except Exception:
+            print(f"{Colors.RED}❌{Colors.END} {test.__doc__.strip()}")
+            print(f"{Colors.YELLOW}{traceback.format_exc()}{Colors.END}")
+            failed += 1
+
+    print("\n" + "=" * 80)
+    print(f"  {Colors.GREEN}✅ Passed: {passed}/{len(TESTS)}{Colors.END}")
+    print(f"  {Colors.RED}❌ Failed: {failed}/{len(TESTS)}{Colors.END}")
+    print("=" * 80 + "\n")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,210 @@
+"""
+Test minifier.py (CSS/JS) - không cần server
+
+Chạy: python test/test_minifier.py
+"""
+
+import os
+import shutil
+import subprocess
+import sys
+import traceback
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from minifier import minify_css, minify_js  # noqa: E402
+
+
+class Colors:
+    GREEN = '\033[92m'
+    RED = '\033[91m'
+    YELLOW = '\033[93m'
+    BLUE = '\033[94m'
+    CYAN = '\033[96m'
+    END = '\033[0m'
+
+
+def css(source):
+    return minify_css(source)[0]
+
+
+def js(source):
+    return minify_js(source)[0]
+
+
+def run_node(source):
+    """stdout khi chạy bằng node (None nếu máy không có node)"""
+    node = shutil.which('node')
+    if node is None:
+        return None
+    result = subprocess.run([node, '-e', source], capture_output=True, text=True, timeout=10)
+    assert result.returncode == 0, result.stderr
+    return result.stdout
+
+
+# ==================== JS ====================
+def test_js_strings():
+    """JS: giữ nguyên nội dung string (khoảng trắng, // và /* */ bên trong)"""
+    assert js("var s = 'a  //  b' + \"c /* d */\";") == "var s='a  //  b'+\"c /* d */\";"
+    assert js("var e = 'it\\'s  ok';") == "var e='it\\'s  ok';"
+
+
+def test_js_regex_vs_division():
+    """JS: phân biệt regex và phép chia"""
+    assert js("var a = b / c / d;") == "var a=b/c/d;"
+    assert js("var t = x[0] / 2; var u = (y) / 3;") == "var t=x[0]/2;var u=(y)/3;"
+    assert js("var r = /ab+c/gi.test(s);") == "var r=/ab+c/gi.test(s);"
+    assert js("var re = /[/]  x/;") == "var re=/[/]  x/;"
+    assert js("if (/^\\d+$/.test(v)) { return v / 2 }") == "if(/^\\d+$/.test(v)){return v/2}"
+    assert js("return /x/.test(a)") == "return/x/.test(a)"
+    assert js("i++ / 2") == "i++/2"
+
+
+def test_js_template_literals():
+    """JS: template literal với ${} lồng nhau giữ nguyên"""
+    source = "var t = `a  ${b + `c ${ {d: 1}.d } e`}  f`;\nvar u = 1"
+    assert js(source) == "var t=`a  ${b + `c ${ {d: 1}.d } e`}  f`;var u=1"
+    assert js("var h = `<div class=\"x\">\n  ${ items.map(i => `<b>${i}</b>`).join('') }\n</div>`;") \
+        == "var h=`<div class=\"x\">\n  ${ items.map(i => `<b>${i}</b>`).join('') }\n</div>`;"
+
+
+def test_js_asi_increment():
+    """JS: xuống dòng trước/sau ++ -- giữ nguyên (ASI)"""
+    assert js("a\n++b") == "a\n++b"
+    assert js("a++\nb") == "a++\nb"
+    assert js("a = b + +c; d = e - -f; g = h + ++i;") == "a=b+ +c;d=e- -f;g=h+ ++i;"
+
+
+def test_js_asi_return():
+    """JS: 'return' + xuống dòng vẫn trả về undefined"""
+    assert js("function f(){ return\n  42 }") == "function f(){return\n42}"
+    assert js("function g(){ return (\n  42\n) }") == "function g(){return(42)}"
+
+
+def test_js_line_starting_with_paren_or_bracket():
+    """JS: dòng bắt đầu bằng ( hoặc [ không bị nối vào dòng trước"""
+    assert js("var a = b\n(function(){})()") == "var a=b\n(function(){})()"
+    assert js("var a = b\n[1,2].forEach(f)") == "var a=b\n[1,2].forEach(f)"
+    assert js("x = y\n;[1].map(f)") == "x=y;[1].map(f)"
+    assert js("var x = 1\nvar y = 2") == "var x=1\nvar y=2"
+
+
+def test_js_same_output_in_node():
+    """JS: bản minify chạy ra cùng kết quả với bản gốc (nếu có node)"""
+    source = r"""
+var a = 10
+var b = 2, g = 5
+var c = a
+/b/g
+var s = 'x  //  y'
+var t = `sum ${a + `${b * 2}`}`
+var n = 1
+n
+++b
+function f() {
+  return
+    42
+}
+var list = []
+;[1, 2, 3].forEach(function (v) { list.push(v / 2) })
+var re = /[/]\d+/.test('/12')
+console.log(JSON.stringify([a, b, c, s, t, n, f(), list, re, a++ / 2]))
+"""
+    original = run_node(source)
+    if original is None:
+        return
+    assert run_node(js(source)) == original
+
+
+# ==================== CSS ====================
+def test_css_zero_units():
+    """CSS: 0px -> 0, giữ 0s/0deg và 0 trong calc()"""
+    assert css("a{margin:0px 0.0em;top:-0px}") == "a{margin:0;top:0}"
+    assert css("a{transition:opacity 0s;transform:rotate(0deg)}") \
+        == "a{transition:opacity 0s;transform:rotate(0deg)}"
+    assert css("a{width:calc(100% - 0px);height:calc(0px + 10vh)}") \
+        == "a{width:calc(100% - 0px);height:calc(0px + 10vh)}"
+    assert css("a{--gap:0px}") == "a{--gap:0px}"
+
+
+def test_css_flex_basis():
+    """CSS: giữ đơn vị của 0 trong flex/flex-basis"""
+    assert css(".a{flex:1 1 0px;flex-basis:0px}") == ".a{flex:1 1 0px;flex-basis:0px}"
+    assert css(".a{flex:1 1 0%}") == ".a{flex:1 1 0%}"
+
+
+def test_css_numbers_and_shorthands():
+    """CSS: số, màu hex, rút gọn margin/padding"""
+    assert css("a{margin:0.50em 1.0px;color:#FFFFFF;background:#AaBbCd}") \
+        == "a{margin:.5em 1px;color:#fff;background:#aabbcd}"
+    assert css("a{padding:1px 2px 1px 2px}") == "a{padding:1px 2px}"
+
+
+def test_css_vendor_selectors_not_merged():
+    """CSS: selector có vendor prefix không gộp với rule khác"""
+    source = "input::-webkit-input-placeholder{color:#999}input::-moz-placeholder{color:#999}"
+    assert css(source) == source
+    assert css(".a:-moz-focusring{outline:0}.b{outline:0}") == ".a:-moz-focusring{outline:0}.b{outline:0}"
+    assert css("a{color:red}b{color:red}") == "a,b{color:red}"
+
+
+def test_css_fallback_declarations():
+    """CSS: fallback khác giá trị giữ nguyên thứ tự, chỉ bỏ khai báo trùng hệt"""
+    assert css("a{display:-webkit-box;display:-ms-flexbox;display:flex;display:flex}") \
+        == "a{display:-webkit-box;display:-ms-flexbox;display:flex}"
+    assert css("a{background:#fff;background:linear-gradient(red,blue)}") \
+        == "a{background:#fff;background:linear-gradient(red,blue)}"
+    assert css("a{color:red}a{color:blue}") == "a{color:red;color:blue}"
+
+
+def test_css_strings_comments_and_empty_rules():
+    """CSS: giữ string/url, bỏ comment (trừ /*! */) và rule rỗng"""
+    assert css("a::before{content:'  a ; b  '}/* x */b{}") == "a::before{content:'  a ; b  '}"
+    assert css("a{background:url( img/a b.png )}") == "a{background:url(img/a b.png)}"
+    assert css("/*! license */a{color:red}") == "/*! license */a{color:red}"
+    assert css("@media (max-width: 600px){a{color:red}}") == "@media (max-width:600px){a{color:red}}"
+
+
+TESTS = [
+    test_js_strings,
+    test_js_regex_vs_division,
+    test_js_template_literals,
+    test_js_asi_increment,
+    test_js_asi_return,
+    test_js_line_starting_with_paren_or_bracket,
+    test_js_same_output_in_node,
+    test_css_zero_units,
+    test_css_flex_basis,
+    test_css_numbers_and_shorthands,
+    test_css_vendor_selectors_not_merged,
+    test_css_fallback_declarations,
+    test_css_strings_comments_and_empty_rules,
+]
+
+
+def main():
+    print("\n" + "=" * 80)
+    print(f"{Colors.BLUE}🧪 TEST MINIFIER (CSS/JS){Colors.END}")
+    print("=" * 80 + "\n")
+
+    passed = 0
+    failed = 0
+    for test in TESTS:
+        try:
+            test()
+            print(f"{Colors.GREEN}✅{Colors.END} {test.__doc__.strip()}")
+            passed += 1
+        except Exception:
+            print(f"{Colors.RED}❌{Colors.END} {test.__doc__.strip()}")
+            print(f"{Colors.YELLOW}{traceback.format_exc()}{Colors.END}")
+            failed += 1
+
+    print("\n" + "=" * 80)
+    print(f"  {Colors.GREEN}✅ Passed: {passed}/{len(TESTS)}{Colors.END}")
+    print(f"  {Colors.RED}❌ Failed: {failed}/{len(TESTS)}{Colors.END}")
+    print("=" * 80 + "\n")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
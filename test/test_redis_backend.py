@@ -0,0 +1,263 @@
+"""
+Test RedisBackend (app/cache.py) với server RESP giả lập (test/resp_server.py), không cần Redis thật
+
+Chạy: python test/test_redis_backend.py
+"""
+
+import os
+import socket
+import sys
+import time
+import traceback
+from contextlib import contextmanager
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app.cache import RedisBackend, RedisError, CacheManager  # noqa: E402
+from resp_server import RESPServer  # noqa: E402
+
+
+class Colors:
+    GREEN = '\033[92m'
+    RED = '\033[91m'
+    YELLOW = '\033[93m'
+    BLUE = '\033[94m'
+    CYAN = '\033[96m'
+    END = '\033[0m'
+
+
+@contextmanager
+def running_server(**kwargs):
+    server = RESPServer(**kwargs).start()
+    try:
+        yield server
+    finally:
+        server.stop()
+
+
+def _free_port():
+    sock = socket.socket()
+    sock.bind(('127.0.0.1', 0))
+    port = sock.getsockname()[1]
+    sock.close()
+    return port
+
+
+# ==================== TEST CASES ====================
+def test_get_set_delete():
+    """get/set/delete + TTL (SET PX)"""
+    with running_server() as server:
+        backend = RedisBackend(server.url)
+        assert backend.get('missing') is None
+
+        backend.set('product_1', {'name': 'Keo dán gạch', 'price': 120000}, 1000.0, None)
+        assert backend.get('product_1') == ({'name': 'Keo dán gạch', 'price': 120000}, 1000.0, None)
+
+        backend.set('short', 'x', 1000.0, 0.05)
+        assert backend.get('short') is not None
+        time.sleep(0.1)
+        assert backend.get('short') is None, 'key có TTL phải hết hạn trên server'
+
+        backend.delete('product_1')
+        assert backend.get('product_1') is None
+
+
+def test_manager_default_ttl_sets_expiry():
+    """CacheManager.set(ttl=None): ghi key với PX = cache_time, chỉ ttl=0 là không hết hạn"""
+    with running_server() as server:
+        manager = CacheManager(RedisBackend(server.url))
+        manager._ttl = 120  # cache_time
+
+        manager.set('products_page:all:1:0:999999999:page=9999', ['p1'])
+        manager.set('related_products_1', ['p2'], ttl=30)
+        manager.set('forever', 1, ttl=0)
+
+        def expires_in(key):
+            _, expires = server.data[(0, f'bricon:c:{key}'.encode('utf-8'))]
+            return None if expires is None else expires - time.monotonic()
+
+        assert 119 < expires_in('products_page:all:1:0:999999999:page=9999') <= 120
+        assert 29 < expires_in('related_products_1') <= 30
+        assert expires_in('forever') is None
+        assert manager.get('products_page:all:1:0:999999999:page=9999') == ['p1']
+
+
+def test_clear_pattern_via_scan():
+    """clear(pattern) quét bằng SCAN (nhiều trang), chỉ xóa key chứa pattern, escape ký tự glob"""
+    with running_server() as server:
+        backend = RedisBackend(server.url)
+        for i in range(1200):
+            backend.set(f'page:/san-pham?page={i}', i, 0.0, None)
+        backend.set('products_page:all:1', 'a', 0.0, None)
+        backend.set('weird*key', 'b', 0.0, None)
+        backend.set('weirdXkey', 'c', 0.0, None)
+
+        backend.clear('page:/san-pham')
+        remaining = set(backend.keys())
+        assert remaining == {'products_page:all:1', 'weird*key', 'weirdXkey'}, remaining
+        assert server.commands.count('SCAN') > 2, 'phải đi hết các trang SCAN'
+
+        # '*' trong pattern là ký tự thường, không phải wildcard
+        backend.clear('weird*')
+        assert set(backend.keys()) == {'products_page:all:1', 'weirdXkey'}
+
+        backend.clear()
+        assert backend.keys() == []
+
+
+def test_key_prefix_isolation():
+    """2 site dùng chung server (prefix khác nhau) không xóa cache của nhau"""
+    with running_server() as server:
+        a = RedisBackend(server.url, prefix='a:')
+        b = RedisBackend(server.url, prefix='b:')
+        a.set('home', 1, 0.0, None)
+        b.set('home', 2, 0.0, None)
+        a.clear()
+        assert a.get('home') is None
+        assert b.get('home')[0] == 2
+
+
+def test_versions():
+    """incr_version/get_version: version dùng chung giữa các worker"""
+    with running_server() as server:
+        worker_1 = RedisBackend(server.url)
+        worker_2 = RedisBackend(server.url)
+        assert worker_1.get_version('search_index') == 0
+        assert worker_1.incr_version('search_index') == 1
+        assert worker_2.incr_version('search_index') == 2
+        assert worker_1.get_version('search_index') == 2
+        # clear() cache không đụng tới version
+        worker_1.clear()
+        assert worker_2.get_version('search_index') == 2
+
+
+def test_auth_and_select():
+    """AUTH + SELECT khi kết nối, key ở db khác không thấy nhau"""
+    with running_server(password='s3cret') as server:
+        db0 = RedisBackend(server.url)
+        db1 = RedisBackend(server.url.rsplit('/', 1)[0] + '/1')
+        db0.set('k', 'zero', 0.0, None)
+        assert db1.get('k') is None
+        assert db0.get('k')[0] == 'zero'
+        assert 'SELECT' in server.commands
+
+
+def test_failed_auth_does_not_keep_connection():
+    """AUTH lỗi: không giữ lại socket chưa xác thực, lần sau kết nối + AUTH lại"""
+    with running_server(password='s3cret') as server:
+        backend = RedisBackend(server.url.replace('s3cret', 'wrong'))
+        try:
+            backend.get('k')
+        except RedisError as e:
+            assert 'WRONGPASS' in str(e)
+        else:
+            raise AssertionError('AUTH sai phải báo lỗi')
+        assert getattr(backend._local, 'conn', None) is None
+
+        backend.password = 's3cret'
+        assert backend.get('k') is None          # không phải NOAUTH trên socket cũ
+        assert server.connections == 2
+        assert server.commands.count('AUTH') == 2
+
+
+def test_fail_fast_when_down():
+    """Server không phản hồi: lỗi 1 lần rồi fail nhanh trong RETRY_AFTER giây, CacheManager coi như miss"""
+    backend = RedisBackend(f'redis://127.0.0.1:{_free_port()}/0', socket_timeout=0.2)
+    try:
+        backend.get('k')
+    except OSError:
+        pass
+    else:
+        raise AssertionError('phải lỗi khi không kết nối được')
+    assert backend._down_until > time.monotonic()
+
+    attempts = []
+    original = socket.create_connection
+    socket.create_connection = lambda *a, **kw: attempts.append(a) or original(*a, **kw)
+    try:
+        started = time.perf_counter()
+        for _ in range(20):
+            try:
+                backend.get('k')
+            except ConnectionError as e:
+                assert 'unavailable' in str(e)
+        assert attempts == [], 'không được thử kết nối lại trước RETRY_AFTER'
+        assert time.perf_counter() - started < 0.05
+
+        manager = CacheManager(backend)
+        assert manager.get('k') is None
+        manager.set('k', 1)
+        assert manager.get_version('search_index') == 0
+        assert manager._stats['errors'] == 3
+
+        # Hết RETRY_AFTER: thử kết nối lại (server lên thì dùng bình thường)
+        with running_server() as server:
+            backend.port = server.port
+            backend._down_until = 0
+            backend.set('k', 'back', 0.0, None)
+            assert backend.get('k')[0] == 'back'
+        assert len(attempts) == 1
+    finally:
+        socket.create_connection = original
+
+
+def test_reconnect_after_server_restart():
+    """Connection hỏng (server restart): bỏ connection, lệnh sau kết nối lại"""
+    with running_server() as server:
+        port = server.port
+        backend = RedisBackend(server.url)
+        backend.set('k', 1, 0.0, None)
+    time.sleep(0.05)
+    try:
+        backend.get('k')
+    except OSError:
+        pass
+    assert getattr(backend._local, 'conn', None) is None
+    server = RESPServer(port=port).start()
+    try:
+        backend._down_until = 0
+        assert backend.get('k') is None
+    finally:
+        server.stop()
+
+
+TESTS = [
+    test_get_set_delete,
+    test_manager_default_ttl_sets_expiry,
+    test_clear_pattern_via_scan,
+    test_key_prefix_isolation,
+    test_versions,
+    test_auth_and_select,
+    test_failed_auth_does_not_keep_connection,
+    test_fail_fast_when_down,
+    test_reconnect_after_server_restart,
+]
+
+
+def main():
+    print("\n" + "=" * 80)
+    print(f"{Colors.BLUE}🧪 TEST REDIS BACKEND (RESP stand-in){Colors.END}")
+    print("=" * 80 + "\n")
+
+    passed = 0
+    failed = 0
+    for test in TESTS:
+        try:
+            test()
+            print(f"{Colors.GREEN}✅{Colors.END} {test.__doc__.strip()}")
+            passed += 1
+        except Exception:
+            print(f"{Colors.RED}❌{Colors.END} {test.__doc__.strip()}")
+            print(f"{Colors.YELLOW}{traceback.format_exc()}{Colors.END}")
+            failed += 1
+
+    print("\n" + "=" * 80)
+    print(f"  {Colors.GREEN}✅ Passed: {passed}/{len(TESTS)}{Colors.END}")
+    print(f"  {Colors.RED}❌ Failed: {failed}/{len(TESTS)}{Colors.END}")
+    print("=" * 80 + "\n")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()